@@ -35,11 +35,38 @@ class Settings(BaseSettings):
     secret_key: str  # REQUIRED - no default
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    jwt_cache_size: int = 10000  # Verified token claims cached per worker (LRU, entries expire with the token)
+    token_revocation_store: str = "memory"  # memory (per process) | redis (shared by all workers, needs REDIS_URL)
+    token_revocation_sync_seconds: float = 5.0  # How often a worker pulls logouts made on other workers
+    token_revocation_capacity: int = 100000  # Revoked tokens the bloom filter is sized for
+    password_hash_workers: int = 2  # bcrypt worker processes per app worker (see app/services/password_hasher.py)
+    password_hash_queue: int = 16  # bcrypt calls that may wait for a worker; beyond this logins get 429
+    password_hash_rounds: int = 12  # bcrypt cost for new hashes; other costs are re-hashed on login
+    password_hash_executor: str = "process"  # process | thread
+
+    # Company directory cache (see app/services/directory_cache.py)
+    directory_cache_ttl_seconds: float = 60.0  # How long other workers may serve a changed company/user; 0 disables
+    directory_cache_size: int = 10000  # Company and company user documents cached per worker (LRU)
+    directory_cache_change_stream: bool = False  # Invalidate on every change via a MongoDB change stream (replica set)
 
     # Database Configuration - REQUIRED, no defaults
     mongodb_uri: str  # REQUIRED - no default
     mongodb_database: str  # REQUIRED - no default
 
+    # MongoDB client profiles - Sensible defaults OK (see app/database/mongodb.py)
+    # OLTP: request-path reads/writes on the primary
+    mongodb_max_pool_size: int = 50
+    mongodb_min_pool_size: int = 10
+    mongodb_max_idle_time_ms: int = 30000
+    mongodb_server_selection_timeout_ms: int = 5000
+    # Analytics: admin reports/aggregations on a separate pool, preferring secondaries
+    mongodb_analytics_enabled: bool = True  # False = analytics queries use the OLTP client
+    mongodb_analytics_uri: Optional[str] = None  # Defaults to mongodb_uri
+    mongodb_analytics_read_preference: str = "secondaryPreferred"
+    mongodb_analytics_max_pool_size: int = 10
+    mongodb_analytics_min_pool_size: int = 0
+    mongodb_analytics_max_time_ms: int = 15000  # Per-operation time limit for reports
+
     # Translation Services - Optional (truly optional)
     google_translate_api_key: Optional[str] = None
     deepl_api_key: Optional[str] = None
@@ -88,10 +115,43 @@ class Settings(BaseSettings):
     rate_limiting_enabled: bool = True
     rate_limit_requests: int = 100
     rate_limit_window: int = 3600  # 1 hour
+    rate_limit_default_enabled: bool = False  # True = routes without a policy get rate_limit_requests/rate_limit_window
+    rate_limit_store: str = "memory"  # memory (per process) | redis (shared by all workers, needs REDIS_URL)
+    rate_limit_trusted_proxies: str = ""  # Comma-separated proxy IPs/CIDRs whose X-Forwarded-For is honored
+    redis_url: Optional[str] = None
 
     # Logging - Sensible defaults OK
     log_level: str = "INFO"
     log_file: str = "./logs/translator.log"
+    # Non-blocking pipeline (see app/utils/structured_logging.py)
+    log_queue_size: int = 10000  # Records beyond this are dropped instead of blocking the event loop
+    log_component_levels: str = ""  # e.g. "translator.middleware=WARNING,app.services.google_drive_service=DEBUG"
+    log_debug_sample_rate: float = 1.0  # Fraction of DEBUG records kept per logger
+    legacy_prints_enabled: bool = True  # False = drop the console print() output on request paths
+
+    # Request middleware - Sensible defaults OK (see app/middleware/)
+    request_body_capture_paths: str = ""  # Comma-separated paths whose raw body is buffered and logged (debugging only)
+    request_body_capture_max_bytes: int = 65536
+    # Per-route policies (see app/middleware/route_policy.py)
+    request_max_body_bytes: int = 1048576  # 1MB for JSON API requests
+    bulk_max_body_bytes: int = 167772160  # 160MB for uploads and base64-encoded translate payloads
+    bulk_max_concurrency: int = 4  # In-flight uploads per worker (translations: ADMISSION_TRANSLATE_MAX_IN_FLIGHT)
+    # Admission control for heavy endpoints (see app/middleware/admission.py)
+    admission_control_enabled: bool = True
+    admission_target_ms: int = 500  # Acceptable queueing delay
+    admission_interval_ms: int = 2000  # Shed once the delay stays above target this long
+    admission_max_queue: int = 32  # Waiting requests per endpoint class per worker
+    admission_translate_max_in_flight: int = 4
+    admission_confirm_max_in_flight: int = 8
+    admission_payment_max_in_flight: int = 16
+    # Per-tenant bulkheads (see app/services/tenant_bulkhead.py)
+    bulkhead_ingest_capacity: int = 16  # Concurrent Drive uploads per worker
+    bulkhead_ingest_tenant_quota: int = 4  # Concurrent Drive uploads per tenant
+    bulkhead_confirm_capacity: int = 8
+    bulkhead_confirm_tenant_quota: int = 2
+    bulkhead_payment_capacity: int = 8
+    bulkhead_payment_tenant_quota: int = 2
+    bulkhead_tenant_quotas: str = ""  # e.g. "company:Acme Health LLC=8;user:someone@example.com=4"
 
     # CORS Configuration - REQUIRED, no defaults
     cors_origins: str  # REQUIRED - no default
@@ -103,9 +163,28 @@ class Settings(BaseSettings):
     api_url: Optional[str] = None
 
 
+    # Archive tier - Sensible defaults OK (see app/services/archive_service.py)
+    archive_horizon_days: int = 365  # Records older than this move to monthly archive collections
+    archive_batch_size: int = 500
+
+    # Streaming exports - Sensible defaults OK (see app/services/export_service.py)
+    export_batch_size: int = 1000  # Cursor batch size and rows per streamed chunk
+    export_timeout_seconds: int = 3600  # Time limit for one export cursor
+
     # Monitoring - Sensible defaults OK
     health_check_interval: int = 30
-    metrics_enabled: bool = True
+    metrics_enabled: bool = True  # Prometheus text exposition at GET /metrics (see app/utils/metrics.py)
+    metrics_allowed_ips: str = "127.0.0.1,::1"  # Comma-separated peer IPs/CIDRs allowed to scrape /metrics
+    metrics_token: str = ""  # When set, "Authorization: Bearer <token>" may scrape /metrics from any peer
+    loop_lag_sample_interval_ms: int = 500
+    loop_block_threshold_ms: int = 250  # Log the loop's stack when a callback blocks longer (0 disables)
+    tracing_enabled: bool = True  # Per-request spans (see app/utils/tracing.py)
+    tracing_exporter: str = "none"  # none, log, file or otlp
+    tracing_file: str = "./logs/traces.jsonl"  # OTLP/JSON lines, one request per line
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"  # OTLP/HTTP JSON collector
+    tracing_max_spans: int = 256  # Spans kept per request; further spans are counted, not kept
+    tracing_queue_size: int = 1000  # Finished requests waiting for the exporter thread
+    server_timing_enabled: bool = True  # Server-Timing response header with span totals
 
     # Email Configuration - REQUIRED for email features
     smtp_host: str  # REQUIRED - no default
@@ -163,6 +242,21 @@ class Settings(BaseSettings):
         """Get list of allowed file extensions."""
         return [ext.strip() for ext in self.allowed_file_types.split(',')]
     
+    @property
+    def body_capture_paths(self) -> List[str]:
+        """Get list of paths whose raw request body is captured for debugging."""
+        return [path.strip() for path in self.request_body_capture_paths.split(',') if path.strip()]
+
+    @property
+    def trusted_proxy_list(self) -> List[str]:
+        """Get list of proxy addresses/networks allowed to set X-Forwarded-For."""
+        return [proxy.strip() for proxy in self.rate_limit_trusted_proxies.split(',') if proxy.strip()]
+
+    @property
+    def metrics_allowed_ip_list(self) -> List[str]:
+        """Get list of peer addresses/networks allowed to scrape /metrics."""
+        return [ip.strip() for ip in self.metrics_allowed_ips.split(',') if ip.strip()]
+
     @property
     def is_production(self) -> bool:
         """Check if running in production environment."""
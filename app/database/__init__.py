@@ -2,6 +2,6 @@
 Database package initialization.
 """
 
-from app.database.mongodb import database, MongoDB
+from app.database.mongodb import database, MongoDB, OLTP_PROFILE, ANALYTICS_PROFILE
 
-__all__ = ['database', 'MongoDB']
+__all__ = ['database', 'MongoDB', 'OLTP_PROFILE', 'ANALYTICS_PROFILE']
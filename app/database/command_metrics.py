@@ -0,0 +1,36 @@
+"""
+MongoDB command latency metrics and trace spans.
+
+A pymongo CommandListener registered on every Motor client (see
+ClientProfile.client_options). The driver reports each command's round-trip
+time in the succeeded/failed events, so nothing is tracked between the
+started and finished events. Motor runs commands with a copy of the
+caller's context, so the spans land in the request's trace.
+"""
+
+from pymongo import monitoring
+
+from app.utils.metrics import MONGO_COMMAND_FAILURES, MONGO_COMMAND_SECONDS
+from app.utils.tracing import record_span
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Records mongodb_command_duration_seconds and a "mongo.<command>" span per command."""
+
+    def __init__(self, client_name: str):
+        self.client_name = client_name
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        duration = event.duration_micros / 1e6
+        MONGO_COMMAND_SECONDS.labels(self.client_name, event.command_name).observe(duration)
+        record_span(f"mongo.{event.command_name}", duration, **{"db.client": self.client_name})
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        duration = event.duration_micros / 1e6
+        MONGO_COMMAND_SECONDS.labels(self.client_name, event.command_name).observe(duration)
+        MONGO_COMMAND_FAILURES.labels(self.client_name, event.command_name).inc()
+        error = (event.failure or {}).get("codeName") or "CommandFailed"
+        record_span(f"mongo.{event.command_name}", duration, error=error, **{"db.client": self.client_name})
@@ -0,0 +1,462 @@
+"""
+Versioned, hash-checked MongoDB index management.
+
+INDEX_SPECS is the single source of truth for the application's indexes.
+Each collection's spec is hashed (together with INDEX_SPECS_VERSION) and the
+hash of the last successful build is stored in the `index_versions`
+collection. At startup a worker only compares hashes; collections whose spec
+changed are built by a background task, so worker cold start never waits on
+index builds. A lease lock in `index_versions` keeps several uvicorn workers
+from racing on the same builds.
+
+Standalone CLI: scripts/manage_indexes.py (status / sync).
+
+Every query shape declared with register_query_shape() must be served by one
+of these indexes; verify with scripts/verify_query_shapes.py.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Bump to force every collection to rebuild regardless of spec changes
+INDEX_SPECS_VERSION = 1
+
+# Collection holding per-collection spec hashes and the build lock
+INDEX_VERSIONS_COLLECTION = "index_versions"
+BUILD_LOCK_ID = "_build_lock"
+BUILD_LOCK_TTL = timedelta(minutes=30)
+
+# How often to poll $currentOp for index build progress
+PROGRESS_POLL_SECONDS = 5
+
+# MongoDB error codes raised when an index exists with another name/options/keys
+INDEX_CONFLICT_CODES = {85, 86}
+
+
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    # Company collection (singular collection name)
+    "company": [
+        IndexModel([("company_name", ASCENDING)], unique=True, name="company_name_unique"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc")
+    ],
+    "users": [
+        IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
+        IndexModel([("email", ASCENDING)], name="email_idx"),
+        IndexModel([("company_name", ASCENDING)], name="company_name_idx"),
+        IndexModel([("email", ASCENDING), ("company_name", ASCENDING)], name="email_company_idx"),
+        IndexModel([("status", ASCENDING)], name="status_idx"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc")
+    ],
+    # Enterprise/corporate users
+    "company_users": [
+        IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
+        IndexModel([("email", ASCENDING)], name="email_idx"),
+        IndexModel([("company_name", ASCENDING)], name="company_name_idx"),
+        IndexModel([("email", ASCENDING), ("company_name", ASCENDING)], name="email_company_idx"),
+        IndexModel([("status", ASCENDING)], name="status_idx"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc")
+    ],
+    # UNIQUE constraint: ONE subscription per company (company_name_unique)
+    "subscriptions": [
+        IndexModel([("company_name", ASCENDING)], unique=True, name="company_name_unique"),
+        IndexModel([("status", ASCENDING)], name="status_idx"),
+        IndexModel([("start_date", ASCENDING)], name="start_date_idx"),
+        IndexModel([("end_date", ASCENDING)], name="end_date_idx"),
+        IndexModel([("company_name", ASCENDING), ("status", ASCENDING)], name="company_status_idx"),
+        IndexModel([("company_name", ASCENDING), ("status", ASCENDING), ("created_at", ASCENDING)], name="company_status_created_idx"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc")
+    ],
+    # Simple user auth
+    "users_login": [
+        IndexModel([("user_email", ASCENDING)], unique=True, name="user_email_unique"),
+        IndexModel([("user_name", ASCENDING)], unique=True, name="user_name_unique"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc")
+    ],
+    # One document per subscription period. The compound unique index serves the
+    # "current period" point read: {subscription_id, period_start <= now, period_end >= now}
+    "usage_periods": [
+        IndexModel(
+            [("subscription_id", ASCENDING), ("period_start", ASCENDING), ("period_end", ASCENDING)],
+            unique=True,
+            name="subscription_period_unique"
+        ),
+        IndexModel([("subscription_id", ASCENDING), ("period_number", ASCENDING)], name="subscription_period_number_idx"),
+        IndexModel([("company_name", ASCENDING)], name="company_name_idx"),
+        IndexModel([("company_name", ASCENDING), ("last_updated", ASCENDING)], name="company_last_updated_idx")
+    ],
+    "translation_transactions": [
+        IndexModel([("transaction_id", ASCENDING)], unique=True, name="transaction_id_unique"),
+        IndexModel([("company_name", ASCENDING), ("status", ASCENDING)], name="company_status_idx"),
+        IndexModel([("company_name", ASCENDING), ("created_at", ASCENDING)], name="company_created_idx"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc")
+    ],
+    # Individual users
+    "user_transactions": [
+        IndexModel([("transaction_id", ASCENDING)], unique=True, name="transaction_id_unique"),
+        IndexModel([("stripe_checkout_session_id", ASCENDING)], unique=True, sparse=True, name="stripe_checkout_session_id_unique"),
+        IndexModel([("stripe_payment_intent_id", ASCENDING)], sparse=True, name="stripe_payment_intent_id_idx"),
+        IndexModel([("user_email", ASCENDING)], name="user_email_idx"),
+        IndexModel([("date", ASCENDING)], name="date_desc_idx"),
+        IndexModel([("user_email", ASCENDING), ("date", ASCENDING)], name="user_email_date_idx"),
+        IndexModel([("status", ASCENDING)], name="status_idx"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc")
+    ],
+    # Stripe payments - CRITICAL FOR PAYMENT FUNCTIONALITY
+    # NOTE: Stripe indexes use sparse for optional fields
+    "payments": [
+        IndexModel([("stripe_payment_intent_id", ASCENDING)], unique=True, sparse=True, name="stripe_payment_intent_id_unique"),
+        IndexModel([("stripe_invoice_id", ASCENDING)], sparse=True, name="stripe_invoice_id_idx"),
+        IndexModel([("stripe_customer_id", ASCENDING)], sparse=True, name="stripe_customer_id_idx"),
+        IndexModel([("company_name", ASCENDING)], name="company_name_idx"),
+        IndexModel([("subscription_id", ASCENDING)], name="subscription_id_idx"),
+        IndexModel([("user_id", ASCENDING)], name="user_id_idx"),
+        IndexModel([("payment_status", ASCENDING)], name="payment_status_idx"),
+        IndexModel([("payment_date", ASCENDING)], name="payment_date_idx"),
+        IndexModel([("user_email", ASCENDING)], name="user_email_idx"),
+        IndexModel([("company_name", ASCENDING), ("payment_status", ASCENDING)], name="company_status_idx"),
+        IndexModel([("user_id", ASCENDING), ("payment_date", ASCENDING)], name="user_payment_date_idx"),
+        IndexModel([("invoice_id", ASCENDING)], name="invoice_id_idx"),
+        IndexModel([("company_name", ASCENDING), ("payment_date", ASCENDING)], name="company_payment_date_idx"),
+        IndexModel([("company_name", ASCENDING), ("payment_status", ASCENDING), ("payment_date", ASCENDING)], name="company_status_payment_date_idx"),
+        IndexModel([("user_email", ASCENDING), ("payment_date", ASCENDING)], name="user_email_payment_date_idx"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc")
+    ],
+    "invoices": [
+        IndexModel([("invoice_number", ASCENDING)], unique=True, name="invoice_number_unique"),
+        IndexModel([("company_name", ASCENDING)], name="company_name_idx"),
+        IndexModel([("subscription_id", ASCENDING)], name="subscription_id_idx"),
+        IndexModel([("status", ASCENDING)], name="status_idx"),
+        IndexModel([("invoice_date", ASCENDING)], name="invoice_date_idx"),
+        IndexModel([("due_date", ASCENDING)], name="due_date_idx"),
+        IndexModel([("company_name", ASCENDING), ("status", ASCENDING)], name="company_status_idx"),
+        # Conditional GET version stamp: newest updated_at/created_at per company is one index read
+        IndexModel([("company_name", ASCENDING), ("updated_at", ASCENDING)], name="company_updated_idx"),
+        IndexModel([("company_name", ASCENDING), ("created_at", ASCENDING)], name="company_created_idx"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc")
+    ],
+    # Stripe webhook audit trail (90-day TTL)
+    "webhook_events": [
+        IndexModel([("event_id", ASCENDING)], unique=True, name="event_id_unique"),
+        IndexModel([("payment_intent_id", ASCENDING)], name="payment_intent_id_idx"),
+        IndexModel([("event_type", ASCENDING)], name="event_type_idx"),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_90_days"),
+        IndexModel([("created_at", -1)], name="created_at_desc")
+    ],
+    # Archive tier manifest: one document per monthly archive collection
+    "archive_manifest": [
+        IndexModel([("collection", ASCENDING), ("month", -1)], name="collection_month_idx")
+    ],
+    # Stripe dispute tracking
+    "disputes": [
+        IndexModel([("dispute_id", ASCENDING)], unique=True, name="dispute_id_unique"),
+        IndexModel([("charge_id", ASCENDING)], name="charge_id_idx"),
+        IndexModel([("payment_intent_id", ASCENDING)], name="payment_intent_id_idx"),
+        IndexModel([("status", ASCENDING)], name="status_idx"),
+        IndexModel([("reason", ASCENDING)], name="reason_idx"),
+        IndexModel([("created_at", ASCENDING)], name="created_at_asc"),
+        IndexModel([("evidence_due_by", ASCENDING)], name="evidence_due_by_idx")
+    ],
+}
+
+# Indexes left behind by earlier schemas (company_id -> company_name migration,
+# idx_-prefixed users_login indexes) or no longer used by any query
+# (translation_transactions user_created_idx, documents_file_name_idx: the
+# file name search is an unanchored regex no index can serve). Dropped
+# before a collection is built.
+LEGACY_INDEXES: Dict[str, List[str]] = {
+    "company_users": ["old_company_idx", "old_email_company_idx"],
+    "subscriptions": ["old_company_idx", "old_company_unique", "old_company_status_idx"],
+    "translation_transactions": ["old_company_status_idx", "user_created_idx", "documents_file_name_idx"],
+    "users_login": ["idx_user_email_unique", "idx_user_name_unique", "idx_created_at"],
+}
+
+
+def _spec_document(model: IndexModel) -> Dict[str, Any]:
+    document = dict(model.document)
+    document["key"] = list(document["key"].items())
+    return document
+
+
+def _index_options(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Index options that must match for an existing index to satisfy a spec."""
+    return {key: value for key, value in document.items() if key not in ("v", "ns", "key", "name")}
+
+
+def compute_spec_hash(collection: str, version: int = INDEX_SPECS_VERSION) -> str:
+    """
+    Hash a collection's index specification.
+
+    The hash covers INDEX_SPECS_VERSION, the index models (key order
+    preserved) and the legacy indexes to drop.
+    """
+    payload = {
+        "version": version,
+        "indexes": [_spec_document(model) for model in INDEX_SPECS.get(collection, [])],
+        "legacy": sorted(LEGACY_INDEXES.get(collection, [])),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class IndexManager:
+    """Builds INDEX_SPECS and records per-collection spec hashes."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.status: Dict[str, Any] = {"state": "idle"}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def versions(self):
+        """Get the index_versions collection."""
+        return self.db[INDEX_VERSIONS_COLLECTION]
+
+    async def pending_collections(self) -> List[str]:
+        """
+        List collections whose stored hash differs from the current spec.
+
+        Returns:
+            list: Collection names that need a build
+        """
+        stored = {
+            doc["_id"]: doc.get("hash")
+            async for doc in self.versions.find({"_id": {"$in": list(INDEX_SPECS)}}, {"hash": 1})
+        }
+        return [
+            collection for collection in INDEX_SPECS
+            if stored.get(collection) != compute_spec_hash(collection)
+        ]
+
+    async def acquire_lock(self) -> bool:
+        """
+        Take the build lease so only one worker builds at a time.
+
+        Returns:
+            bool: True if this process holds the lock
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            await self.versions.find_one_and_update(
+                {
+                    "_id": BUILD_LOCK_ID,
+                    "$or": [{"expires_at": {"$lt": now}}, {"owner": self.owner}]
+                },
+                {"$set": {"owner": self.owner, "expires_at": now + BUILD_LOCK_TTL, "acquired_at": now}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            # Lock document exists, is unexpired and owned by another worker
+            return False
+
+    async def release_lock(self) -> None:
+        """Release the build lease if this process holds it."""
+        await self.versions.delete_one({"_id": BUILD_LOCK_ID, "owner": self.owner})
+
+    async def _drop_conflicting_indexes(self, collection: str) -> List[str]:
+        """
+        Drop existing indexes that clash with the spec by name or key pattern.
+
+        Returns:
+            list: Names of dropped indexes
+        """
+        wanted = {model.document["name"]: _spec_document(model) for model in INDEX_SPECS[collection]}
+        wanted_keys = {json.dumps(spec["key"]): name for name, spec in wanted.items()}
+        dropped = []
+
+        async for existing in self.db[collection].list_indexes():
+            name = existing["name"]
+            if name == "_id_":
+                continue
+            existing = dict(existing)
+            existing["key"] = list(existing["key"].items())
+            existing_key = json.dumps(existing["key"])
+
+            same_name_different_spec = name in wanted and (
+                json.dumps(wanted[name]["key"]) != existing_key
+                or _index_options(wanted[name]) != _index_options(existing)
+            )
+            same_key_different_name = existing_key in wanted_keys and wanted_keys[existing_key] != name
+            if same_name_different_spec or same_key_different_name:
+                await self.db[collection].drop_index(name)
+                logger.info(f"[MongoDB] Dropped conflicting index {collection}.{name}")
+                dropped.append(name)
+
+        return dropped
+
+    async def _report_build_progress(self, collection: str) -> None:
+        """Periodically log index build progress reported by $currentOp."""
+        while True:
+            await asyncio.sleep(PROGRESS_POLL_SECONDS)
+            try:
+                ops = await self.db.client.admin.aggregate([
+                    {"$currentOp": {"allUsers": True, "idleConnections": False}},
+                    {"$match": {"ns": f"{self.db.name}.{collection}", "progress": {"$exists": True}}}
+                ]).to_list(length=None)
+            except Exception as e:
+                logger.debug(f"[MongoDB] Index build progress unavailable: {e}")
+                return
+            for op in ops:
+                progress = op["progress"]
+                logger.info(
+                    f"[MongoDB] Index build {collection}: {op.get('msg', '')} "
+                    f"({progress.get('done')}/{progress.get('total')})"
+                )
+
+    async def build_collection(self, collection: str) -> None:
+        """
+        Build one collection's indexes and record its spec hash.
+
+        Raises:
+            OperationFailure: If the build fails for a reason other than a
+                resolvable name/key conflict
+        """
+        for name in LEGACY_INDEXES.get(collection, []):
+            try:
+                await self.db[collection].drop_index(name)
+                logger.info(f"[MongoDB] Dropped legacy index {collection}.{name}")
+            except (OperationFailure, Exception):
+                pass
+
+        progress_task = asyncio.create_task(self._report_build_progress(collection))
+        try:
+            try:
+                await self.db[collection].create_indexes(INDEX_SPECS[collection])
+            except OperationFailure as e:
+                if e.code not in INDEX_CONFLICT_CODES:
+                    raise
+                logger.warning(f"[MongoDB] Index conflict on {collection}: {e}; dropping conflicting indexes")
+                await self._drop_conflicting_indexes(collection)
+                await self.db[collection].create_indexes(INDEX_SPECS[collection])
+        finally:
+            progress_task.cancel()
+
+        await self.versions.update_one(
+            {"_id": collection},
+            {"$set": {
+                "hash": compute_spec_hash(collection),
+                "version": INDEX_SPECS_VERSION,
+                "index_names": [model.document["name"] for model in INDEX_SPECS[collection]],
+                "built_at": datetime.now(timezone.utc),
+                "built_by": self.owner
+            }},
+            upsert=True
+        )
+
+    async def sync(self, collections: Optional[List[str]] = None, force: bool = False) -> Dict[str, bool]:
+        """
+        Build indexes for changed (or all, with force) collections.
+
+        Each collection is isolated: one failure does not skip the others.
+
+        Args:
+            collections: Limit to these collections (default: all in INDEX_SPECS)
+            force: Build even if the stored hash matches
+
+        Returns:
+            dict: collection -> True if built successfully
+        """
+        targets = collections or list(INDEX_SPECS)
+        if not force:
+            pending = set(await self.pending_collections())
+            targets = [collection for collection in targets if collection in pending]
+
+        self.status = {
+            "state": "building",
+            "total": len(targets),
+            "completed": 0,
+            "failed": [],
+            "current": None,
+            "started_at": datetime.now(timezone.utc).isoformat()
+        }
+        results: Dict[str, bool] = {}
+
+        for collection in targets:
+            self.status["current"] = collection
+            try:
+                await self.build_collection(collection)
+                results[collection] = True
+                logger.info(
+                    f"[MongoDB] {collection} indexes built "
+                    f"({self.status['completed'] + 1}/{len(targets)})"
+                )
+            except (OperationFailure, Exception) as e:
+                results[collection] = False
+                self.status["failed"].append(collection)
+                logger.warning(f"[MongoDB] {collection} index creation failed: {e}")
+            self.status["completed"] += 1
+
+        self.status.update({
+            "state": "failed" if self.status["failed"] else "ready",
+            "current": None,
+            "finished_at": datetime.now(timezone.utc).isoformat()
+        })
+        logger.info(
+            f"[MongoDB] Index sync completed: {len(targets) - len(self.status['failed'])} collections successful, "
+            f"{len(self.status['failed'])} collections had issues"
+        )
+        return results
+
+    async def _sync_if_changed(self) -> None:
+        self.status = {"state": "checking"}
+        pending = await self.pending_collections()
+        if not pending:
+            self.status = {"state": "ready", "total": 0, "completed": 0, "failed": []}
+            logger.info("[MongoDB] Index specs unchanged, skipping index build")
+            return
+
+        if not await self.acquire_lock():
+            self.status = {"state": "skipped", "pending": pending}
+            logger.info(f"[MongoDB] Another worker is building indexes for {pending}, skipping")
+            return
+
+        try:
+            logger.info(f"[MongoDB] Building indexes in background for: {', '.join(pending)}")
+            await self.sync(pending, force=True)
+        finally:
+            await self.release_lock()
+
+    async def _run_background_sync(self) -> None:
+        try:
+            await self._sync_if_changed()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.status = {"state": "failed", "error": str(e)}
+            logger.error(f"[MongoDB] Background index sync failed: {e}", exc_info=True)
+
+    def start_background_sync(self) -> asyncio.Task:
+        """
+        Check spec hashes and build changed collections without blocking the caller.
+
+        Returns:
+            asyncio.Task: The background sync task
+        """
+        self._task = asyncio.create_task(self._run_background_sync())
+        return self._task
+
+    async def stop(self) -> None:
+        """Cancel a running background sync (the server finishes any in-flight build)."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            try:
+                await self.release_lock()
+            except Exception as e:
+                logger.warning(f"[MongoDB] Could not release index build lock: {e}")
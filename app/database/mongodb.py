@@ -3,15 +3,83 @@ MongoDB database connection and management.
 """
 
 import logging
+from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import ASCENDING, IndexModel
-from pymongo.errors import ConnectionFailure, OperationFailure, ServerSelectionTimeoutError
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 
 from app.config import settings
+from app.database.command_metrics import CommandMetricsListener
+from app.database.indexes import IndexManager
 
 logger = logging.getLogger(__name__)
 
+# Client profile names
+OLTP_PROFILE = "oltp"
+ANALYTICS_PROFILE = "analytics"
+
+
+@dataclass(frozen=True)
+class ClientProfile:
+    """Connection settings for one Motor client (one connection pool)."""
+
+    name: str
+    uri: str
+    max_pool_size: int
+    min_pool_size: int
+    read_preference: str = "primary"
+    # Server-side time limit applied to every operation of this client
+    max_time_ms: Optional[int] = None
+
+    def client_options(self) -> Dict[str, Any]:
+        """Keyword arguments for AsyncIOMotorClient."""
+        options: Dict[str, Any] = {
+            "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "maxIdleTimeMS": settings.mongodb_max_idle_time_ms,
+            "readPreference": self.read_preference,
+            "appname": f"translator-{self.name}",
+        }
+        if self.max_time_ms:
+            # Client-side operation timeout; the driver sends it as maxTimeMS
+            options["timeoutMS"] = self.max_time_ms
+        if settings.metrics_enabled:
+            options["event_listeners"] = [CommandMetricsListener(self.name)]
+        return options
+
+
+def build_client_profiles() -> Dict[str, ClientProfile]:
+    """
+    Build the client profiles from settings.
+
+    - oltp: request-path reads and writes on the primary
+    - analytics: admin reports and aggregations with their own pool,
+      secondaryPreferred reads and a per-operation time limit, so reporting
+      load never competes with payment/upload writes for pool slots
+
+    Returns:
+        dict: Profile name -> ClientProfile (analytics omitted when disabled)
+    """
+    profiles = {
+        OLTP_PROFILE: ClientProfile(
+            name=OLTP_PROFILE,
+            uri=settings.mongodb_uri,
+            max_pool_size=settings.mongodb_max_pool_size,
+            min_pool_size=settings.mongodb_min_pool_size,
+        )
+    }
+    if settings.mongodb_analytics_enabled:
+        profiles[ANALYTICS_PROFILE] = ClientProfile(
+            name=ANALYTICS_PROFILE,
+            uri=settings.mongodb_analytics_uri or settings.mongodb_uri,
+            max_pool_size=settings.mongodb_analytics_max_pool_size,
+            min_pool_size=settings.mongodb_analytics_min_pool_size,
+            read_preference=settings.mongodb_analytics_read_preference,
+            max_time_ms=settings.mongodb_analytics_max_time_ms,
+        )
+    return profiles
+
 
 class MongoDB:
     """MongoDB database manager with connection pooling and error handling."""
@@ -20,6 +88,10 @@ class MongoDB:
         self.client: Optional[AsyncIOMotorClient] = None
         self.db: Optional[AsyncIOMotorDatabase] = None
         self._connected: bool = False
+        self.index_manager: Optional[IndexManager] = None
+        self.profiles: Dict[str, ClientProfile] = {}
+        self._clients: Dict[str, AsyncIOMotorClient] = {}
+        self._databases: Dict[str, AsyncIOMotorDatabase] = {}
 
     async def connect(self) -> bool:
         """
@@ -32,17 +104,21 @@ class MongoDB:
             logger.info("[MongoDB] Connecting to MongoDB...")
             logger.info(f"[MongoDB] URI: {settings.mongodb_uri.split('@')[1] if '@' in settings.mongodb_uri else 'localhost'}")
 
-            # Create async MongoDB client with connection pooling
-            self.client = AsyncIOMotorClient(
-                settings.mongodb_uri,
-                serverSelectionTimeoutMS=5000,  # 5 second timeout
-                maxPoolSize=50,
-                minPoolSize=10,
-                maxIdleTimeMS=30000
-            )
-
-            # Get database (uses active_mongodb_database property for mode switching)
-            self.db = self.client[settings.active_mongodb_database]
+            # One client (connection pool) per profile
+            self.profiles = build_client_profiles()
+            for name, profile in self.profiles.items():
+                client = AsyncIOMotorClient(profile.uri, **profile.client_options())
+                self._clients[name] = client
+                # Uses active_mongodb_database property for mode switching
+                self._databases[name] = client[settings.active_mongodb_database]
+                logger.info(
+                    f"[MongoDB] Client profile '{name}': pool {profile.min_pool_size}-{profile.max_pool_size}, "
+                    f"readPreference={profile.read_preference}"
+                    + (f", maxTimeMS={profile.max_time_ms}" if profile.max_time_ms else "")
+                )
+
+            self.client = self._clients[OLTP_PROFILE]
+            self.db = self._databases[OLTP_PROFILE]
 
             # Test connection
             await self.client.admin.command('ping')
@@ -51,8 +127,9 @@ class MongoDB:
             logger.info(f"[MongoDB] Successfully connected to database: {settings.active_mongodb_database}")
             logger.info(f"[MongoDB] Database mode: {'test' if settings.is_test_mode() else 'production'}")
 
-            # Create indexes
-            await self._create_indexes()
+            # Build changed indexes in the background (cold start never waits on builds)
+            self.index_manager = IndexManager(self.db)
+            self.index_manager.start_background_sync()
 
             return True
 
@@ -67,9 +144,14 @@ class MongoDB:
 
     async def disconnect(self) -> None:
         """Close MongoDB connection."""
+        if self.index_manager:
+            await self.index_manager.stop()
         if self.client:
             logger.info("[MongoDB] Closing connection...")
-            self.client.close()
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+            self._databases.clear()
             self._connected = False
             logger.info("[MongoDB] Connection closed")
 
@@ -100,7 +182,16 @@ class MongoDB:
                 "database": settings.active_mongodb_database,
                 "database_mode": "test" if settings.is_test_mode() else "production",
                 "version": server_info.get('version'),
-                "collections": await self.db.list_collection_names()
+                "collections": await self.db.list_collection_names(),
+                "client_profiles": {
+                    name: {
+                        "max_pool_size": profile.max_pool_size,
+                        "read_preference": profile.read_preference,
+                        "max_time_ms": profile.max_time_ms,
+                    }
+                    for name, profile in self.profiles.items()
+                },
+                "indexes": self.index_manager.status if self.index_manager else None
             }
 
         except Exception as e:
@@ -112,256 +203,41 @@ class MongoDB:
             }
 
     async def _create_indexes(self) -> None:
-        """Create database indexes for performance."""
-        logger.info("[MongoDB] Creating database indexes...")
-
-        # Track creation status for each collection
-        success_count = 0
-        failed_count = 0
-
-        # CRITICAL FIX: Wrap EACH collection's index creation in its own try-except
-        # Previously, if one collection failed, ALL subsequent collections were skipped
-        # Now each collection failure is isolated and doesn't block others
+        """
+        Build every collection's indexes now, regardless of stored spec hashes.
 
-        # Company collection indexes (singular collection name)
-        try:
-            companies_indexes = [
-                IndexModel([("company_name", ASCENDING)], unique=True, name="company_name_unique"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc")
-            ]
-            await self.db.company.create_indexes(companies_indexes)
-            logger.info("[MongoDB] Company indexes created")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Company index creation failed: {e}")
-            failed_count += 1
-
-        # Users collection indexes
-        try:
-            users_indexes = [
-                IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
-                IndexModel([("email", ASCENDING)], name="email_idx"),
-                IndexModel([("company_name", ASCENDING)], name="company_name_idx"),
-                IndexModel([("email", ASCENDING), ("company_name", ASCENDING)], name="email_company_idx"),
-                IndexModel([("status", ASCENDING)], name="status_idx"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc")
-            ]
-            await self.db.users.create_indexes(users_indexes)
-            logger.info("[MongoDB] Users indexes created")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Users index creation failed: {e}")
-            failed_count += 1
-
-        # Company users collection indexes (for enterprise/corporate users)
-        try:
-            # Drop old indexes if they exist (migration cleanup)
-            try:
-                await self.db.company_users.drop_index("old_company_idx")
-                logger.info("[MongoDB] Dropped old company index")
-            except (OperationFailure, Exception):
-                pass
-            try:
-                await self.db.company_users.drop_index("old_email_company_idx")
-                logger.info("[MongoDB] Dropped old email_company index")
-            except (OperationFailure, Exception):
-                pass
-
-            company_users_indexes = [
-                IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
-                IndexModel([("email", ASCENDING)], name="email_idx"),
-                IndexModel([("company_name", ASCENDING)], name="company_name_idx"),
-                IndexModel([("email", ASCENDING), ("company_name", ASCENDING)], name="email_company_idx"),
-                IndexModel([("status", ASCENDING)], name="status_idx"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc")
-            ]
-            await self.db.company_users.create_indexes(company_users_indexes)
-            logger.info("[MongoDB] Company users indexes created (company_name migration complete)")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Company users index creation failed: {e}")
-            failed_count += 1
-
-        # Sessions collection indexes
-        # COMMENTED OUT - Short-term solution: Sessions table updates disabled
-        logger.info("[MongoDB] Sessions indexes SKIPPED (commented out for short-term solution)")
-
-        # TTL index creation removed - conflicted with existing expires_at_idx
-        # MongoDB will handle expiration based on expires_at field
-
-        # Subscriptions collection indexes
-        # UNIQUE constraint: ONE subscription per company (company_name_unique)
-        try:
-            # Drop old indexes if they exist (migration cleanup)
-            try:
-                await self.db.subscriptions.drop_index("old_company_idx")
-                logger.info("[MongoDB] Dropped old company index")
-            except (OperationFailure, Exception):
-                pass
-            try:
-                await self.db.subscriptions.drop_index("old_company_unique")
-                logger.info("[MongoDB] Dropped old company unique index")
-            except (OperationFailure, Exception):
-                pass
-            try:
-                await self.db.subscriptions.drop_index("old_company_status_idx")
-                logger.info("[MongoDB] Dropped old company status index")
-            except (OperationFailure, Exception):
-                pass
-
-            subscriptions_indexes = [
-                IndexModel([("company_name", ASCENDING)], unique=True, name="company_name_unique"),
-                IndexModel([("status", ASCENDING)], name="status_idx"),
-                IndexModel([("start_date", ASCENDING)], name="start_date_idx"),
-                IndexModel([("end_date", ASCENDING)], name="end_date_idx"),
-                IndexModel([("company_name", ASCENDING), ("status", ASCENDING)], name="company_status_idx"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc")
-            ]
-            await self.db.subscriptions.create_indexes(subscriptions_indexes)
-            logger.info("[MongoDB] Subscriptions indexes created (company_name UNIQUE constraint enforced)")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Subscriptions index creation failed: {e}")
-            failed_count += 1
-
-        # Users login collection indexes (for simple user auth)
-        try:
-            users_login_indexes = [
-                IndexModel([("user_email", ASCENDING)], unique=True, name="user_email_unique"),
-                IndexModel([("user_name", ASCENDING)], unique=True, name="user_name_unique"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc")
-            ]
-            await self.db.users_login.create_indexes(users_login_indexes)
-            logger.info("[MongoDB] Users login indexes created")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Users login index creation failed: {e}")
-            failed_count += 1
-
-        # Translation transactions collection indexes
-        try:
-            # Drop old indexes if they exist (migration cleanup)
-            try:
-                await self.db.translation_transactions.drop_index("old_company_status_idx")
-                logger.info("[MongoDB] Dropped old company status index")
-            except (OperationFailure, Exception):
-                pass
-
-            translation_transactions_indexes = [
-                IndexModel([("transaction_id", ASCENDING)], unique=True, name="transaction_id_unique"),
-                IndexModel([("company_name", ASCENDING), ("status", ASCENDING)], name="company_status_idx"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc")
-            ]
-            await self.db.translation_transactions.create_indexes(translation_transactions_indexes)
-            logger.info("[MongoDB] Translation transactions indexes created (company_name migration complete)")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Translation transactions index creation failed: {e}")
-            failed_count += 1
-
-        # User transactions collection indexes (for individual users)
-        try:
-            user_transactions_indexes = [
-                IndexModel([("transaction_id", ASCENDING)], unique=True, name="transaction_id_unique"),
-                IndexModel([("stripe_checkout_session_id", ASCENDING)], unique=True, sparse=True, name="stripe_checkout_session_id_unique"),
-                IndexModel([("stripe_payment_intent_id", ASCENDING)], sparse=True, name="stripe_payment_intent_id_idx"),
-                IndexModel([("user_email", ASCENDING)], name="user_email_idx"),
-                IndexModel([("date", ASCENDING)], name="date_desc_idx"),
-                IndexModel([("user_email", ASCENDING), ("date", ASCENDING)], name="user_email_date_idx"),
-                IndexModel([("status", ASCENDING)], name="status_idx"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc")
-            ]
-            await self.db.user_transactions.create_indexes(user_transactions_indexes)
-            logger.info("[MongoDB] User transactions indexes created")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] User transactions index creation failed: {e}")
-            failed_count += 1
-
-        # Payments collection indexes (for Stripe payments) - CRITICAL FOR PAYMENT FUNCTIONALITY
-        # NOTE: Stripe indexes use sparse for optional fields
-        try:
-            payments_indexes = [
-                IndexModel([("stripe_payment_intent_id", ASCENDING)], unique=True, sparse=True, name="stripe_payment_intent_id_unique"),
-                IndexModel([("stripe_invoice_id", ASCENDING)], sparse=True, name="stripe_invoice_id_idx"),
-                IndexModel([("stripe_customer_id", ASCENDING)], sparse=True, name="stripe_customer_id_idx"),
-                IndexModel([("company_name", ASCENDING)], name="company_name_idx"),
-                IndexModel([("subscription_id", ASCENDING)], name="subscription_id_idx"),
-                IndexModel([("user_id", ASCENDING)], name="user_id_idx"),
-                IndexModel([("payment_status", ASCENDING)], name="payment_status_idx"),
-                IndexModel([("payment_date", ASCENDING)], name="payment_date_idx"),
-                IndexModel([("user_email", ASCENDING)], name="user_email_idx"),
-                IndexModel([("company_name", ASCENDING), ("payment_status", ASCENDING)], name="company_status_idx"),
-                IndexModel([("user_id", ASCENDING), ("payment_date", ASCENDING)], name="user_payment_date_idx"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc")
-            ]
-            await self.db.payments.create_indexes(payments_indexes)
-            logger.info("[MongoDB] Payments indexes created")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Payments index creation failed: {e}")
-            failed_count += 1
-
-        # Invoices collection indexes
-        try:
-            invoices_indexes = [
-                IndexModel([("invoice_number", ASCENDING)], unique=True, name="invoice_number_unique"),
-                IndexModel([("company_name", ASCENDING)], name="company_name_idx"),
-                IndexModel([("subscription_id", ASCENDING)], name="subscription_id_idx"),
-                IndexModel([("status", ASCENDING)], name="status_idx"),
-                IndexModel([("invoice_date", ASCENDING)], name="invoice_date_idx"),
-                IndexModel([("due_date", ASCENDING)], name="due_date_idx"),
-                IndexModel([("company_name", ASCENDING), ("status", ASCENDING)], name="company_status_idx"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc")
-            ]
-            await self.db.invoices.create_indexes(invoices_indexes)
-            logger.info("[MongoDB] Invoices indexes created")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Invoices index creation failed: {e}")
-            failed_count += 1
-
-        # Webhook events collection indexes (for Stripe webhook audit trail)
-        try:
-            webhook_events_indexes = [
-                IndexModel([("event_id", ASCENDING)], unique=True, name="event_id_unique"),
-                IndexModel([("payment_intent_id", ASCENDING)], name="payment_intent_id_idx"),
-                IndexModel([("event_type", ASCENDING)], name="event_type_idx"),
-                IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_90_days"),
-                IndexModel([("created_at", -1)], name="created_at_desc")
-            ]
-            await self.db.webhook_events.create_indexes(webhook_events_indexes)
-            logger.info("[MongoDB] Webhook events indexes created (90-day TTL)")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Webhook events index creation failed: {e}")
-            failed_count += 1
-
-        # Disputes collection indexes (for Stripe dispute tracking)
-        try:
-            disputes_indexes = [
-                IndexModel([("dispute_id", ASCENDING)], unique=True, name="dispute_id_unique"),
-                IndexModel([("charge_id", ASCENDING)], name="charge_id_idx"),
-                IndexModel([("payment_intent_id", ASCENDING)], name="payment_intent_id_idx"),
-                IndexModel([("status", ASCENDING)], name="status_idx"),
-                IndexModel([("reason", ASCENDING)], name="reason_idx"),
-                IndexModel([("created_at", ASCENDING)], name="created_at_asc"),
-                IndexModel([("evidence_due_by", ASCENDING)], name="evidence_due_by_idx")
-            ]
-            await self.db.disputes.create_indexes(disputes_indexes)
-            logger.info("[MongoDB] Disputes indexes created")
-            success_count += 1
-        except (OperationFailure, Exception) as e:
-            logger.warning(f"[MongoDB] Disputes index creation failed: {e}")
-            failed_count += 1
-
-        logger.info(f"[MongoDB] Index creation completed: {success_count} collections successful, {failed_count} collections had issues")
+        Startup uses IndexManager.start_background_sync() instead; this is for
+        scripts and tests that need the indexes in place before continuing.
+        """
+        logger.info("[MongoDB] Creating database indexes...")
+        await IndexManager(self.db).sync(force=True)
 
     @property
     def is_connected(self) -> bool:
         """Check if database is connected."""
         return self._connected
 
+    def get_db(self, profile: str = OLTP_PROFILE) -> Optional[AsyncIOMotorDatabase]:
+        """
+        Get the database handle of a client profile.
+
+        Falls back to the OLTP database when the profile is not configured
+        (e.g. analytics disabled), so callers can always name the profile
+        they want.
+
+        Args:
+            profile: OLTP_PROFILE or ANALYTICS_PROFILE
+
+        Returns:
+            AsyncIOMotorDatabase or None if not connected
+        """
+        return self._databases.get(profile, self.db)
+
+    @property
+    def analytics(self) -> Optional[AsyncIOMotorDatabase]:
+        """Database handle for reports/aggregations (secondaryPreferred, own pool)."""
+        return self.get_db(ANALYTICS_PROFILE)
+
     # Collection accessors
     @property
     def company(self):
@@ -395,6 +271,11 @@ class MongoDB:
         """Get subscriptions collection."""
         return self.db.subscriptions if self.db is not None else None
 
+    @property
+    def usage_periods(self):
+        """Get usage_periods collection (one document per subscription usage period)."""
+        return self.db.usage_periods if self.db is not None else None
+
     @property
     def translation_transactions(self):
         """Get translation_transactions collection."""
@@ -0,0 +1,265 @@
+"""
+Query shape registry and explain-based index verification.
+
+Each repository/service module declares the query shapes it issues against
+MongoDB with register_query_shape(). A shape is the filter structure and sort
+of a query, with representative sample values. The verifier runs explain()
+for every registered shape and reports plans that fall back to a collection
+scan (COLLSCAN) or a blocking in-memory sort (SORT), together with the index
+that would serve the shape.
+
+Usage:
+    from app.database.query_shapes import load_query_shapes, verify_query_shapes
+
+    shapes = load_query_shapes()
+    reports = await verify_query_shapes(db, shapes)
+    for report in reports:
+        if not report.ok:
+            print(report.shape.name, report.problems, report.suggested_index)
+
+See scripts/verify_query_shapes.py for the command-line tool.
+"""
+
+import importlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+# Plan stages that indicate a missing index
+COLLSCAN_STAGE = "COLLSCAN"
+BLOCKING_SORT_STAGE = "SORT"
+
+# Operators that constrain a field to a single value (or a set of point values)
+EQUALITY_OPERATORS = {"$eq", "$in"}
+
+# Modules that declare query shapes at import time
+QUERY_SHAPE_MODULES = [
+    "app.services.usage_period_repository",
+    "app.services.subscription_service",
+    "app.services.translation_transaction_service",
+    "app.utils.user_transaction_helper",
+    "app.services.payment_repository",
+    "app.services.payment_application_service",
+    "app.services.webhook_repository",
+    "app.services.archive_service",
+    "app.utils.conditional",
+]
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """A query issued against a collection: filter structure plus sort."""
+
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Tuple[Tuple[str, int], ...] = ()
+    source: str = ""
+
+
+@dataclass
+class QueryShapeReport:
+    """Result of explaining one query shape."""
+
+    shape: QueryShape
+    stages: List[str] = field(default_factory=list)
+    problems: List[str] = field(default_factory=list)
+    suggested_index: List[Tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+class QueryShapeRegistry:
+    """Registry of query shapes keyed by shape name."""
+
+    def __init__(self):
+        self._shapes: Dict[str, QueryShape] = {}
+
+    def register(
+        self,
+        name: str,
+        collection: str,
+        filter: Dict[str, Any],
+        sort: Optional[List[Tuple[str, int]]] = None,
+        source: str = ""
+    ) -> QueryShape:
+        """
+        Register a query shape.
+
+        Args:
+            name: Unique shape name, e.g. "payments.by_invoice"
+            collection: Collection name
+            filter: Query filter with representative sample values
+            sort: Sort specification as (field, direction) pairs
+            source: Where the query is issued (for reports)
+
+        Returns:
+            QueryShape: The registered shape
+
+        Raises:
+            ValueError: If a different shape is already registered under `name`
+        """
+        shape = QueryShape(
+            name=name,
+            collection=collection,
+            filter=filter,
+            sort=tuple(sort or ()),
+            source=source
+        )
+        existing = self._shapes.get(name)
+        if existing is not None and existing != shape:
+            raise ValueError(f"Query shape already registered with a different definition: {name}")
+        self._shapes[name] = shape
+        return shape
+
+    def shapes(self, collection: Optional[str] = None) -> List[QueryShape]:
+        """List registered shapes, optionally for one collection."""
+        return [
+            shape for shape in self._shapes.values()
+            if collection is None or shape.collection == collection
+        ]
+
+
+# Global registry instance
+query_shape_registry = QueryShapeRegistry()
+
+
+def register_query_shape(
+    name: str,
+    collection: str,
+    filter: Dict[str, Any],
+    sort: Optional[List[Tuple[str, int]]] = None,
+    source: str = ""
+) -> QueryShape:
+    """Register a query shape on the global registry."""
+    return query_shape_registry.register(name, collection, filter, sort=sort, source=source)
+
+
+def load_query_shapes() -> List[QueryShape]:
+    """Import every module in QUERY_SHAPE_MODULES and return all registered shapes."""
+    for module_name in QUERY_SHAPE_MODULES:
+        importlib.import_module(module_name)
+    return query_shape_registry.shapes()
+
+
+def _is_operator_expression(value: Any) -> bool:
+    return isinstance(value, dict) and bool(value) and all(key.startswith("$") for key in value)
+
+
+def suggest_index(shape: QueryShape) -> List[Tuple[str, int]]:
+    """
+    Suggest an index for a query shape using the Equality-Sort-Range rule.
+
+    Equality fields come first, then the sort fields, then range fields.
+    Top-level logical operators ($or, $and, ...) are not analysed.
+
+    Returns:
+        list: Index key specification as (field, direction) pairs
+    """
+    equality: List[str] = []
+    ranges: List[str] = []
+
+    for key, value in shape.filter.items():
+        if key.startswith("$"):
+            continue
+        if _is_operator_expression(value) and not set(value) <= EQUALITY_OPERATORS:
+            ranges.append(key)
+        else:
+            equality.append(key)
+
+    index: List[Tuple[str, int]] = [(key, 1) for key in equality]
+    for key, direction in shape.sort:
+        if key not in equality:
+            index.append((key, direction))
+    indexed = {key for key, _ in index}
+    index.extend((key, 1) for key in ranges if key not in indexed)
+    return index
+
+
+def plan_stages(plan: Any) -> List[str]:
+    """
+    Collect every stage name in an explain plan tree.
+
+    Handles classic plans (inputStage/inputStages), slot-based engine plans
+    (queryPlan) and sharded plans (shards[].winningPlan).
+    """
+    stages: List[str] = []
+    if isinstance(plan, list):
+        for item in plan:
+            stages.extend(plan_stages(item))
+    elif isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for key in ("queryPlan", "winningPlan", "inputStage", "inputStages", "shards"):
+            if key in plan:
+                stages.extend(plan_stages(plan[key]))
+    return stages
+
+
+def find_plan_problems(explain: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """
+    Inspect an explain() result for collection scans and blocking sorts.
+
+    Returns:
+        tuple: (stages in the winning plan, list of problem descriptions)
+    """
+    stages = plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+    problems = []
+    if COLLSCAN_STAGE in stages:
+        problems.append("collection scan (COLLSCAN)")
+    if BLOCKING_SORT_STAGE in stages:
+        problems.append("in-memory sort (SORT)")
+    return stages, problems
+
+
+async def explain_query_shape(db: AsyncIOMotorDatabase, shape: QueryShape) -> Dict[str, Any]:
+    """Run explain (queryPlanner verbosity) for a query shape."""
+    find_command: Dict[str, Any] = {"find": shape.collection, "filter": shape.filter}
+    if shape.sort:
+        find_command["sort"] = dict(shape.sort)
+    return await db.command("explain", find_command, verbosity="queryPlanner")
+
+
+async def verify_query_shapes(
+    db: AsyncIOMotorDatabase,
+    shapes: Optional[List[QueryShape]] = None
+) -> List[QueryShapeReport]:
+    """
+    Explain each query shape and report plans that need an index.
+
+    Args:
+        db: Database with the application's indexes in place
+        shapes: Shapes to verify (defaults to every registered shape)
+
+    Returns:
+        list: One QueryShapeReport per shape
+    """
+    if shapes is None:
+        shapes = load_query_shapes()
+
+    reports = []
+    for shape in shapes:
+        explain = await explain_query_shape(db, shape)
+        stages, problems = find_plan_problems(explain)
+        report = QueryShapeReport(shape=shape, stages=stages, problems=problems)
+        if problems:
+            report.suggested_index = suggest_index(shape)
+            logger.warning(
+                f"[QUERY_SHAPES] {shape.name} ({shape.collection}): {', '.join(problems)}; "
+                f"suggested index {report.suggested_index}"
+            )
+        reports.append(report)
+    return reports
+
+
+def format_index_model(report: QueryShapeReport) -> str:
+    """Render a report's suggested index as an IndexModel line for INDEX_SPECS."""
+    keys = ", ".join(f'("{key}", {"ASCENDING" if direction == 1 else "DESCENDING"})' for key, direction in report.suggested_index)
+    name = "_".join(key.replace(".", "_") for key, _ in report.suggested_index) + "_idx"
+    return f'IndexModel([{keys}], name="{name}")'
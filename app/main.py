@@ -4,7 +4,7 @@ Main FastAPI application for the Translation Web Server.
 
 from fastapi import FastAPI, Request, HTTPException, Depends, Body, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 import uvicorn
@@ -21,17 +21,23 @@ from app.routers import languages, upload, auth, subscriptions, translate_user,
 from app.routers import payment_simplified as payment
 
 # Import middleware and utilities
-# RateLimitMiddleware removed - causes file upload failures with BaseHTTPMiddleware
-# Using slowapi for endpoint-specific rate limiting instead
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.rate_limiting import RateLimitMiddleware, close_rate_limit_stores, parse_trusted_proxies
 from app.middleware.encoding_fix import EncodingFixMiddleware
+from app.middleware.route_policy import RoutePolicyMiddleware
+from app.middleware.admission import AdmissionMiddleware, admission_controller
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.utils.loop_monitor import loop_lag_monitor
+from app.utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY as METRICS_REGISTRY, scrape_allowed
+from app.services.tenant_bulkhead import request_tenant, tenant_bulkheads, tenant_key
+from app.services.password_hasher import password_hasher
+from app.services.directory_cache import directory_cache
+from app.services.token_revocation import token_revocation
 from app.middleware.auth_middleware import get_current_user, get_optional_user
 from app.utils.health import health_checker
-
-# Import slowapi for endpoint-specific rate limiting
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+from app.utils.structured_logging import configure_logging, shutdown_logging, legacy_print
+from app.utils.tracing import configure_tracing, shutdown_tracing, add_event as add_trace_event, traced
 
 
 # Application lifespan events
@@ -39,6 +45,8 @@ from slowapi.errors import RateLimitExceeded
 async def lifespan(app: FastAPI):
     """Handle application startup and shutdown events."""
     # Startup
+    configure_logging()
+    configure_tracing()
     logging.info(f"Starting {settings.app_name} v{settings.app_version}")
 
     # Initialize services
@@ -47,11 +55,27 @@ async def lifespan(app: FastAPI):
     # Create required directories
     settings.ensure_directories()
 
+    # Start the bcrypt workers before the first login
+    password_hasher.start()
+
+    if settings.metrics_enabled or settings.loop_block_threshold_ms > 0:
+        loop_lag_monitor.start()
+
+    if settings.directory_cache_change_stream and directory_cache.enabled:
+        directory_cache.start_change_stream()
+
     yield
 
     # Shutdown
     logging.info(f"Shutting down {settings.app_name}")
+    await loop_lag_monitor.stop()
+    await directory_cache.stop_change_stream()
+    password_hasher.shutdown()
+    await close_rate_limit_stores()
+    await token_revocation.close()
     await cleanup_services()
+    shutdown_tracing()
+    shutdown_logging()
 
 
 # Create FastAPI application
@@ -65,11 +89,6 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Initialize slowapi rate limiter (endpoint-specific, not global middleware)
-limiter = Limiter(key_func=get_remote_address)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # ============================================================================
 # MIDDLEWARE CONFIGURATION - ORDER MATTERS!
 # ============================================================================
@@ -78,24 +97,31 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # - Middleware added LAST executes FIRST (outermost layer)
 #
 # Current execution order (request flow):
-# 1. timeout_middleware (decorator - outermost)
-# 2. LoggingMiddleware
-# 3. EncodingFixMiddleware
-# 4. RequestBodyDebugMiddleware (for payment endpoints debugging)
-# 5. CORSMiddleware (innermost - adds headers last)
-# 6. Endpoint
+# 1. CORSMiddleware (outermost - adds headers to every response)
+#    MetricsMiddleware (pure ASGI - request counts/latency by route for GET /metrics)
+# 2. LoggingMiddleware (pure ASGI - adds X-Request-ID / X-Process-Time)
+#    TracingMiddleware (pure ASGI - trace per request with X-Request-ID as trace id, Server-Timing header)
+# 3. RateLimitMiddleware (pure ASGI - per-route policies, shared store, see rate_limiting.py)
+#    Outside RoutePolicy/Admission so rejected requests never hold a concurrency or admission slot
+# 4. RoutePolicyMiddleware (pure ASGI - per-route timeout, body size, concurrency, see route_policy.py)
+# 5. AdmissionMiddleware (pure ASGI - queues/sheds heavy endpoints under overload, see admission.py)
+# 6. EncodingFixMiddleware (pure ASGI - pass-through unless REQUEST_BODY_CAPTURE_PATHS is set)
+# 7. Endpoint
 #
-# IMPORTANT: CORSMiddleware must be innermost so it processes responses
-# from ALL sources including timeout errors from outer middleware
+# NOTE: CORSMiddleware is added last, so it wraps every other middleware and
+# its headers are applied to their 408/413/429/503 responses too
 # ============================================================================
 
 # Add custom middleware FIRST (so they execute in the middle)
 # DISABLED: RequestBodyDebugMiddleware causes body stream corruption
 # app.add_middleware(RequestBodyDebugMiddleware)
 app.add_middleware(EncodingFixMiddleware)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(RoutePolicyMiddleware)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(TracingMiddleware)
 app.add_middleware(LoggingMiddleware)
-# REMOVED: RateLimitMiddleware - causes file upload failures with BaseHTTPMiddleware
-# Using slowapi decorators on specific endpoints instead (see auth.py)
+app.add_middleware(MetricsMiddleware)
 
 # Add CORS middleware LAST (so it's closest to the endpoint and processes ALL responses)
 app.add_middleware(
@@ -104,7 +130,10 @@ app.add_middleware(
     allow_credentials=settings.cors_credentials,
     allow_methods=settings.cors_methods,
     allow_headers=["*"] if settings.cors_headers == "*" else settings.cors_headers.split(','),
-    expose_headers=["X-Request-ID", "X-Process-Time"]  # Allow frontend to read custom headers
+    expose_headers=[  # Allow frontend to read custom headers
+        "X-Request-ID", "X-Process-Time", "Server-Timing",
+        "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset", "Retry-After"
+    ]
 )
 
 # Include routers
@@ -130,7 +159,7 @@ app.include_router(translate_user.router)
 # Include test helper endpoints only in test/dev mode
 if settings.environment.lower() in ["test", "development"]:
     app.include_router(test_helpers.router)
-    print("⚠️  Test helper endpoints enabled (test/dev mode only)")
+    legacy_print("⚠️  Test helper endpoints enabled (test/dev mode only)")
 
 # Import models for /translate endpoint
 from pydantic import BaseModel, EmailStr, Field
@@ -210,7 +239,7 @@ async def create_transaction_record(
         logging.info(f"[TRANSACTION] ========== CREATING SINGLE TRANSACTION ==========")
         logging.info(f"[TRANSACTION] Transaction ID: {transaction_id}")
         logging.info(f"[TRANSACTION] Number of files: {len(files_info)}")
-        print(f"\n📦 [TRANSACTION] Creating SINGLE transaction {transaction_id} with {len(files_info)} document(s)")
+        legacy_print(f"\n📦 [TRANSACTION] Creating SINGLE transaction {transaction_id} with {len(files_info)} document(s)")
 
         # Build documents array with ALL files
         documents = []
@@ -243,7 +272,7 @@ async def create_transaction_record(
             file_names.append(filename or f"file_{idx}")
 
             logging.info(f"[TRANSACTION]   Document {idx + 1}: {filename} ({file_info.get('page_count', 1)} pages, file_id: {file_info.get('file_id')}, mode: {file_mode.value})")
-            print(f"   📄 Document {idx + 1}: {filename} ({file_info.get('page_count', 1)} pages, mode: {file_mode.value})")
+            legacy_print(f"   📄 Document {idx + 1}: {filename} ({file_info.get('page_count', 1)} pages, mode: {file_mode.value})")
 
         # Log transaction-level translation_mode summary
         mode_summary = {}
@@ -251,7 +280,7 @@ async def create_transaction_record(
             mode = doc.get("translation_mode", "automatic")
             mode_summary[mode] = mode_summary.get(mode, 0) + 1
         logging.info(f"[TRANSACTION] Translation mode summary: {mode_summary}")
-        print(f"   🎯 Translation modes: {mode_summary}")
+        legacy_print(f"   🎯 Translation modes: {mode_summary}")
 
         # Build transaction document with nested documents[] array
         # IMPORTANT: Store actual email, not generated user_id
@@ -289,47 +318,23 @@ async def create_transaction_record(
             transaction_doc["unit_type"] = "page"
             logging.info(f"[TRANSACTION] Individual customer (no company)")
 
-        # Log the full transaction document before insertion
-        import json
-        logging.info(f"[TRANSACTION] ========== FULL TRANSACTION DOCUMENT ==========")
-        # Create a serializable copy for logging (handle datetime and ObjectId)
-        log_doc = {}
-        for key, value in transaction_doc.items():
-            if key == "documents":
-                # Log documents separately with translation_mode highlighted
-                log_doc["documents"] = []
-                for doc in value:
-                    doc_copy = {}
-                    for dk, dv in doc.items():
-                        if hasattr(dv, 'isoformat'):
-                            doc_copy[dk] = dv.isoformat()
-                        else:
-                            doc_copy[dk] = dv
-                    log_doc["documents"].append(doc_copy)
-            elif hasattr(value, 'isoformat'):
-                log_doc[key] = value.isoformat()
-            elif hasattr(value, '__str__') and 'ObjectId' in str(type(value)):
-                log_doc[key] = str(value)
-            else:
-                log_doc[key] = value
-
-        # Print formatted transaction document
-        print(f"\n   📋 FULL TRANSACTION DOCUMENT:")
-        print(f"   {json.dumps(log_doc, indent=6, default=str)}")
-        logging.info(f"[TRANSACTION] Document: {json.dumps(log_doc, default=str)}")
-        logging.info(f"[TRANSACTION] ================================================")
+        # Log the full transaction document before insertion (DEBUG only: the
+        # dump is not built at all unless DEBUG is enabled)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            import json
+            logging.debug("[TRANSACTION] Document: %s", json.dumps(transaction_doc, default=str))
 
         # Insert into appropriate collection based on user type
         if company_name:
             # Enterprise user -> translation_transactions collection
             await database.translation_transactions.insert_one(transaction_doc)
             logging.info(f"[TRANSACTION] 📝 Inserted into ENTERPRISE collection: translation_transactions")
-            print(f"   📝 Collection: translation_transactions (Enterprise)")
+            legacy_print(f"   📝 Collection: translation_transactions (Enterprise)")
         else:
             # Individual user -> user_transactions collection
             await database.user_transactions.insert_one(transaction_doc)
             logging.info(f"[TRANSACTION] 📝 Inserted into INDIVIDUAL collection: user_transactions")
-            print(f"   📝 Collection: user_transactions (Individual)")
+            legacy_print(f"   📝 Collection: user_transactions (Individual)")
 
         logging.info(f"[TRANSACTION] ✅ SUCCESS: Created {transaction_id}")
         logging.info(f"[TRANSACTION]   Total documents: {len(documents)}")
@@ -338,8 +343,8 @@ async def create_transaction_record(
         logging.info(f"[TRANSACTION]   Files: {', '.join(file_names)}")
         logging.info(f"[TRANSACTION] =================================================")
 
-        print(f"   ✅ Transaction {transaction_id} created with {len(documents)} document(s), {total_pages} total pages")
-        print(f"   💰 Total price: ${total_pages * price_per_page:.2f}")
+        legacy_print(f"   ✅ Transaction {transaction_id} created with {len(documents)} document(s), {total_pages} total pages")
+        legacy_print(f"   💰 Total price: ${total_pages * price_per_page:.2f}")
 
         return transaction_id
 
@@ -354,10 +359,10 @@ async def create_transaction_record(
         logging.error(f"[TRANSACTION] Error Message: {error_msg}")
         logging.error(f"[TRANSACTION] Stack Trace:\n{stack_trace}")
 
-        print(f"   ❌ [TRANSACTION] Failed to create transaction")
-        print(f"   ❌ Error Type: {error_type}")
-        print(f"   ❌ Error Message: {error_msg}")
-        print(f"   ❌ See logs for full stack trace")
+        legacy_print(f"   ❌ [TRANSACTION] Failed to create transaction")
+        legacy_print(f"   ❌ Error Type: {error_type}")
+        legacy_print(f"   ❌ Error Message: {error_msg}")
+        legacy_print(f"   ❌ See logs for full stack trace")
 
         return None
 
@@ -365,6 +370,7 @@ async def create_transaction_record(
 # Direct translate endpoint (Google Drive upload)
 @app.post("/translate", tags=["Translation"])
 async def translate_files(
+    http_request: Request,
     request: TranslateRequest = Body(...),
     current_user: Optional[dict] = Depends(get_optional_user)
 ):
@@ -379,35 +385,35 @@ async def translate_files(
     # Initialize timing tracker
     request_start_time = time.time()
 
-    def log_step(step_name: str, details: str = ""):
-        """Log step with timing"""
+    def log_step(step_name: str, details: str = "", *args):
+        """Log step with timing; details is a %-format for args, formatted in the log listener."""
         elapsed = time.time() - request_start_time
-        msg = f"[TRANSLATE {elapsed:6.2f}s] {step_name}"
+        add_trace_event(step_name)
         if details:
-            msg += f" - {details}"
-        logging.info(msg)
-        print(msg)
+            logging.info("[TRANSLATE %6.2fs] %s - " + details, elapsed, step_name, *args)
+        else:
+            logging.info("[TRANSLATE %6.2fs] %s", elapsed, step_name)
 
-    log_step("REQUEST RECEIVED", f"User: {current_user.get('email') if current_user else 'Individual'}, Company: {current_user.get('company_name') if current_user else 'None'}")
-    log_step("REQUEST DETAILS", f"Email: {request.email}, {request.sourceLanguage} -> {request.targetLanguage}, Files: {len(request.files)}")
+    log_step("REQUEST RECEIVED", "User: %s, Company: %s", current_user.get('email') if current_user else 'Individual', current_user.get('company_name') if current_user else 'None')
+    log_step("REQUEST DETAILS", "Email: %s, %s -> %s, Files: %s", request.email, request.sourceLanguage, request.targetLanguage, len(request.files))
 
     # Log request payload
     for i, file_info in enumerate(request.files, 1):
-        log_step(f"FILE {i} INPUT", f"'{file_info.name}' ({file_info.size:,} bytes, {file_info.type})")
+        log_step(f"FILE {i} INPUT", "'%s' (%d bytes, %s)", file_info.name, file_info.size, file_info.type)
 
-    print(f"TRANSLATE REQUEST RECEIVED")
-    print(f"Customer: {request.email}")
-    print(f"Translation: {request.sourceLanguage} -> {request.targetLanguage}")
-    print(f"Files to process: {len(request.files)}")
+    legacy_print(f"TRANSLATE REQUEST RECEIVED")
+    legacy_print(f"Customer: {request.email}")
+    legacy_print(f"Translation: {request.sourceLanguage} -> {request.targetLanguage}")
+    legacy_print(f"Files to process: {len(request.files)}")
     for i, file_info in enumerate(request.files, 1):
-        print(f"   File {i}: '{file_info.name}' ({file_info.size:,} bytes, {file_info.type})")
+        legacy_print(f"   File {i}: '{file_info.name}' ({file_info.size:,} bytes, {file_info.type})")
 
     # Validate email format (additional validation beyond EmailStr)
     log_step("VALIDATION START", "Validating email format")
     import re
     email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
     if not email_pattern.match(request.email):
-        log_step("VALIDATION FAILED", f"Invalid email format: {request.email}")
+        log_step("VALIDATION FAILED", "Invalid email format: %s", request.email)
         raise HTTPException(
             status_code=400,
             detail="Invalid email format"
@@ -430,14 +436,14 @@ async def translate_files(
     ]
 
     if request.sourceLanguage not in valid_languages:
-        log_step("VALIDATION FAILED", f"Invalid source language: {request.sourceLanguage}")
+        log_step("VALIDATION FAILED", "Invalid source language: %s", request.sourceLanguage)
         raise HTTPException(
             status_code=400,
             detail=f"Invalid source language: {request.sourceLanguage}"
         )
 
     if request.targetLanguage not in valid_languages:
-        log_step("VALIDATION FAILED", f"Invalid target language: {request.targetLanguage}")
+        log_step("VALIDATION FAILED", "Invalid target language: %s", request.targetLanguage)
         raise HTTPException(
             status_code=400,
             detail=f"Invalid target language: {request.targetLanguage}"
@@ -450,7 +456,7 @@ async def translate_files(
             detail="Source and target languages cannot be the same"
         )
 
-    log_step("VALIDATION PASSED", f"Languages: {request.sourceLanguage} -> {request.targetLanguage}")
+    log_step("VALIDATION PASSED", "Languages: %s -> %s", request.sourceLanguage, request.targetLanguage)
 
     # Validate files
     if not request.files:
@@ -461,13 +467,13 @@ async def translate_files(
         )
 
     if len(request.files) > 10:
-        log_step("VALIDATION FAILED", f"Too many files: {len(request.files)}")
+        log_step("VALIDATION FAILED", "Too many files: %s", len(request.files))
         raise HTTPException(
             status_code=400,
             detail="Maximum 10 files allowed per request"
         )
 
-    log_step("VALIDATION COMPLETE", f"{len(request.files)} file(s) validated")
+    log_step("VALIDATION COMPLETE", "%s file(s) validated", len(request.files))
 
     # Import Google Drive service
     from app.services.google_drive_service import google_drive_service
@@ -477,9 +483,10 @@ async def translate_files(
     # IMPORTANT: Do this BEFORE creating folders so we know which structure to create
     company_name = current_user.get("company_name") if current_user else None
     is_enterprise = company_name is not None
+    tenant = request_tenant(current_user, http_request)
 
     # Enhanced customer type logging
-    log_step("CUSTOMER TYPE DETECTED", f"{'Enterprise' if is_enterprise else 'Individual'} (company: {company_name})")
+    log_step("CUSTOMER TYPE DETECTED", "%s (company: %s)", 'Enterprise' if is_enterprise else 'Individual', company_name)
     logging.info(f"[CUSTOMER TYPE] {'✓ Enterprise' if is_enterprise else '○ Individual'}")
     logging.info(f"[CUSTOMER TYPE]   User Email: {request.email}")
     if current_user:
@@ -487,33 +494,32 @@ async def translate_files(
         logging.info(f"[CUSTOMER TYPE]   User Name: {current_user.get('user_name', 'N/A')}")
     logging.info(f"[CUSTOMER TYPE]   Company Name: {company_name if company_name else 'N/A (individual customer)'}")
 
-    print(f"\n👤 Customer Type: {'Enterprise' if is_enterprise else 'Individual'}")
+    legacy_print(f"\n👤 Customer Type: {'Enterprise' if is_enterprise else 'Individual'}")
     if is_enterprise:
-        print(f"   Company: {company_name}")
+        legacy_print(f"   Company: {company_name}")
     user_name = current_user.get('user_name', 'N/A') if current_user else 'N/A'
-    print(f"   User: {user_name} ({request.email})")
+    legacy_print(f"   User: {user_name} ({request.email})")
 
     # For enterprise users, validate company exists in database
     # CRITICAL: Enforce referential integrity - REJECT if company doesn't exist
     if is_enterprise:
-        from app.database import database
         try:
-            company_doc = await database.company.find_one({"company_name": company_name})
+            company_doc = await directory_cache.get_company(company_name)
             if not company_doc:
                 # REJECT: Company doesn't exist in database
-                log_step("VALIDATION FAILED", f"Company does not exist: {company_name}")
+                log_step("VALIDATION FAILED", "Company does not exist: %s", company_name)
                 logging.error(f"[VALIDATION] REJECTED: Company '{company_name}' does not exist in database")
                 raise HTTPException(
                     status_code=400,
                     detail=f"Invalid company: Company '{company_name}' does not exist in database. Cannot create translation for non-existent company."
                 )
 
-            log_step("COMPANY VALIDATED", f"Enterprise: {company_name}")
-            print(f"Enterprise company validated: {company_name}")
+            log_step("COMPANY VALIDATED", "Enterprise: %s", company_name)
+            legacy_print(f"Enterprise company validated: {company_name}")
         except HTTPException:
             raise  # Re-raise HTTP exceptions
         except Exception as e:
-            log_step("COMPANY LOOKUP FAILED", f"Error: {e}")
+            log_step("COMPANY LOOKUP FAILED", "Error: %s", e)
             logging.error(f"[VALIDATION] Database error while validating company: {e}")
             raise HTTPException(
                 status_code=500,
@@ -521,33 +527,33 @@ async def translate_files(
             )
 
     # Create Google Drive folder structure with proper hierarchy
-    log_step("FOLDER CREATE START", f"Creating structure for: {request.email}")
+    log_step("FOLDER CREATE START", "Creating structure for: %s", request.email)
     try:
         if is_enterprise and company_name:
             # Enterprise: CompanyName/user_email/Temp/
-            print(f"Creating enterprise folder structure: {company_name}/{request.email}/Temp/")
+            legacy_print(f"Creating enterprise folder structure: {company_name}/{request.email}/Temp/")
             folder_id = await google_drive_service.create_customer_folder_structure(
                 customer_email=request.email,
                 company_name=company_name
             )
-            log_step("FOLDER CREATED", f"{company_name}/{request.email}/Temp/ (ID: {folder_id})")
-            print(f"Google Drive folder created: {company_name}/{request.email}/Temp/ (ID: {folder_id})")
+            log_step("FOLDER CREATED", "%s/%s/Temp/ (ID: %s)", company_name, request.email, folder_id)
+            legacy_print(f"Google Drive folder created: {company_name}/{request.email}/Temp/ (ID: {folder_id})")
         else:
             # Individual: user_email/Temp/
-            print(f"Creating individual folder structure: {request.email}/Temp/")
+            legacy_print(f"Creating individual folder structure: {request.email}/Temp/")
             folder_id = await google_drive_service.create_customer_folder_structure(
                 customer_email=request.email,
                 company_name=None
             )
-            log_step("FOLDER CREATED", f"{request.email}/Temp/ (ID: {folder_id})")
-            print(f"Google Drive folder created: {request.email}/Temp/ (ID: {folder_id})")
+            log_step("FOLDER CREATED", "%s/Temp/ (ID: %s)", request.email, folder_id)
+            legacy_print(f"Google Drive folder created: {request.email}/Temp/ (ID: {folder_id})")
     except GoogleDriveError as e:
-        log_step("FOLDER CREATE FAILED", f"Google Drive error: {str(e)}")
-        print(f"Google Drive error creating folder: {e}")
+        log_step("FOLDER CREATE FAILED", "Google Drive error: %s", e)
+        legacy_print(f"Google Drive error creating folder: {e}")
         raise google_drive_error_to_http_exception(e)
     except Exception as e:
-        log_step("FOLDER CREATE FAILED", f"Unexpected error: {str(e)}")
-        print(f"Unexpected error creating folder: {e}")
+        log_step("FOLDER CREATE FAILED", "Unexpected error: %s", e)
+        legacy_print(f"Unexpected error creating folder: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to create folder structure: {str(e)}"
@@ -561,12 +567,12 @@ async def translate_files(
     import uuid
     storage_id = f"store_{uuid.uuid4().hex[:10]}"
 
-    print(f"Created storage job: {storage_id}")
+    legacy_print(f"Created storage job: {storage_id}")
     if is_enterprise and company_name:
-        print(f"Target folder: {company_name}/{request.email}/Temp/ (ID: {folder_id})")
+        legacy_print(f"Target folder: {company_name}/{request.email}/Temp/ (ID: {folder_id})")
     else:
-        print(f"Target folder: {request.email}/Temp/ (ID: {folder_id})")
-    print(f"Starting file uploads to Google Drive...")
+        legacy_print(f"Target folder: {request.email}/Temp/ (ID: {folder_id})")
+    legacy_print(f"Starting file uploads to Google Drive...")
 
     # Store files with enhanced metadata (no sessions)
     stored_files = []
@@ -580,16 +586,16 @@ async def translate_files(
 
     for i, file_info in enumerate(request.files, 1):
         try:
-            log_step(f"FILE {i} UPLOAD START", f"'{file_info.name}' ({file_info.size:,} bytes)")
-            print(f"   Uploading file {i}/{len(request.files)}: '{file_info.name}'")
+            log_step(f"FILE {i} UPLOAD START", "'%s' (%d bytes)", file_info.name, file_info.size)
+            legacy_print(f"   Uploading file {i}/{len(request.files)}: '{file_info.name}'")
 
             # Decode base64 content from client
             import base64
             try:
                 file_content = base64.b64decode(file_info.content)
-                log_step(f"FILE {i} BASE64 DECODED", f"Decoded {len(file_content):,} bytes")
+                log_step(f"FILE {i} BASE64 DECODED", "Decoded %d bytes", len(file_content))
             except Exception as e:
-                log_step(f"FILE {i} DECODE FAILED", f"Error: {str(e)}")
+                log_step(f"FILE {i} DECODE FAILED", "Error: %s", e)
                 raise HTTPException(
                     status_code=400,
                     detail=f"Failed to decode file content for '{file_info.name}': {str(e)}"
@@ -603,17 +609,18 @@ async def translate_files(
                 page_count = max(1, file_info.size // 25000)  # Estimate: 25KB per page
 
             total_pages += page_count
-            log_step(f"FILE {i} PAGE COUNT", f"{page_count} pages estimated")
+            log_step(f"FILE {i} PAGE COUNT", "%s pages estimated", page_count)
 
             # Upload to Google Drive with metadata for customer linking (no sessions)
-            log_step(f"FILE {i} GDRIVE UPLOAD", f"Uploading to folder {folder_id}")
-            file_result = await google_drive_service.upload_file_to_folder(
-                file_content=file_content,  # Use decoded base64 content
-                filename=file_info.name,
-                folder_id=folder_id,
-                target_language=request.targetLanguage
-            )
-            log_step(f"FILE {i} GDRIVE UPLOADED", f"File ID: {file_result['file_id']}")
+            log_step(f"FILE {i} GDRIVE UPLOAD", "Uploading to folder %s", folder_id)
+            async with tenant_bulkheads.ingest.slot(tenant):
+                file_result = await google_drive_service.upload_file_to_folder(
+                    file_content=file_content,  # Use decoded base64 content
+                    filename=file_info.name,
+                    folder_id=folder_id,
+                    target_language=request.targetLanguage
+                )
+            log_step(f"FILE {i} GDRIVE UPLOADED", "File ID: %s", file_result['file_id'])
 
             # Get translation_mode for this file BEFORE metadata update (default to automatic)
             # Valid values: automatic, human, formats, handwriting
@@ -621,7 +628,7 @@ async def translate_files(
             logging.info(f"[FILE {i}] Translation mode assignment: '{file_info.name}' -> '{file_translation_mode}'")
 
             # Update file with enhanced metadata for payment linking
-            log_step(f"FILE {i} METADATA UPDATE", f"Setting file properties (translation_mode: {file_translation_mode})")
+            log_step(f"FILE {i} METADATA UPDATE", "Setting file properties (translation_mode: %s)", file_translation_mode)
             file_metadata = {
                 'customer_email': request.email,
                 'source_language': request.sourceLanguage,
@@ -638,7 +645,7 @@ async def translate_files(
                 properties=file_metadata
             )
             logging.info(f"[FILE {i}] ✅ Metadata SET successfully with translation_mode='{file_translation_mode}'")
-            log_step(f"FILE {i} COMPLETE", f"URL: {file_result.get('google_drive_url', 'N/A')}")
+            log_step(f"FILE {i} COMPLETE", "URL: %s", file_result.get('google_drive_url', 'N/A'))
 
             stored_files.append({
                 "file_id": file_result['file_id'],
@@ -649,11 +656,11 @@ async def translate_files(
                 "google_drive_url": file_result.get('google_drive_url'),
                 "translation_mode": file_translation_mode
             })
-            print(f"   Successfully uploaded: '{file_info.name}' -> Google Drive ID: {file_result['file_id']}, Pages: {page_count}, Mode: {file_translation_mode}")
+            legacy_print(f"   Successfully uploaded: '{file_info.name}' -> Google Drive ID: {file_result['file_id']}, Pages: {page_count}, Mode: {file_translation_mode}")
 
         except Exception as e:
-            log_step(f"FILE {i} FAILED", f"Error: {str(e)}")
-            print(f"   Failed to upload '{file_info.name}': {e}")
+            log_step(f"FILE {i} FAILED", "Error: %s", e)
+            legacy_print(f"   Failed to upload '{file_info.name}': {e}")
             # Get translation_mode for failed file too (for logging consistency)
             file_translation_mode = upload_file_modes.get(file_info.name, "automatic")
             stored_files.append({
@@ -670,15 +677,15 @@ async def translate_files(
     successful_uploads = len([f for f in stored_files if f["status"] == "stored"])
     failed_uploads = len([f for f in stored_files if f["status"] == "failed"])
 
-    print(f"UPLOAD COMPLETE: {successful_uploads} successful, {failed_uploads} failed")
-    print(f"Total pages for pricing: {total_pages}")
-    print(f"Customer: {request.email} (no session needed)")
-    print(f"Next step: Process payment, then webhook will move files from Temp to Inbox")
+    legacy_print(f"UPLOAD COMPLETE: {successful_uploads} successful, {failed_uploads} failed")
+    legacy_print(f"Total pages for pricing: {total_pages}")
+    legacy_print(f"Customer: {request.email} (no session needed)")
+    legacy_print(f"Next step: Process payment, then webhook will move files from Temp to Inbox")
 
     # For enterprise customers, get subscription pricing
     transaction_ids = []  # Changed from transaction_id to transaction_ids (array)
     if is_enterprise:
-        log_step("SUBSCRIPTION QUERY", f"Querying for company: {company_name}")
+        log_step("SUBSCRIPTION QUERY", "Querying for company: %s", company_name)
         logging.info(f"Querying subscription for company: {company_name}")
         from app.services.subscription_service import subscription_service
         from bson import ObjectId
@@ -701,29 +708,14 @@ async def translate_files(
             # Enhanced subscription logging - Find current active period
             # Database schema: units_allocated, units_used, promotional_units
             # Formula: total_remaining = (units_allocated + promotional_units) - units_used
-            usage_periods = subscription.get("usage_periods", [])
             subscription_unit = subscription.get("subscription_unit", "page")
             status = subscription.get("status", "unknown")
 
-            # Find current active period (same logic as subscription_service.py)
+            # Find current active period (indexed lookup in usage_periods collection)
+            from app.services.usage_period_repository import usage_period_repository
             now = datetime.now(timezone.utc)
-            current_period = None
-            current_period_idx = None
-
-            for idx, period in enumerate(usage_periods):
-                period_start = period.get("period_start")
-                period_end = period.get("period_end")
-
-                # Handle timezone-aware comparison
-                if period_start and not period_start.tzinfo:
-                    period_start = period_start.replace(tzinfo=timezone.utc)
-                if period_end and not period_end.tzinfo:
-                    period_end = period_end.replace(tzinfo=timezone.utc)
-
-                if period_start and period_end and period_start <= now <= period_end:
-                    current_period = period
-                    current_period_idx = idx
-                    break
+            current_period = await usage_period_repository.get_current_period(str(subscription["_id"]), now)
+            current_period_idx = current_period.get("period_number") if current_period else None
 
             # Calculate availability from current active period only
             if current_period:
@@ -752,7 +744,7 @@ async def translate_files(
                 total_used = 0
                 total_remaining = 0
 
-            log_step("SUBSCRIPTION FOUND", f"Status: {status}, Price: ${price_per_page} per {subscription_unit}")
+            log_step("SUBSCRIPTION FOUND", "Status: %s, Price: $%s per %s", status, price_per_page, subscription_unit)
             logging.info(f"[SUBSCRIPTION] ✓ Active subscription found for company {company_name}")
             logging.info(f"[SUBSCRIPTION]   Subscription ID: {subscription.get('_id')}")
             logging.info(f"[SUBSCRIPTION]   Status: {status}")
@@ -768,22 +760,21 @@ async def translate_files(
                 logging.info(f"[SUBSCRIPTION]   Used Units: {total_used} {subscription_unit}s")
                 logging.info(f"[SUBSCRIPTION]   Remaining Units: {total_remaining} {subscription_unit}s")
 
-                print(f"\n📊 Current Subscription Period:")
-                print(f"   Status: {status}")
-                print(f"   Period: {current_period_idx} ({current_period.get('period_start')} to {current_period.get('period_end')})")
-                print(f"   Units Allocated: {units_allocated} {subscription_unit}s")
-                print(f"   Promotional Units: {promotional_units} {subscription_unit}s")
-                print(f"   Total Allocated: {total_allocated} {subscription_unit}s")
-                print(f"   Used Units: {total_used} {subscription_unit}s")
-                print(f"   Remaining Units: {total_remaining} {subscription_unit}s")
-                print(f"   Price: ${price_per_page} per {subscription_unit}")
+                legacy_print(f"\n📊 Current Subscription Period:")
+                legacy_print(f"   Status: {status}")
+                legacy_print(f"   Period: {current_period_idx} ({current_period.get('period_start')} to {current_period.get('period_end')})")
+                legacy_print(f"   Units Allocated: {units_allocated} {subscription_unit}s")
+                legacy_print(f"   Promotional Units: {promotional_units} {subscription_unit}s")
+                legacy_print(f"   Total Allocated: {total_allocated} {subscription_unit}s")
+                legacy_print(f"   Used Units: {total_used} {subscription_unit}s")
+                legacy_print(f"   Remaining Units: {total_remaining} {subscription_unit}s")
+                legacy_print(f"   Price: ${price_per_page} per {subscription_unit}")
             else:
                 logging.warning(f"[SUBSCRIPTION] ⚠ No active period found for current date")
-                print(f"\n⚠️  No active usage period for current date")
-                print(f"   Total usage periods: {len(usage_periods)}")
+                legacy_print(f"\n⚠️  No active usage period for current date")
         else:
             # REJECT: Enterprise user must have an active subscription
-            log_step("VALIDATION FAILED", f"No active subscription for company: {company_name}")
+            log_step("VALIDATION FAILED", "No active subscription for company: %s", company_name)
             logging.error(f"[SUBSCRIPTION] REJECTED: No active subscription found for company '{company_name}'")
             raise HTTPException(
                 status_code=403,
@@ -810,7 +801,7 @@ async def translate_files(
                     mode_info.fileName: mode_info.translationMode.value
                     for mode_info in request.fileTranslationModes
                 }
-                log_step("TRANSLATION MODES", f"Received modes for {len(mode_map)} files")
+                log_step("TRANSLATION MODES", "Received modes for %s files", len(mode_map))
 
             # Record usage for each file separately (per-file pricing)
             updated_subscription = None
@@ -835,7 +826,7 @@ async def translate_files(
                     usage_data=usage_update
                 )
 
-                log_step("FILE USAGE RECORDED", f"'{file_name}': {pages} units (mode: {mode})")
+                log_step("FILE USAGE RECORDED", "'%s': %s units (mode: %s)", file_name, pages, mode)
 
             # Extract overdraft information from final subscription state
             if updated_subscription:
@@ -846,41 +837,8 @@ async def translate_files(
                 # Enterprise users don't require payment (using subscription, even if overdraft)
                 payment_required = False
 
-                # Get current period from usage_periods array
-                usage_periods = updated_subscription.get("usage_periods", [])
-
-                if not usage_periods:
-                    log_step("SUBSCRIPTION ERROR", "No usage periods found in subscription")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Subscription has no usage periods configured. Contact administrator."
-                    )
-
-                # Get current period and validate by date comparison
-                now = datetime.now(timezone.utc)
-                current_period = None
-
-                for period in usage_periods:
-                    period_start = period.get("period_start")
-                    period_end = period.get("period_end")
-
-                    # Ensure datetime objects have timezone info
-                    if period_start and not period_start.tzinfo:
-                        period_start = period_start.replace(tzinfo=timezone.utc)
-                    if period_end and not period_end.tzinfo:
-                        period_end = period_end.replace(tzinfo=timezone.utc)
-
-                    # Validate: today's date must fall within period
-                    if period_start and period_end and period_start <= now <= period_end:
-                        current_period = period
-                        log_step(
-                            "CURRENT PERIOD FOUND",
-                            f"Period: {period_start.date()} to {period_end.date()}, "
-                            f"Allocated: {period.get('units_allocated', 0)}, "
-                            f"Used: {period.get('units_used', 0)}, "
-                            f"Remaining: {period.get('units_remaining', 0)}"
-                        )
-                        break
+                # record_usage returns the period it incremented (already date-validated)
+                current_period = updated_subscription.get("current_period")
 
                 if not current_period:
                     log_step("SUBSCRIPTION ERROR", "No valid period found for current date")
@@ -889,6 +847,11 @@ async def translate_files(
                         detail="No active subscription period found for current date. Contact administrator."
                     )
 
+                log_step(
+                    "CURRENT PERIOD FOUND",
+                    "Period: %s to %s, Allocated: %s, Used: %s, Remaining: %s", current_period.get('period_start'), current_period.get('period_end'), current_period.get('units_allocated', 0), current_period.get('units_used', 0), current_period.get('units_remaining', 0)
+                )
+
                 # Extract subscription data from validated current period
                 subscription_info_dict = {
                     "units_allocated": current_period.get("units_allocated", 0),
@@ -903,35 +866,35 @@ async def translate_files(
                 payment_required = True
 
             if overdraft_detected:
-                log_step("OVERDRAFT DETECTED", f"Overdraft: {overdraft_amount} units, Soft limit exceeded: {exceeds_soft_limit}")
+                log_step("OVERDRAFT DETECTED", "Overdraft: %s units, Soft limit exceeded: %s", overdraft_amount, exceeds_soft_limit)
                 logging.warning(f"[OVERDRAFT] ⚠ Subscription overdraft detected")
                 logging.warning(f"[OVERDRAFT]   Required: {total_pages} {subscription_unit}s")
                 logging.warning(f"[OVERDRAFT]   Available: {total_remaining} {subscription_unit}s")
                 logging.warning(f"[OVERDRAFT]   Overdraft: {overdraft_amount} {subscription_unit}s")
                 logging.warning(f"[OVERDRAFT]   Exceeds soft limit: {exceeds_soft_limit}")
-                print(f"\n⚠️  Subscription overdraft")
-                print(f"   Required: {total_pages} {subscription_unit}s")
-                print(f"   Available: {total_remaining} {subscription_unit}s")
-                print(f"   Overdraft: {overdraft_amount} {subscription_unit}s")
+                legacy_print(f"\n⚠️  Subscription overdraft")
+                legacy_print(f"   Required: {total_pages} {subscription_unit}s")
+                legacy_print(f"   Available: {total_remaining} {subscription_unit}s")
+                legacy_print(f"   Overdraft: {overdraft_amount} {subscription_unit}s")
                 if exceeds_soft_limit:
-                    print(f"   ⚠️  Exceeds soft limit (-100 pages)")
+                    legacy_print(f"   ⚠️  Exceeds soft limit (-100 pages)")
             else:
-                log_step("SUBSCRIPTION USAGE", f"Using {total_pages} of {total_remaining} units available")
+                log_step("SUBSCRIPTION USAGE", "Using %s of %s units available", total_pages, total_remaining)
                 logging.info(f"[PAYMENT] ✓ Using subscription units (no overdraft)")
                 logging.info(f"[PAYMENT]   Required: {total_pages} {subscription_unit}s")
                 logging.info(f"[PAYMENT]   Available: {total_remaining} {subscription_unit}s")
-                print(f"\n✅ Using subscription units")
-                print(f"   Required: {total_pages} {subscription_unit}s")
-                print(f"   Available: {total_remaining} {subscription_unit}s")
+                legacy_print(f"\n✅ Using subscription units")
+                legacy_print(f"   Required: {total_pages} {subscription_unit}s")
+                legacy_print(f"   Available: {total_remaining} {subscription_unit}s")
         except Exception as e:
-            log_step("SUBSCRIPTION ERROR", f"Error recording usage: {e}")
+            log_step("SUBSCRIPTION ERROR", "Error recording usage: %s", e)
             logging.error(f"[SUBSCRIPTION] Error recording usage: {e}")
             # Fall back to requiring payment
             payment_required = True
     else:
         log_step("PAYMENT REQUIRED", "Individual customer or no subscription")
         logging.info(f"[PAYMENT] Payment required for {'individual customer' if not is_enterprise else 'enterprise without subscription'}")
-        print(f"\n💳 Payment required: {'Individual customer' if not is_enterprise else 'Enterprise without subscription'}")
+        legacy_print(f"\n💳 Payment required: {'Individual customer' if not is_enterprise else 'Enterprise without subscription'}")
 
     # ========================================================================
     # CREATE SINGLE TRANSACTION FOR ALL FILES
@@ -940,7 +903,7 @@ async def translate_files(
     # All files are stored in the documents[] array of a single transaction.
     successful_stored_files = [f for f in stored_files if f["status"] == "stored"]
 
-    log_step("TRANSACTION CREATE START", f"Creating SINGLE transaction for {len(successful_stored_files)} file(s)")
+    log_step("TRANSACTION CREATE START", "Creating SINGLE transaction for %s file(s)", len(successful_stored_files))
     logging.info(f"[TRANSLATE] ========== TRANSACTION CREATION ==========")
     logging.info(f"[TRANSLATE] Creating ONE transaction with {len(successful_stored_files)} document(s)")
     logging.info(f"[TRANSLATE] Files: {[f['filename'] for f in successful_stored_files]}")
@@ -968,11 +931,11 @@ async def translate_files(
 
         if transaction_id:
             transaction_ids = [transaction_id]  # Single transaction ID
-            log_step("TRANSACTION CREATED", f"SINGLE transaction {transaction_id} with {len(successful_stored_files)} document(s)")
+            log_step("TRANSACTION CREATED", "SINGLE transaction %s with %s document(s)", transaction_id, len(successful_stored_files))
             logging.info(f"[TRANSLATE] ✅ SINGLE transaction created: {transaction_id}")
 
             # Update all uploaded files with transaction_id in their metadata
-            log_step("FILE METADATA UPDATE", f"Adding transaction_id to {len(successful_stored_files)} file(s)")
+            log_step("FILE METADATA UPDATE", "Adding transaction_id to %s file(s)", len(successful_stored_files))
             for file_info in successful_stored_files:
                 file_id = file_info.get("file_id")
                 if file_id:
@@ -984,7 +947,7 @@ async def translate_files(
                         logging.info(f"[FILE {file_id[:20]}...] ✅ Added transaction_id={transaction_id}")
                     except Exception as e:
                         logging.error(f"[FILE {file_id[:20]}...] ❌ Failed to add transaction_id: {e}")
-            log_step("FILE METADATA UPDATED", f"All files now have transaction_id={transaction_id}")
+            log_step("FILE METADATA UPDATED", "All files now have transaction_id=%s", transaction_id)
         else:
             # CRITICAL: Transaction creation failed - cannot proceed
             log_step("TRANSACTION FAILED", "Transaction creation returned None - cannot process files")
@@ -996,7 +959,7 @@ async def translate_files(
             )
 
     logging.info(f"[TRANSLATE] ==============================================")
-    log_step("TRANSACTION CREATE COMPLETE", f"Created {len(transaction_ids)} transaction(s) with {len(successful_stored_files)} total document(s)")
+    log_step("TRANSACTION CREATE COMPLETE", "Created %s transaction(s) with %s total document(s)", len(transaction_ids), len(successful_stored_files))
 
     # Extract user information from JWT token (if authenticated)
     user_info = None
@@ -1006,7 +969,7 @@ async def translate_files(
             "email": current_user.get("email", request.email),
             "full_name": current_user.get("fullName") or current_user.get("user_name", "Unknown User")
         }
-        log_step("USER INFO", f"Permission: {user_info['permission_level']}, Email: {user_info['email']}, Name: {user_info['full_name']}")
+        log_step("USER INFO", "Permission: %s, Email: %s, Name: %s", user_info['permission_level'], user_info['email'], user_info['full_name'])
     else:
         # Individual user (not authenticated via corporate login)
         user_info = {
@@ -1017,7 +980,7 @@ async def translate_files(
         log_step("USER INFO", "Individual user (no corporate authentication)")
 
     # Prepare and log response
-    log_step("RESPONSE PREPARE", f"Success: {successful_uploads}/{len(request.files)} files, {total_pages} pages, ${total_pages * price_per_page:.2f}")
+    log_step("RESPONSE PREPARE", "Success: %s/%s files, %s pages, $%.2f", successful_uploads, len(request.files), total_pages, total_pages * price_per_page)
 
     response_data = {
         "success": True,
@@ -1087,15 +1050,15 @@ async def translate_files(
     # ============================================================================
     # RAW OUTGOING DATA - Logged before sending response
     # ============================================================================
-    print("=" * 100)
-    print("[RAW OUTGOING DATA] /translate RESPONSE - Sending to client")
-    print(f"[RAW OUTGOING DATA] Success: {response_data['success']}")
-    print(f"[RAW OUTGOING DATA] Storage ID: {response_data['data']['id']}")
-    print(f"[RAW OUTGOING DATA] Status: {response_data['data']['status']}")
-    print(f"[RAW OUTGOING DATA] Progress: {response_data['data']['progress']}%")
-    print(f"[RAW OUTGOING DATA] Message: {response_data['data']['message']}")
-    print(f"[RAW OUTGOING DATA] Pricing:")
-    print(f"[RAW OUTGOING DATA]   - Total Pages: {response_data['data']['pricing']['total_pages']}")
+    legacy_print("=" * 100)
+    legacy_print("[RAW OUTGOING DATA] /translate RESPONSE - Sending to client")
+    legacy_print(f"[RAW OUTGOING DATA] Success: {response_data['success']}")
+    legacy_print(f"[RAW OUTGOING DATA] Storage ID: {response_data['data']['id']}")
+    legacy_print(f"[RAW OUTGOING DATA] Status: {response_data['data']['status']}")
+    legacy_print(f"[RAW OUTGOING DATA] Progress: {response_data['data']['progress']}%")
+    legacy_print(f"[RAW OUTGOING DATA] Message: {response_data['data']['message']}")
+    legacy_print(f"[RAW OUTGOING DATA] Pricing:")
+    legacy_print(f"[RAW OUTGOING DATA]   - Total Pages: {response_data['data']['pricing']['total_pages']}")
 
     # Handle None values for enterprise users
     price_per_page = response_data['data']['pricing']['price_per_page']
@@ -1103,43 +1066,43 @@ async def translate_files(
     currency = response_data['data']['pricing']['currency']
 
     if price_per_page is not None:
-        print(f"[RAW OUTGOING DATA]   - Price Per Page: ${price_per_page:.2f}")
+        legacy_print(f"[RAW OUTGOING DATA]   - Price Per Page: ${price_per_page:.2f}")
     else:
-        print(f"[RAW OUTGOING DATA]   - Price Per Page: N/A (using subscription)")
+        legacy_print(f"[RAW OUTGOING DATA]   - Price Per Page: N/A (using subscription)")
 
     if total_amount is not None:
-        print(f"[RAW OUTGOING DATA]   - Total Amount: ${total_amount:.2f}")
+        legacy_print(f"[RAW OUTGOING DATA]   - Total Amount: ${total_amount:.2f}")
     else:
-        print(f"[RAW OUTGOING DATA]   - Total Amount: N/A (using subscription)")
+        legacy_print(f"[RAW OUTGOING DATA]   - Total Amount: N/A (using subscription)")
 
     if currency is not None:
-        print(f"[RAW OUTGOING DATA]   - Currency: {currency}")
+        legacy_print(f"[RAW OUTGOING DATA]   - Currency: {currency}")
     else:
-        print(f"[RAW OUTGOING DATA]   - Currency: N/A (using subscription)")
-
-    print(f"[RAW OUTGOING DATA]   - Customer Type: {response_data['data']['pricing']['customer_type']}")
-    print(f"[RAW OUTGOING DATA]   - Transaction IDs ({len(response_data['data']['pricing']['transaction_ids'])}): {response_data['data']['pricing']['transaction_ids']}")
-    print(f"[RAW OUTGOING DATA] Files:")
-    print(f"[RAW OUTGOING DATA]   - Total Files: {response_data['data']['files']['total_files']}")
-    print(f"[RAW OUTGOING DATA]   - Successful: {response_data['data']['files']['successful_uploads']}")
-    print(f"[RAW OUTGOING DATA]   - Failed: {response_data['data']['files']['failed_uploads']}")
+        legacy_print(f"[RAW OUTGOING DATA]   - Currency: N/A (using subscription)")
+
+    legacy_print(f"[RAW OUTGOING DATA]   - Customer Type: {response_data['data']['pricing']['customer_type']}")
+    legacy_print(f"[RAW OUTGOING DATA]   - Transaction IDs ({len(response_data['data']['pricing']['transaction_ids'])}): {response_data['data']['pricing']['transaction_ids']}")
+    legacy_print(f"[RAW OUTGOING DATA] Files:")
+    legacy_print(f"[RAW OUTGOING DATA]   - Total Files: {response_data['data']['files']['total_files']}")
+    legacy_print(f"[RAW OUTGOING DATA]   - Successful: {response_data['data']['files']['successful_uploads']}")
+    legacy_print(f"[RAW OUTGOING DATA]   - Failed: {response_data['data']['files']['failed_uploads']}")
     for i, file in enumerate(response_data['data']['files']['stored_files'], 1):
-        print(f"[RAW OUTGOING DATA]   File {i}: '{file['filename']}' | Status: {file['status']} | Pages: {file['page_count']} | Mode: {file.get('translation_mode', 'automatic')} | GDrive: {file.get('google_drive_url', 'N/A')[:50]}...")
-    print(f"[RAW OUTGOING DATA] Customer: {response_data['data']['customer']['email']}")
-    print(f"[RAW OUTGOING DATA] Payment Required: {response_data['data']['payment']['required']}")
-    print(f"[RAW OUTGOING DATA] Payment Amount (cents): {response_data['data']['payment']['amount_cents']}")
+        legacy_print(f"[RAW OUTGOING DATA]   File {i}: '{file['filename']}' | Status: {file['status']} | Pages: {file['page_count']} | Mode: {file.get('translation_mode', 'automatic')} | GDrive: {file.get('google_drive_url', 'N/A')[:50]}...")
+    legacy_print(f"[RAW OUTGOING DATA] Customer: {response_data['data']['customer']['email']}")
+    legacy_print(f"[RAW OUTGOING DATA] Payment Required: {response_data['data']['payment']['required']}")
+    legacy_print(f"[RAW OUTGOING DATA] Payment Amount (cents): {response_data['data']['payment']['amount_cents']}")
     if response_data['data'].get('subscription'):
-        print(f"[RAW OUTGOING DATA] Subscription Information:")
-        print(f"[RAW OUTGOING DATA]   - Units Allocated: {response_data['data']['subscription']['units_allocated']}")
-        print(f"[RAW OUTGOING DATA]   - Units Used: {response_data['data']['subscription']['units_used']}")
-        print(f"[RAW OUTGOING DATA]   - Units Remaining: {response_data['data']['subscription']['units_remaining']}")
-        print(f"[RAW OUTGOING DATA]   - Promotional Units: {response_data['data']['subscription']['promotional_units']}")
-        print(f"[RAW OUTGOING DATA]   - Subscription Unit: {response_data['data']['subscription']['subscription_unit']}")
-    print(f"[RAW OUTGOING DATA] User Information:")
-    print(f"[RAW OUTGOING DATA]   - Permission Level: {response_data['data']['user']['permission_level']}")
-    print(f"[RAW OUTGOING DATA]   - Email: {response_data['data']['user']['email']}")
-    print(f"[RAW OUTGOING DATA]   - Full Name: {response_data['data']['user']['full_name']}")
-    print("=" * 100)
+        legacy_print(f"[RAW OUTGOING DATA] Subscription Information:")
+        legacy_print(f"[RAW OUTGOING DATA]   - Units Allocated: {response_data['data']['subscription']['units_allocated']}")
+        legacy_print(f"[RAW OUTGOING DATA]   - Units Used: {response_data['data']['subscription']['units_used']}")
+        legacy_print(f"[RAW OUTGOING DATA]   - Units Remaining: {response_data['data']['subscription']['units_remaining']}")
+        legacy_print(f"[RAW OUTGOING DATA]   - Promotional Units: {response_data['data']['subscription']['promotional_units']}")
+        legacy_print(f"[RAW OUTGOING DATA]   - Subscription Unit: {response_data['data']['subscription']['subscription_unit']}")
+    legacy_print(f"[RAW OUTGOING DATA] User Information:")
+    legacy_print(f"[RAW OUTGOING DATA]   - Permission Level: {response_data['data']['user']['permission_level']}")
+    legacy_print(f"[RAW OUTGOING DATA]   - Email: {response_data['data']['user']['email']}")
+    legacy_print(f"[RAW OUTGOING DATA]   - Full Name: {response_data['data']['user']['full_name']}")
+    legacy_print("=" * 100)
 
     return JSONResponse(content=response_data)
 
@@ -1168,6 +1131,7 @@ class IndividualConfirmRequest(BaseModel):
 # ============================================================================
 # Background Task for Transaction Confirmation
 # ============================================================================
+@traced("confirm.process_transaction")
 async def process_transaction_confirmation_background(
     transaction_ids: List[str],
     customer_email: str,
@@ -1185,22 +1149,21 @@ async def process_transaction_confirmation_background(
         from app.database import database
         from app.services.google_drive_service import google_drive_service
         from app.services.subscription_service import subscription_service
-        from app.models.subscription import UsageUpdate
         from datetime import datetime, timezone
 
-        print("\n" + "=" * 80)
-        print("🔄 BACKGROUND TASK STARTED - Transaction Confirmation")
-        print("=" * 80)
-        print(f"⏱️  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"📋 Task Details:")
-        print(f"   Customer: {customer_email}")
-        print(f"   Company: {company_name or 'Individual'}")
-        print(f"   Transactions: {len(transaction_ids)}")
-        print(f"   Files to move: {len(file_ids)}")
-        print("=" * 80)
+        legacy_print("\n" + "=" * 80)
+        legacy_print("🔄 BACKGROUND TASK STARTED - Transaction Confirmation")
+        legacy_print("=" * 80)
+        legacy_print(f"⏱️  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        legacy_print(f"📋 Task Details:")
+        legacy_print(f"   Customer: {customer_email}")
+        legacy_print(f"   Company: {company_name or 'Individual'}")
+        legacy_print(f"   Transactions: {len(transaction_ids)}")
+        legacy_print(f"   Files to move: {len(file_ids)}")
+        legacy_print("=" * 80)
 
         # Move files from Temp to Inbox
-        print(f"\n📁 Step 1: Moving files from Temp to Inbox...")
+        legacy_print(f"\n📁 Step 1: Moving files from Temp to Inbox...")
         move_start = time.time()
         move_result = await google_drive_service.move_files_to_inbox_on_payment_success(
             customer_email=customer_email,
@@ -1208,11 +1171,11 @@ async def process_transaction_confirmation_background(
             company_name=company_name
         )
         move_time = (time.time() - move_start) * 1000
-        print(f"⏱️  File move completed in {move_time:.2f}ms")
-        print(f"✅ Moved: {move_result['moved_successfully']}/{move_result['total_files']} files")
+        legacy_print(f"⏱️  File move completed in {move_time:.2f}ms")
+        legacy_print(f"✅ Moved: {move_result['moved_successfully']}/{move_result['total_files']} files")
 
         # Verify files in Inbox
-        print(f"\n🔍 Step 2: Verifying files in Inbox...")
+        legacy_print(f"\n🔍 Step 2: Verifying files in Inbox...")
         inbox_folder_id = move_result['inbox_folder_id']
         verified_count = 0
 
@@ -1230,17 +1193,17 @@ async def process_transaction_confirmation_background(
 
                 if is_in_inbox:
                     verified_count += 1
-                    print(f"   ✅ File {file_id[:20]}... verified in Inbox")
+                    legacy_print(f"   ✅ File {file_id[:20]}... verified in Inbox")
                 else:
-                    print(f"   ⚠️  File {file_id[:20]}... NOT in Inbox")
+                    legacy_print(f"   ⚠️  File {file_id[:20]}... NOT in Inbox")
 
             except Exception as e:
-                print(f"   ❌ Failed to verify file {file_id[:20]}...: {e}")
+                legacy_print(f"   ❌ Failed to verify file {file_id[:20]}...: {e}")
 
-        print(f"✅ Verified: {verified_count}/{len(move_result.get('moved_files', []))} files")
+        legacy_print(f"✅ Verified: {verified_count}/{len(move_result.get('moved_files', []))} files")
 
         # Step 5: Update file properties with transaction_id
-        print(f"\n📝 Step 5: Adding transaction IDs to file metadata...")
+        legacy_print(f"\n📝 Step 5: Adding transaction IDs to file metadata...")
         metadata_start = time.time()
         metadata_updates_successful = 0
 
@@ -1256,36 +1219,36 @@ async def process_transaction_confirmation_background(
                     }
                 )
                 metadata_updates_successful += 1
-                print(f"   ✓ File {file_id[:20]}...: Added transaction_id={transaction_id}")
+                legacy_print(f"   ✓ File {file_id[:20]}...: Added transaction_id={transaction_id}")
             except Exception as e:
-                print(f"   ⚠️  Failed to update metadata for file {file_id[:20]}...: {e}")
+                legacy_print(f"   ⚠️  Failed to update metadata for file {file_id[:20]}...: {e}")
                 # Continue processing other files even if one fails
 
         metadata_elapsed = (time.time() - metadata_start) * 1000
-        print(f"⏱️  Metadata update completed in {metadata_elapsed:.2f}ms")
-        print(f"✅ Updated: {metadata_updates_successful}/{len(file_ids)} files")
-
-        # Update transaction status
-        print(f"\n🔄 Step 3: Updating transaction status...")
-        for txn_id in transaction_ids:
-            await database.translation_transactions.update_one(
-                {"transaction_id": txn_id},
-                {
-                    "$set": {
-                        "status": "confirmed",
-                        "updated_at": datetime.now(timezone.utc)
-                    }
+        legacy_print(f"⏱️  Metadata update completed in {metadata_elapsed:.2f}ms")
+        legacy_print(f"✅ Updated: {metadata_updates_successful}/{len(file_ids)} files")
+
+        # Update transaction status (single update_many instead of one write per ID)
+        legacy_print(f"\n🔄 Step 3: Updating transaction status...")
+        txn_filter = {"transaction_id": {"$in": transaction_ids}}
+        status_result = await database.translation_transactions.update_many(
+            txn_filter,
+            {
+                "$set": {
+                    "status": "confirmed",
+                    "updated_at": datetime.now(timezone.utc)
                 }
-            )
-            print(f"   ✓ Transaction {txn_id} confirmed")
+            }
+        )
+        legacy_print(f"   ✓ {status_result.modified_count}/{len(transaction_ids)} transactions confirmed")
 
         # Update subscription usage
-        print(f"\n💳 Step 4: Updating subscription usage...")
-        transactions = []
-        for txn_id in transaction_ids:
-            txn = await database.translation_transactions.find_one({"transaction_id": txn_id})
-            if txn:
-                transactions.append(txn)
+        legacy_print(f"\n💳 Step 4: Updating subscription usage...")
+        # Only the fields needed for usage aggregation are fetched
+        transactions = await database.translation_transactions.find(
+            txn_filter,
+            {"_id": 0, "subscription_id": 1, "units_count": 1}
+        ).to_list(length=len(transaction_ids))
 
         subscription_updates = {}
         for txn in transactions:
@@ -1299,39 +1262,37 @@ async def process_transaction_confirmation_background(
                 subscription_updates[sub_id_str] += units_count
 
         if subscription_updates:
-            for subscription_id_str, total_units in subscription_updates.items():
-                try:
-                    # Batch operations: mark as "mixed" since multiple transactions may have different modes
-                    usage_update = UsageUpdate(
-                        units_to_add=total_units,
-                        use_promotional_units=False,
-                        translation_mode="mixed"  # Batch aggregation
-                    )
-                    await subscription_service.record_usage(
-                        subscription_id=subscription_id_str,
-                        usage_data=usage_update
-                    )
-                    print(f"   ✅ Subscription {subscription_id_str}: +{total_units} units (batch mode: mixed)")
-                except Exception as e:
-                    print(f"   ⚠️  Subscription update failed for {subscription_id_str}: {e}")
+            try:
+                # Batch operations: mark as "mixed" since multiple transactions may have different modes
+                usage_results = await subscription_service.record_usage_batch(
+                    subscription_updates,
+                    translation_mode="mixed"
+                )
+                for subscription_id_str, usage_result in usage_results.items():
+                    if "error" in usage_result:
+                        legacy_print(f"   ⚠️  Subscription update failed for {subscription_id_str}: {usage_result['error']}")
+                    else:
+                        legacy_print(f"   ✅ Subscription {subscription_id_str}: +{usage_result['units_added']} units (batch mode: mixed)")
+            except Exception as e:
+                legacy_print(f"   ⚠️  Subscription batch update failed: {e}")
         else:
-            print(f"   ℹ️  No subscription updates needed (individual customer)")
+            legacy_print(f"   ℹ️  No subscription updates needed (individual customer)")
 
         total_time = (time.time() - task_start) * 1000
-        print(f"\n✅ BACKGROUND TASK COMPLETE")
-        print(f"⏱️  TOTAL TASK TIME: {total_time:.2f}ms")
-        print(f"📊 Results: {verified_count}/{len(file_ids)} files verified in Inbox")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n✅ BACKGROUND TASK COMPLETE")
+        legacy_print(f"⏱️  TOTAL TASK TIME: {total_time:.2f}ms")
+        legacy_print(f"📊 Results: {verified_count}/{len(file_ids)} files verified in Inbox")
+        legacy_print("=" * 80 + "\n")
 
         logging.info(f"Background task completed for {customer_email}: {verified_count}/{len(file_ids)} files verified in {total_time:.2f}ms")
 
     except Exception as e:
         total_time = (time.time() - task_start) * 1000
-        print(f"\n❌ BACKGROUND TASK ERROR")
-        print(f"⏱️  Failed after: {total_time:.2f}ms")
-        print(f"💥 Error type: {type(e).__name__}")
-        print(f"💥 Error message: {str(e)}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n❌ BACKGROUND TASK ERROR")
+        legacy_print(f"⏱️  Failed after: {total_time:.2f}ms")
+        legacy_print(f"💥 Error type: {type(e).__name__}")
+        legacy_print(f"💥 Error message: {str(e)}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"Background confirmation error for {customer_email}: {e}", exc_info=True)
 
 
@@ -1352,16 +1313,16 @@ async def confirm_transactions(
     2. Moves files from customer_email/Temp/ to customer_email/Inbox/
     3. Returns count of successfully moved files
     """
-    print(f"[CONFIRM ENDPOINT] ✅ REACHED! Pydantic body parsing completed successfully!")
-    print(f"[CONFIRM ENDPOINT] Transaction IDs: {request.transaction_ids}")
-    print(f"[CONFIRM ENDPOINT] Current user: {current_user.get('email')}")
+    legacy_print(f"[CONFIRM ENDPOINT] ✅ REACHED! Pydantic body parsing completed successfully!")
+    legacy_print(f"[CONFIRM ENDPOINT] Transaction IDs: {request.transaction_ids}")
+    legacy_print(f"[CONFIRM ENDPOINT] Current user: {current_user.get('email')}")
 
     from app.database import database
     from app.services.google_drive_service import google_drive_service
     from datetime import datetime, timezone
 
     logging.info(f"[CONFIRM] User {current_user.get('email')} confirming {len(request.transaction_ids)} transactions")
-    print(f"[CONFIRM] Confirming transactions: {request.transaction_ids}")
+    legacy_print(f"[CONFIRM] Confirming transactions: {request.transaction_ids}")
 
     if not request.transaction_ids:
         raise HTTPException(status_code=400, detail="No transaction IDs provided")
@@ -1407,21 +1368,23 @@ async def confirm_transactions(
         # Log what we're about to do (fast - logging only)
         if company_name:
             logging.info(f"[CONFIRM] Scheduling background task to move {len(file_ids)} files from {company_name}/{customer_email}/Temp/ to Inbox/")
-            print(f"[CONFIRM] Scheduling background task: {len(file_ids)} files from {company_name}/{customer_email}/Temp/ to Inbox/")
+            legacy_print(f"[CONFIRM] Scheduling background task: {len(file_ids)} files from {company_name}/{customer_email}/Temp/ to Inbox/")
         else:
             logging.info(f"[CONFIRM] Scheduling background task to move {len(file_ids)} files from {customer_email}/Temp/ to Inbox/")
-            print(f"[CONFIRM] Scheduling background task: {len(file_ids)} files from {customer_email}/Temp/ to Inbox/")
+            legacy_print(f"[CONFIRM] Scheduling background task: {len(file_ids)} files from {customer_email}/Temp/ to Inbox/")
 
         # Schedule background task for file move, verification, and updates
-        print(f"[CONFIRM] Adding background task to queue...")
+        legacy_print(f"[CONFIRM] Adding background task to queue...")
         background_tasks.add_task(
+            tenant_bulkheads.confirm.run,
+            tenant_key(company_name, customer_email),
             process_transaction_confirmation_background,
             transaction_ids=request.transaction_ids,
             customer_email=customer_email,
             company_name=company_name,
             file_ids=file_ids
         )
-        print(f"[CONFIRM] ✅ Background task scheduled successfully")
+        legacy_print(f"[CONFIRM] ✅ Background task scheduled successfully")
 
         # Return IMMEDIATELY (< 1 second) - background task will handle everything else
         response = {
@@ -1438,7 +1401,7 @@ async def confirm_transactions(
         }
 
         logging.info(f"[CONFIRM] Immediate response sent: {len(request.transaction_ids)} transactions scheduled for processing")
-        print(f"[CONFIRM] ⚡ INSTANT RESPONSE: {len(request.transaction_ids)} transactions scheduled (background processing started)")
+        legacy_print(f"[CONFIRM] ⚡ INSTANT RESPONSE: {len(request.transaction_ids)} transactions scheduled (background processing started)")
 
         return JSONResponse(content=response)
 
@@ -1446,7 +1409,7 @@ async def confirm_transactions(
         raise
     except Exception as e:
         logging.error(f"[CONFIRM] Failed to confirm transactions: {e}", exc_info=True)
-        print(f"[CONFIRM] Error: {e}")
+        legacy_print(f"[CONFIRM] Error: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to confirm transactions: {str(e)}"
@@ -1474,7 +1437,7 @@ async def decline_transactions(
     from datetime import datetime, timezone
 
     logging.info(f"[DECLINE] User {current_user.get('email')} declining {len(request.transaction_ids)} transactions")
-    print(f"[DECLINE] Declining transactions: {request.transaction_ids}")
+    legacy_print(f"[DECLINE] Declining transactions: {request.transaction_ids}")
 
     if not request.transaction_ids:
         raise HTTPException(status_code=400, detail="No transaction IDs provided")
@@ -1516,7 +1479,7 @@ async def decline_transactions(
                 file_ids.append(file_id)
 
         logging.info(f"[DECLINE] Deleting {len(file_ids)} files from Temp/ for {customer_email}")
-        print(f"[DECLINE] Deleting {len(file_ids)} files from Temp/")
+        legacy_print(f"[DECLINE] Deleting {len(file_ids)} files from Temp/")
 
         # Delete files using existing Google Drive service function
         deleted_count = await google_drive_service.delete_files_on_payment_failure(
@@ -1537,7 +1500,7 @@ async def decline_transactions(
                 }
             )
             logging.info(f"[DECLINE] Transaction {txn_id} status updated to 'declined'")
-            print(f"[DECLINE] Transaction {txn_id} declined")
+            legacy_print(f"[DECLINE] Transaction {txn_id} declined")
 
         response = {
             "success": True,
@@ -1549,7 +1512,7 @@ async def decline_transactions(
         }
 
         logging.info(f"[DECLINE] Success: {len(request.transaction_ids)} transactions declined, {deleted_count} files deleted")
-        print(f"[DECLINE] Complete: {len(request.transaction_ids)} transactions declined, {deleted_count} files deleted")
+        legacy_print(f"[DECLINE] Complete: {len(request.transaction_ids)} transactions declined, {deleted_count} files deleted")
 
         return JSONResponse(content=response)
 
@@ -1557,7 +1520,7 @@ async def decline_transactions(
         raise
     except Exception as e:
         logging.error(f"[DECLINE] Failed to decline transactions: {e}", exc_info=True)
-        print(f"[DECLINE] Error: {e}")
+        legacy_print(f"[DECLINE] Error: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to decline transactions: {str(e)}"
@@ -1687,11 +1650,12 @@ async def confirm_enterprise_transaction(
             # Move files from Temp to Inbox
             try:
                 customer_email = transaction.get("user_id")  # user_id contains the email address
-                move_result = await google_drive_service.move_files_to_inbox_on_payment_success(
-                    customer_email=customer_email,
-                    file_ids=file_ids,
-                    company_name=company_name
-                )
+                async with tenant_bulkheads.confirm.slot(tenant_key(company_name, customer_email)):
+                    move_result = await google_drive_service.move_files_to_inbox_on_payment_success(
+                        customer_email=customer_email,
+                        file_ids=file_ids,
+                        company_name=company_name
+                    )
 
                 moved_count = move_result.get('moved_successfully', 0)
                 failed_count = move_result.get('failed_moves', 0)
@@ -1885,11 +1849,12 @@ async def confirm_individual_transaction(
 
             # Move files from Temp to Inbox
             try:
-                move_result = await google_drive_service.move_files_to_inbox_on_payment_success(
-                    customer_email=user_email,
-                    file_ids=file_ids,
-                    company_name=None  # Individual users have no company
-                )
+                async with tenant_bulkheads.confirm.slot(tenant_key(None, user_email)):
+                    move_result = await google_drive_service.move_files_to_inbox_on_payment_success(
+                        customer_email=user_email,
+                        file_ids=file_ids,
+                        company_name=None  # Individual users have no company
+                    )
 
                 moved_count = move_result.get('moved_successfully', 0)
                 failed_count = move_result.get('failed_moves', 0)
@@ -2031,6 +1996,40 @@ async def health_check():
         )
 
 
+@app.get("/health/admission", tags=["Health"])
+async def admission_status():
+    """Admission control counters per endpoint class and tenant bulkhead usage."""
+    return JSONResponse(
+        content={
+            "enabled": settings.admission_control_enabled,
+            "classes": admission_controller.snapshot(),
+            "bulkheads": tenant_bulkheads.snapshot(),
+            "timestamp": time.time()
+        }
+    )
+
+
+METRICS_ALLOWED_NETWORKS = parse_trusted_proxies(settings.metrics_allowed_ip_list)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Prometheus text exposition of this worker's metrics.
+
+    Only allowlisted peers (METRICS_ALLOWED_IPS) or scrapers presenting
+    METRICS_TOKEN get the body; everyone else sees the same 404 as when
+    metrics are disabled, so the endpoint's existence is not advertised.
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    peer = request.client.host if request.client else None
+    if not scrape_allowed(peer, request.headers.get("authorization"), METRICS_ALLOWED_NETWORKS, settings.metrics_token):
+        logging.warning(f"[METRICS] Scrape refused for peer {peer}")
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(content=METRICS_REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 # API version endpoint
 @app.get("/api/v1", tags=["API Info"])
 async def api_info():
@@ -2051,9 +2050,9 @@ from fastapi.exceptions import RequestValidationError
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with safe encoding handling."""
     # DEBUG: Print validation errors immediately
-    print("🔴 DEBUG: PYDANTIC VALIDATION ERROR!")
-    print(f"🔴 DEBUG: Path: {request.url.path}")
-    print(f"🔴 DEBUG: Errors: {exc.errors()}")
+    legacy_print("🔴 DEBUG: PYDANTIC VALIDATION ERROR!")
+    legacy_print(f"🔴 DEBUG: Path: {request.url.path}")
+    legacy_print(f"🔴 DEBUG: Errors: {exc.errors()}")
     try:
         # Safely serialize validation errors to avoid Unicode decode issues
         safe_errors = []
@@ -2127,7 +2126,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             },
             "timestamp": time.time(),
             "path": str(request.url)
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -2156,76 +2156,8 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 
-# ============================================================================
-# TIMEOUT MIDDLEWARE - MUST BE OUTERMOST TO CATCH ALL TIMEOUTS
-# ============================================================================
-# This middleware is added via decorator AFTER all add_middleware calls,
-# making it the outermost layer that executes first and catches timeouts.
-#
-# CRITICAL FIX: Timeout responses must manually add CORS headers because
-# they bypass the CORSMiddleware by being created at the outermost layer.
-# ============================================================================
-@app.middleware("http")
-async def timeout_middleware(request: Request, call_next):
-    """Add request timeout handling with proper CORS headers."""
-    import asyncio
-    import time as time_module
-
-    # DETAILED TIMING LOG
-    start_time = time_module.time()
-    print(f"[TIMEOUT MIDDLEWARE] START: {request.method} {request.url.path}")
-
-    try:
-        # Set timeout based on endpoint
-        if "/files/upload" in str(request.url):
-            timeout = 300  # 5 minutes for file uploads
-        elif "/translate" in str(request.url):
-            timeout = 120  # 2 minutes for translations
-        elif "/api/payment/" in str(request.url):
-            timeout = 90   # 90 seconds for payment processing (Google Drive operations)
-        elif "/login/" in str(request.url):
-            timeout = 60   # 1 minute for authentication
-        else:
-            timeout = 30   # 30 seconds for other requests
-
-        print(f"[TIMEOUT MIDDLEWARE] Timeout set to {timeout}s, calling next middleware...")
-        response = await asyncio.wait_for(call_next(request), timeout=timeout)
-        elapsed = time_module.time() - start_time
-        print(f"[TIMEOUT MIDDLEWARE] COMPLETE: {elapsed:.2f}s - {request.method} {request.url.path}")
-        return response
-
-    except asyncio.TimeoutError:
-        elapsed = time_module.time() - start_time
-        print(f"[TIMEOUT MIDDLEWARE] TIMEOUT FIRED: {elapsed:.2f}s - {request.method} {request.url.path}")
-        # CRITICAL: Manually add CORS headers to timeout responses
-        # because they bypass CORSMiddleware
-        response = JSONResponse(
-            status_code=408,
-            content={
-                "success": False,
-                "error": {
-                    "code": 408,
-                    "message": "Request timeout",
-                    "type": "timeout_error"
-                },
-                "timestamp": time.time()
-            }
-        )
-
-        # Add CORS headers manually using settings
-        origin = request.headers.get("origin")
-        if origin:
-            # Check if origin is allowed
-            allowed_origins = settings.cors_origins
-            if origin in allowed_origins or "*" in allowed_origins:
-                response.headers["Access-Control-Allow-Origin"] = origin
-                response.headers["Access-Control-Allow-Credentials"] = str(settings.cors_credentials).lower()
-                response.headers["Access-Control-Allow-Methods"] = ", ".join(settings.cors_methods)
-                response.headers["Access-Control-Allow-Headers"] = "*"
-                response.headers["Access-Control-Expose-Headers"] = "X-Request-ID, X-Process-Time"
-
-        logging.warning(f"Request timeout: {request.method} {request.url.path} (>{timeout}s)")
-        return response
+# Request timeouts are per-route policies enforced by RoutePolicyMiddleware
+# (app/middleware/route_policy.py), inside CORSMiddleware so timeouts carry CORS headers.
 
 
 # Custom OpenAPI schema
@@ -2334,6 +2266,10 @@ async def initialize_stripe():
         "url": settings.api_url if settings.api_url else 'https://api.example.com'
     }
 
+    if settings.metrics_enabled:
+        from app.utils.stripe_metrics import instrument_stripe
+        instrument_stripe()
+
     logging.info(f"[STRIPE] Initialized Stripe SDK v{stripe.VERSION} with API version {stripe.api_version}")
 
 
@@ -2390,10 +2326,7 @@ async def cleanup_services():
 # Development server runner
 if __name__ == "__main__":
     # Configure logging
-    logging.basicConfig(
-        level=getattr(logging, settings.log_level.upper()),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    configure_logging()
 
     # Run the server
     uvicorn.run(
@@ -0,0 +1,351 @@
+"""
+Admission control and load shedding for heavy endpoints.
+
+Translations, transaction confirmation and payment processing wait on Drive
+and MongoDB; when those slow down, requests used to pile up until the route
+timeout fired. Each endpoint class (build_admission_classes()) now has a gate:
+
+- At most max_in_flight requests run; up to max_queue more wait in FIFO order.
+- CoDel-style shedding: the queueing delay (sojourn time) of every admitted
+  request is observed. A delay that stays above `target` for a whole
+  `interval` means a standing queue, not a burst: the gate enters the
+  dropping state and sheds new arrivals that cannot run at once, while the
+  requests already queued are still served. The state ends as soon as a
+  request is admitted with a delay below target (or the queue drains).
+- Deadline shedding: an arrival whose expected wait (queue position x
+  in-flight latency EWMA / max_in_flight) exceeds its route timeout
+  (scope["state"]["route_policy"], see route_policy.py) is shed at once
+  instead of timing out later; a queued request that still waits longer
+  than the route timeout is shed then. The route timeout itself is paused
+  while the request is queued and restarts on admission
+  (scope["state"]["route_timeout"]), so the handler gets all of it.
+
+Shed requests get 503 with Retry-After (the expected time to drain the
+queue). Routes without an admission class (/health, /login/*, reads) are
+never queued, so they stay responsive under overload.
+
+Counters (admitted, shed by reason, queued) are exposed through
+admission_controller.snapshot() and GET /health/admission.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.middleware.route_policy import send_error_response
+from app.middleware.route_table import RouteTable
+from app.utils.metrics import CallbackMetric
+
+logger = logging.getLogger("translator.admission")
+
+# Shed reasons
+SHED_OVERLOAD = "overload"      # CoDel dropping state
+SHED_QUEUE_FULL = "queue_full"
+SHED_DEADLINE = "deadline"      # would time out while queued
+
+# Upper bound of the Retry-After hint (seconds)
+MAX_RETRY_AFTER = 60
+# Weight of the newest sample in the in-flight latency EWMA
+LATENCY_EWMA_WEIGHT = 0.2
+
+
+@dataclass(frozen=True)
+class AdmissionClass:
+    """Capacity and CoDel parameters of one endpoint class."""
+
+    name: str
+    max_in_flight: int
+    max_queue: int
+    # Acceptable queueing delay (seconds)
+    target: float = 0.5
+    # How long the delay may stay above target before shedding (seconds)
+    interval: float = 2.0
+
+
+class AdmissionRejected(Exception):
+    """A request was shed."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """Concurrency limit, wait queue and CoDel state of one endpoint class."""
+
+    def __init__(self, admission_class: AdmissionClass):
+        self.admission_class = admission_class
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[float, asyncio.Future]] = deque()
+        # CoDel state
+        self.dropping = False
+        self._first_above_time = 0.0
+        # EWMA of the time admitted requests spend in the app (seconds)
+        self.latency = 0.0
+        # Counters
+        self.admitted = 0
+        self.queued_total = 0
+        self.shed: Dict[str, int] = {SHED_OVERLOAD: 0, SHED_QUEUE_FULL: 0, SHED_DEADLINE: 0}
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self, position: int) -> float:
+        """Seconds until the request at 1-based queue `position` is admitted."""
+        return position * self.latency / self.admission_class.max_in_flight
+
+    def retry_after(self) -> int:
+        """Retry-After hint: the time to drain the current queue."""
+        return min(MAX_RETRY_AFTER, max(1, math.ceil(self.expected_wait(len(self._waiters) + 1))))
+
+    async def acquire(self, deadline: Optional[float] = None) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            deadline: Longest acceptable wait in seconds (route timeout)
+
+        Raises:
+            AdmissionRejected: The request was shed
+        """
+        admission_class = self.admission_class
+        if self.in_flight < admission_class.max_in_flight and not self._waiters:
+            self._observe_sojourn(0.0, time.monotonic())
+            self._admit()
+            return
+
+        if self.dropping:
+            raise self._rejected(SHED_OVERLOAD)
+        if len(self._waiters) >= admission_class.max_queue:
+            raise self._rejected(SHED_QUEUE_FULL)
+        if deadline is not None and self.expected_wait(len(self._waiters) + 1) > deadline:
+            raise self._rejected(SHED_DEADLINE)
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (time.monotonic(), future)
+        self._waiters.append(waiter)
+        self.queued_total += 1
+        try:
+            # shield: on timeout the future is checked (and dropped) below, not cancelled
+            await asyncio.wait_for(asyncio.shield(future), deadline)
+        except asyncio.TimeoutError:
+            if future.done():
+                # Admitted as the wait ran out
+                return
+            self._waiters.remove(waiter)
+            future.cancel()
+            raise self._rejected(SHED_DEADLINE)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Admitted just before the cancellation: hand the slot on
+                self.release(0.0)
+            else:
+                future.cancel()
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: float) -> None:
+        """Free a slot after the request spent `latency` seconds in the app."""
+        self.in_flight -= 1
+        if latency > 0:
+            self.latency = (
+                latency if self.latency == 0.0
+                else self.latency + LATENCY_EWMA_WEIGHT * (latency - self.latency)
+            )
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit waiters while slots are free."""
+        while self._waiters and self.in_flight < self.admission_class.max_in_flight:
+            enqueued_at, future = self._waiters.popleft()
+            if future.done():
+                continue
+            now = time.monotonic()
+            self._observe_sojourn(now - enqueued_at, now)
+            self._admit()
+            future.set_result(None)
+
+    def _observe_sojourn(self, sojourn: float, now: float) -> None:
+        """CoDel: update the dropping state with the queueing delay of an admitted request."""
+        admission_class = self.admission_class
+        if sojourn < admission_class.target:
+            self._first_above_time = 0.0
+            self.dropping = False
+        elif self._first_above_time == 0.0:
+            self._first_above_time = now + admission_class.interval
+        elif now >= self._first_above_time:
+            if not self.dropping:
+                logger.warning(
+                    f"[ADMISSION] {admission_class.name}: queueing delay above "
+                    f"{admission_class.target}s for {admission_class.interval}s, shedding load"
+                )
+            self.dropping = True
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self.admitted += 1
+
+    def _rejected(self, reason: str) -> AdmissionRejected:
+        self.shed[reason] += 1
+        return AdmissionRejected(reason, self.retry_after())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "queued_total": self.queued_total,
+            "shed": dict(self.shed),
+            "dropping": self.dropping,
+            "latency_ms": round(self.latency * 1000, 1),
+        }
+
+
+def build_admission_classes() -> RouteTable[AdmissionClass]:
+    """Build the endpoint class table from settings."""
+    target = settings.admission_target_ms / 1000
+    interval = settings.admission_interval_ms / 1000
+    max_queue = settings.admission_max_queue
+
+    translate = AdmissionClass(
+        "translate", settings.admission_translate_max_in_flight, max_queue, target, interval
+    )
+    confirm = AdmissionClass(
+        "confirm", settings.admission_confirm_max_in_flight, max_queue, target, interval
+    )
+    payment = AdmissionClass(
+        "payment", settings.admission_payment_max_in_flight, max_queue, target, interval
+    )
+
+    return RouteTable(
+        exact={
+            ("POST", "/translate"): translate,
+            ("POST", "/translate-user"): translate,
+            ("POST", "/api/translate"): translate,
+            ("POST", "/api/transactions/confirm"): confirm,
+            ("POST", "/api/transactions/confirm-enterprise"): confirm,
+            ("POST", "/api/transactions/confirm-individual"): confirm,
+        },
+        prefixes={
+            ("*", "/api/payment/"): payment,
+            ("POST", "/api/v1/user-transactions/"): payment,
+        },
+    )
+
+
+class AdmissionController:
+    """Endpoint class table plus one gate per class."""
+
+    def __init__(self, classes: Optional[RouteTable[AdmissionClass]] = None):
+        self.classes = build_admission_classes() if classes is None else classes
+        self._gates: Dict[str, AdmissionGate] = {}
+
+    def gate_for(self, method: str, path: str) -> Optional[AdmissionGate]:
+        """Gate of a request, or None for routes without admission control."""
+        admission_class = self.classes.match(method, path)
+        if admission_class is None:
+            return None
+        gate = self._gates.get(admission_class.name)
+        if gate is None:
+            gate = self._gates[admission_class.name] = AdmissionGate(admission_class)
+        return gate
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Counters per endpoint class."""
+        return {name: gate.snapshot() for name, gate in self._gates.items()}
+
+
+class AdmissionMiddleware:
+    """Queues or sheds requests to heavy endpoints (see module docstring)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: Optional[AdmissionController] = None,
+        enabled: Optional[bool] = None
+    ):
+        """
+        Args:
+            app: Downstream ASGI application
+            controller: Default: the module-level admission_controller
+            enabled: Default: settings.admission_control_enabled
+        """
+        self.app = app
+        self.controller = admission_controller if controller is None else controller
+        self.enabled = settings.admission_control_enabled if enabled is None else enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        gate = self.controller.gate_for(scope["method"], scope["path"])
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        route_policy = scope.get("state", {}).get("route_policy")
+        # Queueing time does not count against the route timeout
+        route_timeout = scope.get("state", {}).get("route_timeout")
+        if route_timeout is not None:
+            route_timeout.pause()
+        try:
+            await gate.acquire(deadline=route_policy.timeout if route_policy else None)
+        except AdmissionRejected as e:
+            logger.warning(
+                f"[ADMISSION] 503 {scope['method']} {scope['path']}: shed ({e.reason}), "
+                f"{gate.admission_class.name} in_flight={gate.in_flight} queued={gate.queue_depth}"
+            )
+            await send_error_response(
+                send, 503, "Server is busy, please retry later", "overload_error",
+                headers=[(b"retry-after", str(e.retry_after).encode())]
+            )
+            return
+
+        if route_timeout is not None:
+            route_timeout.restart()
+
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release(time.perf_counter() - start_time)
+
+
+# Global admission controller instance
+admission_controller = AdmissionController()
+
+
+def _gate_samples(field: str):
+    return lambda: [((name,), gate[field]) for name, gate in admission_controller.snapshot().items()]
+
+
+CallbackMetric("admission_in_flight", "Admitted requests running per endpoint class", ["class"], _gate_samples("in_flight"))
+CallbackMetric("admission_queue_depth", "Requests waiting per endpoint class", ["class"], _gate_samples("queued"))
+CallbackMetric(
+    "admission_admitted_total", "Requests admitted per endpoint class", ["class"],
+    _gate_samples("admitted"), metric_type="counter"
+)
+CallbackMetric(
+    "admission_queued_total", "Requests that had to wait per endpoint class", ["class"],
+    _gate_samples("queued_total"), metric_type="counter"
+)
+CallbackMetric(
+    "admission_shed_total", "Requests shed with 503 per endpoint class and reason", ["class", "reason"],
+    lambda: [
+        ((name, reason), count)
+        for name, gate in admission_controller.snapshot().items()
+        for reason, count in gate["shed"].items()
+    ],
+    metric_type="counter"
+)
@@ -47,14 +47,12 @@ async def get_current_user(
     import time
     start_time = time.time()
 
-    def log_timing(step: str):
-        elapsed = time.time() - start_time
-        msg = f"[AUTH MIDDLEWARE {elapsed:6.2f}s] {step}"
-        logger.info(msg)
-        print(msg)
+    def log_timing(step: str, *args):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[AUTH MIDDLEWARE %6.2fs] " + step, time.time() - start_time, *args)
 
     log_timing("START - get_current_user called")
-    log_timing(f"AUTH HEADER: {authorization[:50] if authorization else 'NONE'}...")
+    log_timing("AUTH HEADER: %s", "present" if authorization else "NONE")
 
     if not authorization:
         log_timing("FAILED - No authorization header")
@@ -66,8 +64,8 @@ async def get_current_user(
         )
 
     if not authorization.startswith("Bearer "):
-        log_timing(f"FAILED - Invalid format: {authorization[:20]}")
-        logger.warning(f"[AUTH MIDDLEWARE] Invalid authorization header format: {authorization[:20]}...")
+        log_timing("FAILED - Invalid format")
+        logger.warning("[AUTH MIDDLEWARE] Invalid authorization header format")
         raise HTTPException(
             status_code=401,
             detail="Invalid authorization header format. Expected: Bearer {token}",
@@ -75,8 +73,7 @@ async def get_current_user(
         )
 
     session_token = authorization.replace("Bearer ", "")
-    log_timing(f"TOKEN EXTRACTED: {session_token[:8]}...{session_token[-8:]}")
-    logger.info(f"[AUTH MIDDLEWARE] Verifying token: {session_token[:8]}...{session_token[-8:]}")
+    log_timing("TOKEN EXTRACTED")
 
     # Verify session with auth service
     log_timing("CALLING auth_service.verify_session...")
@@ -92,8 +89,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    log_timing(f"SUCCESS - User authenticated: {user_data.get('email')}")
-    logger.info(f"[AUTH MIDDLEWARE] Authentication successful - User: {user_data['email']}")
+    log_timing("SUCCESS - User authenticated: %s", user_data.get("email"))
+    logger.debug("[AUTH MIDDLEWARE] Authentication successful - User: %s", user_data["email"])
 
     return user_data
 
@@ -130,13 +127,13 @@ async def get_optional_user(
         return None
 
     session_token = authorization.replace("Bearer ", "")
-    logger.info(f"[AUTH MIDDLEWARE] Optional auth - verifying token: {session_token[:8]}...{session_token[-8:]}")
+    logger.debug("[AUTH MIDDLEWARE] Optional auth - verifying token: %s...%s", session_token[:8], session_token[-8:])
 
     # Verify session with auth service
     user_data = await auth_service.verify_session(session_token)
 
     if user_data:
-        logger.info(f"[AUTH MIDDLEWARE] Optional auth successful - User: {user_data['email']}")
+        logger.debug("[AUTH MIDDLEWARE] Optional auth successful - User: %s", user_data["email"])
     else:
         logger.debug("[AUTH MIDDLEWARE] Optional auth - token invalid or expired")
 
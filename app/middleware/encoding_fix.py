@@ -1,113 +1,133 @@
 """
 Encoding fix middleware to handle malformed UTF-8 requests.
-This middleware intercepts requests and fixes encoding issues before they reach validation.
+
+Pure ASGI middleware. By default it passes every request through without
+touching the body (FastAPI/Pydantic handles encoding). Raw body capture for
+debugging is opt-in: paths listed in settings.request_body_capture_paths
+have their body buffered (up to settings.request_body_capture_max_bytes),
+logged, and replayed to the application.
 """
 
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.middleware.route_table import RouteTable
 
 logger = logging.getLogger("translator.encoding_fix")
 
 
-class EncodingFixMiddleware(BaseHTTPMiddleware):
+class EncodingFixMiddleware:
     """Middleware to fix encoding issues in incoming requests."""
-    
-    def __init__(self, app):
-        super().__init__(app)
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        capture_paths: Optional[List[str]] = None,
+        capture_max_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            app: Downstream ASGI application
+            capture_paths: Paths whose raw body is captured and logged
+                (default: settings.request_body_capture_paths)
+            capture_max_bytes: Largest body that is buffered for capture
+                (default: settings.request_body_capture_max_bytes)
+        """
+        self.app = app
         self.content_types_to_fix = {
             'application/json',
             'application/x-www-form-urlencoded',
             'text/plain'
         }
-    
-    async def dispatch(self, request: Request, call_next):
-        """Fix encoding issues in request before processing."""
-
-        # Log entry for debugging - CHANGED TO INFO to ensure visibility
-        logger.info(f"[ENCODING FIX] Processing: {request.method} {request.url.path}")
-        print(f"[ENCODING FIX] Processing: {request.method} {request.url.path}")
-
-        # ===================================================================
-        # SPECIAL HANDLING FOR /submit ENDPOINT (GoogleTranslator debugging)
-        # ===================================================================
-        # Capture raw request body BEFORE Pydantic validation for debugging
-        if request.url.path == "/submit":
-            try:
-                # Read and cache the body for logging
-                body = await request.body()
-
-                print("=" * 80)
-                print("🔍 /submit REQUEST - RAW BODY CAPTURE (BEFORE VALIDATION)")
-                print("=" * 80)
-                print(f"📦 Content-Length: {len(body)} bytes")
-                print(f"📦 Content-Type: {request.headers.get('content-type', 'unknown')}")
-
-                # Decode and log the body
-                try:
-                    body_str = body.decode('utf-8')
-                    print(f"\n📦 Raw Body (UTF-8):")
-                    print(body_str)
-
-                    # Try to parse as JSON for pretty printing
-                    try:
-                        import json
-                        body_json = json.loads(body_str)
-                        print(f"\n📦 Parsed JSON:")
-                        print(json.dumps(body_json, indent=2))
-
-                        # Highlight the transaction_id value
-                        transaction_id = body_json.get('transaction_id')
-                        print(f"\n🎯 TRANSACTION_ID VALUE: {repr(transaction_id)}")
-                        print(f"🎯 TRANSACTION_ID TYPE: {type(transaction_id).__name__}")
-
-                        if transaction_id is None:
-                            print("❌ ISSUE CONFIRMED: transaction_id is null/None in request!")
-                        elif not transaction_id:
-                            print(f"❌ ISSUE: transaction_id is empty: {repr(transaction_id)}")
-                        else:
-                            print(f"✅ transaction_id looks valid: {transaction_id}")
-
-                    except json.JSONDecodeError as e:
-                        print(f"⚠️  JSON parsing failed: {e}")
-                except UnicodeDecodeError:
-                    print(f"⚠️  Body is not UTF-8: {body.hex()[:200]}")
-
-                print("=" * 80)
-
-                # IMPORTANT: Re-wrap body in a new stream for Pydantic to consume
-                # This prevents the "body already consumed" issue
-                from io import BytesIO
-
-                async def receive():
-                    return {"type": "http.request", "body": body}
-
-                # Create a new request scope with cached body
-                request._receive = receive
-
-            except Exception as e:
-                print(f"⚠️  Error capturing /submit body: {e}")
-                logger.error(f"Error capturing /submit request body: {e}", exc_info=True)
-
-        # CRITICAL FIX: DO NOT consume request body in middleware for other endpoints
-        # BaseHTTPMiddleware + body reading causes stream corruption and ClientDisconnect errors
-        # FastAPI/Pydantic handles encoding perfectly - this middleware is unnecessary
-        #
-        # Previous behavior: Tried to read body to fix encoding issues
-        # Problem: Consuming body stream causes it to be unavailable to endpoints
-        # Result: FastAPI waits indefinitely for body data, causing 90s timeouts
-        #
-        # Solution: Skip body processing entirely, let FastAPI handle it (except /submit above)
-
-        if request.url.path != "/submit":
-            logger.info(f"[ENCODING FIX] Skipping body processing for: {request.url.path}")
-            print(f"[ENCODING FIX] SKIPPING {request.url.path} - Body NOT consumed (middleware disabled)")
-
-        return await call_next(request)
-    
+        if capture_paths is None:
+            capture_paths = settings.body_capture_paths
+        self.capture_routes: RouteTable[bool] = RouteTable(exact={("*", path): True for path in capture_paths})
+        self.capture_max_bytes = (
+            settings.request_body_capture_max_bytes if capture_max_bytes is None else capture_max_bytes
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass the request through; capture its raw body only on configured paths."""
+        if scope["type"] != "http" or not self.capture_routes or not self.capture_routes.match(
+            scope["method"], scope["path"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        receive = await self._capture_body(scope, receive)
+        await self.app(scope, receive, send)
+
+    async def _capture_body(self, scope: Scope, receive: Receive) -> Receive:
+        """
+        Buffer and log the request body, then return a `receive` that replays it.
+
+        Bodies larger than capture_max_bytes are not logged; the chunks read so
+        far are replayed and the rest streams from the client as usual.
+        """
+        chunks: List[Message] = []
+        size = 0
+        more_body = True
+        while more_body and size <= self.capture_max_bytes:
+            message = await receive()
+            chunks.append(message)
+            if message["type"] != "http.request":
+                break
+            size += len(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        if more_body or size > self.capture_max_bytes:
+            logger.info(
+                f"[ENCODING FIX] {scope['method']} {scope['path']}: body exceeds "
+                f"{self.capture_max_bytes} bytes, not captured"
+            )
+        else:
+            body = b"".join(message.get("body", b"") for message in chunks if message["type"] == "http.request")
+            self._log_captured_body(scope, body)
+
+        async def replay() -> Message:
+            if chunks:
+                return chunks.pop(0)
+            return await receive()
+
+        return replay
+
+    def _log_captured_body(self, scope: Scope, body: bytes):
+        """Log a captured raw body (before Pydantic validation)."""
+        content_type = "unknown"
+        for name, value in scope.get("headers") or ():
+            if name == b"content-type":
+                content_type = value.decode("latin-1")
+                break
+
+        logger.info("=" * 80)
+        logger.info(f"🔍 {scope['path']} REQUEST - RAW BODY CAPTURE (BEFORE VALIDATION)")
+        logger.info(f"📦 Content-Length: {len(body)} bytes")
+        logger.info(f"📦 Content-Type: {content_type}")
+
+        try:
+            body_str = body.decode('utf-8')
+        except UnicodeDecodeError:
+            logger.info(f"⚠️  Body is not UTF-8: {body.hex()[:200]}")
+            logger.info("=" * 80)
+            return
+
+        logger.info(f"📦 Raw Body (UTF-8): {body_str}")
+        try:
+            body_json = json.loads(body_str)
+        except json.JSONDecodeError as e:
+            logger.info(f"⚠️  JSON parsing failed: {e}")
+        else:
+            if isinstance(body_json, dict) and 'transaction_id' in body_json:
+                transaction_id = body_json.get('transaction_id')
+                logger.info(f"🎯 TRANSACTION_ID VALUE: {repr(transaction_id)}")
+                if not transaction_id:
+                    logger.info(f"❌ ISSUE: transaction_id is empty: {repr(transaction_id)}")
+        logger.info("=" * 80)
+
     def _fix_body_encoding(self, body: bytes, content_type: str) -> bytes:
         """Fix encoding issues in request body."""
         
@@ -177,17 +197,6 @@ class EncodingFixMiddleware(BaseHTTPMiddleware):
         
         # If all fail, use utf-8 with error replacement
         return body.decode('utf-8', errors='replace')
-    
-    def _create_request_with_fixed_body(self, original_request: Request, fixed_body: bytes) -> Request:
-        """Create a new request with the fixed body."""
-        # This is a simplified approach. In a real implementation,
-        # you might need to use more sophisticated request reconstruction
-        
-        # For now, we'll modify the request's internal state
-        # Note: This is a workaround and might not work in all cases
-        original_request._body = fixed_body
-        
-        return original_request
 
 
 # Helper function to check if text contains problematic characters
@@ -1,207 +1,243 @@
 """
 Logging middleware for request/response tracking.
+
+Pure ASGI middleware: it never reads the request or response body. The
+X-Request-ID and X-Process-Time headers are added by wrapping `send` when
+the response starts, and request/response logging happens at the same
+points, so streaming and upload requests pass through untouched.
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 import time
 import logging
 import uuid
-from typing import Dict, Any
+from typing import Dict, Iterable, Tuple
 import json
 
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from app.config import settings
+from app.middleware.route_table import RouteTable
 
 
 # Configure logger
 logger = logging.getLogger("translator.middleware")
 
+# Request metadata dumps for endpoints that are debugged from the console
+TRANSLATE_METADATA = "translate"
+CONFIRM_METADATA = "transaction_confirm"
+
+METADATA_ROUTES = RouteTable(exact={
+    ("POST", "/translate"): TRANSLATE_METADATA,
+    ("POST", "/api/transactions/confirm"): CONFIRM_METADATA,
+})
+
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+def _decode_headers(raw_headers: Iterable[Tuple[bytes, bytes]]) -> Dict[str, str]:
+    return {name.decode("latin-1"): value.decode("latin-1") for name, value in raw_headers}
+
+
+class LoggingMiddleware:
     """Middleware for logging HTTP requests and responses."""
-    
-    def __init__(self, app):
-        super().__init__(app)
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.sensitive_headers = {
             'authorization', 'x-api-key', 'cookie', 'x-auth-token'
         }
-        self.log_request_body = settings.debug
-        self.log_response_body = settings.debug
-    
-    async def dispatch(self, request: Request, call_next):
-        """Process request with logging - WITH STUB ENHANCEMENTS."""
-        print(f"Hello World - Logging middleware processing: {request.method} {request.url.path}")
-        
-        # Generate request ID
+        self.metadata_routes = METADATA_ROUTES
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Generate request ID (exposed as request.state.request_id)
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
+        scope.setdefault("state", {})["request_id"] = request_id
+
         # Start timing
-        start_time = time.time()
-        
+        start_time = time.perf_counter()
+        headers = _decode_headers(scope.get("headers") or ())
+
         # Log request
-        await self._log_request(request, request_id)
-        
-        # Process request
+        self._log_request(scope, headers, request_id)
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                process_time = time.perf_counter() - start_time
+
+                # Add custom headers
+                response_headers = list(message.get("headers") or [])
+                response_headers.append((b"x-request-id", request_id.encode("latin-1")))
+                response_headers.append((b"x-process-time", f"{process_time:.4f}s".encode("latin-1")))
+                message["headers"] = response_headers
+
+                # Log response
+                self._log_response(scope, message["status"], response_headers, request_id, process_time)
+            await send(message)
+
         try:
-            response = await call_next(request)
-            
-            # Calculate processing time
-            process_time = time.time() - start_time
-            
-            # Log response
-            await self._log_response(request, response, request_id, process_time)
-            
-            # Add custom headers
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = f"{process_time:.4f}s"
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Log error
-            process_time = time.time() - start_time
-            await self._log_error(request, e, request_id, process_time)
+            process_time = time.perf_counter() - start_time
+            self._log_error(scope, e, request_id, process_time, response_started)
             raise
-    
-    async def _log_request(self, request: Request, request_id: str):
-        """Log incoming request."""
 
-        # Get client info
-        client_ip = request.client.host if request.client else "unknown"
-        forwarded_for = request.headers.get('X-Forwarded-For')
+    def _client_ip(self, scope: Scope, headers: Dict[str, str]) -> str:
+        forwarded_for = headers.get('x-forwarded-for')
         if forwarded_for:
-            client_ip = forwarded_for.split(',')[0].strip()
+            return forwarded_for.split(',')[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
 
-        user_agent = request.headers.get('User-Agent', 'Unknown')
-
-        # Prepare log data
-        log_data = {
-            'request_id': request_id,
-            'method': request.method,
-            'url': str(request.url),
-            'path': request.url.path,
-            'query_params': dict(request.query_params),
-            'client_ip': client_ip,
-            'user_agent': user_agent,
-            'headers': self._sanitize_headers(dict(request.headers)),
-            'timestamp': time.time()
-        }
+    def _log_request(self, scope: Scope, headers: Dict[str, str], request_id: str):
+        """Log incoming request."""
+        method = scope["method"]
+        path = scope["path"]
 
-        # ALWAYS log request metadata for /translate and /api/transactions/confirm endpoints (but NOT body)
-        # We don't read the body here to avoid consuming the request stream before Pydantic validation
-        if request.url.path == '/translate' and request.method == 'POST':
-            print("=" * 80)
-            print(f"[RAW REQUEST METADATA] POST /translate - Request ID: {request_id}")
-            print(f"[RAW REQUEST METADATA] Client IP: {client_ip}")
-            print(f"[RAW REQUEST METADATA] User-Agent: {user_agent}")
-            print(f"[RAW REQUEST METADATA] Headers: {json.dumps(self._sanitize_headers(dict(request.headers)), indent=2)}")
-            print(f"[RAW REQUEST METADATA] Query Params: {dict(request.query_params)}")
-            print(f"[RAW REQUEST METADATA] Content-Type: {request.headers.get('Content-Type', 'N/A')}")
-            print(f"[RAW REQUEST METADATA] Content-Length: {request.headers.get('Content-Length', 'N/A')} bytes")
-            print(f"[RAW REQUEST METADATA] NOTE: Body details will be logged in endpoint after Pydantic parsing")
-            print("=" * 80)
-
-        # ADD DETAILED LOGGING FOR /api/transactions/confirm
-        elif request.url.path == '/api/transactions/confirm' and request.method == 'POST':
-            print("=" * 80)
-            print(f"[TRANSACTION CONFIRM REQ] Request ID: {request_id}")
-            print(f"[TRANSACTION CONFIRM REQ] Client IP: {client_ip}")
-            print(f"[TRANSACTION CONFIRM REQ] User-Agent: {user_agent}")
-            print(f"[TRANSACTION CONFIRM REQ] Content-Type: {request.headers.get('Content-Type', 'N/A')}")
-            print(f"[TRANSACTION CONFIRM REQ] Content-Length: {request.headers.get('Content-Length', '0')} bytes")
-            print(f"[TRANSACTION CONFIRM REQ] Authorization: {request.headers.get('Authorization', 'MISSING')[:50]}...")
-            print(f"[TRANSACTION CONFIRM REQ] Accept-Encoding: {request.headers.get('Accept-Encoding', 'N/A')}")
-            print(f"[TRANSACTION CONFIRM REQ] Transfer-Encoding: {request.headers.get('Transfer-Encoding', 'N/A')}")
-            print(f"[TRANSACTION CONFIRM REQ] Referer: {request.headers.get('Referer', 'N/A')}")
-            print(f"[TRANSACTION CONFIRM REQ] Origin: {request.headers.get('Origin', 'N/A')}")
-            print(f"[TRANSACTION CONFIRM REQ] NOTE: Request will now proceed to Pydantic body parsing")
-            print("=" * 80)
-
-        # Add request body if enabled and appropriate for other endpoints
-        elif (self.log_request_body and
-            request.method in ['POST', 'PUT', 'PATCH'] and
-            self._should_log_body(request)):
-            try:
-                body = await self._get_request_body(request)
-                if body:
-                    log_data['body'] = body
-            except Exception as e:
-                log_data['body_error'] = str(e)
+        # Request metadata (NOT body) for /translate and /api/transactions/confirm at DEBUG
+        metadata = self.metadata_routes.match(method, path)
+        if metadata is not None:
+            self._log_request_metadata(metadata, scope, headers, request_id)
 
         # Log request
         if settings.is_development:
-            logger.info(f"Incoming request: {request.method} {request.url.path}")
-            logger.debug(f"Request details: {json.dumps(log_data, default=str, indent=2)}")
-        else:
+            logger.info(f"Incoming request: {method} {path}")
+            if logger.isEnabledFor(logging.DEBUG):
+                log_data = self._request_log_data(scope, headers, request_id)
+                logger.debug(f"Request details: {json.dumps(log_data, default=str, indent=2)}")
+        elif logger.isEnabledFor(logging.INFO):
+            log_data = self._request_log_data(scope, headers, request_id)
             logger.info(
-                f"Request - {request_id} - {request.method} {request.url.path} - {client_ip}",
+                f"Request - {request_id} - {method} {path} - {log_data['client_ip']}",
                 extra={'request_data': log_data}
             )
-    
-    async def _log_response(self, request: Request, response, request_id: str, process_time: float):
-        """Log outgoing response."""
-        
-        log_data = {
+
+    def _request_log_data(self, scope: Scope, headers: Dict[str, str], request_id: str) -> dict:
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        return {
             'request_id': request_id,
-            'status_code': response.status_code,
-            'process_time': process_time,
-            'response_headers': dict(response.headers),
+            'method': scope["method"],
+            'path': scope["path"],
+            'query_string': query_string,
+            'client_ip': self._client_ip(scope, headers),
+            'user_agent': headers.get('user-agent', 'Unknown'),
+            'headers': self._sanitize_headers(headers),
             'timestamp': time.time()
         }
-        
-        # Add response body if enabled and appropriate
-        if (self.log_response_body and 
-            self._should_log_response_body(response)):
-            try:
-                body = await self._get_response_body(response)
-                if body:
-                    log_data['body'] = body
-            except Exception as e:
-                log_data['body_error'] = str(e)
-        
+
+    def _log_request_metadata(self, metadata: str, scope: Scope, headers: Dict[str, str], request_id: str):
+        """DEBUG dump of request metadata for the debugged endpoints (formatted in the log listener)."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        client_ip = self._client_ip(scope, headers)
+        user_agent = headers.get('user-agent', 'Unknown')
+
+        if metadata == TRANSLATE_METADATA:
+            logger.debug(
+                "[RAW REQUEST METADATA] POST /translate - Request ID: %s - Client IP: %s - User-Agent: %s - "
+                "Headers: %s - Query String: %s - Content-Type: %s - Content-Length: %s bytes "
+                "(body details are logged in the endpoint after Pydantic parsing)",
+                request_id, client_ip, user_agent, self._sanitize_headers(headers),
+                scope.get('query_string', b'').decode('latin-1'),
+                headers.get('content-type', 'N/A'), headers.get('content-length', 'N/A')
+            )
+
+        elif metadata == CONFIRM_METADATA:
+            logger.debug(
+                "[TRANSACTION CONFIRM REQ] Request ID: %s - Client IP: %s - User-Agent: %s - Content-Type: %s - "
+                "Content-Length: %s bytes - Authorization: %s - Accept-Encoding: %s - Transfer-Encoding: %s - "
+                "Referer: %s - Origin: %s",
+                request_id, client_ip, user_agent, headers.get('content-type', 'N/A'),
+                headers.get('content-length', '0'), "present" if 'authorization' in headers else "MISSING",
+                headers.get('accept-encoding', 'N/A'), headers.get('transfer-encoding', 'N/A'),
+                headers.get('referer', 'N/A'), headers.get('origin', 'N/A')
+            )
+
+    def _log_response(
+        self,
+        scope: Scope,
+        status_code: int,
+        response_headers: Iterable[Tuple[bytes, bytes]],
+        request_id: str,
+        process_time: float
+    ):
+        """Log outgoing response."""
+
         # Determine log level based on status code
-        if response.status_code >= 500:
+        if status_code >= 500:
             log_level = logging.ERROR
-        elif response.status_code >= 400:
+        elif status_code >= 400:
             log_level = logging.WARNING
         else:
             log_level = logging.INFO
-        
+
+        if not logger.isEnabledFor(log_level):
+            return
+
         # Log response
         if settings.is_development:
             logger.log(
                 log_level,
-                f"Response: {response.status_code} - {process_time:.4f}s - {request.method} {request.url.path}"
+                f"Response: {status_code} - {process_time:.4f}s - {scope['method']} {scope['path']}"
             )
-            if log_level >= logging.WARNING:
+            if log_level >= logging.WARNING and logger.isEnabledFor(logging.DEBUG):
+                log_data = self._response_log_data(status_code, response_headers, request_id, process_time)
                 logger.debug(f"Response details: {json.dumps(log_data, default=str, indent=2)}")
         else:
             logger.log(
                 log_level,
-                f"Response - {request_id} - {response.status_code} - {process_time:.4f}s",
-                extra={'response_data': log_data}
+                f"Response - {request_id} - {status_code} - {process_time:.4f}s",
+                extra={'response_data': self._response_log_data(status_code, response_headers, request_id, process_time)}
             )
-    
-    async def _log_error(self, request: Request, error: Exception, request_id: str, process_time: float):
+
+    def _response_log_data(
+        self,
+        status_code: int,
+        response_headers: Iterable[Tuple[bytes, bytes]],
+        request_id: str,
+        process_time: float
+    ) -> dict:
+        return {
+            'request_id': request_id,
+            'status_code': status_code,
+            'process_time': process_time,
+            'response_headers': _decode_headers(response_headers),
+            'timestamp': time.time()
+        }
+
+    def _log_error(
+        self,
+        scope: Scope,
+        error: Exception,
+        request_id: str,
+        process_time: float,
+        response_started: bool = False
+    ):
         """Log request processing error."""
-        
+
         log_data = {
             'request_id': request_id,
             'error_type': type(error).__name__,
             'error_message': str(error),
             'process_time': process_time,
-            'method': request.method,
-            'path': request.url.path,
+            'method': scope["method"],
+            'path': scope["path"],
+            'response_started': response_started,
             'timestamp': time.time()
         }
-        
+
         logger.error(
             f"Request error - {request_id} - {type(error).__name__}: {str(error)}",
             extra={'error_data': log_data},
             exc_info=True
         )
-    
+
     def _sanitize_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
         """Remove sensitive information from headers."""
         sanitized = {}
@@ -211,109 +247,3 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             else:
                 sanitized[key] = value
         return sanitized
-    
-    def _should_log_body(self, request: Request) -> bool:
-        """Determine if request body should be logged."""
-        # CRITICAL: Don't consume request body for ANY endpoint with Pydantic validation
-        # BaseHTTPMiddleware + body reading causes stream corruption and ClientDisconnect errors
-        # FastAPI/Pydantic handles body parsing - middleware should NOT consume it
-        #
-        # Previous behavior: Only skipped /login/, causing 90s timeouts on other POST endpoints
-        # New behavior: Skip ALL endpoints to let FastAPI handle body parsing
-
-        # Skip ALL POST/PUT/PATCH endpoints to avoid consuming body stream
-        # Endpoints log their own body AFTER Pydantic validation succeeds
-        return False
-    
-    def _should_log_response_body(self, response) -> bool:
-        """Determine if response body should be logged."""
-        content_type = response.headers.get('Content-Type', '').lower()
-        
-        # Only log JSON responses
-        if 'application/json' not in content_type:
-            return False
-        
-        # Don't log large responses
-        content_length = response.headers.get('Content-Length')
-        if content_length and int(content_length) > 10000:  # 10KB limit
-            return False
-        
-        return True
-    
-    async def _get_request_body(self, request: Request) -> Any:
-        """Get request body for logging with robust encoding handling."""
-        try:
-            content_type = request.headers.get('Content-Type', '').lower()
-            
-            if 'application/json' in content_type:
-                body = await request.json()
-                return self._sanitize_body(body)
-            elif 'application/x-www-form-urlencoded' in content_type:
-                form = await request.form()
-                return dict(form)
-            else:
-                body = await request.body()
-                if len(body) < 1000:  # Only log small text bodies
-                    return self._safe_decode_body(body)
-                else:
-                    return f"<binary data: {len(body)} bytes>"
-        except Exception as e:
-            return f"<body read error: {str(e)}>"
-    
-    def _safe_decode_body(self, body: bytes) -> str:
-        """Safely decode request body with multiple encoding attempts."""
-        if not body:
-            return ""
-        
-        # Try multiple encodings in order of likelihood
-        encodings = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252', 'iso-8859-1']
-        
-        for encoding in encodings:
-            try:
-                decoded = body.decode(encoding)
-                # Validate the decoded text doesn't contain replacement characters
-                if '\ufffd' not in decoded:
-                    return f"<{encoding}> {decoded}"
-                elif encoding == 'utf-8':
-                    # If UTF-8 fails, log the problematic bytes for debugging
-                    try:
-                        # Find the first problematic byte
-                        body.decode('utf-8')  # This will raise UnicodeDecodeError
-                    except UnicodeDecodeError as e:
-                        logger.warning(f"UTF-8 decode error: {e}")
-            except UnicodeDecodeError:
-                continue
-        
-        # If all encodings fail, return hex representation
-        return f"<hex> {body.hex()[:200]}..." if len(body) > 100 else f"<hex> {body.hex()}"
-    
-    async def _get_response_body(self, response) -> Any:
-        """Get response body for logging."""
-        # This is complex because response body might already be consumed
-        # In production, you might want to use a more sophisticated approach
-        return None
-    
-    def _sanitize_body(self, body: Any) -> Any:
-        """Remove sensitive information from request/response body."""
-        if isinstance(body, dict):
-            sanitized = {}
-            sensitive_fields = {
-                'password', 'token', 'api_key', 'secret', 'private_key',
-                'credit_card', 'ssn', 'social_security'
-            }
-            
-            for key, value in body.items():
-                if any(sensitive_field in key.lower() for sensitive_field in sensitive_fields):
-                    sanitized[key] = "[REDACTED]"
-                elif isinstance(value, (dict, list)):
-                    sanitized[key] = self._sanitize_body(value)
-                else:
-                    sanitized[key] = value
-            
-            return sanitized
-        
-        elif isinstance(body, list):
-            return [self._sanitize_body(item) for item in body]
-        
-        else:
-            return body
\ No newline at end of file
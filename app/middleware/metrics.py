@@ -0,0 +1,54 @@
+"""
+HTTP request metrics middleware.
+
+Counts requests by method, route template and status, and observes their
+duration until the response body has been sent. The route template
+(e.g. /api/v1/payments/{payment_id}) comes from the matched FastAPI route,
+so path parameters do not create new series; requests that match no route
+are recorded as "unmatched".
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.metrics import HTTP_REQUESTS, HTTP_REQUEST_SECONDS
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Records http_requests_total and http_request_duration_seconds."""
+
+    def __init__(self, app: ASGIApp, enabled: bool = None):
+        """
+        Args:
+            app: Downstream ASGI application
+            enabled: Default: settings.metrics_enabled
+        """
+        self.app = app
+        self.enabled = settings.metrics_enabled if enabled is None else enabled
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, template, str(status_code)).inc()
+            HTTP_REQUEST_SECONDS.labels(method, template).observe(time.perf_counter() - start_time)
@@ -1,227 +1,455 @@
 """
 Rate limiting middleware.
+
+Pure ASGI middleware with a sliding-window-counter limiter and a pluggable
+store, so limits hold across workers:
+- MemoryRateLimitStore: per-process (single worker / development / tests)
+- RedisRateLimitStore: shared by every worker (settings.rate_limit_store="redis")
+
+Sliding window counter: each (policy, client) keeps the request count of
+the current and the previous fixed window; the rate is estimated as
+previous * (fraction of the previous window still inside the sliding
+window) + current. That is O(1) state and O(1) work per request (one Redis
+round trip), unlike a per-request timestamp log.
+
+Policies are per route (POLICY_ROUTES, a precomputed RouteTable); routes
+without a policy are not limited unless settings.rate_limit_default_enabled
+applies the default policy (rate_limit_requests per rate_limit_window).
+
+Clients are keyed on the peer address of the connection. Request headers
+(API keys, bearer tokens) are not verified at this layer, so keying on them
+would let a client reset its counter by sending a new value each time.
+X-Forwarded-For is honored only when the peer is one of
+settings.rate_limit_trusted_proxies: the client is then the right-most
+forwarded address that is not itself a trusted proxy.
 """
 
-from fastapi import Request, Response, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Dict, Optional
+import ipaddress
+import json
+import logging
+import math
 import time
-import asyncio
-from collections import defaultdict, deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import settings
+from app.middleware.route_table import RouteTable
+
+logger = logging.getLogger("translator.rate_limiting")
+
+KEY_PREFIX = "ratelimit"
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_trusted_proxies(proxies: Sequence[str]) -> List[IPNetwork]:
+    """
+    Parse proxy addresses and CIDR ranges.
+
+    Raises:
+        ValueError: On an entry that is not an IP address or network
+    """
+    return [ipaddress.ip_network(proxy, strict=False) for proxy in proxies]
+
+
+def _is_trusted(address: str, trusted_proxies: Sequence[IPNetwork]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def client_address(scope: Scope, trusted_proxies: Sequence[IPNetwork]) -> str:
+    """
+    Address of the client that sent a request (see module docstring).
+
+    The peer address, or with a trusted proxy as peer the right-most
+    X-Forwarded-For hop that is not itself a trusted proxy.
+
+    Args:
+        scope: ASGI connection scope
+        trusted_proxies: Networks whose X-Forwarded-For is honored
+
+    Returns:
+        Client IP address ("unknown" if the server did not report a peer)
+    """
+    client = scope.get("client")
+    client_ip = client[0] if client else "unknown"
+    if not trusted_proxies or not _is_trusted(client_ip, trusted_proxies):
+        return client_ip
+
+    forwarded_for = [
+        value.decode("latin-1") for name, value in scope.get("headers") or () if name == b"x-forwarded-for"
+    ]
+    hops = [hop.strip() for hop in ",".join(forwarded_for).split(",") if hop.strip()]
+    # Right to left: each trusted proxy appended the address it received the request from
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted_proxies):
+            try:
+                return str(ipaddress.ip_address(hop))
+            except ValueError:
+                break
+    return client_ip
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """At most `limit` requests per `period` seconds per client."""
+
+    name: str
+    limit: int
+    period: int
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of one rate limit check."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the current window ends
+    reset_after: int
+    # Seconds until a request would be allowed (0 when allowed)
+    retry_after: int
+
+
+def _window_position(now: float, period: int) -> Tuple[int, float]:
+    """Index of the current fixed window and the seconds elapsed in it."""
+    window = int(now // period)
+    return window, now - window * period
+
+
+def _estimate(previous: int, current: int, elapsed: float, period: int) -> float:
+    return previous * (1 - elapsed / period) + current
+
+
+def _retry_after(previous: int, current: int, limit: int, elapsed: float, period: int) -> int:
+    """
+    Seconds until one more request fits, given the counts before this request.
+
+    Solves previous * (1 - (elapsed + t) / period) + current + 1 <= limit
+    for t, rolling over into the next window when the current count alone
+    is already at the limit.
+    """
+    budget = limit - 1 - current
+    if budget >= 0:
+        wait = period * (1 - budget / previous) - elapsed if previous else 0.0
+    else:
+        # Next window: this window's count becomes the previous count
+        wait = (period - elapsed) + max(0.0, period * (1 - (limit - 1) / current))
+    return max(1, math.ceil(wait))
+
+
+def _result(previous: int, current: int, allowed: bool, policy: RateLimitPolicy, elapsed: float) -> RateLimitResult:
+    """Build the result; `current` includes this request only when allowed."""
+    estimate = _estimate(previous, current, elapsed, policy.period)
+    return RateLimitResult(
+        allowed=allowed,
+        limit=policy.limit,
+        remaining=max(0, math.floor(policy.limit - estimate)),
+        reset_after=max(1, math.ceil(policy.period - elapsed)),
+        retry_after=0 if allowed else _retry_after(previous, current, policy.limit, elapsed, policy.period),
+    )
+
+
+class RateLimitStore:
+    """Counter store interface."""
+
+    async def hit(self, key: str, policy: RateLimitPolicy, now: Optional[float] = None) -> RateLimitResult:
+        """
+        Count one request for `key` under `policy`, unless it is over the limit.
+
+        Args:
+            key: Client key (already scoped by the caller)
+            policy: Policy to apply
+            now: Current UNIX time (default: time.time())
+
+        Returns:
+            RateLimitResult
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release store resources."""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    Per-process store.
+
+    Entries of finished windows are swept when the table reaches `max_keys`;
+    if it is still above SWEEP_TARGET of `max_keys`, the oldest entries are
+    evicted down to it. The full scan therefore runs at most once per
+    (1 - SWEEP_TARGET) * max_keys new clients, not on every new client.
+    """
+
+    # Fraction of max_keys left after a sweep
+    SWEEP_TARGET = 0.9
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> [window index, previous window count, current window count, period]
+        self._windows: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    async def hit(self, key: str, policy: RateLimitPolicy, now: Optional[float] = None) -> RateLimitResult:
+        now = time.time() if now is None else now
+        window, elapsed = _window_position(now, policy.period)
+
+        entry = self._windows.get(key)
+        if entry is None:
+            if len(self._windows) >= self.max_keys:
+                self._sweep(now)
+            entry = self._windows[key] = [window, 0, 0, policy.period]
+        elif entry[0] != window:
+            entry[1] = entry[2] if entry[0] == window - 1 else 0
+            entry[2] = 0
+            entry[0] = window
+
+        previous, current = entry[1], entry[2]
+        if _estimate(previous, current + 1, elapsed, policy.period) > policy.limit:
+            return _result(previous, current, False, policy, elapsed)
+
+        entry[2] = current + 1
+        return _result(previous, current + 1, True, policy, elapsed)
+
+    def _sweep(self, now: float) -> None:
+        stale = [
+            key for key, (window, _, _, period) in self._windows.items()
+            if window < int(now // period) - 1
+        ]
+        for key in stale:
+            del self._windows[key]
 
+        overflow = len(self._windows) - int(self.max_keys * self.SWEEP_TARGET)
+        if overflow > 0:
+            for key in list(islice(self._windows, overflow)):
+                del self._windows[key]
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware using sliding window algorithm."""
-    
-    def __init__(self, app):
-        super().__init__(app)
-        # In-memory storage (should use Redis in production)
-        self.client_requests: Dict[str, deque] = defaultdict(lambda: deque())
-        self.cleanup_task = None
-        
-        # Rate limit settings
-        self.requests_per_window = settings.rate_limit_requests
-        self.window_seconds = settings.rate_limit_window
-        
-        # Different limits for different endpoints
-        self.endpoint_limits = {
-            '/api/v1/translate': {'requests': 50, 'window': 3600},  # 50 per hour
-            '/api/v1/files/upload': {'requests': 20, 'window': 3600},  # 20 per hour
-            '/api/v1/languages': {'requests': 200, 'window': 3600},  # 200 per hour
-            '/api/v1/payments': {'requests': 30, 'window': 3600},  # 30 per hour
-            '/login/admin': {'requests': 5, 'window': 900},  # 5 attempts per 15 minutes (brute force protection)
-        }
-    
-    async def dispatch(self, request: Request, call_next):
-        """Process the request with rate limiting - WITH STUB ENHANCEMENTS."""
-        # Skip rate limiting if disabled (e.g., for tests)
-        if not settings.rate_limiting_enabled:
-            return await call_next(request)
-
-        print(f"Hello World - Rate limiting middleware processing: {request.method} {request.url.path}")
-
-        # Get client identifier
-        client_id = self._get_client_id(request)
-
-        # Check if rate limited
-        if await self._is_rate_limited(client_id, request):
-            return await self._create_rate_limit_response(client_id, request)
-
-        # Record the request
-        await self._record_request(client_id, request)
-
-        # Process the request
-        response = await call_next(request)
-
-        # Add rate limit headers
-        await self._add_rate_limit_headers(response, client_id, request)
-
-        return response
-    
-    def _get_client_id(self, request: Request) -> str:
-        """Get client identifier for rate limiting."""
-        # Priority order: API key > JWT token > IP address
-        
-        # Check for API key
-        api_key = request.headers.get('X-API-Key')
-        if api_key:
-            return f"api_key:{api_key}"
-        
-        # Check for Authorization header
-        auth_header = request.headers.get('Authorization')
-        if auth_header and auth_header.startswith('Bearer '):
-            token = auth_header.split(' ')[1]
-            return f"bearer:{token}"
-        
-        # Fall back to IP address
-        client_ip = request.client.host
-        forwarded_for = request.headers.get('X-Forwarded-For')
-        if forwarded_for:
-            client_ip = forwarded_for.split(',')[0].strip()
-        
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Store shared by all workers.
+
+    One MULTI/EXEC round trip per request: INCR the current window counter,
+    refresh its expiry (two windows) and read the previous window counter.
+    Rejected requests are given back with DECR so they do not extend the
+    client's penalty.
+    """
+
+    def __init__(self, client, prefix: str = KEY_PREFIX):
+        """
+        Args:
+            client: redis.asyncio.Redis (or a compatible client)
+            prefix: Key prefix
+        """
+        self.client = client
+        self.prefix = prefix
+
+    async def hit(self, key: str, policy: RateLimitPolicy, now: Optional[float] = None) -> RateLimitResult:
+        now = time.time() if now is None else now
+        window, elapsed = _window_position(now, policy.period)
+        current_key = f"{self.prefix}:{key}:{window}"
+        previous_key = f"{self.prefix}:{key}:{window - 1}"
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incr(current_key)
+            pipe.expire(current_key, policy.period * 2)
+            pipe.get(previous_key)
+            current, _, previous = await pipe.execute()
+
+        previous = int(previous or 0)
+        if _estimate(previous, current, elapsed, policy.period) > policy.limit:
+            await self.client.decr(current_key)
+            return _result(previous, current - 1, False, policy, elapsed)
+        return _result(previous, current, True, policy, elapsed)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def build_rate_limit_store() -> RateLimitStore:
+    """
+    Store selected by settings.rate_limit_store ("memory" or "redis").
+
+    Raises:
+        ValueError: On an unknown store or a Redis store without REDIS_URL
+    """
+    if settings.rate_limit_store == "memory":
+        return MemoryRateLimitStore()
+    if settings.rate_limit_store == "redis":
+        if not settings.redis_url:
+            raise ValueError("RATE_LIMIT_STORE=redis requires REDIS_URL")
+        import redis.asyncio as redis_asyncio
+
+        return RedisRateLimitStore(redis_asyncio.from_url(settings.redis_url))
+    raise ValueError(f"Unknown RATE_LIMIT_STORE: {settings.rate_limit_store} (use memory or redis)")
+
+
+# Stores built by RateLimitMiddleware itself, closed by close_rate_limit_stores()
+_owned_stores: List[RateLimitStore] = []
+
+
+async def close_rate_limit_stores() -> None:
+    """Close the stores the middleware created (called on application shutdown)."""
+    while _owned_stores:
+        store = _owned_stores.pop()
+        try:
+            await store.close()
+        except Exception as e:
+            logger.warning(f"[RATE LIMIT] Failed to close store: {type(e).__name__}: {e}")
+
+
+# Per-route policies (login limits previously enforced by slowapi decorators in auth.py)
+POLICY_ROUTES: RouteTable[RateLimitPolicy] = RouteTable(exact={
+    ("POST", "/login/admin"): RateLimitPolicy("login_admin", limit=100, period=60),
+    ("POST", "/login/corporate"): RateLimitPolicy("login_corporate", limit=20, period=300),
+    ("POST", "/translate"): RateLimitPolicy("translate", limit=50, period=3600),
+    ("POST", "/translate-user"): RateLimitPolicy("translate_user", limit=50, period=3600),
+    ("POST", "/api/upload"): RateLimitPolicy("upload", limit=20, period=3600),
+})
+
+
+class RateLimitMiddleware:
+    """Rate limiting middleware using a sliding window counter."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: Optional[RateLimitStore] = None,
+        policies: Optional[RouteTable[RateLimitPolicy]] = None,
+        default_policy: Optional[RateLimitPolicy] = None,
+        enabled: Optional[bool] = None,
+        trusted_proxies: Optional[Sequence[str]] = None
+    ):
+        """
+        Args:
+            app: Downstream ASGI application
+            store: Counter store (default: build_rate_limit_store())
+            policies: Route -> policy table (default: POLICY_ROUTES)
+            default_policy: Policy for routes without one (default: the
+                settings policy when rate_limit_default_enabled, else None)
+            enabled: Default: rate_limiting_enabled, and never in test mode
+            trusted_proxies: Proxy IPs/CIDRs whose X-Forwarded-For is honored
+                (default: settings.trusted_proxy_list)
+        """
+        self.app = app
+        self.enabled = (
+            settings.rate_limiting_enabled and not settings.is_test_mode()
+            if enabled is None else enabled
+        )
+        if store is None and self.enabled:
+            store = build_rate_limit_store()
+            _owned_stores.append(store)
+        self.store = store
+        self.policies = POLICY_ROUTES if policies is None else policies
+        if default_policy is None and settings.rate_limit_default_enabled:
+            default_policy = RateLimitPolicy(
+                "default", limit=settings.rate_limit_requests, period=settings.rate_limit_window
+            )
+        self.default_policy = default_policy
+        self.trusted_proxies = parse_trusted_proxies(
+            settings.trusted_proxy_list if trusted_proxies is None else trusted_proxies
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.policies.match(scope["method"], scope["path"]) or self.default_policy
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        client_id = self._get_client_id(scope)
+        try:
+            result = await self.store.hit(f"{policy.name}:{client_id}", policy)
+        except Exception as e:
+            # Fail open: a store outage must not take the API down
+            logger.warning(f"[RATE LIMIT] Store error, request allowed: {type(e).__name__}: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        if not result.allowed:
+            logger.info(
+                "[RATE LIMIT] %s exceeded by %s on %s %s", policy.name, client_id, scope["method"], scope["path"]
+            )
+            await self._send_rate_limit_response(send, policy, result)
+            return
+
+        headers = self._rate_limit_headers(policy, result)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers") or []) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _get_client_id(self, scope: Scope) -> str:
+        """Get client identifier for rate limiting (peer address, see module docstring)."""
+        return f"ip:{client_address(scope, self.trusted_proxies)}"
+
+        forwarded_for = [
+            value.decode("latin-1") for name, value in scope.get("headers") or () if name == b"x-forwarded-for"
+        ]
+        hops = [hop.strip() for hop in ",".join(forwarded_for).split(",") if hop.strip()]
+        # Right to left: each trusted proxy appended the address it received the request from
+        for hop in reversed(hops):
+            if not self._is_trusted_proxy(hop):
+                try:
+                    return f"ip:{ipaddress.ip_address(hop)}"
+                except ValueError:
+                    break
         return f"ip:{client_ip}"
-    
-    async def _is_rate_limited(self, client_id: str, request: Request) -> bool:
-        """Check if the client is rate limited."""
-        now = time.time()
-        requests = self.client_requests[client_id]
-        
-        # Get rate limits for this endpoint
-        limits = self._get_endpoint_limits(request.url.path)
-        
-        # Remove old requests outside the window
-        while requests and requests[0]['timestamp'] < now - limits['window']:
-            requests.popleft()
-        
-        # Check if limit exceeded
-        return len(requests) >= limits['requests']
-    
-    async def _record_request(self, client_id: str, request: Request):
-        """Record a request for rate limiting."""
+
+    def _rate_limit_headers(self, policy: RateLimitPolicy, result: RateLimitResult) -> List[Tuple[bytes, bytes]]:
+        reset_time = int(time.time()) + result.reset_after
+        return [
+            (b"x-ratelimit-limit", str(result.limit).encode()),
+            (b"x-ratelimit-remaining", str(result.remaining).encode()),
+            (b"x-ratelimit-reset", str(reset_time).encode()),
+            (b"x-ratelimit-window", str(policy.period).encode()),
+        ]
+
+    async def _send_rate_limit_response(self, send: Send, policy: RateLimitPolicy, result: RateLimitResult) -> None:
+        """Send the rate limit exceeded response."""
         now = time.time()
-        self.client_requests[client_id].append({
-            'timestamp': now,
-            'path': request.url.path,
-            'method': request.method
-        })
-    
-    def _get_endpoint_limits(self, path: str) -> Dict[str, int]:
-        """Get rate limits for a specific endpoint."""
-        # Check for specific endpoint limits
-        for endpoint_pattern, limits in self.endpoint_limits.items():
-            if path.startswith(endpoint_pattern):
-                return limits
-        
-        # Default limits
-        return {
-            'requests': self.requests_per_window,
-            'window': self.window_seconds
-        }
-    
-    async def _create_rate_limit_response(self, client_id: str, request: Request) -> Response:
-        """Create rate limit exceeded response."""
-        limits = self._get_endpoint_limits(request.url.path)
-        requests = self.client_requests[client_id]
-        
-        # Calculate reset time
-        if requests:
-            oldest_request = requests[0]['timestamp']
-            reset_time = oldest_request + limits['window']
-        else:
-            reset_time = time.time() + limits['window']
-        
-        # Create error response
-        error_content = {
+        reset_time = now + result.retry_after
+        body = json.dumps({
             "success": False,
             "error": {
                 "code": 429,
                 "message": "Rate limit exceeded",
                 "type": "rate_limit_error",
                 "details": {
-                    "limit": limits['requests'],
-                    "window_seconds": limits['window'],
+                    "limit": policy.limit,
+                    "window_seconds": policy.period,
                     "reset_time": reset_time,
-                    "retry_after": int(reset_time - time.time())
+                    "retry_after": result.retry_after
                 }
             },
-            "timestamp": time.time()
-        }
-        
-        from fastapi.responses import JSONResponse
-        response = JSONResponse(
-            content=error_content,
-            status_code=429
-        )
-        
-        # Add rate limit headers
-        response.headers["X-RateLimit-Limit"] = str(limits['requests'])
-        response.headers["X-RateLimit-Remaining"] = "0"
-        response.headers["X-RateLimit-Reset"] = str(int(reset_time))
-        response.headers["Retry-After"] = str(int(reset_time - time.time()))
-        
-        return response
-    
-    async def _add_rate_limit_headers(self, response: Response, client_id: str, request: Request):
-        """Add rate limit headers to the response."""
-        limits = self._get_endpoint_limits(request.url.path)
-        requests = self.client_requests[client_id]
-        
-        now = time.time()
-        
-        # Count requests in current window
-        current_requests = sum(1 for req in requests if req['timestamp'] > now - limits['window'])
-        remaining = max(0, limits['requests'] - current_requests)
-        
-        # Calculate reset time
-        if requests:
-            oldest_in_window = min(
-                req['timestamp'] for req in requests 
-                if req['timestamp'] > now - limits['window']
-            )
-            reset_time = oldest_in_window + limits['window']
-        else:
-            reset_time = now + limits['window']
-        
-        # Add headers
-        response.headers["X-RateLimit-Limit"] = str(limits['requests'])
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(reset_time))
-        response.headers["X-RateLimit-Window"] = str(limits['window'])
-    
-    async def _start_cleanup_task(self):
-        """Start background task to clean up old rate limit data."""
-        if self.cleanup_task is not None:
-            return
-        
-        async def cleanup_loop():
-            while True:
-                try:
-                    await asyncio.sleep(300)  # Clean up every 5 minutes
-                    await self._cleanup_old_data()
-                except Exception as e:
-                    # Log error but don't stop the cleanup task
-                    print(f"Rate limit cleanup error: {e}")
-        
-        self.cleanup_task = asyncio.create_task(cleanup_loop())
-    
-    async def _cleanup_old_data(self):
-        """Clean up old rate limit data to prevent memory leaks."""
-        now = time.time()
-        max_window = max(limits['window'] for limits in self.endpoint_limits.values())
-        cutoff_time = now - max_window * 2  # Keep data for 2x the longest window
-        
-        clients_to_remove = []
-        for client_id, requests in self.client_requests.items():
-            # Remove old requests
-            while requests and requests[0]['timestamp'] < cutoff_time:
-                requests.popleft()
-            
-            # Mark empty clients for removal
-            if not requests:
-                clients_to_remove.append(client_id)
-        
-        # Remove empty clients
-        for client_id in clients_to_remove:
-            del self.client_requests[client_id]
\ No newline at end of file
+            "timestamp": now
+        }).encode("utf-8")
+
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-ratelimit-limit", str(policy.limit).encode()),
+                (b"x-ratelimit-remaining", b"0"),
+                (b"x-ratelimit-reset", str(int(reset_time)).encode()),
+                (b"retry-after", str(result.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
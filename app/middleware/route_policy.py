@@ -0,0 +1,323 @@
+"""
+Per-route request policies: timeout, body size cap, concurrency cap, priority.
+
+build_route_policies() declares the policies; they are resolved through a
+precomputed RouteTable (one dict lookup per request after the first
+request to a path). RoutePolicyMiddleware enforces it as pure ASGI:
+
+- Body size: requests whose Content-Length exceeds the cap get 413 before
+  the body is read; chunked bodies are counted as they are received and
+  stopped with 413 as soon as they cross the cap.
+- Concurrency: when a route's in-flight requests are at its cap, further
+  requests get 503 with Retry-After instead of piling up. Routes with an
+  admission class (admission.py) have no cap here: AdmissionMiddleware
+  runs inside this middleware and queues them, which a cap here would
+  pre-empt with 503s.
+- Timeout: if the handler has not started its response within the
+  timeout it is cancelled and 408 is returned. Once the response has
+  started (e.g. a streaming export) it is allowed to finish. Inner layers
+  that queue a request pause the timeout while it waits and restart it
+  when it is dequeued (scope["state"]["route_timeout"], a RouteTimeout),
+  so queueing time is not charged to the handler.
+- Priority: exposed to later layers as scope["state"]["route_policy"].
+
+The middleware sits inside CORSMiddleware, so 408/413/503 responses carry
+CORS headers like any other response.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.middleware.route_table import RouteTable
+
+logger = logging.getLogger("translator.route_policy")
+
+# Priorities (lower value = more important)
+PRIORITY_CRITICAL = 0  # payments, webhooks, health
+PRIORITY_NORMAL = 1    # interactive API calls
+PRIORITY_BULK = 2      # translations, uploads, exports
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    """Limits applied to one route (or route prefix)."""
+
+    name: str
+    # Seconds until the handler must start its response
+    timeout: float = 30
+    # Largest accepted request body (None = unlimited)
+    max_body_bytes: Optional[int] = None
+    # Largest number of in-flight requests (None = unlimited)
+    max_concurrency: Optional[int] = None
+    priority: int = PRIORITY_NORMAL
+
+
+def build_route_policies() -> RouteTable[RoutePolicy]:
+    """Build the route policy table from settings."""
+    default_body = settings.request_max_body_bytes
+    bulk_body = settings.bulk_max_body_bytes
+    bulk_concurrency = settings.bulk_max_concurrency
+
+    # Concurrency is bounded by the translate admission class
+    translate = RoutePolicy("translate", timeout=120, max_body_bytes=bulk_body, priority=PRIORITY_BULK)
+    export = RoutePolicy("export", timeout=30, max_body_bytes=default_body, priority=PRIORITY_BULK)
+
+    return RouteTable(
+        exact={
+            ("GET", "/health"): RoutePolicy("health", timeout=10, max_body_bytes=default_body, priority=PRIORITY_CRITICAL),
+            ("POST", "/api/upload"): RoutePolicy(
+                "upload", timeout=300, max_body_bytes=bulk_body,
+                max_concurrency=bulk_concurrency, priority=PRIORITY_BULK
+            ),
+            ("POST", "/translate"): translate,
+            ("POST", "/translate-user"): translate,
+            ("POST", "/api/translate"): translate,
+            ("GET", "/api/v1/payments/export"): export,
+            ("GET", "/api/v1/user-transactions/export"): export,
+            ("GET", "/api/v1/invoices/export"): export,
+        },
+        prefixes={
+            # Google Drive operations during payment processing
+            ("*", "/api/payment/"): RoutePolicy(
+                "payment", timeout=90, max_body_bytes=default_body, priority=PRIORITY_CRITICAL
+            ),
+            ("*", "/api/webhooks/"): RoutePolicy(
+                "webhooks", timeout=30, max_body_bytes=default_body, priority=PRIORITY_CRITICAL
+            ),
+            ("*", "/login/"): RoutePolicy("login", timeout=60, max_body_bytes=default_body),
+        },
+    )
+
+
+class RouteTimeout:
+    """Handler deadline of one request; paused while an inner layer queues the request."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._loop = asyncio.get_running_loop()
+        self.deadline: Optional[float] = self._loop.time() + timeout
+        # Set whenever the deadline moves, to wake the waiting middleware
+        self.changed = asyncio.Event()
+
+    def pause(self) -> None:
+        self.deadline = None
+        self.changed.set()
+
+    def restart(self) -> None:
+        """Give the handler its full timeout from now."""
+        self.deadline = self._loop.time() + self.timeout
+        self.changed.set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, None while paused."""
+        return None if self.deadline is None else max(0.0, self.deadline - self._loop.time())
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and self._loop.time() >= self.deadline
+
+
+class RequestBodyTooLarge(Exception):
+    """A streamed request body crossed the route's max_body_bytes."""
+
+
+class RoutePolicyMiddleware:
+    """Enforces the route policies (see module docstring)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        policies: Optional[RouteTable[RoutePolicy]] = None,
+        default_policy: Optional[RoutePolicy] = None
+    ):
+        """
+        Args:
+            app: Downstream ASGI application
+            policies: Route -> policy table (default: build_route_policies())
+            default_policy: Policy for routes without one (default: 30s
+                timeout, settings.request_max_body_bytes)
+        """
+        self.app = app
+        self.policies = build_route_policies() if policies is None else policies
+        self.default_policy = default_policy or RoutePolicy(
+            "default", timeout=30, max_body_bytes=settings.request_max_body_bytes
+        )
+        # Policy name -> in-flight requests
+        self.in_flight: Dict[str, int] = {}
+
+    def resolve(self, method: str, path: str) -> RoutePolicy:
+        """Policy of a request."""
+        return self.policies.match(method, path) or self.default_policy
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.resolve(scope["method"], scope["path"])
+        scope.setdefault("state", {})["route_policy"] = policy
+
+        # Body size: reject on the declared length before reading anything
+        body_limit = None
+        if policy.max_body_bytes is not None:
+            content_length = _content_length(scope)
+            if content_length is not None and content_length > policy.max_body_bytes:
+                logger.warning(
+                    f"[ROUTE POLICY] 413 {scope['method']} {scope['path']}: "
+                    f"Content-Length {content_length} > {policy.max_body_bytes}"
+                )
+                await send_error_response(send, 413, "Request body too large", "payload_too_large_error")
+                return
+            if content_length is None:
+                # Chunked body: count it as it streams in
+                body_limit = _BodyLimit(receive, policy.max_body_bytes)
+                receive = body_limit.receive
+
+        # Concurrency cap: reject instead of queueing
+        if policy.max_concurrency is not None:
+            if self.in_flight.get(policy.name, 0) >= policy.max_concurrency:
+                logger.warning(
+                    f"[ROUTE POLICY] 503 {scope['method']} {scope['path']}: "
+                    f"{policy.name} at {policy.max_concurrency} concurrent requests"
+                )
+                await send_error_response(
+                    send, 503, "Too many concurrent requests", "concurrency_limit_error",
+                    headers=[(b"retry-after", b"1")]
+                )
+                return
+            self.in_flight[policy.name] = self.in_flight.get(policy.name, 0) + 1
+
+        try:
+            await self._call_with_timeout(scope, receive, send, policy, body_limit)
+        finally:
+            if policy.max_concurrency is not None:
+                self.in_flight[policy.name] -= 1
+
+    async def _call_with_timeout(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        policy: RoutePolicy,
+        body_limit: Optional["_BodyLimit"] = None
+    ) -> None:
+        """Run the app; 408 if it has not started its response within policy.timeout."""
+        started = asyncio.Event()
+        response_started = False
+        route_timeout = RouteTimeout(policy.timeout)
+        scope.setdefault("state", {})["route_timeout"] = route_timeout
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if body_limit is not None and body_limit.exceeded:
+                # The app answered the aborted body (FastAPI: 400); answer 413 instead
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    started.set()
+                    self._log_body_too_large(scope, policy)
+                    await send_error_response(send, 413, "Request body too large", "payload_too_large_error")
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+                started.set()
+            await send(message)
+
+        start_time = time.perf_counter()
+        handler = asyncio.ensure_future(self.app(scope, receive, send_wrapper))
+        waiter = asyncio.ensure_future(started.wait())
+        try:
+            # Inner layers may pause or restart the deadline while this waits
+            while not handler.done() and not started.is_set() and not route_timeout.expired:
+                route_timeout.changed.clear()
+                changed = asyncio.ensure_future(route_timeout.changed.wait())
+                try:
+                    await asyncio.wait(
+                        {handler, waiter, changed}, timeout=route_timeout.remaining(),
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    changed.cancel()
+        finally:
+            waiter.cancel()
+
+        if not handler.done() and not response_started:
+            handler.cancel()
+            try:
+                await handler
+            except (asyncio.CancelledError, Exception):
+                pass
+            elapsed = time.perf_counter() - start_time
+            logger.warning(f"[ROUTE POLICY] 408 {scope['method']} {scope['path']} (>{policy.timeout}s, {elapsed:.2f}s)")
+            await send_error_response(send, 408, "Request timeout", "timeout_error")
+            return
+
+        try:
+            await handler
+        except RequestBodyTooLarge:
+            if response_started:
+                raise
+            self._log_body_too_large(scope, policy)
+            await send_error_response(send, 413, "Request body too large", "payload_too_large_error")
+
+    def _log_body_too_large(self, scope: Scope, policy: RoutePolicy) -> None:
+        logger.warning(
+            f"[ROUTE POLICY] 413 {scope['method']} {scope['path']}: body > {policy.max_body_bytes} bytes"
+        )
+
+
+def _content_length(scope: Scope) -> Optional[int]:
+    for name, value in scope.get("headers") or ():
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+class _BodyLimit:
+    """Wraps `receive` to stop a streamed body once it crosses max_bytes."""
+
+    def __init__(self, receive: Receive, max_bytes: int):
+        self._receive = receive
+        self.max_bytes = max_bytes
+        self.received = 0
+        self.exceeded = False
+
+    async def receive(self) -> Message:
+        message = await self._receive()
+        if message["type"] == "http.request":
+            self.received += len(message.get("body", b""))
+            if self.received > self.max_bytes:
+                self.exceeded = True
+                raise RequestBodyTooLarge()
+        return message
+
+
+async def send_error_response(send: Send, status_code: int, message: str, error_type: str, headers=None) -> None:
+    """Send an error response in the API's error envelope."""
+    body = json.dumps({
+        "success": False,
+        "error": {
+            "code": status_code,
+            "message": message,
+            "type": error_type
+        },
+        "timestamp": time.time()
+    }).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ] + list(headers or []),
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,85 @@
+"""
+Precomputed per-path lookup for middleware.
+
+Middleware that does per-path work (special logging, body capture, ...)
+builds a RouteTable once at startup instead of comparing request paths
+against string literals on every request. Lookups are a dict hit for exact
+routes; prefix routes are checked longest-first and the result is memoized
+per (method, path).
+
+Usage:
+    table = RouteTable(
+        exact={("POST", "/translate"): "translate"},
+        prefixes={("*", "/api/payments/"): "payments"},
+    )
+    table.match("POST", "/translate")  # -> "translate"
+"""
+
+from typing import Dict, Generic, List, Mapping, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+ANY_METHOD = "*"
+
+# Memoized lookups (paths with IDs are unbounded, so the memo is capped)
+MAX_MEMO_SIZE = 4096
+
+
+class RouteTable(Generic[V]):
+    """(method, path) -> value lookup, exact routes first, then longest prefix."""
+
+    def __init__(
+        self,
+        exact: Optional[Mapping[Tuple[str, str], V]] = None,
+        prefixes: Optional[Mapping[Tuple[str, str], V]] = None
+    ):
+        """
+        Args:
+            exact: (method, path) -> value; method may be "*" for any method
+            prefixes: (method, path prefix) -> value; method may be "*"
+        """
+        self._exact: Dict[Tuple[str, str], V] = dict(exact or {})
+        self._prefixes: List[Tuple[str, str, V]] = sorted(
+            ((method, prefix, value) for (method, prefix), value in (prefixes or {}).items()),
+            key=lambda route: len(route[1]),
+            reverse=True
+        )
+        self._memo: Dict[Tuple[str, str], Optional[V]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._exact or self._prefixes)
+
+    def match(self, method: str, path: str) -> Optional[V]:
+        """
+        Value registered for a request, or None.
+
+        Args:
+            method: HTTP method (upper case, as in the ASGI scope)
+            path: Request path
+
+        Returns:
+            The value of the exact route, else of the longest matching prefix
+        """
+        key = (method, path)
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+
+        value = self._lookup(method, path)
+        if len(self._memo) >= MAX_MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = value
+        return value
+
+    def _lookup(self, method: str, path: str) -> Optional[V]:
+        value = self._exact.get((method, path))
+        if value is None:
+            value = self._exact.get((ANY_METHOD, path))
+        if value is not None:
+            return value
+
+        for route_method, prefix, route_value in self._prefixes:
+            if route_method in (method, ANY_METHOD) and path.startswith(prefix):
+                return route_value
+        return None
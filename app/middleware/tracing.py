@@ -0,0 +1,63 @@
+"""
+Request tracing middleware.
+
+Opens a trace for every HTTP request (trace id = the X-Request-ID set by
+LoggingMiddleware, so it must run inside it), names the root span after the
+matched route template once the app returns, and adds a Server-Timing
+header summarizing the spans finished before the response started.
+"""
+
+import uuid
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.tracing import request_trace, server_timing, trace_id_from_request_id
+
+
+class TracingMiddleware:
+    """One trace per request, exported by app.utils.tracing."""
+
+    def __init__(self, app: ASGIApp, enabled: bool = None, server_timing_header: bool = None):
+        """
+        Args:
+            app: Downstream ASGI application
+            enabled: Default: settings.tracing_enabled
+            server_timing_header: Default: settings.server_timing_enabled
+        """
+        self.app = app
+        self.enabled = settings.tracing_enabled if enabled is None else enabled
+        self.server_timing_header = (
+            settings.server_timing_enabled if server_timing_header is None else server_timing_header
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        request_id = scope.setdefault("state", {}).get("request_id") or str(uuid.uuid4())
+
+        with request_trace(
+            trace_id_from_request_id(request_id),
+            f"{method} {scope['path']}",
+            **{"http.method": method, "http.target": scope["path"], "http.request_id": request_id}
+        ) as trace:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    trace.root.set_attribute("http.status_code", message["status"])
+                    if self.server_timing_header:
+                        headers = list(message.get("headers") or [])
+                        headers.append((b"server-timing", server_timing(trace).encode("latin-1")))
+                        message["headers"] = headers
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                template = getattr(scope.get("route"), "path", None)
+                if template:
+                    trace.root.name = f"{method} {template}"
+                    trace.root.set_attribute("http.route", template)
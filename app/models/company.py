@@ -0,0 +1,34 @@
+"""
+Company models for company list responses.
+"""
+
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from app.utils.projection import projection_for
+
+
+class CompanySummary(BaseModel):
+    """
+    Company record for list views.
+
+    GET /api/v1/companies projects exactly these fields (see
+    COMPANY_SUMMARY_PROJECTION); any other stored fields are returned by
+    GET /api/v1/companies/{company_name}.
+    """
+    id: str = Field(..., alias="_id", description="MongoDB ObjectId of the company record")
+    company_name: str = Field(..., description="Company name (unique)")
+    description: Optional[str] = Field(None, description="Company description")
+    line_of_business: Optional[str] = Field(None, description="Line of business")
+    address: Optional[Dict[str, Any]] = Field(None, description="Postal address")
+    contact_person: Optional[Dict[str, Any]] = Field(None, description="Primary contact person")
+    contact_email: Optional[str] = Field(None, description="Contact email address")
+    phone_number: Optional[List[str]] = Field(None, description="Phone numbers")
+    created_at: Optional[str] = Field(None, description="Record creation timestamp in ISO 8601 format")
+    updated_at: Optional[str] = Field(None, description="Last update timestamp in ISO 8601 format")
+
+    model_config = {'populate_by_name': True}
+
+
+# Fields fetched by list endpoints (matches CompanySummary)
+COMPANY_SUMMARY_PROJECTION = projection_for(CompanySummary)
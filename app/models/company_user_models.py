@@ -9,6 +9,7 @@ from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional
 from datetime import datetime
 from app.mongodb_models import PermissionLevel, UserStatus
+from app.utils.projection import projection_for
 import re
 
 
@@ -194,9 +195,14 @@ class CompanyUserResponse(BaseModel):
         }
 
 
+# Fields fetched by list endpoints (matches CompanyUserResponse; never password_hash)
+COMPANY_USER_RESPONSE_PROJECTION = {"_id": 0, **projection_for(CompanyUserResponse)}
+
+
 # Export all models
 __all__ = [
     "CompanyUserCreate",
     "CompanyUserUpdate",
-    "CompanyUserResponse"
+    "CompanyUserResponse",
+    "COMPANY_USER_RESPONSE_PROJECTION"
 ]
@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field, field_validator, computed_field
 
+from app.utils.projection import projection_for
+
 
 # ============================================================================
 # Invoice Supporting Models
@@ -146,6 +148,36 @@ class InvoiceListItem(BaseModel):
     }
 
 
+class InvoiceSummary(BaseModel):
+    """
+    Slim invoice record for list views.
+
+    GET /api/v1/invoices projects exactly these fields (see
+    INVOICE_SUMMARY_PROJECTION); line items and payment applications are
+    returned by GET /api/v1/invoices/{invoice_id}.
+    """
+    id: str = Field(..., alias="_id", description="MongoDB ObjectId of the invoice record")
+    invoice_id: Optional[str] = Field(None, description="Invoice ID (falls back to invoice_number)")
+    invoice_number: str = Field(..., description="Unique invoice number (e.g., INV-2025-001)")
+    company_name: str = Field(..., description="Company name (e.g., 'Acme Health LLC')")
+    subscription_id: Optional[str] = Field(None, description="Subscription identifier linked to this invoice")
+    invoice_date: str = Field(..., description="Invoice date in ISO 8601 format")
+    due_date: str = Field(..., description="Payment due date in ISO 8601 format")
+    status: str = Field(..., description="Invoice status: sent | paid | overdue | cancelled")
+    billing_period: Optional[BillingPeriod] = Field(None, description="Billing period for quarterly invoices")
+    subtotal: float = Field(default=0.0, ge=0, description="Subtotal before tax")
+    tax_amount: float = Field(default=0.0, ge=0, description="Tax amount in dollars")
+    total_amount: float = Field(..., ge=0, description="Total invoice amount in dollars")
+    amount_paid: float = Field(default=0.0, ge=0, description="Amount paid towards this invoice")
+    amount_due: Optional[float] = Field(None, ge=0, description="Outstanding amount in dollars")
+    pdf_url: Optional[str] = Field(None, description="URL to the invoice PDF document")
+    stripe_payment_link_url: Optional[str] = Field(None, description="Stripe Payment Link URL for customer payment")
+    created_at: Optional[str] = Field(None, description="Record creation timestamp in ISO 8601 format")
+    updated_at: Optional[str] = Field(None, description="Last update timestamp in ISO 8601 format")
+
+    model_config = {'populate_by_name': True}
+
+
 class InvoiceListFilters(BaseModel):
     """Filters applied to the invoice list query."""
     company_name: str = Field(..., description="Company name used for filtering")
@@ -448,3 +480,6 @@ class InvoiceUpdateResponse(BaseModel):
         }
     }
 
+
+# Fields fetched by list endpoints (matches InvoiceSummary)
+INVOICE_SUMMARY_PROJECTION = projection_for(InvoiceSummary)
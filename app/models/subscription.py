@@ -118,7 +118,12 @@ class SubscriptionResponse(BaseModel):
     start_date: datetime
     end_date: Optional[datetime]
     status: str
-    usage_periods: List[UsagePeriod]
+    # Not stored on the subscription document: the endpoint loads the periods
+    # from the usage_periods collection (UsagePeriodRepository.list_periods)
+    usage_periods: List[UsagePeriod] = Field(
+        default_factory=list,
+        description="Usage periods loaded from the usage_periods collection"
+    )
     created_at: datetime
     updated_at: datetime
 
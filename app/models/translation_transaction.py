@@ -6,6 +6,8 @@ from datetime import datetime, timezone
 from typing import Optional, List
 from pydantic import BaseModel, Field
 
+from app.utils.projection import projection_for
+
 
 # ============================================================================
 # Translation Transaction Models (for translation_transactions collection)
@@ -68,11 +70,53 @@ class TranslationDocumentSchema(BaseModel):
     }
 
 
-class TranslationTransactionListItem(BaseModel):
+class TranslationDocumentSummary(BaseModel):
+    """Per-document fields shown in transaction list views (timings and Drive file IDs omitted)."""
+    file_name: str = Field(..., description="Original filename (e.g., 'contract.pdf')")
+    file_size: int = Field(default=0, ge=0, description="File size in bytes")
+    original_url: Optional[str] = Field(None, description="Google Drive URL of the original file")
+    translated_url: Optional[str] = Field(None, description="Google Drive URL of the translated file (None if not yet translated)")
+    translated_name: Optional[str] = Field(None, description="Translated filename (None if not yet translated)")
+    status: str = Field(..., description="Document status: uploaded | translating | completed | failed")
+    translation_mode: Optional[str] = Field(None, description="Translation mode for this document")
+
+
+class TranslationTransactionSummary(BaseModel):
+    """
+    Slim translation transaction record for list views.
+
+    The company list endpoint projects exactly these fields (see
+    TRANSLATION_TRANSACTION_SUMMARY_PROJECTION); the full record, including
+    per-document timings, is returned by GET /api/v1/translation-transactions/{transaction_id}.
+    """
+    id: str = Field(..., alias="_id", description="MongoDB ObjectId of the transaction record")
+    transaction_id: str = Field(..., description="Unique transaction identifier (e.g., TXN-20FEF6D8FE)")
+    user_id: str = Field(..., description="User email address")
+    documents: List[TranslationDocumentSummary] = Field(default_factory=list, description="Documents in this transaction (summary fields)")
+    source_language: str = Field(..., description="Source language code (e.g., en)")
+    target_language: str = Field(..., description="Target language code (e.g., fr)")
+    units_count: int = Field(..., ge=0, description="Number of translation units (pages or words)")
+    price_per_unit: float = Field(..., ge=0, description="Price per translation unit in dollars")
+    total_price: float = Field(..., ge=0, description="Total transaction price in dollars")
+    status: str = Field(..., description="Transaction status: started | confirmed | pending | failed")
+    error_message: str = Field(default="", description="Error message if status is failed")
+    total_documents: Optional[int] = Field(None, description="Number of documents in the transaction")
+    completed_documents: Optional[int] = Field(None, description="Number of documents translated so far")
+    created_at: str = Field(..., description="Record creation timestamp in ISO 8601 format")
+    updated_at: str = Field(..., description="Record update timestamp in ISO 8601 format")
+    company_name: Optional[str] = Field(None, description="Company name if enterprise customer")
+    subscription_id: Optional[str] = Field(None, description="Subscription identifier (ObjectId) if enterprise customer")
+    unit_type: str = Field(default="page", description="Unit type for billing: page | word")
+
+    model_config = {'populate_by_name': True}
+
+
+class TranslationTransactionListItem(TranslationTransactionSummary):
     """
-    Individual translation transaction item in the company transactions list.
+    Full translation transaction record with complete per-document details.
 
-    This schema represents a transaction record as returned in the list endpoint.
+    Extends TranslationTransactionSummary (the list-view shape) with the full
+    document schema, so it is accepted wherever a summary is expected.
     All datetime fields are returned as ISO 8601 strings.
     Supports multiple documents per transaction via the documents array.
     """
@@ -158,7 +202,7 @@ class TranslationTransactionListFilters(BaseModel):
 
 class TranslationTransactionListData(BaseModel):
     """Data payload containing transactions list with pagination and filter information."""
-    transactions: List[TranslationTransactionListItem] = Field(..., description="Array of transaction records matching the query")
+    transactions: List[TranslationTransactionSummary] = Field(..., description="Array of transaction summaries matching the query")
     count: int = Field(..., ge=0, description="Number of transactions returned in this response")
     limit: int = Field(..., ge=1, le=100, description="Maximum number of results requested")
     skip: int = Field(..., ge=0, description="Number of results skipped (pagination offset)")
@@ -184,10 +228,7 @@ class TranslationTransactionListData(BaseModel):
                                         'translated_url': None,
                                         'translated_name': None,
                                         'status': 'translating',
-                                        'uploaded_at': '2025-10-26T13:15:10+00:00',
-                                        'translated_at': None,
-                                        'processing_started_at': '2025-10-26T13:15:15+00:00',
-                                        'processing_duration': None
+                                        'translation_mode': 'automatic'
                                     }
                                 ],
                                 'source_language': 'en',
@@ -215,10 +256,7 @@ class TranslationTransactionListData(BaseModel):
                                         'translated_url': 'https://docs.google.com/document/d/3XYZabc789/edit',
                                         'translated_name': 'Document_de.pdf',
                                         'status': 'completed',
-                                        'uploaded_at': '2025-10-25T10:30:00+00:00',
-                                        'translated_at': '2025-10-25T11:00:00+00:00',
-                                        'processing_started_at': '2025-10-25T10:30:05+00:00',
-                                        'processing_duration': 1795.0
+                                        'translation_mode': 'automatic'
                                     }
                                 ],
                                 'source_language': 'es',
@@ -294,10 +332,7 @@ class TranslationTransactionListResponse(BaseModel):
                                             'translated_url': None,
                                             'translated_name': None,
                                             'status': 'translating',
-                                            'uploaded_at': '2025-10-26T13:15:10+00:00',
-                                            'translated_at': None,
-                                            'processing_started_at': '2025-10-26T13:15:15+00:00',
-                                            'processing_duration': None
+                                            'translation_mode': 'automatic'
                                         }
                                     ],
                                     'source_language': 'en',
@@ -360,10 +395,7 @@ class TranslationTransactionListResponse(BaseModel):
                                             'translated_url': 'https://docs.google.com/document/d/3XYZabc789/edit',
                                             'translated_name': 'Document_de.pdf',
                                             'status': 'completed',
-                                            'uploaded_at': '2025-10-25T10:30:00+00:00',
-                                            'translated_at': '2025-10-25T11:00:00+00:00',
-                                            'processing_started_at': '2025-10-25T10:30:05+00:00',
-                                            'processing_duration': 1795.0
+                                            'translation_mode': 'automatic'
                                         }
                                     ],
                                     'source_language': 'es',
@@ -393,3 +425,7 @@ class TranslationTransactionListResponse(BaseModel):
             ]
         }
     }
+
+
+# Fields fetched by list endpoints (matches TranslationTransactionSummary)
+TRANSLATION_TRANSACTION_SUMMARY_PROJECTION = projection_for(TranslationTransactionSummary)
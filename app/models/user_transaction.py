@@ -6,6 +6,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
+from app.utils.projection import projection_for
+
 
 class UserTransactionDocument(BaseModel):
     """
@@ -186,6 +188,49 @@ class UserTransactionListItem(BaseModel):
         }
 
 
+class UserTransactionDocumentSummary(BaseModel):
+    """Per-document fields shown in transaction list views (timings omitted)."""
+    file_name: str = Field(..., description="Original filename (e.g., 'contract.pdf')")
+    file_size: int = Field(default=0, ge=0, description="File size in bytes")
+    original_url: Optional[str] = Field(None, description="Google Drive URL of the original file")
+    translated_url: Optional[str] = Field(None, description="Google Drive URL of the translated file (None if not yet translated)")
+    translated_name: Optional[str] = Field(None, description="Translated filename (None if not yet translated)")
+    status: str = Field(default="uploaded", description="Document processing status: uploaded | translating | completed | failed")
+    translation_mode: Optional[str] = Field(None, description="Translation mode for this document")
+
+
+class UserTransactionSummary(BaseModel):
+    """
+    Slim user transaction record for list views.
+
+    GET /api/v1/user-transactions projects exactly these fields (see
+    USER_TRANSACTION_SUMMARY_PROJECTION). Refunds, Stripe payment details and
+    per-document timings are returned by GET /api/v1/user-transactions/{stripe_checkout_session_id}.
+    """
+    id: str = Field(..., alias="_id", description="MongoDB ObjectId (24-character hex string)")
+    transaction_id: Optional[str] = Field(None, description="Unique transaction ID (USER + 6 digits)")
+    user_name: str = Field(..., description="Full name of the user")
+    user_email: str = Field(..., description="Email address of the user")
+    documents: List[UserTransactionDocumentSummary] = Field(default_factory=list, description="Documents in this transaction (summary fields)")
+    number_of_units: int = Field(..., description="Number of units (pages, words, or characters)")
+    unit_type: str = Field(..., description="Type of unit: page | word | character")
+    cost_per_unit: float = Field(..., description="Cost per single unit in dollars")
+    total_cost: float = Field(..., description="Total cost in dollars")
+    source_language: str = Field(..., description="Source language code")
+    target_language: str = Field(..., description="Target language code")
+    stripe_checkout_session_id: str = Field(..., description="Stripe checkout session ID")
+    date: str = Field(..., description="Transaction date (ISO 8601 format)")
+    status: str = Field(..., description="Transaction status: processing | completed | failed")
+    payment_status: Optional[str] = Field(None, description="Payment status: APPROVED | COMPLETED | CANCELED | FAILED")
+    amount_cents: Optional[int] = Field(None, description="Payment amount in cents")
+    currency: Optional[str] = Field(None, description="Currency code")
+    created_at: str = Field(..., description="Record creation timestamp (ISO 8601 format)")
+    updated_at: str = Field(..., description="Last update timestamp (ISO 8601 format)")
+
+    class Config:
+        populate_by_name = True
+
+
 class UserTransactionListFilters(BaseModel):
     """Applied filter values."""
 
@@ -290,3 +335,21 @@ class UserTransactionListResponse(BaseModel):
                 }
             }
         }
+
+
+# Legacy database field name → current field name. create_user_transaction
+# stores the current names (which are also the API names); older records use
+# the legacy ones.
+TRANSACTION_FIELD_MAPPINGS = {
+    'price_per_unit': 'cost_per_unit',
+    'total_price': 'total_cost',
+    'units_count': 'number_of_units'
+}
+
+# Fields fetched by list endpoints (matches UserTransactionSummary). Older
+# records store units_count/price_per_unit/total_price, which
+# serialize_transaction_for_json maps onto the API names.
+USER_TRANSACTION_SUMMARY_PROJECTION = projection_for(
+    UserTransactionSummary,
+    extra_fields=tuple(TRANSACTION_FIELD_MAPPINGS)
+)
@@ -116,7 +116,12 @@ class LineItem(BaseModel):
 
 
 class UsagePeriod(BaseModel):
-    """Embedded usage period in subscriptions."""
+    """
+    Usage period of a subscription, one document per period in the
+    usage_periods collection (no longer embedded in subscriptions).
+    """
+    subscription_id: str  # Subscription ObjectId as string
+    period_number: Optional[int] = None
     period_start: datetime
     period_end: datetime
     units_allocated: int
@@ -248,8 +253,9 @@ class Subscription(BaseModel):
     billing_frequency: str = "monthly"  # monthly, quarterly, yearly
     payment_terms_days: int = 30  # Payment terms (e.g., Net 30)
 
-    # Embedded arrays
-    usage_periods: List[UsagePeriod] = Field(default_factory=list)
+    # Usage periods live in the usage_periods collection keyed by
+    # subscription_id; a legacy embedded array is moved there and $unset by
+    # UsagePeriodRepository.migrate_embedded_periods
 
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -12,12 +12,10 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 import logging
-import bcrypt
-import asyncio
-from functools import partial
 from datetime import datetime, timezone
 
 from app.services.auth_service import auth_service, AuthenticationError
+from app.services.password_hasher import PasswordHasherBusy, password_hasher
 from app.models.auth_models import (
     UserSignupRequest,
     UserSignupResponse,
@@ -28,37 +26,12 @@ from app.models.auth_models import (
 )
 from app.database.mongodb import database
 
-# Import slowapi for rate limiting
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/login", tags=["Authentication"])
 
 
-def get_rate_limit_key(request: Request) -> str:
-    """
-    Get rate limit key - returns empty string in test mode to effectively disable rate limiting.
-
-    In test mode, all requests use the same key "", but with enabled=False
-    the limiter won't track them.
-    """
-    if settings.is_test_mode():
-        # Return a constant key that won't be rate limited
-        return "test_mode_bypass"
-    return get_remote_address(request)
-
-
-# Initialize rate limiter with test mode awareness
-# In test mode, use a permissive configuration
-limiter = Limiter(
-    key_func=get_rate_limit_key,
-    enabled=not settings.is_test_mode()  # Disable rate limiting in test mode
-)
-
-
 class CorporateLoginRequest(BaseModel):
     """Corporate login request model."""
     company_name: str = Field(..., alias='companyName', min_length=1)
@@ -99,8 +72,8 @@ class IndividualLoginResponse(BaseModel):
     error: Optional[dict] = None
 
 
+# Rate limited by RateLimitMiddleware (login_admin policy)
 @router.post("/admin", response_model=AdminLoginResponse)
-@limiter.limit("100/minute")  # Allow more logins for E2E testing
 async def admin_login(req: AdminLoginRequest, request: Request):
     """
     Admin login endpoint with MongoDB authentication.
@@ -191,6 +164,9 @@ async def admin_login(req: AdminLoginRequest, request: Request):
 
         raise HTTPException(status_code=401, detail=str(e))
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error("=" * 80)
         logger.error(f"💥 ADMIN LOGIN UNEXPECTED ERROR")
@@ -306,6 +282,9 @@ async def individual_login(request: IndividualLoginRequest):
 
         raise HTTPException(status_code=401, detail=str(e))
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error("=" * 80)
         logger.error(f"💥 UNEXPECTED ERROR")
@@ -325,8 +304,8 @@ async def individual_login(request: IndividualLoginRequest):
         raise HTTPException(status_code=500, detail="Login processing failed")
 
 
+# Brute force protection by RateLimitMiddleware (login_corporate policy: 20 attempts per 5 minutes)
 @router.post("/corporate", response_model=CorporateLoginResponse)
-@limiter.limit("20/5minutes")  # Brute force protection: 20 attempts per 5 minutes
 async def corporate_login(req: CorporateLoginRequest, request: Request):
     """
     Corporate login endpoint with MongoDB authentication.
@@ -429,6 +408,9 @@ async def corporate_login(req: CorporateLoginRequest, request: Request):
 
         raise HTTPException(status_code=401, detail=str(e))
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error("=" * 80)
         logger.error(f"💥 UNEXPECTED ERROR")
@@ -651,18 +633,9 @@ async def user_signup(request: UserSignupRequest):
             logger.warning(f"[SIGNUP] User with username {request.user_name} already exists")
             raise HTTPException(status_code=400, detail="Username already taken")
 
-        # Hash password with bcrypt (12 rounds)
-        logger.info(f"[SIGNUP] Hashing password with bcrypt (12 rounds)...")
-        password_bytes = request.password.encode('utf-8')[:72]  # bcrypt limit is 72 bytes
-
-        # Run bcrypt in thread pool to avoid blocking event loop
-        loop = asyncio.get_event_loop()
-        salt = await loop.run_in_executor(None, bcrypt.gensalt, 12)
-        password_hash = await loop.run_in_executor(
-            None,
-            partial(bcrypt.hashpw, password_bytes, salt)
-        )
-        password_hash_str = password_hash.decode('utf-8')
+        # Hash password with bcrypt in the dedicated worker pool
+        logger.info(f"[SIGNUP] Hashing password with bcrypt ({password_hasher.rounds} rounds)...")
+        password_hash_str = await password_hasher.hash(request.password)
         logger.info(f"[SIGNUP] Password hashed successfully")
 
         # Create user document
@@ -772,14 +745,11 @@ async def user_login(request: UserLoginRequest):
             raise HTTPException(status_code=401, detail="Invalid credentials")
 
         try:
-            # Run bcrypt verification in thread pool
-            password_bytes = request.password.encode('utf-8')[:72]
-            loop = asyncio.get_event_loop()
-            password_valid = await loop.run_in_executor(
-                None,
-                partial(bcrypt.checkpw, password_bytes, password_hash.encode('utf-8'))
-            )
+            # Run bcrypt verification in the dedicated worker pool
+            password_valid = await password_hasher.verify(request.password, password_hash)
             logger.info(f"[LOGIN] Password verification completed")
+        except PasswordHasherBusy:
+            raise
         except Exception as e:
             logger.error(f"[LOGIN] Password verification error: {e}")
             raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -790,12 +760,16 @@ async def user_login(request: UserLoginRequest):
 
         logger.info(f"[LOGIN] Password verified successfully")
 
-        # Update last_login timestamp
+        # Update last_login timestamp (and the password hash if its bcrypt cost is outdated)
         now = datetime.now(timezone.utc)
         logger.info(f"[LOGIN] Updating last_login timestamp...")
+        login_update = {"last_login": now, "updated_at": now}
+        new_hash = await password_hasher.rehash_if_needed(request.password, password_hash)
+        if new_hash:
+            login_update["password"] = new_hash
         await database.users_login.update_one(
             {"_id": user["_id"]},
-            {"$set": {"last_login": now, "updated_at": now}}
+            {"$set": login_update}
         )
         logger.info(f"[LOGIN] Last login updated")
 
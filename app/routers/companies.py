@@ -2,12 +2,15 @@
 Company management router for retrieving and managing company records.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from typing import List
 import logging
 
 from app.database.mongodb import database
+from app.models.company import COMPANY_SUMMARY_PROJECTION
+from app.services.directory_cache import directory_cache
+from app.utils.conditional import ConditionalGet, collection_version, make_etag
 
 logger = logging.getLogger(__name__)
 
@@ -77,11 +80,16 @@ def serialize_company_for_json(company: dict) -> dict:
         }
     }
 )
-async def get_all_companies():
+async def get_all_companies(request: Request):
     """
     Get all companies from the database.
 
-    Returns full company objects with all fields including address, contact info, etc.
+    Returns company summaries (CompanySummary): name, description, line of
+    business, address and contact info. Use GET /api/v1/companies/{company_name}
+    for the full stored record.
+
+    Supports conditional GET (ETag / Last-Modified): returns 304 without
+    loading the companies when the client's copy is current.
     """
     from datetime import datetime, timezone
 
@@ -90,9 +98,15 @@ async def get_all_companies():
         logger.info(f"🔍 [{timestamp}] GET /api/v1/companies - START")
         logger.info(f"📥 Request Parameters: None (fetching all companies)")
 
+        stamp = await collection_version(database.company, {})
+        conditional = ConditionalGet(request, make_etag("companies", stamp), stamp.last_modified)
+        if conditional.is_not_modified():
+            logger.info(f"📤 Response: 304 Not Modified (count={stamp.count})")
+            return conditional.not_modified_response()
+
         # Fetch all companies from database
         logger.info(f"🔄 Calling database.company.find()...")
-        companies = await database.company.find({}).to_list(length=None)
+        companies = await database.company.find({}, COMPANY_SUMMARY_PROJECTION).to_list(length=None)
         logger.info(f"🔎 Database Query Result: count={len(companies)}")
 
         # Serialize all companies
@@ -114,7 +128,7 @@ async def get_all_companies():
         }
         logger.info(f"📤 Response: success=True, count={len(companies)}")
 
-        return JSONResponse(content=response_data)
+        return conditional.apply(JSONResponse(content=response_data))
 
     except Exception as e:
         logger.error(f"❌ Failed to retrieve companies:", exc_info=True)
@@ -126,6 +140,52 @@ async def get_all_companies():
         )
 
 
+@router.get(
+    "/{company_name}",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Company retrieved successfully"},
+        404: {"description": "Company not found"},
+        500: {"description": "Internal server error"}
+    }
+)
+async def get_company(company_name: str):
+    """
+    Get the full company record.
+
+    Args:
+        company_name: The name of the company
+
+    Returns:
+        Company object with all stored fields
+    """
+    try:
+        logger.info(f"🔍 GET /api/v1/companies/{company_name} - START")
+        company = await database.company.find_one({"company_name": company_name})
+
+        if not company:
+            logger.warning(f"❌ Company not found: {company_name}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Company not found: {company_name}"
+            )
+
+        logger.info(f"✅ Company retrieved: {company_name}")
+        return JSONResponse(content={
+            "success": True,
+            "data": serialize_company_for_json(company)
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Failed to retrieve company:", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve company: {str(e)}"
+        )
+
+
 @router.post(
     "",
     status_code=status.HTTP_201_CREATED,
@@ -270,6 +330,9 @@ async def update_company(company_name: str, update_data: dict):
             {"company_name": company_name},
             {"$set": update_data}
         )
+        directory_cache.invalidate_company(company_name)
+        if update_data.get("company_name", company_name) != company_name:
+            directory_cache.invalidate_company(update_data["company_name"])
 
         if result.modified_count == 0:
             logger.warning(f"⚠️ No changes made to company: {company_name}")
@@ -11,26 +11,30 @@ This router handles:
 - User ID generation
 
 Security:
-- Passwords are hashed using bcrypt with 12 rounds
+- Passwords are hashed using bcrypt (settings.password_hash_rounds) in a dedicated worker pool
 - Plain text passwords are never logged or stored
 - Email uniqueness is enforced per company
 """
 
 import logging
 import uuid
-import asyncio
 import re
-from functools import partial
 from datetime import datetime, timezone
 from typing import Optional
 
-import bcrypt
 from bson import ObjectId
 from fastapi import APIRouter, HTTPException, status, Query, Request
 from pydantic import EmailStr
 
-from app.models.company_user_models import CompanyUserCreate, CompanyUserUpdate, CompanyUserResponse
+from app.models.company_user_models import (
+    CompanyUserCreate,
+    CompanyUserUpdate,
+    CompanyUserResponse,
+    COMPANY_USER_RESPONSE_PROJECTION,
+)
 from app.database.mongodb import database
+from app.services.directory_cache import directory_cache
+from app.services.password_hasher import password_hasher
 from app.mongodb_models import CompanyUser, PermissionLevel, UserStatus
 
 # Configure logger
@@ -181,18 +185,9 @@ async def create_company_user(
 
         logger.info(f"[CREATE_COMPANY_USER] Email is unique within company")
 
-        # Step 3: Hash password using bcrypt (12 rounds, async executor)
-        logger.info(f"[CREATE_COMPANY_USER] Hashing password with bcrypt (12 rounds)...")
-        password_bytes = request.password.encode('utf-8')[:72]  # bcrypt 72-byte limit
-
-        # Run bcrypt in thread pool to avoid blocking event loop
-        loop = asyncio.get_event_loop()
-        salt = await loop.run_in_executor(None, bcrypt.gensalt, 12)
-        password_hash = await loop.run_in_executor(
-            None,
-            partial(bcrypt.hashpw, password_bytes, salt)
-        )
-        password_hash_str = password_hash.decode('utf-8')
+        # Step 3: Hash password using bcrypt (dedicated worker pool)
+        logger.info(f"[CREATE_COMPANY_USER] Hashing password with bcrypt ({password_hasher.rounds} rounds)...")
+        password_hash_str = await password_hasher.hash(request.password)
         logger.info(f"[CREATE_COMPANY_USER] Password hashed successfully")
 
         # Step 4: Generate unique user_id
@@ -366,7 +361,7 @@ async def get_company_users(
         logger.info(f"[GET_COMPANY_USERS] === DATABASE QUERY ===")
         logger.info(f"[GET_COMPANY_USERS] Query: {query}")
 
-        users = await database.company_users.find(query).to_list(None)
+        users = await database.company_users.find(query, COMPANY_USER_RESPONSE_PROJECTION).to_list(None)
 
         logger.info(f"[GET_COMPANY_USERS] === QUERY RESULTS ===")
         logger.info(f"[GET_COMPANY_USERS] Found {len(users)} users in database")
@@ -685,15 +680,8 @@ async def update_company_user(
         if update_data.password is not None:
             # Password validation already done by Pydantic model
             # Hash password
-            logger.info(f"[UPDATE_COMPANY_USER] Hashing new password with bcrypt (12 rounds)...")
-            password_bytes = update_data.password.encode('utf-8')[:72]  # bcrypt 72-byte limit
-            loop = asyncio.get_event_loop()
-            salt = await loop.run_in_executor(None, bcrypt.gensalt, 12)
-            password_hash = await loop.run_in_executor(
-                None,
-                partial(bcrypt.hashpw, password_bytes, salt)
-            )
-            update_doc["password_hash"] = password_hash.decode('utf-8')
+            logger.info(f"[UPDATE_COMPANY_USER] Hashing new password with bcrypt ({password_hasher.rounds} rounds)...")
+            update_doc["password_hash"] = await password_hasher.hash(update_data.password)
             logger.info(f"[UPDATE_COMPANY_USER] Password hashed successfully")
 
         if update_data.permission_level is not None:
@@ -731,6 +719,7 @@ async def update_company_user(
             {"user_id": user_id},
             {"$set": update_doc}
         )
+        directory_cache.invalidate_users(existing_user.get("company_name"))
 
         logger.info(f"🔎 Database Update Result:")
         logger.info(f"   - matched_count: {result.matched_count}")
@@ -869,6 +858,7 @@ async def delete_company_user(user_id: str):
         logger.info(f"   - Filter: {{'user_id': '{user_id}'}}")
 
         result = await database.company_users.delete_one({"user_id": user_id})
+        directory_cache.invalidate_users(existing_user.get("company_name"))
 
         logger.info(f"🔎 Database Delete Result:")
         logger.info(f"   - deleted_count: {result.deleted_count}")
@@ -44,6 +44,8 @@ async def get_dashboard_metrics() -> Dict[str, Any]:
     try:
         logger.info("Fetching dashboard metrics...")
 
+        # Reporting queries run on the analytics client profile (own pool, secondaryPreferred)
+
         # 1. Total Revenue - sum all COMPLETED payments
         revenue_pipeline = [
             {"$match": {"payment_status": "COMPLETED"}},
@@ -53,19 +55,19 @@ async def get_dashboard_metrics() -> Dict[str, Any]:
             }}
         ]
 
-        revenue_result = await database.payments.aggregate(revenue_pipeline).to_list(length=1)
+        revenue_result = await database.analytics.payments.aggregate(revenue_pipeline).to_list(length=1)
         total_revenue_cents = revenue_result[0]["total"] if revenue_result else 0
         total_revenue_dollars = total_revenue_cents / 100.0
 
         logger.info(f"Total revenue: ${total_revenue_dollars:.2f} (from {total_revenue_cents} cents)")
 
         # 2. Active Subscriptions - count active subscriptions
-        active_subscriptions = await database.subscriptions.count_documents({"status": "active"})
+        active_subscriptions = await database.analytics.subscriptions.count_documents({"status": "active"})
         logger.info(f"Active subscriptions: {active_subscriptions}")
 
         # 3. Total Transactions - count all translation_transactions + user_transactions
-        translation_txn_count = await database.translation_transactions.count_documents({})
-        user_txn_count = await database.user_transactions.count_documents({})
+        translation_txn_count = await database.analytics.translation_transactions.count_documents({})
+        user_txn_count = await database.analytics.user_transactions.count_documents({})
         total_transactions = translation_txn_count + user_txn_count
         logger.info(f"Total transactions: {total_transactions} (translation: {translation_txn_count}, user: {user_txn_count})")
 
@@ -76,7 +78,7 @@ async def get_dashboard_metrics() -> Dict[str, Any]:
             {"$count": "total"}
         ]
 
-        active_companies_result = await database.subscriptions.aggregate(active_companies_pipeline).to_list(length=1)
+        active_companies_result = await database.analytics.subscriptions.aggregate(active_companies_pipeline).to_list(length=1)
         active_companies = active_companies_result[0]["total"] if active_companies_result else 0
         logger.info(f"Active companies: {active_companies}")
 
@@ -2,13 +2,14 @@
 Enterprise documents router for viewing translated documents.
 """
 
-from fastapi import APIRouter, Query, Depends, HTTPException, status
+from fastapi import APIRouter, Query, Depends, HTTPException, Request, Response, status
 from typing import Optional, Dict, Any
 import logging
 import time
 
 from app.database.mongodb import database
 from app.middleware.auth_middleware import get_current_user, get_admin_user
+from app.utils.conditional import ConditionalGet, collection_version, make_etag
 from app.utils.serialization import serialize_for_json
 
 logger = logging.getLogger(__name__)
@@ -153,6 +154,8 @@ async def get_documents(
 
 @router.get("/invoices")
 async def get_invoices(
+    request: Request,
+    response: Response,
     search: Optional[str] = Query(None, description="Search by invoice number"),
     sort_by: str = Query("date", description="Sort by date, amount, or due_date"),
     sort_order: str = Query("desc", description="asc or desc"),
@@ -164,6 +167,7 @@ async def get_invoices(
     Get all invoices for the user's company with pagination, search, and sorting.
 
     Returns a list of invoices filtered by company_name from the authenticated user.
+    Supports conditional GET (ETag / Last-Modified over the company's invoices).
     """
     start_time = time.time()
     company_name = current_user.get("company_name")
@@ -181,6 +185,17 @@ async def get_invoices(
         raise HTTPException(status_code=403, detail="Corporate user required")
 
     try:
+        stamp = await collection_version(database.invoices, {"company_name": company_name})
+        conditional = ConditionalGet(
+            request,
+            make_etag("enterprise_invoices", company_name, search, sort_by, sort_order, page, page_size, stamp),
+            stamp.last_modified
+        )
+        if conditional.is_not_modified():
+            logger.info(f"[ENTERPRISE_INVOICES_NOT_MODIFIED] company={company_name} user={user_email}")
+            return conditional.not_modified_response()
+        conditional.apply(response)
+
         # Build query filter
         query_filter = {"company_name": company_name}
 
@@ -262,12 +277,15 @@ async def get_invoices(
 
 @router.get("/invoice/unpaid")
 async def get_unpaid_invoice(
+    request: Request,
+    response: Response,
     admin_user: Dict[str, Any] = Depends(get_admin_user)
 ):
     """
     Get the latest unpaid invoice for the admin's company.
 
     Admin only endpoint - returns 403 if user is not admin.
+    Supports conditional GET (ETag / Last-Modified over the company's invoices).
     """
     start_time = time.time()
     company_name = admin_user.get("company_name")
@@ -283,6 +301,13 @@ async def get_unpaid_invoice(
         raise HTTPException(status_code=403, detail="Admin user required")
 
     try:
+        stamp = await collection_version(database.invoices, {"company_name": company_name})
+        conditional = ConditionalGet(request, make_etag("unpaid_invoice", company_name, stamp), stamp.last_modified)
+        if conditional.is_not_modified():
+            logger.info(f"[ENTERPRISE_INVOICE_NOT_MODIFIED] company={company_name} admin={admin_email}")
+            return conditional.not_modified_response()
+        conditional.apply(response)
+
         # Query for unpaid invoice with timing
         query_start = time.time()
         invoice = await database.invoices.find_one(
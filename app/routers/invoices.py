@@ -3,8 +3,9 @@ Invoice management router for retrieving company invoices.
 """
 
 from fastapi import APIRouter, Path, Query, HTTPException, status, Depends
-from fastapi.responses import JSONResponse
-from typing import Optional, Dict, Any
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional, Dict, Any, Literal
+from datetime import datetime
 import logging
 import json
 from bson import ObjectId
@@ -16,10 +17,13 @@ from app.models.invoice import (
     InvoiceUpdate,
     InvoiceCreateResponse,
     InvoiceUpdateResponse,
-    InvoiceListItem
+    InvoiceListItem,
+    INVOICE_SUMMARY_PROJECTION
 )
-from app.utils.serialization import serialize_for_json
+from app.utils.responses import FastJSONResponse
 from app.middleware.auth_middleware import get_admin_user
+from app.services.directory_cache import directory_cache
+from app.services.export_service import export_service
 from app.services.invoice_generation_service import invoice_generation_service, InvoiceGenerationError
 
 logger = logging.getLogger(__name__)
@@ -33,6 +37,7 @@ router = APIRouter(
 @router.get(
     "/company/{company_name}",
     response_model=InvoiceListResponse,
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     responses={
         200: {
@@ -364,19 +369,7 @@ async def get_company_invoices(
         else:
             logger.warning(f"[INVOICES DEBUG] NO DOCUMENTS RETURNED FROM MONGODB!")
 
-        # Convert ObjectIds and datetime objects to JSON-serializable format
-        logger.info(f"[INVOICES DEBUG] ========== STARTING SERIALIZATION ==========")
-        for idx, invoice in enumerate(invoices):
-            logger.info(f"[INVOICES DEBUG] Document {idx + 1}: Serializing invoice {invoice.get('invoice_number', 'N/A')}")
-
-            # Serialize ALL datetime/ObjectId/Decimal128 fields recursively
-            invoices[idx] = serialize_for_json(invoice)
-
-            logger.info(f"[INVOICES DEBUG] Document {idx + 1}: Serialization complete")
-
-        logger.info(f"[INVOICES DEBUG] ========== SERIALIZATION COMPLETE ==========")
-        logger.info(f"[INVOICES DEBUG] Total invoices after serialization: {len(invoices)}")
-
+        # Raw documents: FastJSONResponse converts ObjectId/datetime/Decimal128 while encoding
         # Build response payload
         response_payload = {
             "success": True,
@@ -394,12 +387,12 @@ async def get_company_invoices(
 
         logger.info(f"[INVOICES DEBUG] ========== FINAL RESPONSE ==========")
         logger.info(f"[INVOICES DEBUG] Sending {len(invoices)} invoices to client")
-        logger.info(f"[INVOICES DEBUG] Response invoice IDs: {[inv['_id'] for inv in invoices]}")
+        logger.info(f"[INVOICES DEBUG] Response invoice IDs: {[str(inv['_id']) for inv in invoices]}")
         logger.info(f"[INVOICES DEBUG] Full response JSON:")
         logger.info(f"[INVOICES DEBUG] {json.dumps(response_payload, indent=2, default=str)}")
         logger.info(f"[INVOICES DEBUG] ========== END REQUEST ==========")
 
-        return JSONResponse(content=response_payload)
+        return FastJSONResponse(content=response_payload)
 
     except HTTPException:
         raise
@@ -415,6 +408,66 @@ async def get_company_invoices(
         )
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export invoices (streaming NDJSON/CSV)",
+    responses={
+        200: {
+            "description": "Streamed export file",
+            "content": {"application/x-ndjson": {}, "text/csv": {}}
+        }
+    }
+)
+async def export_invoices(
+    admin_user: Dict[str, Any] = Depends(get_admin_user),
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="ndjson or csv"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by invoice status"),
+    company_name: Optional[str] = Query(None, description="Filter by company name"),
+    date_from: Optional[datetime] = Query(None, description="Inclusive start date (ISO 8601)"),
+    date_to: Optional[datetime] = Query(None, description="Inclusive end date (ISO 8601)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export (default: all exportable fields)")
+):
+    """
+    Stream all matching invoices as NDJSON or CSV (Admin Only).
+
+    Reads a single database cursor in batches and writes rows as they
+    arrive, so exports of any size use constant memory. Use this instead of
+    paging through the list endpoint to pull complete data sets.
+
+    **Query Parameters:**
+    - `format`: `ndjson` (default, one JSON document per line) or `csv`
+    - `status`: Invoice status
+    - `company_name`: Company name
+    - `date_from` / `date_to`: Inclusive date range
+    - `fields`: Comma-separated subset of columns
+
+    **Response:**
+    - **200**: Streamed file (Content-Disposition: attachment)
+    - **400**: Unknown field or format
+    - **401/403**: Not an admin
+
+    **Example:**
+    ```bash
+    curl -H "Authorization: Bearer $TOKEN" -o export.csv \\
+      "http://localhost:8000/api/v1/invoices/export?format=csv&company_name=Acme%20Health%20LLC"
+    ```
+    """
+    logger.info(f"[EXPORT] invoices export requested by {admin_user.get('email')} (format={export_format})")
+    try:
+        return export_service.streaming_response(
+            "invoices",
+            export_format,
+            filters={"status": status_filter, "company_name": company_name},
+            fields=fields,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.post(
     "",
     response_model=InvoiceCreateResponse,
@@ -554,7 +607,7 @@ async def create_invoice(invoice_data: InvoiceCreate, admin: Dict[str, Any] = De
 
         # Check if company exists
         logger.info(f"🔄 Checking if company exists: {invoice_data.company_id}")
-        company = await database.company.find_one({"company_name": invoice_data.company_id})
+        company = await directory_cache.get_company(invoice_data.company_id)
         if not company:
             logger.warning(f"❌ Company not found: {invoice_data.company_id}")
             raise HTTPException(
@@ -1106,18 +1159,22 @@ async def get_invoice(
     "",
     status_code=status.HTTP_200_OK,
     summary="List All Invoices",
-    description="Retrieve all invoices with billing fields (Admin only)"
+    description="Retrieve all invoices as summary records without line items (Admin only)"
 )
 async def list_invoices(
     admin: Dict[str, Any] = Depends(get_admin_user)
 ):
     """
-    List all invoices with billing fields.
+    List all invoices as summary records (InvoiceSummary).
 
     Returns array of invoices, each containing:
     - billing_period
-    - line_items
     - All amount fields
+    - Payment link URL
+
+    Line items and payment applications are only returned by
+    GET /api/v1/invoices/{invoice_id}. To pull every invoice, prefer the
+    streaming GET /api/v1/invoices/export (constant memory).
     """
     from datetime import datetime, timezone
     from bson.decimal128 import Decimal128
@@ -1125,8 +1182,9 @@ async def list_invoices(
     try:
         logger.info(f"🔍 GET /api/v1/invoices - START")
 
-        # Find all invoices
-        invoices_cursor = database.invoices.find({})
+        # Find all invoices (summary fields only)
+        # Admin listing over all invoices: analytics client profile
+        invoices_cursor = database.analytics.invoices.find({}, INVOICE_SUMMARY_PROJECTION)
         invoices = await invoices_cursor.to_list(length=None)
 
         logger.info(f"📊 Found {len(invoices)} invoices")
@@ -1163,13 +1221,6 @@ async def list_invoices(
                 if isinstance(value, Decimal128):
                     invoice[key] = float(value.to_decimal())
 
-            # Convert Decimal128 in line_items array (nested)
-            if "line_items" in invoice and isinstance(invoice["line_items"], list):
-                for line_item in invoice["line_items"]:
-                    for key, value in list(line_item.items()):
-                        if isinstance(value, Decimal128):
-                            line_item[key] = float(value.to_decimal())
-
         logger.info(f"✅ Returning {len(invoices)} invoices")
 
         return JSONResponse(content=invoices)
@@ -1521,7 +1572,7 @@ async def send_invoice_email(
         logger.info(f"[INVOICE_EMAIL] Looking up company with company_name: {company_id}")
 
         # Query by company_name (string), not _id (ObjectId)
-        company = await database.company.find_one({"company_name": company_id})
+        company = await directory_cache.get_company(company_id)
 
         if not company:
             logger.error(f"[INVOICE_EMAIL] Company record not found in database for company_name: {company_id}")
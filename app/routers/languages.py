@@ -4,29 +4,43 @@ Language-related API endpoints.
 
 import logging
 from typing import List
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
 
 from app.models.responses import SupportedLanguagesResponse, SimpleLanguage
 from app.services.language_service import language_service
+from app.utils.conditional import ConditionalGet, make_etag
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["Languages"])
 
 @router.get("/languages", response_model=SupportedLanguagesResponse)
-async def get_supported_languages():
+async def get_supported_languages(request: Request):
     """
     Get supported languages from supported_languages.txt file.
     
     Returns a list of languages with their codes and names parsed from the file.
     Each line in the file is expected to have format: "Language Name    code"
+
+    Supports conditional GET: returns 304 when If-None-Match matches the
+    ETag of the current language list.
     """
     logger.info("Request received for supported languages")
     
     try:
         # Get languages from service
         languages_data = await language_service.get_supported_languages()
+
+        conditional = ConditionalGet(
+            request,
+            make_etag("languages", language_service.version),
+            language_service.last_modified,
+            cache_control="public, no-cache"
+        )
+        if conditional.is_not_modified():
+            logger.info("Supported languages not modified (304)")
+            return conditional.not_modified_response()
         
         # Convert to simple dictionaries for JSON serialization
         languages = [{"code": lang["code"], "name": lang["name"]} for lang in languages_data]
@@ -38,7 +52,7 @@ async def get_supported_languages():
         
         logger.info(f"Response sent with {len(languages)} supported languages")
         
-        return JSONResponse(content=response_data)
+        return conditional.apply(JSONResponse(content=response_data))
         
     except FileNotFoundError as e:
         logger.error(f"Languages file not found: {e}")
@@ -444,7 +444,8 @@ async def get_orders(
         print(f"[ORDERS] 📊 QUERY FILTER: {match_stage}")
         print(f"[ORDERS] 📅 DATE RANGE: {start_date} to {end_date}")
 
-        transactions = await database.translation_transactions.find(match_stage).sort("created_at", -1).to_list(length=None)
+        # Order history report: analytics client profile (own pool, secondaryPreferred)
+        transactions = await database.analytics.translation_transactions.find(match_stage).sort("created_at", -1).to_list(length=None)
 
         logger.info(f"[ORDERS] Found {len(transactions)} transactions for company {company_name}")
         print(f"[ORDERS] 📦 FOUND {len(transactions)} transactions")
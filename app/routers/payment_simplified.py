@@ -24,7 +24,10 @@ except ImportError:
 from app.services.google_drive_service import google_drive_service
 from app.services.pricing_service import pricing_service
 from app.services.payment_creation_service import payment_creation_service
+from app.services.tenant_bulkhead import tenant_bulkheads, tenant_key
 from app.utils.amount_converter import AmountConverter
+from app.utils.structured_logging import legacy_print
+from app.utils.tracing import traced
 from app.config import settings
 
 # Configure Stripe API key
@@ -88,6 +91,7 @@ class PaymentSuccessRequest(BaseModel):
             raise ValueError("payment_intent_id is required")
         return self.payment_intent_id
 
+@traced("payment.process_files")
 async def process_payment_files_background(
     customer_email: str,
     payment_intent_id: str,
@@ -111,22 +115,22 @@ async def process_payment_files_background(
     task_start = time.time()
 
     try:
-        print("\n" + "=" * 80)
-        print("🔄 BACKGROUND TASK STARTED")
-        print("=" * 80)
-        print(f"⏱️  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"📋 Task Details:")
-        print(f"   Customer: {customer_email}")
-        print(f"   Payment ID: {payment_intent_id}")
-        print(f"   Amount: ${amount} {currency}")
+        legacy_print("\n" + "=" * 80)
+        legacy_print("🔄 BACKGROUND TASK STARTED")
+        legacy_print("=" * 80)
+        legacy_print(f"⏱️  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        legacy_print(f"📋 Task Details:")
+        legacy_print(f"   Customer: {customer_email}")
+        legacy_print(f"   Payment ID: {payment_intent_id}")
+        legacy_print(f"   Amount: ${amount} {currency}")
         if webhook_event_id:
-            print(f"   Source: Webhook (event_id: {webhook_event_id})")
+            legacy_print(f"   Source: Webhook (event_id: {webhook_event_id})")
         else:
-            print(f"   Source: Client Notification (fallback)")
-        print("=" * 80)
+            legacy_print(f"   Source: Client Notification (fallback)")
+        legacy_print("=" * 80)
 
         # Step 0: Create or update payment using centralized service (idempotent)
-        print(f"\n💾 Step 0: Creating payment record (idempotent)...")
+        legacy_print(f"\n💾 Step 0: Creating payment record (idempotent)...")
         persist_start = time.time()
 
         try:
@@ -141,63 +145,63 @@ async def process_payment_files_background(
             )
 
             persist_time = (time.time() - persist_start) * 1000
-            print(f"⏱️  Payment persistence completed in {persist_time:.2f}ms")
+            legacy_print(f"⏱️  Payment persistence completed in {persist_time:.2f}ms")
 
             if not result["created"]:
                 # Payment already existed - duplicate webhook
-                print(f"⚠️  Payment {payment_intent_id} already processed (duplicate webhook)")
-                print(f"✅ Returning early - payment ID: {result['payment'].get('_id')}")
+                legacy_print(f"⚠️  Payment {payment_intent_id} already processed (duplicate webhook)")
+                legacy_print(f"✅ Returning early - payment ID: {result['payment'].get('_id')}")
                 logging.info(f"[PAYMENT] Duplicate payment webhook ignored: {payment_intent_id}")
                 return  # Exit early, don't reprocess
 
             payment_id = str(result["payment"]["_id"])
-            print(f"✅ Payment record created with ID: {payment_id}")
+            legacy_print(f"✅ Payment record created with ID: {payment_id}")
             logging.info(f"[PAYMENT] New payment created: {payment_intent_id}")
 
         except Exception as e:
             persist_time = (time.time() - persist_start) * 1000
-            print(f"⏱️  Payment persistence attempted in {persist_time:.2f}ms")
-            print(f"⚠️  Failed to persist payment: {str(e)}")
+            legacy_print(f"⏱️  Payment persistence attempted in {persist_time:.2f}ms")
+            legacy_print(f"⚠️  Failed to persist payment: {str(e)}")
             logging.warning(f"Failed to persist payment {payment_intent_id}: {e}")
 
         # Get files - use direct lookup if file_ids provided, otherwise search
-        print(f"\n🔍 Step 2: Locating files for customer...")
+        legacy_print(f"\n🔍 Step 2: Locating files for customer...")
         find_start = time.time()
 
         if file_ids:
             # OPTIMIZED: Direct file ID lookup (no search)
-            print(f"   Using direct file ID lookup ({len(file_ids)} files)")
+            legacy_print(f"   Using direct file ID lookup ({len(file_ids)} files)")
             files_to_move = []
             for i, file_id in enumerate(file_ids, 1):
                 try:
                     file_info = await google_drive_service.get_file_by_id(file_id)
                     files_to_move.append(file_info)
-                    print(f"   ✓ {i}/{len(file_ids)}: {file_info.get('filename')} (ID: {file_id[:20]}...)")
+                    legacy_print(f"   ✓ {i}/{len(file_ids)}: {file_info.get('filename')} (ID: {file_id[:20]}...)")
                 except Exception as e:
                     logging.warning(f"Failed to fetch file {file_id}: {e}")
-                    print(f"   ✗ {i}/{len(file_ids)}: Failed to fetch {file_id[:20]}... - {str(e)}")
+                    legacy_print(f"   ✗ {i}/{len(file_ids)}: Failed to fetch {file_id[:20]}... - {str(e)}")
         else:
             # FALLBACK: Search by email (legacy, finds all files - may include old uploads)
-            print(f"   ⚠️  No file_ids provided - falling back to Drive search (may find old files)")
+            legacy_print(f"   ⚠️  No file_ids provided - falling back to Drive search (may find old files)")
             files_to_move = await google_drive_service.find_files_by_customer_email(
                 customer_email=customer_email,
                 status="awaiting_payment"
             )
 
         find_time = (time.time() - find_start) * 1000
-        print(f"⏱️  File lookup completed in {find_time:.2f}ms")
+        legacy_print(f"⏱️  File lookup completed in {find_time:.2f}ms")
 
         if not files_to_move:
-            print(f"⚠️  No files found for {customer_email}")
+            legacy_print(f"⚠️  No files found for {customer_email}")
             total_time = (time.time() - task_start) * 1000
-            print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
-            print("=" * 80 + "\n")
+            legacy_print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
+            legacy_print("=" * 80 + "\n")
             return
 
-        print(f"\n✅ Located {len(files_to_move)} files to process")
+        legacy_print(f"\n✅ Located {len(files_to_move)} files to process")
 
         # Create translation transaction record
-        print(f"\n💾 Step 2.5: Creating translation transaction record...")
+        legacy_print(f"\n💾 Step 2.5: Creating translation transaction record...")
         transaction_start = time.time()
 
         try:
@@ -208,9 +212,9 @@ async def process_payment_files_background(
             # Use pre-generated transaction_id or generate new one
             if not transaction_id:
                 transaction_id = generate_translation_transaction_id()
-                print(f"✅ Generated new transaction ID: {transaction_id}")
+                legacy_print(f"✅ Generated new transaction ID: {transaction_id}")
             else:
-                print(f"✅ Using pre-generated transaction ID: {transaction_id}")
+                legacy_print(f"✅ Using pre-generated transaction ID: {transaction_id}")
 
             # Build documents array from files_to_move
             documents = []
@@ -267,53 +271,53 @@ async def process_payment_files_background(
             transaction_time = (time.time() - transaction_start) * 1000
 
             if mongo_id:
-                print(f"⏱️  Transaction creation completed in {transaction_time:.2f}ms")
-                print(f"✅ Translation transaction created:")
-                print(f"   transaction_id: {transaction_id}")
-                print(f"   MongoDB _id: {mongo_id}")
-                print(f"   Documents: {len(documents)}")
-                print(f"   Total units: {total_units} pages")
-                print(f"   Total price: ${total_price}")
-                print(f"   Languages: {source_language} → {target_language}")
+                legacy_print(f"⏱️  Transaction creation completed in {transaction_time:.2f}ms")
+                legacy_print(f"✅ Translation transaction created:")
+                legacy_print(f"   transaction_id: {transaction_id}")
+                legacy_print(f"   MongoDB _id: {mongo_id}")
+                legacy_print(f"   Documents: {len(documents)}")
+                legacy_print(f"   Total units: {total_units} pages")
+                legacy_print(f"   Total price: ${total_price}")
+                legacy_print(f"   Languages: {source_language} → {target_language}")
             else:
-                print(f"⏱️  Transaction creation attempted in {transaction_time:.2f}ms")
-                print(f"⚠️  Failed to create transaction record (mongo_id is None)")
+                legacy_print(f"⏱️  Transaction creation attempted in {transaction_time:.2f}ms")
+                legacy_print(f"⚠️  Failed to create transaction record (mongo_id is None)")
                 transaction_id = None  # Reset if creation failed
 
         except Exception as e:
             transaction_time = (time.time() - transaction_start) * 1000
-            print(f"⏱️  Transaction creation attempted in {transaction_time:.2f}ms")
-            print(f"⚠️  Error creating transaction: {str(e)}")
+            legacy_print(f"⏱️  Transaction creation attempted in {transaction_time:.2f}ms")
+            legacy_print(f"⚠️  Error creating transaction: {str(e)}")
             logging.warning(f"Failed to create translation transaction for {customer_email}: {e}")
             transaction_id = None  # Reset on error
 
         # DO NOT move files - let confirm endpoint handle it
-        print(f"\n📁 Step 3: Files remain in Temp (awaiting user confirmation)")
-        print(f"   Files ready for confirmation: {len(files_to_move)}")
+        legacy_print(f"\n📁 Step 3: Files remain in Temp (awaiting user confirmation)")
+        legacy_print(f"   Files ready for confirmation: {len(files_to_move)}")
         for i, file_info in enumerate(files_to_move, 1):
-            print(f"      {i}. {file_info.get('filename')} (ID: {file_info.get('file_id')[:20]}...)")
-        print(f"   ⚠️  Files will be moved when user clicks 'Confirm' button")
-        print(f"   ⚠️  Confirm endpoint will: update metadata → move to Inbox")
+            legacy_print(f"      {i}. {file_info.get('filename')} (ID: {file_info.get('file_id')[:20]}...)")
+        legacy_print(f"   ⚠️  Files will be moved when user clicks 'Confirm' button")
+        legacy_print(f"   ⚠️  Confirm endpoint will: update metadata → move to Inbox")
 
         total_time = (time.time() - task_start) * 1000
-        print(f"\n✅ PAYMENT WEBHOOK COMPLETE (Files not moved yet)")
-        print(f"⏱️  TOTAL TASK TIME: {total_time:.2f}ms")
-        print(f"   - Payment persistence: {persist_time:.2f}ms")
-        print(f"   - File search: {find_time:.2f}ms")
+        legacy_print(f"\n✅ PAYMENT WEBHOOK COMPLETE (Files not moved yet)")
+        legacy_print(f"⏱️  TOTAL TASK TIME: {total_time:.2f}ms")
+        legacy_print(f"   - Payment persistence: {persist_time:.2f}ms")
+        legacy_print(f"   - File search: {find_time:.2f}ms")
         if transaction_id:
-            print(f"   - Transaction creation: Completed")
-        print(f"   - File movement: SKIPPED (done by confirm endpoint)")
-        print("=" * 80 + "\n")
+            legacy_print(f"   - Transaction creation: Completed")
+        legacy_print(f"   - File movement: SKIPPED (done by confirm endpoint)")
+        legacy_print("=" * 80 + "\n")
 
         logging.info(f"Payment webhook completed for {customer_email}: {len(files_to_move)} files ready for confirmation (not moved yet)")
 
     except Exception as e:
         total_time = (time.time() - task_start) * 1000
-        print(f"\n❌ BACKGROUND TASK ERROR")
-        print(f"⏱️  Failed after: {total_time:.2f}ms")
-        print(f"💥 Error type: {type(e).__name__}")
-        print(f"💥 Error message: {str(e)}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n❌ BACKGROUND TASK ERROR")
+        legacy_print(f"⏱️  Failed after: {total_time:.2f}ms")
+        legacy_print(f"💥 Error type: {type(e).__name__}")
+        legacy_print(f"💥 Error message: {str(e)}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"Background file processing error for {customer_email}: {e}", exc_info=True)
 
 
@@ -348,26 +352,26 @@ async def create_payment_intent(
     Raises:
         HTTPException: 400 if idempotency key missing or Stripe API error occurs
     """
-    print("\n" + "=" * 80)
-    print("💳 CREATE PAYMENT INTENT REQUEST")
-    print("=" * 80)
-    print(f"Amount: ${AmountConverter.cents_to_dollars(request.amount):.2f} ({request.amount} cents)")
-    print(f"Currency: {request.currency.upper()}")
+    legacy_print("\n" + "=" * 80)
+    legacy_print("💳 CREATE PAYMENT INTENT REQUEST")
+    legacy_print("=" * 80)
+    legacy_print(f"Amount: ${AmountConverter.cents_to_dollars(request.amount):.2f} ({request.amount} cents)")
+    legacy_print(f"Currency: {request.currency.upper()}")
     if request.metadata:
-        print(f"Metadata: {request.metadata}")
+        legacy_print(f"Metadata: {request.metadata}")
 
     # CRITICAL: Validate idempotency key is present (prevents duplicate charges)
     if not idempotency_key or not idempotency_key.strip():
         logging.error("[STRIPE] Missing required Idempotency-Key header")
-        print("❌ ERROR: Idempotency-Key header is required to prevent duplicate charges")
-        print("=" * 80 + "\n")
+        legacy_print("❌ ERROR: Idempotency-Key header is required to prevent duplicate charges")
+        legacy_print("=" * 80 + "\n")
         raise HTTPException(
             status_code=400,
             detail="Idempotency-Key header is required to prevent duplicate charges. Please include 'Idempotency-Key' in request headers."
         )
 
-    print(f"✓ Idempotency-Key: {idempotency_key[:20]}... (verified)")
-    print("=" * 80)
+    legacy_print(f"✓ Idempotency-Key: {idempotency_key[:20]}... (verified)")
+    legacy_print("=" * 80)
 
     try:
         # TEST MODE: Return mock payment intent without calling Stripe API
@@ -376,11 +380,11 @@ async def create_payment_intent(
             mock_intent_id = f"pi_test_{uuid.uuid4().hex[:24]}"
             mock_client_secret = f"{mock_intent_id}_secret_{uuid.uuid4().hex[:16]}"
 
-            print(f"\n✅ TEST MODE: Mock payment intent created")
-            print(f"   Payment Intent ID: {mock_intent_id}")
-            print(f"   Client Secret: {mock_client_secret[:20]}...")
-            print(f"   Amount: ${AmountConverter.cents_to_dollars(request.amount):.2f} {request.currency.upper()}")
-            print("=" * 80 + "\n")
+            legacy_print(f"\n✅ TEST MODE: Mock payment intent created")
+            legacy_print(f"   Payment Intent ID: {mock_intent_id}")
+            legacy_print(f"   Client Secret: {mock_client_secret[:20]}...")
+            legacy_print(f"   Amount: ${AmountConverter.cents_to_dollars(request.amount):.2f} {request.currency.upper()}")
+            legacy_print("=" * 80 + "\n")
 
             logging.info(
                 f"TEST MODE: Mock payment intent created: {mock_intent_id} "
@@ -409,11 +413,11 @@ async def create_payment_intent(
 
         intent = stripe.PaymentIntent.create(**intent_params)
 
-        print(f"\n✅ Payment intent created successfully")
-        print(f"   Payment Intent ID: {intent.id}")
-        print(f"   Client Secret: {intent.client_secret[:20]}...")
-        print(f"   Amount: ${AmountConverter.cents_to_dollars(intent.amount):.2f} {intent.currency.upper()}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n✅ Payment intent created successfully")
+        legacy_print(f"   Payment Intent ID: {intent.id}")
+        legacy_print(f"   Client Secret: {intent.client_secret[:20]}...")
+        legacy_print(f"   Amount: ${AmountConverter.cents_to_dollars(intent.amount):.2f} {intent.currency.upper()}")
+        legacy_print("=" * 80 + "\n")
 
         logging.info(
             f"Payment intent created: {intent.id} "
@@ -431,49 +435,49 @@ async def create_payment_intent(
     except CardError as e:
         # Card was declined
         error_msg = str(e.user_message) if hasattr(e, 'user_message') else str(e)
-        print(f"\n❌ Card error: {error_msg}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n❌ Card error: {error_msg}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"Stripe card error: {error_msg}")
         raise HTTPException(status_code=400, detail=error_msg)
 
     except InvalidRequestError as e:
         # Invalid parameters
         error_msg = str(e)
-        print(f"\n❌ Invalid request error: {error_msg}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n❌ Invalid request error: {error_msg}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"Stripe invalid request: {error_msg}")
         raise HTTPException(status_code=400, detail=error_msg)
 
     except AuthenticationError as e:
         # Authentication with Stripe API failed
         error_msg = "Authentication with payment provider failed"
-        print(f"\n❌ Authentication error: {str(e)}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n❌ Authentication error: {str(e)}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"Stripe authentication error: {e}")
         raise HTTPException(status_code=500, detail=error_msg)
 
     except APIConnectionError as e:
         # Network communication failed
         error_msg = "Payment provider connection failed"
-        print(f"\n❌ API connection error: {str(e)}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n❌ API connection error: {str(e)}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"Stripe API connection error: {e}")
         raise HTTPException(status_code=503, detail=error_msg)
 
     except StripeError as e:
         # Generic Stripe error
         error_msg = str(e)
-        print(f"\n❌ Stripe error: {error_msg}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n❌ Stripe error: {error_msg}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"Stripe error: {error_msg}")
         raise HTTPException(status_code=400, detail=error_msg)
 
     except Exception as e:
         # Unexpected error
         error_msg = "An unexpected error occurred while creating payment intent"
-        print(f"\n❌ Unexpected error: {str(e)}")
-        print(f"   Type: {type(e).__name__}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n❌ Unexpected error: {str(e)}")
+        legacy_print(f"   Type: {type(e).__name__}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"Unexpected error in create_payment_intent: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=error_msg)
 
@@ -490,30 +494,30 @@ async def handle_payment_success(
     import time
     start_time = time.time()
 
-    print("\n" + "=" * 80)
-    print("⚡ INSTANT PAYMENT SUCCESS WEBHOOK")
-    print("=" * 80)
-    print(f"⏱️  Request received at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    legacy_print("\n" + "=" * 80)
+    legacy_print("⚡ INSTANT PAYMENT SUCCESS WEBHOOK")
+    legacy_print("=" * 80)
+    legacy_print(f"⏱️  Request received at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
 
     try:
         # Log raw request data
-        print("\n📥 RAW REQUEST DATA:")
-        print(f"   payment_intent_id (snake_case): {request.payment_intent_id}")
-        print(f"   customer_email (root): {request.customer_email}")
-        print(f"   amount: {request.amount}")
-        print(f"   currency: {request.currency}")
-        print(f"   payment_method: {request.payment_method}")
-        print(f"   timestamp: {request.timestamp}")
+        legacy_print("\n📥 RAW REQUEST DATA:")
+        legacy_print(f"   payment_intent_id (snake_case): {request.payment_intent_id}")
+        legacy_print(f"   customer_email (root): {request.customer_email}")
+        legacy_print(f"   amount: {request.amount}")
+        legacy_print(f"   currency: {request.currency}")
+        legacy_print(f"   payment_method: {request.payment_method}")
+        legacy_print(f"   timestamp: {request.timestamp}")
 
         if request.metadata:
-            print(f"\n📋 METADATA:")
-            print(f"   status: {request.metadata.status}")
-            print(f"   cardBrand: {request.metadata.cardBrand}")
-            print(f"   last4: {request.metadata.last4}")
-            print(f"   receiptNumber: {request.metadata.receiptNumber}")
-            print(f"   created: {request.metadata.created}")
-            print(f"   simulated: {request.metadata.simulated}")
-            print(f"   customer_email (metadata): {request.metadata.customer_email}")
+            legacy_print(f"\n📋 METADATA:")
+            legacy_print(f"   status: {request.metadata.status}")
+            legacy_print(f"   cardBrand: {request.metadata.cardBrand}")
+            legacy_print(f"   last4: {request.metadata.last4}")
+            legacy_print(f"   receiptNumber: {request.metadata.receiptNumber}")
+            legacy_print(f"   created: {request.metadata.created}")
+            legacy_print(f"   simulated: {request.metadata.simulated}")
+            legacy_print(f"   customer_email (metadata): {request.metadata.customer_email}")
 
         # Extract required fields (FAST - no I/O)
         parse_start = time.time()
@@ -521,11 +525,11 @@ async def handle_payment_success(
         payment_intent_id = request.get_payment_intent_id()
         parse_time = (time.time() - parse_start) * 1000
 
-        print(f"\n✅ EXTRACTED FIELDS (took {parse_time:.2f}ms):")
-        print(f"   Customer: {customer_email}")
-        print(f"   Payment ID: {payment_intent_id}")
-        print(f"   Amount: ${request.amount} {request.currency}")
-        print(f"   Payment Method: {request.payment_method}")
+        legacy_print(f"\n✅ EXTRACTED FIELDS (took {parse_time:.2f}ms):")
+        legacy_print(f"   Customer: {customer_email}")
+        legacy_print(f"   Payment ID: {payment_intent_id}")
+        legacy_print(f"   Amount: ${request.amount} {request.currency}")
+        legacy_print(f"   Payment Method: {request.payment_method}")
 
         # CHECK: Has webhook already processed this payment?
         # Webhook sets webhook_processing=True to claim payment processing
@@ -544,13 +548,13 @@ async def handle_payment_success(
                 f"processed by webhook (webhook_processing=True), skipping"
             )
 
-            print(f"\n⚠️  WEBHOOK ALREADY PROCESSED THIS PAYMENT")
-            print(f"   Payment ID: {payment_intent_id}")
-            print(f"   Webhook processing flag: True")
-            print(f"   Skipping client-side processing")
-            print(f"⏱️  Webhook check time: {check_webhook_time:.2f}ms")
-            print(f"⏱️  TOTAL TIME: {total_time:.2f}ms")
-            print("=" * 80 + "\n")
+            legacy_print(f"\n⚠️  WEBHOOK ALREADY PROCESSED THIS PAYMENT")
+            legacy_print(f"   Payment ID: {payment_intent_id}")
+            legacy_print(f"   Webhook processing flag: True")
+            legacy_print(f"   Skipping client-side processing")
+            legacy_print(f"⏱️  Webhook check time: {check_webhook_time:.2f}ms")
+            legacy_print(f"⏱️  TOTAL TIME: {total_time:.2f}ms")
+            legacy_print("=" * 80 + "\n")
 
             return JSONResponse(content={
                 "success": True,
@@ -565,21 +569,21 @@ async def handle_payment_success(
             })
 
         check_webhook_time = (time.time() - check_webhook_start) * 1000
-        print(f"\n✅ WEBHOOK CHECK: Payment not yet processed by webhook")
-        print(f"   Proceeding with client-side processing (webhook fallback)")
-        print(f"⏱️  Webhook check time: {check_webhook_time:.2f}ms")
+        legacy_print(f"\n✅ WEBHOOK CHECK: Payment not yet processed by webhook")
+        legacy_print(f"   Proceeding with client-side processing (webhook fallback)")
+        legacy_print(f"⏱️  Webhook check time: {check_webhook_time:.2f}ms")
 
         # Create translation transaction (synchronously, returns transaction_id)
-        print(f"\n💾 Creating translation transaction...")
+        legacy_print(f"\n💾 Creating translation transaction...")
         transaction_create_start = time.time()
         transaction_id = None
 
         try:
             from app.utils.transaction_id_generator import generate_translation_transaction_id
             transaction_id = generate_translation_transaction_id()
-            print(f"✅ Transaction ID generated: {transaction_id}")
+            legacy_print(f"✅ Transaction ID generated: {transaction_id}")
         except Exception as e:
-            print(f"⚠️  Failed to generate transaction ID: {str(e)}")
+            legacy_print(f"⚠️  Failed to generate transaction ID: {str(e)}")
             logging.warning(f"Failed to generate transaction ID: {e}")
 
         transaction_create_time = (time.time() - transaction_create_start) * 1000
@@ -587,6 +591,8 @@ async def handle_payment_success(
         # Schedule background file processing (pass transaction_id and file_ids)
         task_schedule_start = time.time()
         background_tasks.add_task(
+            tenant_bulkheads.payment.run,
+            tenant_key(None, customer_email),
             process_payment_files_background,
             customer_email=customer_email,
             payment_intent_id=payment_intent_id,
@@ -599,10 +605,10 @@ async def handle_payment_success(
         task_schedule_time = (time.time() - task_schedule_start) * 1000
 
         total_time = (time.time() - start_time) * 1000
-        print(f"\n⚡ INSTANT RESPONSE - Background task scheduled (took {task_schedule_time:.2f}ms)")
-        print(f"⏱️  Transaction ID generation: {transaction_create_time:.2f}ms")
-        print(f"⏱️  TOTAL PROCESSING TIME: {total_time:.2f}ms")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n⚡ INSTANT RESPONSE - Background task scheduled (took {task_schedule_time:.2f}ms)")
+        legacy_print(f"⏱️  Transaction ID generation: {transaction_create_time:.2f}ms")
+        legacy_print(f"⏱️  TOTAL PROCESSING TIME: {total_time:.2f}ms")
+        legacy_print("=" * 80 + "\n")
 
         # Return IMMEDIATELY (< 100ms) with transaction_id
         response_data = {
@@ -619,18 +625,18 @@ async def handle_payment_success(
         # Add transaction_id to response if created successfully
         if transaction_id:
             response_data["data"]["transaction_id"] = transaction_id
-            print(f"📤 Returning transaction_id: {transaction_id}")
+            legacy_print(f"📤 Returning transaction_id: {transaction_id}")
 
         return JSONResponse(content=response_data)
 
     except ValueError as e:
-        print(f"❌ VALIDATION ERROR: {e}")
-        print("=" * 80 + "\n")
+        legacy_print(f"❌ VALIDATION ERROR: {e}")
+        legacy_print("=" * 80 + "\n")
         raise HTTPException(status_code=400, detail=str(e))
 
     except Exception as e:
-        print(f"❌ UNEXPECTED ERROR: {e}")
-        print("=" * 80 + "\n")
+        legacy_print(f"❌ UNEXPECTED ERROR: {e}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"Payment success error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -663,17 +669,17 @@ async def process_user_payment_files_background(
     task_start = time.time()
 
     try:
-        print("\n" + "=" * 80)
-        print("🔄 USER PAYMENT BACKGROUND TASK STARTED")
-        print("=" * 80)
-        print(f"⏱️  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"📋 Task Details:")
-        print(f"   Customer: {customer_email}")
-        print(f"   Square Transaction ID: {stripe_checkout_session_id}")
-        print("=" * 80)
+        legacy_print("\n" + "=" * 80)
+        legacy_print("🔄 USER PAYMENT BACKGROUND TASK STARTED")
+        legacy_print("=" * 80)
+        legacy_print(f"⏱️  Started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+        legacy_print(f"📋 Task Details:")
+        legacy_print(f"   Customer: {customer_email}")
+        legacy_print(f"   Square Transaction ID: {stripe_checkout_session_id}")
+        legacy_print("=" * 80)
 
         # Step 0: Create or update payment using centralized service (idempotent)
-        print(f"\n💾 Step 0: Creating payment record (idempotent)...")
+        legacy_print(f"\n💾 Step 0: Creating payment record (idempotent)...")
         persist_start = time.time()
 
         try:
@@ -687,48 +693,48 @@ async def process_user_payment_files_background(
             )
 
             persist_time = (time.time() - persist_start) * 1000
-            print(f"⏱️  Payment persistence completed in {persist_time:.2f}ms")
+            legacy_print(f"⏱️  Payment persistence completed in {persist_time:.2f}ms")
 
             if not result["created"]:
                 # Payment already existed - duplicate webhook
-                print(f"⚠️  Payment {stripe_checkout_session_id} already processed (duplicate)")
+                legacy_print(f"⚠️  Payment {stripe_checkout_session_id} already processed (duplicate)")
                 logging.info(f"[PAYMENT] Duplicate user payment ignored: {stripe_checkout_session_id}")
                 # Continue processing for user payments (user transaction still needs to be completed)
 
             payment_id = str(result["payment"]["_id"])
-            print(f"✅ Payment record created/found with ID: {payment_id}")
+            legacy_print(f"✅ Payment record created/found with ID: {payment_id}")
 
         except Exception as e:
             persist_time = (time.time() - persist_start) * 1000
-            print(f"⏱️  Payment persistence attempted in {persist_time:.2f}ms")
-            print(f"⚠️  Failed to persist payment: {str(e)}")
+            legacy_print(f"⏱️  Payment persistence attempted in {persist_time:.2f}ms")
+            legacy_print(f"⚠️  Failed to persist payment: {str(e)}")
             logging.warning(f"Failed to persist user payment {stripe_checkout_session_id}: {e}")
 
         # Step 1: Get transaction from user_transactions collection
-        print(f"\n🔍 Step 1: Fetching user transaction...")
+        legacy_print(f"\n🔍 Step 1: Fetching user transaction...")
         fetch_start = time.time()
         transaction = await get_user_transaction(stripe_checkout_session_id)
         fetch_time = (time.time() - fetch_start) * 1000
-        print(f"⏱️  Transaction fetch completed in {fetch_time:.2f}ms")
+        legacy_print(f"⏱️  Transaction fetch completed in {fetch_time:.2f}ms")
 
         if not transaction:
-            print(f"⚠️  Transaction not found: {stripe_checkout_session_id}")
+            legacy_print(f"⚠️  Transaction not found: {stripe_checkout_session_id}")
             total_time = (time.time() - task_start) * 1000
-            print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
-            print("=" * 80 + "\n")
+            legacy_print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
+            legacy_print("=" * 80 + "\n")
             logging.warning(
                 f"User payment background task: Transaction not found - {stripe_checkout_session_id}"
             )
             return
 
-        print(f"✅ Transaction found:")
-        print(f"   User: {transaction.get('user_name')} ({transaction.get('user_email')})")
-        print(f"   Document: {transaction.get('document_url')}")
-        print(f"   Status: {transaction.get('status')}")
-        print(f"   Total Cost: ${transaction.get('total_cost')}")
+        legacy_print(f"✅ Transaction found:")
+        legacy_print(f"   User: {transaction.get('user_name')} ({transaction.get('user_email')})")
+        legacy_print(f"   Document: {transaction.get('document_url')}")
+        legacy_print(f"   Status: {transaction.get('status')}")
+        legacy_print(f"   Total Cost: ${transaction.get('total_cost')}")
 
         # Step 2: Extract file_id from document_url
-        print(f"\n📁 Step 2: Extracting file information...")
+        legacy_print(f"\n📁 Step 2: Extracting file information...")
         document_url = transaction.get('document_url', '')
 
         # Extract file_id from Google Drive URL
@@ -741,22 +747,22 @@ async def process_user_payment_files_background(
 
         if not file_id:
             error_msg = f"Could not extract file_id from document_url: {document_url}"
-            print(f"❌ {error_msg}")
+            legacy_print(f"❌ {error_msg}")
             await update_user_transaction_status(
                 stripe_checkout_session_id=stripe_checkout_session_id,
                 new_status="failed",
                 error_message=error_msg
             )
             total_time = (time.time() - task_start) * 1000
-            print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
-            print("=" * 80 + "\n")
+            legacy_print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
+            legacy_print("=" * 80 + "\n")
             logging.error(f"User payment background task: {error_msg}")
             return
 
-        print(f"✅ Extracted file_id: {file_id[:20]}...")
+        legacy_print(f"✅ Extracted file_id: {file_id[:20]}...")
 
         # Step 3: Move file from Temp to Inbox
-        print(f"\n📂 Step 3: Moving file from Temp to Inbox...")
+        legacy_print(f"\n📂 Step 3: Moving file from Temp to Inbox...")
         move_start = time.time()
 
         try:
@@ -765,9 +771,9 @@ async def process_user_payment_files_background(
                 file_ids=[file_id]
             )
             move_time = (time.time() - move_start) * 1000
-            print(f"⏱️  File move completed in {move_time:.2f}ms")
-            print(f"✅ Moved: {result['moved_successfully']}/{result['total_files']} files")
-            print(f"📂 Inbox folder ID: {result.get('inbox_folder_id', 'N/A')}")
+            legacy_print(f"⏱️  File move completed in {move_time:.2f}ms")
+            legacy_print(f"✅ Moved: {result['moved_successfully']}/{result['total_files']} files")
+            legacy_print(f"📂 Inbox folder ID: {result.get('inbox_folder_id', 'N/A')}")
 
             if result['moved_successfully'] == 0:
                 error_msg = "File move failed - no files moved successfully"
@@ -775,34 +781,34 @@ async def process_user_payment_files_background(
                     error_details = result['failed_files'][0].get('error', 'Unknown error')
                     error_msg = f"File move failed: {error_details}"
 
-                print(f"❌ {error_msg}")
+                legacy_print(f"❌ {error_msg}")
                 await update_user_transaction_status(
                     stripe_checkout_session_id=stripe_checkout_session_id,
                     new_status="failed",
                     error_message=error_msg
                 )
                 total_time = (time.time() - task_start) * 1000
-                print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
-                print("=" * 80 + "\n")
+                legacy_print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
+                legacy_print("=" * 80 + "\n")
                 logging.error(f"User payment background task: {error_msg}")
                 return
 
         except Exception as move_error:
             error_msg = f"Google Drive move error: {str(move_error)}"
-            print(f"❌ {error_msg}")
+            legacy_print(f"❌ {error_msg}")
             await update_user_transaction_status(
                 stripe_checkout_session_id=stripe_checkout_session_id,
                 new_status="failed",
                 error_message=error_msg
             )
             total_time = (time.time() - task_start) * 1000
-            print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
-            print("=" * 80 + "\n")
+            legacy_print(f"⏱️  BACKGROUND TASK TOTAL TIME: {total_time:.2f}ms")
+            legacy_print("=" * 80 + "\n")
             logging.error(f"User payment background task: {error_msg}", exc_info=True)
             return
 
         # Step 4: Update transaction status to "completed"
-        print(f"\n🔄 Step 4: Updating transaction status to 'completed'...")
+        legacy_print(f"\n🔄 Step 4: Updating transaction status to 'completed'...")
         update_start = time.time()
 
         success = await update_user_transaction_status(
@@ -811,15 +817,15 @@ async def process_user_payment_files_background(
         )
 
         update_time = (time.time() - update_start) * 1000
-        print(f"⏱️  Status update completed in {update_time:.2f}ms")
+        legacy_print(f"⏱️  Status update completed in {update_time:.2f}ms")
 
         if success:
-            print(f"✅ Transaction status updated to 'completed'")
+            legacy_print(f"✅ Transaction status updated to 'completed'")
         else:
-            print(f"⚠️  Failed to update transaction status (transaction may not exist)")
+            legacy_print(f"⚠️  Failed to update transaction status (transaction may not exist)")
 
         # Step 5: Update file status in Google Drive metadata
-        print(f"\n🔄 Step 5: Updating file status in Google Drive metadata...")
+        legacy_print(f"\n🔄 Step 5: Updating file status in Google Drive metadata...")
         status_start = time.time()
 
         try:
@@ -829,21 +835,21 @@ async def process_user_payment_files_background(
                 payment_intent_id=stripe_checkout_session_id
             )
             status_time = (time.time() - status_start) * 1000
-            print(f"⏱️  File status update completed in {status_time:.2f}ms")
-            print(f"✅ File status updated to 'payment_confirmed'")
+            legacy_print(f"⏱️  File status update completed in {status_time:.2f}ms")
+            legacy_print(f"✅ File status updated to 'payment_confirmed'")
         except Exception as status_error:
-            print(f"⚠️  Failed to update file status: {str(status_error)[:60]}")
+            legacy_print(f"⚠️  Failed to update file status: {str(status_error)[:60]}")
             logging.warning(
                 f"User payment: Failed to update file status for {file_id}: {status_error}"
             )
 
         total_time = (time.time() - task_start) * 1000
-        print(f"\n✅ USER PAYMENT BACKGROUND TASK COMPLETE")
-        print(f"⏱️  TOTAL TASK TIME: {total_time:.2f}ms")
-        print(f"   - Transaction fetch: {fetch_time:.2f}ms")
-        print(f"   - File move: {move_time:.2f}ms")
-        print(f"   - Status update: {update_time:.2f}ms")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n✅ USER PAYMENT BACKGROUND TASK COMPLETE")
+        legacy_print(f"⏱️  TOTAL TASK TIME: {total_time:.2f}ms")
+        legacy_print(f"   - Transaction fetch: {fetch_time:.2f}ms")
+        legacy_print(f"   - File move: {move_time:.2f}ms")
+        legacy_print(f"   - Status update: {update_time:.2f}ms")
+        legacy_print("=" * 80 + "\n")
 
         logging.info(
             f"User payment background task completed for {customer_email}: "
@@ -852,11 +858,11 @@ async def process_user_payment_files_background(
 
     except Exception as e:
         total_time = (time.time() - task_start) * 1000
-        print(f"\n❌ USER PAYMENT BACKGROUND TASK ERROR")
-        print(f"⏱️  Failed after: {total_time:.2f}ms")
-        print(f"💥 Error type: {type(e).__name__}")
-        print(f"💥 Error message: {str(e)}")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n❌ USER PAYMENT BACKGROUND TASK ERROR")
+        legacy_print(f"⏱️  Failed after: {total_time:.2f}ms")
+        legacy_print(f"💥 Error type: {type(e).__name__}")
+        legacy_print(f"💥 Error message: {str(e)}")
+        legacy_print("=" * 80 + "\n")
 
         # Attempt to mark transaction as failed
         try:
@@ -903,20 +909,20 @@ async def handle_user_payment_success(
     import time
     start_time = time.time()
 
-    print("\n" + "=" * 80)
-    print("⚡ INSTANT USER PAYMENT SUCCESS WEBHOOK")
-    print("=" * 80)
-    print(f"⏱️  Request received at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    legacy_print("\n" + "=" * 80)
+    legacy_print("⚡ INSTANT USER PAYMENT SUCCESS WEBHOOK")
+    legacy_print("=" * 80)
+    legacy_print(f"⏱️  Request received at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
 
     try:
         # Log raw request data
-        print("\n📥 RAW REQUEST DATA:")
-        print(f"   customer_email (root): {request.customer_email}")
-        print(f"   payment_intent_id: {request.payment_intent_id}")
-        print(f"   amount: {request.amount}")
-        print(f"   currency: {request.currency}")
-        print(f"   payment_method: {request.payment_method}")
-        print(f"   timestamp: {request.timestamp}")
+        legacy_print("\n📥 RAW REQUEST DATA:")
+        legacy_print(f"   customer_email (root): {request.customer_email}")
+        legacy_print(f"   payment_intent_id: {request.payment_intent_id}")
+        legacy_print(f"   amount: {request.amount}")
+        legacy_print(f"   currency: {request.currency}")
+        legacy_print(f"   payment_method: {request.payment_method}")
+        legacy_print(f"   timestamp: {request.timestamp}")
 
         # Extract stripe_checkout_session_id from request or metadata
         stripe_checkout_session_id = None
@@ -924,29 +930,29 @@ async def handle_user_payment_success(
         # Try to get from root level first (check if request has stripe_checkout_session_id attribute)
         if hasattr(request, 'stripe_checkout_session_id') and getattr(request, 'stripe_checkout_session_id'):
             stripe_checkout_session_id = getattr(request, 'stripe_checkout_session_id')
-            print(f"   stripe_checkout_session_id (root): {stripe_checkout_session_id}")
+            legacy_print(f"   stripe_checkout_session_id (root): {stripe_checkout_session_id}")
 
         # Try metadata next
         if not stripe_checkout_session_id and request.metadata:
-            print(f"\n📋 METADATA:")
-            print(f"   status: {request.metadata.status}")
-            print(f"   cardBrand: {request.metadata.cardBrand}")
-            print(f"   last4: {request.metadata.last4}")
-            print(f"   receiptNumber: {request.metadata.receiptNumber}")
-            print(f"   created: {request.metadata.created}")
-            print(f"   simulated: {request.metadata.simulated}")
-            print(f"   customer_email (metadata): {request.metadata.customer_email}")
+            legacy_print(f"\n📋 METADATA:")
+            legacy_print(f"   status: {request.metadata.status}")
+            legacy_print(f"   cardBrand: {request.metadata.cardBrand}")
+            legacy_print(f"   last4: {request.metadata.last4}")
+            legacy_print(f"   receiptNumber: {request.metadata.receiptNumber}")
+            legacy_print(f"   created: {request.metadata.created}")
+            legacy_print(f"   simulated: {request.metadata.simulated}")
+            legacy_print(f"   customer_email (metadata): {request.metadata.customer_email}")
 
             # Check for stripe_checkout_session_id in metadata
             if hasattr(request.metadata, 'stripe_checkout_session_id'):
                 stripe_checkout_session_id = getattr(request.metadata, 'stripe_checkout_session_id')
-                print(f"   stripe_checkout_session_id (metadata): {stripe_checkout_session_id}")
+                legacy_print(f"   stripe_checkout_session_id (metadata): {stripe_checkout_session_id}")
 
         # Validate stripe_checkout_session_id
         if not stripe_checkout_session_id:
             error_msg = "stripe_checkout_session_id not found in request or metadata"
-            print(f"❌ VALIDATION ERROR: {error_msg}")
-            print("=" * 80 + "\n")
+            legacy_print(f"❌ VALIDATION ERROR: {error_msg}")
+            legacy_print("=" * 80 + "\n")
             raise HTTPException(status_code=400, detail=error_msg)
 
         # Extract customer email (FAST - no I/O)
@@ -954,11 +960,11 @@ async def handle_user_payment_success(
         customer_email = request.get_customer_email()
         parse_time = (time.time() - parse_start) * 1000
 
-        print(f"\n✅ EXTRACTED FIELDS (took {parse_time:.2f}ms):")
-        print(f"   Customer: {customer_email}")
-        print(f"   Square Transaction ID: {stripe_checkout_session_id}")
-        print(f"   Amount: ${request.amount} {request.currency}")
-        print(f"   Payment Method: {request.payment_method}")
+        legacy_print(f"\n✅ EXTRACTED FIELDS (took {parse_time:.2f}ms):")
+        legacy_print(f"   Customer: {customer_email}")
+        legacy_print(f"   Square Transaction ID: {stripe_checkout_session_id}")
+        legacy_print(f"   Amount: ${request.amount} {request.currency}")
+        legacy_print(f"   Payment Method: {request.payment_method}")
 
         # CHECK: Has webhook already processed this payment?
         # For user payments, check user_transactions collection
@@ -977,13 +983,13 @@ async def handle_user_payment_success(
                 f"processed by webhook (webhook_processing=True), skipping"
             )
 
-            print(f"\n⚠️  WEBHOOK ALREADY PROCESSED THIS USER PAYMENT")
-            print(f"   Transaction ID: {stripe_checkout_session_id}")
-            print(f"   Webhook processing flag: True")
-            print(f"   Skipping client-side processing")
-            print(f"⏱️  Webhook check time: {check_webhook_time:.2f}ms")
-            print(f"⏱️  TOTAL TIME: {total_time:.2f}ms")
-            print("=" * 80 + "\n")
+            legacy_print(f"\n⚠️  WEBHOOK ALREADY PROCESSED THIS USER PAYMENT")
+            legacy_print(f"   Transaction ID: {stripe_checkout_session_id}")
+            legacy_print(f"   Webhook processing flag: True")
+            legacy_print(f"   Skipping client-side processing")
+            legacy_print(f"⏱️  Webhook check time: {check_webhook_time:.2f}ms")
+            legacy_print(f"⏱️  TOTAL TIME: {total_time:.2f}ms")
+            legacy_print("=" * 80 + "\n")
 
             return JSONResponse(content={
                 "success": True,
@@ -998,9 +1004,9 @@ async def handle_user_payment_success(
             })
 
         check_webhook_time = (time.time() - check_webhook_start) * 1000
-        print(f"\n✅ WEBHOOK CHECK: User payment not yet processed by webhook")
-        print(f"   Proceeding with client-side processing (webhook fallback)")
-        print(f"⏱️  Webhook check time: {check_webhook_time:.2f}ms")
+        legacy_print(f"\n✅ WEBHOOK CHECK: User payment not yet processed by webhook")
+        legacy_print(f"   Proceeding with client-side processing (webhook fallback)")
+        legacy_print(f"⏱️  Webhook check time: {check_webhook_time:.2f}ms")
 
         # Link payment intent to transaction for correlation
         if request.payment_intent_id:
@@ -1010,13 +1016,15 @@ async def handle_user_payment_success(
                 stripe_payment_intent_id=request.payment_intent_id
             )
             if correlation_success:
-                print(f"✅ Payment intent {request.payment_intent_id} linked to transaction {stripe_checkout_session_id}")
+                legacy_print(f"✅ Payment intent {request.payment_intent_id} linked to transaction {stripe_checkout_session_id}")
             else:
                 logging.warning(f"⚠️  Failed to link payment intent {request.payment_intent_id} to transaction {stripe_checkout_session_id}")
 
         # Schedule background file processing for user transaction
         task_schedule_start = time.time()
         background_tasks.add_task(
+            tenant_bulkheads.payment.run,
+            tenant_key(None, customer_email),
             process_user_payment_files_background,
             customer_email=customer_email,
             stripe_checkout_session_id=stripe_checkout_session_id,
@@ -1027,9 +1035,9 @@ async def handle_user_payment_success(
         task_schedule_time = (time.time() - task_schedule_start) * 1000
 
         total_time = (time.time() - start_time) * 1000
-        print(f"\n⚡ INSTANT RESPONSE - User payment background task scheduled (took {task_schedule_time:.2f}ms)")
-        print(f"⏱️  TOTAL PROCESSING TIME: {total_time:.2f}ms")
-        print("=" * 80 + "\n")
+        legacy_print(f"\n⚡ INSTANT RESPONSE - User payment background task scheduled (took {task_schedule_time:.2f}ms)")
+        legacy_print(f"⏱️  TOTAL PROCESSING TIME: {total_time:.2f}ms")
+        legacy_print("=" * 80 + "\n")
 
         # Return IMMEDIATELY (< 100ms)
         return JSONResponse(
@@ -1046,8 +1054,8 @@ async def handle_user_payment_success(
         )
 
     except ValueError as e:
-        print(f"❌ VALIDATION ERROR: {e}")
-        print("=" * 80 + "\n")
+        legacy_print(f"❌ VALIDATION ERROR: {e}")
+        legacy_print("=" * 80 + "\n")
         raise HTTPException(status_code=400, detail=str(e))
 
     except HTTPException:
@@ -1055,8 +1063,8 @@ async def handle_user_payment_success(
         raise
 
     except Exception as e:
-        print(f"❌ UNEXPECTED ERROR: {e}")
-        print("=" * 80 + "\n")
+        legacy_print(f"❌ UNEXPECTED ERROR: {e}")
+        legacy_print("=" * 80 + "\n")
         logging.error(f"User payment success error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1068,7 +1076,7 @@ async def handle_payment_failure(customer_email: EmailStr, payment_intent_id: st
     1. Find all files for customer with status "awaiting_payment"
     2. Delete files from Temp folder
     """
-    print(f"❌ PAYMENT FAILED for {customer_email}: {payment_intent_id}")
+    legacy_print(f"❌ PAYMENT FAILED for {customer_email}: {payment_intent_id}")
     
     try:
         # Find files for customer
@@ -1097,7 +1105,7 @@ async def handle_payment_failure(customer_email: EmailStr, payment_intent_id: st
             file_ids=file_ids
         )
         
-        print(f"Payment failure cleanup: {result['deleted_successfully']}/{result['total_files']} files deleted")
+        legacy_print(f"Payment failure cleanup: {result['deleted_successfully']}/{result['total_files']} files deleted")
         
         return JSONResponse(
             content={
@@ -11,8 +11,8 @@ Uses the existing payment_repository for database operations.
 """
 
 from fastapi import APIRouter, HTTPException, Query, Path, status, Depends
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Literal, Optional, Dict, Any
 from datetime import datetime, timezone
 from bson import ObjectId, Decimal128
 from pydantic import EmailStr
@@ -36,9 +36,11 @@ from app.models.payment import (
 )
 from pydantic import BaseModel
 from app.services.payment_repository import payment_repository
+from app.services.export_service import export_service
 from app.services.payment_application_service import payment_application_service, PaymentApplicationError
 from app.middleware.auth_middleware import get_admin_user
 from app.database.mongodb import database
+from app.utils.responses import FastJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -142,6 +144,7 @@ def payment_doc_to_response(payment_doc: dict) -> dict:
 @router.get(
     "/",
     response_model=AllPaymentsResponse,
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     responses={
         200: {
@@ -459,31 +462,13 @@ async def get_all_payments(
             f"[ADMIN] Retrieved {len(payments)} payments (total: {total_count} matching filters)"
         )
 
-        # Helper function to recursively convert ObjectIds, datetimes, and Decimal128
-        def convert_doc(obj):
-            """Recursively convert ObjectIds, datetimes, and Decimal128 to JSON-serializable types."""
-            if isinstance(obj, ObjectId):
-                return str(obj)
-            elif isinstance(obj, datetime):
-                return obj.isoformat()
-            elif isinstance(obj, Decimal128):  # Decimal128 type - more reliable check
-                return float(obj.to_decimal())
-            elif isinstance(obj, dict):
-                return {key: convert_doc(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_doc(item) for item in obj]
-            else:
-                return obj
-
-        # Convert all payments using recursive converter
-        converted_payments = [convert_doc(payment) for payment in payments]
-
-        # Build response
+        # Build response (raw documents: FastJSONResponse converts
+        # ObjectId/datetime/Decimal128 while encoding)
         response_content = {
             "success": True,
             "data": {
-                "payments": converted_payments,
-                "count": len(converted_payments),
+                "payments": payments,
+                "count": len(payments),
                 "total": total_count,
                 "limit": limit,
                 "skip": skip,
@@ -495,10 +480,10 @@ async def get_all_payments(
         }
 
         logger.info(
-            f"[ADMIN] Successfully prepared response with {len(converted_payments)} payments"
+            f"[ADMIN] Successfully prepared response with {len(payments)} payments"
         )
 
-        return JSONResponse(content=response_content)
+        return FastJSONResponse(content=response_content)
 
     except HTTPException:
         raise
@@ -510,6 +495,66 @@ async def get_all_payments(
         )
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export payments (streaming NDJSON/CSV)",
+    responses={
+        200: {
+            "description": "Streamed export file",
+            "content": {"application/x-ndjson": {}, "text/csv": {}}
+        }
+    }
+)
+async def export_payments(
+    admin_user: Dict[str, Any] = Depends(get_admin_user),
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="ndjson or csv"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by payment status"),
+    company_name: Optional[str] = Query(None, description="Filter by company name"),
+    date_from: Optional[datetime] = Query(None, description="Inclusive start date (ISO 8601)"),
+    date_to: Optional[datetime] = Query(None, description="Inclusive end date (ISO 8601)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export (default: all exportable fields)")
+):
+    """
+    Stream all matching payments as NDJSON or CSV (Admin Only).
+
+    Reads a single database cursor in batches and writes rows as they
+    arrive, so exports of any size use constant memory. Use this instead of
+    paging through the list endpoint to pull complete data sets.
+
+    **Query Parameters:**
+    - `format`: `ndjson` (default, one JSON document per line) or `csv`
+    - `status`: Payment status (COMPLETED, PENDING, FAILED, REFUNDED)
+    - `company_name`: Company name
+    - `date_from` / `date_to`: Inclusive date range
+    - `fields`: Comma-separated subset of columns
+
+    **Response:**
+    - **200**: Streamed file (Content-Disposition: attachment)
+    - **400**: Unknown field or format
+    - **401/403**: Not an admin
+
+    **Example:**
+    ```bash
+    curl -H "Authorization: Bearer $TOKEN" -o export.csv \\
+      "http://localhost:8000/api/v1/payments/export?format=csv&status=COMPLETED"
+    ```
+    """
+    logger.info(f"[EXPORT] payments export requested by {admin_user.get('email')} (format={export_format})")
+    try:
+        return export_service.streaming_response(
+            "payments",
+            export_format,
+            filters={"status": status_filter, "company_name": company_name},
+            fields=fields,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.post("/", response_model=PaymentResponse, status_code=status.HTTP_201_CREATED)
 async def create_payment(payment_data: PaymentCreate):
     """
@@ -977,7 +1022,7 @@ async def get_payment_by_id(
 
         logger.info(f"🔄 Calling payment_repository.get_payment_by_id()...")
         logger.info(f"Fetching payment by ID: {payment_id}")
-        payment_doc = await payment_repository.get_payment_by_id(payment_id)
+        payment_doc = await payment_repository.get_payment_by_id(payment_id, include_archived=True)
         logger.info(f"🔎 Database Result: found={payment_doc is not None}")
 
         if not payment_doc:
@@ -1043,7 +1088,7 @@ async def get_payment_by_square_id(
 
         logger.info(f"🔄 Calling payment_repository.get_payment_by_square_id()...")
         logger.info(f"Fetching payment by Square ID: {stripe_payment_intent_id}")
-        payment_doc = await payment_repository.get_payment_by_square_id(stripe_payment_intent_id)
+        payment_doc = await payment_repository.get_payment_by_square_id(stripe_payment_intent_id, include_archived=True)
         logger.info(f"🔎 Database Result: found={payment_doc is not None}")
 
         if not payment_doc:
@@ -1084,6 +1129,7 @@ async def get_payment_by_square_id(
 @router.get(
     "/company/{company_name}",
     response_model=PaymentListResponse,
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     responses={
         200: {
@@ -1362,56 +1408,24 @@ async def get_company_payments(
         print(f"[PAYMENTS DEBUG] Retrieved {len(payments)} payments from repository")
         logger.info(f"Retrieved {len(payments)} payments from repository")
 
-        # Helper function to recursively convert ObjectIds, datetimes, and Decimal128
-        def convert_doc(obj):
-            """Recursively convert ObjectIds, datetimes, and Decimal128 to JSON-serializable types."""
-            if isinstance(obj, ObjectId):
-                return str(obj)
-            elif isinstance(obj, datetime):
-                return obj.isoformat()
-            elif isinstance(obj, Decimal128):  # Decimal128 type - more reliable check
-                return float(obj.to_decimal())
-            elif isinstance(obj, dict):
-                return {key: convert_doc(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_doc(item) for item in obj]
-            else:
-                return obj
-
-        # Convert all payments using recursive converter
-        for idx, payment in enumerate(payments):
-            print(f"[PAYMENTS DEBUG] Processing payment {idx + 1}")
-            # Apply recursive conversion
-            payments[idx] = convert_doc(payment)
-            print(f"[PAYMENTS DEBUG] Payment {idx + 1} converted successfully")
-
         logger.info(f"Found {len(payments)} payments for company {company_name}, creating response")
 
-        # Try to serialize the response before returning it
-        import json
-        try:
-            response_content = {
-                "success": True,
-                "data": {
-                    "payments": payments,
-                    "count": len(payments),
-                    "limit": limit,
-                    "skip": skip,
-                    "filters": {
-                        "company_name": company_name,
-                        "status": status_filter
-                    }
+        # Raw documents: FastJSONResponse converts ObjectId/datetime/Decimal128 while encoding
+        response_content = {
+            "success": True,
+            "data": {
+                "payments": payments,
+                "count": len(payments),
+                "limit": limit,
+                "skip": skip,
+                "filters": {
+                    "company_name": company_name,
+                    "status": status_filter
                 }
             }
-            # Test serialization
-            test_json = json.dumps(response_content, default=str)
-            logger.info(f"Response serialization successful, size: {len(test_json)} bytes")
-        except Exception as json_err:
-            logger.error(f"JSON serialization test failed: {json_err}")
-            logger.error(f"Problematic data: {payments}")
-            raise
-
-        return JSONResponse(content=response_content)
+        }
+
+        return FastJSONResponse(content=response_content)
 
     except HTTPException:
         raise
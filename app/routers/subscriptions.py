@@ -15,6 +15,7 @@ from decimal import Decimal
 
 from app.database.mongodb import database
 from app.services.subscription_service import subscription_service, SubscriptionError
+from app.services.usage_period_repository import usage_period_repository
 from app.models.subscription import (
     SubscriptionCreate,
     SubscriptionUpdate,
@@ -24,6 +25,7 @@ from app.models.subscription import (
     SubscriptionSummary
 )
 from app.middleware.auth_middleware import get_current_user, get_admin_user
+from app.utils.conditional import ConditionalGet, collection_version, make_etag, newest
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/subscriptions", tags=["Subscriptions"])
@@ -142,9 +144,11 @@ async def get_subscription(
         logger.error(f"❌ Unexpected error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
+    usage_periods = await usage_period_repository.list_periods(str(subscription["_id"]))
+
     logger.info(f"✅ Subscription found: company={subscription.get('company_name')}, "
                f"status={subscription.get('status')}, "
-               f"usage_periods={len(subscription.get('usage_periods', []))}")
+               f"usage_periods={len(usage_periods)}")
 
     # Helper function to serialize usage periods
     def serialize_usage_period(period):
@@ -188,7 +192,7 @@ async def get_subscription(
             "status": subscription["status"],
             "billing_frequency": subscription.get("billing_frequency", "quarterly"),
             "payment_terms_days": subscription.get("payment_terms_days", 30),
-            "usage_periods": [serialize_usage_period(period) for period in subscription.get("usage_periods", [])],
+            "usage_periods": [serialize_usage_period(period) for period in usage_periods],
             "created_at": subscription["created_at"].isoformat(),
             "updated_at": subscription["updated_at"].isoformat()
         }
@@ -199,6 +203,7 @@ async def get_subscription(
 
 @router.get("/company/{company_name}")
 async def get_company_subscriptions(
+    request: Request,
     company_name: str,
     status: Optional[str] = None,
     active_only: bool = False
@@ -209,12 +214,28 @@ async def get_company_subscriptions(
     Query parameters:
     - status: Filter by status (active, inactive, expired)
     - active_only: Only return active subscriptions (true/false)
+
+    Supports conditional GET: the ETag covers the company's subscriptions and
+    usage periods; a matching If-None-Match returns 304 before they are loaded.
     """
     timestamp = datetime.now(timezone.utc).isoformat()
     logger.info(f"🔍 [{timestamp}] GET /api/subscriptions/company/{company_name} - START")
     logger.info(f"📥 Request Params: company_name={company_name}, status={status}, active_only={active_only}")
     logger.info(f"🔎 Query Filters: company_name={company_name}, status_filter={status}, active_only={active_only}")
 
+    subscriptions_stamp = await collection_version(database.subscriptions, {"company_name": company_name})
+    periods_stamp = await collection_version(
+        database.usage_periods, {"company_name": company_name}, fields=("last_updated", "created_at")
+    )
+    conditional = ConditionalGet(
+        request,
+        make_etag("company_subscriptions", company_name, status, active_only, subscriptions_stamp, periods_stamp),
+        newest(subscriptions_stamp, periods_stamp)
+    )
+    if conditional.is_not_modified():
+        logger.info(f"📤 Response: 304 Not Modified, company_name={company_name}")
+        return conditional.not_modified_response()
+
     subscriptions = await subscription_service.get_company_subscriptions(
         company_name, status=status, active_only=active_only
     )
@@ -224,6 +245,11 @@ async def get_company_subscriptions(
         logger.info(f"📊 Sample Subscription: id={sample_sub.get('_id')}, "
                    f"company={sample_sub.get('company_name')}, status={sample_sub.get('status')}")
 
+    # One query for every subscription's periods
+    periods_by_subscription = await usage_period_repository.list_periods_for_subscriptions(
+        [str(sub["_id"]) for sub in subscriptions]
+    )
+
     # Helper function to serialize usage periods
     def serialize_usage_period(period):
         """Convert datetime objects in usage period to ISO format and calculate derived fields."""
@@ -267,7 +293,9 @@ async def get_company_subscriptions(
             "payment_terms_days": sub.get("payment_terms_days", 30),
             "start_date": sub["start_date"].isoformat(),
             "end_date": sub["end_date"].isoformat() if sub.get("end_date") else None,
-            "usage_periods": [serialize_usage_period(period) for period in sub.get("usage_periods", [])],
+            "usage_periods": [
+                serialize_usage_period(period) for period in periods_by_subscription.get(str(sub["_id"]), [])
+            ],
             "created_at": sub["created_at"].isoformat(),
             "updated_at": sub["updated_at"].isoformat()
         }
@@ -284,7 +312,7 @@ async def get_company_subscriptions(
 
     logger.info(f"📤 Response: nested structure with data wrapper, count={len(subscriptions)}, "
                f"company_name={company_name}")
-    return JSONResponse(content={"data": response_data})
+    return conditional.apply(JSONResponse(content={"data": response_data}))
 
 
 @router.options("/{subscription_id}")
@@ -508,14 +536,14 @@ async def add_usage_period(
             raise HTTPException(status_code=404, detail="Subscription not found")
 
         logger.info(f"✅ Usage period added: subscription_id={subscription['_id']}, "
-                   f"periods_count={len(subscription.get('usage_periods', []))}")
+                   f"periods_count={subscription.get('usage_periods_count', 0)}")
 
         response_data = {
             "success": True,
             "message": "Usage period added successfully",
             "data": {
                 "subscription_id": str(subscription["_id"]),
-                "usage_periods_count": len(subscription.get("usage_periods", []))
+                "usage_periods_count": subscription.get("usage_periods_count", 0)
             }
         }
         logger.info(f"📤 Response: {response_data}")
@@ -14,6 +14,7 @@ import bcrypt
 import uuid
 
 from app.database import database
+from app.services.directory_cache import directory_cache
 from app.config import settings
 
 router = APIRouter(prefix="/api/test", tags=["testing"])
@@ -228,6 +229,9 @@ async def seed_test_data():
         traceback.print_exc()
         raise
 
+    # Seeded companies and users replace existing documents
+    directory_cache.clear()
+
     return {
         "message": "Test data seeded successfully",
         "test_user": {
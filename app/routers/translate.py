@@ -10,6 +10,7 @@ import uuid
 import re
 
 from app.services.pricing_service import pricing_service
+from app.utils.structured_logging import legacy_print
 
 router = APIRouter(prefix="/api", tags=["Translation"])
 
@@ -33,10 +34,10 @@ async def store_files_on_google_drive(request: TranslateRequest):
     Store files on Google Drive temp subdirectory.
     NO translation processing - only file storage.
     """
-    print(f"Hello World - Store files endpoint called for {len(request.files)} files")
-    print(f"Hello World - Storing files for: {request.sourceLanguage} -> {request.targetLanguage}")
-    print(f"Hello World - Customer email: {request.email}")
-    print(f"Hello World - Translation mode: {request.translation_mode}")
+    legacy_print(f"Hello World - Store files endpoint called for {len(request.files)} files")
+    legacy_print(f"Hello World - Storing files for: {request.sourceLanguage} -> {request.targetLanguage}")
+    legacy_print(f"Hello World - Customer email: {request.email}")
+    legacy_print(f"Hello World - Translation mode: {request.translation_mode}")
     
     # Validate email format (additional validation beyond EmailStr)
     email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
@@ -100,12 +101,12 @@ async def store_files_on_google_drive(request: TranslateRequest):
     # Create Google Drive folder structure
     try:
         folder_id = await google_drive_service.create_customer_folder_structure(request.email)
-        print(f"Hello World - Created Google Drive folder structure: {folder_id}")
+        legacy_print(f"Hello World - Created Google Drive folder structure: {folder_id}")
     except GoogleDriveError as e:
-        print(f"Hello World - Google Drive error: {e}")
+        legacy_print(f"Hello World - Google Drive error: {e}")
         raise google_drive_error_to_http_exception(e)
     except Exception as e:
-        print(f"Hello World - Unexpected error creating folder: {e}")
+        legacy_print(f"Hello World - Unexpected error creating folder: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to create folder structure: {str(e)}"
@@ -114,8 +115,8 @@ async def store_files_on_google_drive(request: TranslateRequest):
     # Generate storage ID
     storage_id = f"store_{uuid.uuid4().hex[:10]}"
     
-    print(f"Hello World - Created storage job: {storage_id}")
-    print(f"Hello World - Files will be stored in Google Drive temp folder: {folder_id}")
+    legacy_print(f"Hello World - Created storage job: {storage_id}")
+    legacy_print(f"Hello World - Files will be stored in Google Drive temp folder: {folder_id}")
     
     # Store file metadata in Google Drive (simulated file storage for now)
     stored_files = []
@@ -147,10 +148,10 @@ async def store_files_on_google_drive(request: TranslateRequest):
                 "status": "stored",
                 "google_drive_url": file_result.get('google_drive_url')
             })
-            print(f"Hello World - Stored file in Google Drive: {file_info.name}")
+            legacy_print(f"Hello World - Stored file in Google Drive: {file_info.name}")
             
         except Exception as e:
-            print(f"Hello World - Failed to store file {file_info.name}: {e}")
+            legacy_print(f"Hello World - Failed to store file {file_info.name}: {e}")
             stored_files.append({
                 "file_id": None,
                 "filename": file_info.name,
@@ -177,9 +178,9 @@ async def store_files_on_google_drive(request: TranslateRequest):
     successful_file_ids = [f["file_id"] for f in stored_files if f["status"] == "stored" and f["file_id"]]
     failed_files = [f for f in stored_files if f["status"] == "failed"]
     
-    print(f"UPLOAD COMPLETE: {len(successful_file_ids)} successful, {len(failed_files)} failed")
-    print(f"Estimated pages: {total_pages}, Total amount: ${total_amount:.2f}")
-    print(f"Files stored in Temp folder, awaiting payment")
+    legacy_print(f"UPLOAD COMPLETE: {len(successful_file_ids)} successful, {len(failed_files)} failed")
+    legacy_print(f"Estimated pages: {total_pages}, Total amount: ${total_amount:.2f}")
+    legacy_print(f"Files stored in Temp folder, awaiting payment")
     
     return JSONResponse(
         content={
@@ -21,7 +21,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Literal
 
-from fastapi import APIRouter, Body, HTTPException, Depends
+from fastapi import APIRouter, Body, HTTPException, Depends, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, EmailStr
 
@@ -33,8 +33,10 @@ from app.middleware.auth_middleware import get_optional_user
 from app.services.google_drive_service import google_drive_service
 from app.services.pricing_service import pricing_service
 from app.services.subscription_service import subscription_service
+from app.services.tenant_bulkhead import request_tenant, tenant_bulkheads
 from app.models.subscription import UsageUpdate
 from app.utils.user_transaction_helper import create_user_transaction
+from app.utils.structured_logging import legacy_print
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -222,6 +224,7 @@ def validate_language_code(language: str, language_type: str) -> None:
 
 @router.post("/translate-user", tags=["Translation"])
 async def translate_user_files(
+    http_request: Request,
     request: TranslateUserRequest = Body(...),
     current_user: Optional[Dict] = Depends(get_optional_user)
 ):
@@ -247,6 +250,7 @@ async def translate_user_files(
     - Individual users (no auth): pay per translation
 
     Args:
+        http_request: Raw request (bulkhead tenant of anonymous callers)
         request: Translation request with files, languages, email, userName
         current_user: Optional authenticated user data (from Authorization header)
 
@@ -268,45 +272,44 @@ async def translate_user_files(
     else:
         logger.warning(f"   ⚠️  No authentication (current_user is None)")
 
-    def log_step(step_name: str, details: str = ""):
-        """Log step with timing."""
+    def log_step(step_name: str, details: str = "", *args):
+        """Log step with timing; details is a %-format for args, formatted in the log listener."""
         elapsed = time.time() - request_start_time
-        msg = f"[TRANSLATE-USER {elapsed:6.2f}s] {step_name}"
         if details:
-            msg += f" - {details}"
-        logging.info(msg)
-        print(msg)
+            logging.info("[TRANSLATE-USER %6.2fs] %s - " + details, elapsed, step_name, *args)
+        else:
+            logging.info("[TRANSLATE-USER %6.2fs] %s", elapsed, step_name)
 
     # ========================================================================
     # RAW INCOMING DATA
     # ========================================================================
-    print("=" * 100)
-    print("[RAW INCOMING DATA] /translate-user ENDPOINT REACHED")
-    print(f"[RAW INCOMING DATA] Request Data:")
-    print(f"[RAW INCOMING DATA]   - User Name: {request.userName}")
-    print(f"[RAW INCOMING DATA]   - User Email: {request.email}")
-    print(f"[RAW INCOMING DATA]   - Source Language: {request.sourceLanguage}")
-    print(f"[RAW INCOMING DATA]   - Target Language: {request.targetLanguage}")
-    print(f"[RAW INCOMING DATA]   - File Translation Modes: {len(request.fileTranslationModes) if request.fileTranslationModes else 0} entries")
+    legacy_print("=" * 100)
+    legacy_print("[RAW INCOMING DATA] /translate-user ENDPOINT REACHED")
+    legacy_print(f"[RAW INCOMING DATA] Request Data:")
+    legacy_print(f"[RAW INCOMING DATA]   - User Name: {request.userName}")
+    legacy_print(f"[RAW INCOMING DATA]   - User Email: {request.email}")
+    legacy_print(f"[RAW INCOMING DATA]   - Source Language: {request.sourceLanguage}")
+    legacy_print(f"[RAW INCOMING DATA]   - Target Language: {request.targetLanguage}")
+    legacy_print(f"[RAW INCOMING DATA]   - File Translation Modes: {len(request.fileTranslationModes) if request.fileTranslationModes else 0} entries")
     if request.fileTranslationModes:
         for mode_info in request.fileTranslationModes:
-            print(f"[RAW INCOMING DATA]     - {mode_info.fileName}: {mode_info.translationMode}")
-    print(f"[RAW INCOMING DATA]   - Number of Files: {len(request.files)}")
-    print(
+            legacy_print(f"[RAW INCOMING DATA]     - {mode_info.fileName}: {mode_info.translationMode}")
+    legacy_print(f"[RAW INCOMING DATA]   - Number of Files: {len(request.files)}")
+    legacy_print(
         f"[RAW INCOMING DATA]   - Payment Intent ID: {request.paymentIntentId or 'None'}"
     )
-    print(f"[RAW INCOMING DATA] Files Details:")
+    legacy_print(f"[RAW INCOMING DATA] Files Details:")
     for i, file_info in enumerate(request.files, 1):
-        print(
+        legacy_print(
             f"[RAW INCOMING DATA]   File {i}: '{file_info.name}' | "
             f"{file_info.size:,} bytes | Type: {file_info.type} | ID: {file_info.id}"
         )
-    print("=" * 100)
+    legacy_print("=" * 100)
 
-    log_step("REQUEST RECEIVED", f"User: {request.userName} ({request.email})")
+    log_step("REQUEST RECEIVED", "User: %s (%s)", request.userName, request.email)
     log_step(
         "REQUEST DETAILS",
-        f"{request.sourceLanguage} -> {request.targetLanguage}, Files: {len(request.files)}",
+        "%s -> %s, Files: %s", request.sourceLanguage, request.targetLanguage, len(request.files),
     )
 
     # ========================================================================
@@ -319,7 +322,7 @@ async def translate_user_files(
         validate_email_format(request.email)
         validate_email_domain(request.email)
     except HTTPException as e:
-        log_step("VALIDATION FAILED", f"Email validation: {e.detail}")
+        log_step("VALIDATION FAILED", "Email validation: %s", e.detail)
         raise
 
     # Validate language codes
@@ -327,7 +330,7 @@ async def translate_user_files(
         validate_language_code(request.sourceLanguage, "source")
         validate_language_code(request.targetLanguage, "target")
     except HTTPException as e:
-        log_step("VALIDATION FAILED", f"Language validation: {e.detail}")
+        log_step("VALIDATION FAILED", "Language validation: %s", e.detail)
         raise
 
     if request.sourceLanguage == request.targetLanguage:
@@ -338,7 +341,7 @@ async def translate_user_files(
 
     log_step(
         "VALIDATION PASSED",
-        f"Languages: {request.sourceLanguage} -> {request.targetLanguage}",
+        "Languages: %s -> %s", request.sourceLanguage, request.targetLanguage,
     )
 
     # Validate files
@@ -347,33 +350,33 @@ async def translate_user_files(
         raise HTTPException(status_code=400, detail="At least one file is required")
 
     if len(request.files) > 10:
-        log_step("VALIDATION FAILED", f"Too many files: {len(request.files)}")
+        log_step("VALIDATION FAILED", "Too many files: %s", len(request.files))
         raise HTTPException(
             status_code=400, detail="Maximum 10 files allowed per request"
         )
 
-    log_step("VALIDATION COMPLETE", f"{len(request.files)} file(s) validated")
+    log_step("VALIDATION COMPLETE", "%s file(s) validated", len(request.files))
 
     # ========================================================================
     # GOOGLE DRIVE FOLDER CREATION
     # ========================================================================
-    log_step("FOLDER CREATE START", f"Creating structure for: {request.email}")
+    log_step("FOLDER CREATE START", "Creating structure for: %s", request.email)
 
     try:
         # Individual user: user_email/Temp/
-        print(f"Creating individual folder structure: {request.email}/Temp/")
+        legacy_print(f"Creating individual folder structure: {request.email}/Temp/")
         folder_id = await google_drive_service.create_customer_folder_structure(
             customer_email=request.email, company_name=None
         )
-        log_step("FOLDER CREATED", f"{request.email}/Temp/ (ID: {folder_id})")
-        print(f"Google Drive folder created: {request.email}/Temp/ (ID: {folder_id})")
+        log_step("FOLDER CREATED", "%s/Temp/ (ID: %s)", request.email, folder_id)
+        legacy_print(f"Google Drive folder created: {request.email}/Temp/ (ID: {folder_id})")
     except GoogleDriveError as e:
-        log_step("FOLDER CREATE FAILED", f"Google Drive error: {str(e)}")
-        print(f"Google Drive error creating folder: {e}")
+        log_step("FOLDER CREATE FAILED", "Google Drive error: %s", e)
+        legacy_print(f"Google Drive error creating folder: {e}")
         raise google_drive_error_to_http_exception(e)
     except Exception as e:
-        log_step("FOLDER CREATE FAILED", f"Unexpected error: {str(e)}")
-        print(f"Unexpected error creating folder: {e}")
+        log_step("FOLDER CREATE FAILED", "Unexpected error: %s", e)
+        legacy_print(f"Unexpected error creating folder: {e}")
         raise HTTPException(
             status_code=500, detail=f"Failed to create folder structure: {str(e)}"
         )
@@ -382,14 +385,14 @@ async def translate_user_files(
     # FILE UPLOAD AND PROCESSING
     # ========================================================================
     storage_id = f"store_{uuid.uuid4().hex[:10]}"
-    print(f"Created storage job: {storage_id}")
-    print(f"Target folder: {request.email}/Temp/ (ID: {folder_id})")
-    print(f"Starting file uploads to Google Drive...")
+    legacy_print(f"Created storage job: {storage_id}")
+    legacy_print(f"Target folder: {request.email}/Temp/ (ID: {folder_id})")
+    legacy_print(f"Starting file uploads to Google Drive...")
 
     # ✅ FIX: Generate ONE transaction ID for entire batch (not per file)
     batch_square_tx_id = generate_stripe_checkout_session_id()
-    log_step("BATCH TRANSACTION ID", f"Generated batch Square ID: {batch_square_tx_id}")
-    print(f"Generated batch Square transaction ID: {batch_square_tx_id}")
+    log_step("BATCH TRANSACTION ID", "Generated batch Square ID: %s", batch_square_tx_id)
+    legacy_print(f"Generated batch Square transaction ID: {batch_square_tx_id}")
 
     stored_files = []
     all_documents = []  # ✅ FIX: Accumulate all documents for single transaction
@@ -415,15 +418,15 @@ async def translate_user_files(
 
     # Determine customer type based on authentication
     customer_type = "enterprise" if (current_user and current_user.get("company_name")) else "individual"
-    log_step("CUSTOMER TYPE", f"Detected as: {customer_type}")
-    print(f"Customer type: {customer_type}")
+    log_step("CUSTOMER TYPE", "Detected as: %s", customer_type)
+    legacy_print(f"Customer type: {customer_type}")
 
     # Build file-level translation modes dict from request
     file_translation_modes: Dict[str, str] = {}
     if request.fileTranslationModes:
         for mode_info in request.fileTranslationModes:
             file_translation_modes[mode_info.fileName] = mode_info.translationMode
-        log_step("FILE MODES", f"Per-file translation modes: {file_translation_modes}")
+        log_step("FILE MODES", "Per-file translation modes: %s", file_translation_modes)
     else:
         log_step("FILE MODES", "No per-file modes specified, using default (automatic)")
 
@@ -431,18 +434,18 @@ async def translate_user_files(
         try:
             log_step(
                 f"FILE {i} UPLOAD START",
-                f"'{file_info.name}' ({file_info.size:,} bytes)",
+                "'%s' (%d bytes)", file_info.name, file_info.size,
             )
-            print(
+            legacy_print(
                 f"   Uploading file {i}/{len(request.files)}: '{file_info.name}'"
             )
 
             # Decode base64 content
             try:
                 file_content = base64.b64decode(file_info.content)
-                log_step(f"FILE {i} BASE64 DECODED", f"Decoded {len(file_content):,} bytes")
+                log_step(f"FILE {i} BASE64 DECODED", "Decoded %d bytes", len(file_content))
             except Exception as e:
-                log_step(f"FILE {i} DECODE FAILED", f"Error: {str(e)}")
+                log_step(f"FILE {i} DECODE FAILED", "Error: %s", e)
                 raise HTTPException(
                     status_code=400,
                     detail=f"Failed to decode file content for '{file_info.name}': {str(e)}",
@@ -470,21 +473,22 @@ async def translate_user_files(
             total_units += page_count  # Always track raw page count
             total_quota_units += file_quota_units  # Quota units (with multipliers)
 
-            log_step(f"FILE {i} PAGE COUNT", f"{page_count} {unit_type}s estimated")
+            log_step(f"FILE {i} PAGE COUNT", "%s %ss estimated", page_count, unit_type)
             if customer_type == "enterprise":
                 log_step(f"FILE {i} QUOTA CALC",
-                        f"Mode: {file_mode}, Raw: {page_count} pages, Quota: {file_quota_units} units (multiplier applied)")
-                print(f"   📊 Quota Calculation: {page_count} pages × {file_mode} mode = {file_quota_units} quota units")
+                        "Mode: %s, Raw: %s pages, Quota: %s units (multiplier applied)", file_mode, page_count, file_quota_units)
+                legacy_print(f"   📊 Quota Calculation: {page_count} pages × {file_mode} mode = {file_quota_units} quota units")
 
             # Upload to Google Drive
-            log_step(f"FILE {i} GDRIVE UPLOAD", f"Uploading to folder {folder_id}")
-            file_result = await google_drive_service.upload_file_to_folder(
-                file_content=file_content,
-                filename=file_info.name,
-                folder_id=folder_id,
-                target_language=request.targetLanguage,
-            )
-            log_step(f"FILE {i} GDRIVE UPLOADED", f"File ID: {file_result['file_id']}")
+            log_step(f"FILE {i} GDRIVE UPLOAD", "Uploading to folder %s", folder_id)
+            async with tenant_bulkheads.ingest.slot(request_tenant(current_user, http_request)):
+                file_result = await google_drive_service.upload_file_to_folder(
+                    file_content=file_content,
+                    filename=file_info.name,
+                    folder_id=folder_id,
+                    target_language=request.targetLanguage,
+                )
+            log_step(f"FILE {i} GDRIVE UPLOADED", "File ID: %s", file_result['file_id'])
 
             # Update file metadata (initial properties)
             log_step(f"FILE {i} METADATA UPDATE", "Setting initial file properties")
@@ -506,9 +510,9 @@ async def translate_user_files(
             )
 
             # Log all metadata values being set
-            print(f"   📋 File Metadata Set on Google Drive:")
+            legacy_print(f"   📋 File Metadata Set on Google Drive:")
             for key, value in initial_properties.items():
-                print(f"      • {key}: {value}")
+                legacy_print(f"      • {key}: {value}")
 
             # ✅ FIX: Accumulate document in batch array (don't create transaction yet)
             all_documents.append({
@@ -526,11 +530,11 @@ async def translate_user_files(
                 "processing_duration": None,
                 "translation_mode": file_mode,  # Per-file translation mode
             })
-            log_step(f"FILE {i} ADDED TO BATCH", f"Document added to batch transaction")
+            log_step(f"FILE {i} ADDED TO BATCH", "Document added to batch transaction")
 
             log_step(
                 f"FILE {i} COMPLETE",
-                f"URL: {file_result.get('google_drive_url', 'N/A')}",
+                "URL: %s", file_result.get('google_drive_url', 'N/A'),
             )
 
             stored_files.append(
@@ -545,15 +549,15 @@ async def translate_user_files(
                     "stripe_checkout_session_id": batch_square_tx_id,  # ✅ FIX: Use batch ID
                 }
             )
-            print(
+            legacy_print(
                 f"   Successfully uploaded: '{file_info.name}' -> "
                 f"Google Drive ID: {file_result['file_id']}, "
                 f"{page_count} {unit_type}s"
             )
 
         except Exception as e:
-            log_step(f"FILE {i} FAILED", f"Error: {str(e)}")
-            print(f"   Failed to upload '{file_info.name}': {e}")
+            log_step(f"FILE {i} FAILED", "Error: %s", e)
+            legacy_print(f"   Failed to upload '{file_info.name}': {e}")
             stored_files.append(
                 {
                     "file_id": None,
@@ -576,14 +580,14 @@ async def translate_user_files(
         # Individual: Use raw page count (pricing service applies multipliers)
         units_for_billing = total_quota_units if customer_type == "enterprise" else total_units
 
-        log_step("BATCH TRANSACTION CREATE", f"Creating transaction with {len(all_documents)} documents")
-        print(f"\n💾 Creating batch transaction record...")
-        print(f"   Documents: {len(all_documents)}")
-        print(f"   Raw pages: {total_units}")
+        log_step("BATCH TRANSACTION CREATE", "Creating transaction with %s documents", len(all_documents))
+        legacy_print(f"\n💾 Creating batch transaction record...")
+        legacy_print(f"   Documents: {len(all_documents)}")
+        legacy_print(f"   Raw pages: {total_units}")
         if customer_type == "enterprise":
-            print(f"   Quota units (with multipliers): {total_quota_units}")
-        print(f"   Units for billing: {units_for_billing}")
-        print(f"   Square TX ID: {batch_square_tx_id}")
+            legacy_print(f"   Quota units (with multipliers): {total_quota_units}")
+        legacy_print(f"   Units for billing: {units_for_billing}")
+        legacy_print(f"   Square TX ID: {batch_square_tx_id}")
 
         try:
             # Determine unit_type from first document (all should be same type)
@@ -607,9 +611,9 @@ async def translate_user_files(
             cost_per_unit = total_amount / units_for_billing if units_for_billing > 0 else 0
 
             log_step("PRICING CALCULATED",
-                    f"Customer: {customer_type}, Mode: {batch_translation_mode}, Total: ${total_amount:.2f} ({units_for_billing} units @ avg ${cost_per_unit:.4f}/unit)")
+                    "Customer: %s, Mode: %s, Total: $%.2f (%s units @ avg $%.4f/unit)", customer_type, batch_translation_mode, total_amount, units_for_billing, cost_per_unit)
             if customer_type == "enterprise":
-                print(f"   💰 Pricing: {total_units} raw pages → {total_quota_units} quota units → ${total_amount:.2f}")
+                legacy_print(f"   💰 Pricing: {total_units} raw pages → {total_quota_units} quota units → ${total_amount:.2f}")
 
             try:
                 batch_transaction_id = await create_user_transaction(
@@ -633,8 +637,8 @@ async def translate_user_files(
                         detail="Failed to create transaction record"
                     )
 
-                log_step("BATCH TRANSACTION CREATED", f"TX ID: {batch_transaction_id}")
-                print(f"   ✅ Batch transaction created: {batch_transaction_id}")
+                log_step("BATCH TRANSACTION CREATED", "TX ID: %s", batch_transaction_id)
+                legacy_print(f"   ✅ Batch transaction created: {batch_transaction_id}")
 
                 # Update all files' metadata with the same transaction_id
                 for file_info in stored_files:
@@ -644,9 +648,9 @@ async def translate_user_files(
                                 file_id=file_info["file_id"],
                                 properties={"transaction_id": batch_transaction_id},
                             )
-                            print(f"   ✅ Updated {file_info['filename']} with transaction_id")
+                            legacy_print(f"   ✅ Updated {file_info['filename']} with transaction_id")
                         except Exception as e:
-                            print(f"   ⚠️  Failed to update {file_info['filename']} metadata: {e}")
+                            legacy_print(f"   ⚠️  Failed to update {file_info['filename']} metadata: {e}")
 
             except HTTPException:
                 raise  # Re-raise HTTP exceptions
@@ -660,8 +664,8 @@ async def translate_user_files(
         except HTTPException:
             raise  # Re-raise HTTP exceptions from inner try block
         except Exception as e:
-            log_step("BATCH TRANSACTION ERROR", f"Error: {str(e)}")
-            print(f"   ❌ Error creating batch transaction: {e}")
+            log_step("BATCH TRANSACTION ERROR", "Error: %s", e)
+            legacy_print(f"   ❌ Error creating batch transaction: {e}")
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to process transaction: {str(e)}"
@@ -675,23 +679,23 @@ async def translate_user_files(
         user_email = current_user.get("email")
 
         if company_name:
-            log_step("ENTERPRISE USER DETECTED", f"Company: {company_name}, User: {user_email}")
-            print(f"\n🏢 Enterprise user detected: {company_name}")
-            print(f"   User: {user_email}")
-            print(f"   Units to record: {total_units}")
+            log_step("ENTERPRISE USER DETECTED", "Company: %s, User: %s", company_name, user_email)
+            legacy_print(f"\n🏢 Enterprise user detected: {company_name}")
+            legacy_print(f"   User: {user_email}")
+            legacy_print(f"   Units to record: {total_units}")
 
             try:
                 # Find active subscription for this company
                 from app.database.mongodb import database
-                subscription = await database.subscriptions.find_one({
-                    "company_name": company_name,
-                    "status": "active"
-                })
+                subscription = await database.subscriptions.find_one(
+                    {"company_name": company_name, "status": "active"},
+                    {"usage_periods": 0}
+                )
 
                 if subscription:
                     subscription_id = str(subscription["_id"])
-                    log_step("SUBSCRIPTION FOUND", f"ID: {subscription_id}")
-                    print(f"   Found active subscription: {subscription_id}")
+                    log_step("SUBSCRIPTION FOUND", "ID: %s", subscription_id)
+                    legacy_print(f"   Found active subscription: {subscription_id}")
 
                     # Record usage using subscription service
                     usage_data = UsageUpdate(
@@ -700,8 +704,8 @@ async def translate_user_files(
                         translation_mode=batch_translation_mode  # Include mode for logging
                     )
 
-                    log_step("RECORDING USAGE", f"Adding {units_for_billing} quota units (mode: {batch_translation_mode}) to subscription")
-                    print(f"   📊 Usage Recording: {total_units} raw pages → {units_for_billing} quota units")
+                    log_step("RECORDING USAGE", "Adding %s quota units (mode: %s) to subscription", units_for_billing, batch_translation_mode)
+                    legacy_print(f"   📊 Usage Recording: {total_units} raw pages → {units_for_billing} quota units")
                     updated_subscription = await subscription_service.record_usage(
                         subscription_id,
                         usage_data
@@ -717,32 +721,15 @@ async def translate_user_files(
 
                         if overdraft_detected:
                             log_step("OVERDRAFT DETECTED",
-                                    f"Overdraft: {overdraft_amount} units, Soft limit exceeded: {exceeds_soft_limit}")
-                            print(f"   ⚠️  Overdraft: {overdraft_amount} units")
-                            print(f"      Available: {available_units}, Requested: {requested_units}")
+                                    "Overdraft: %s units, Soft limit exceeded: %s", overdraft_amount, exceeds_soft_limit)
+                            legacy_print(f"   ⚠️  Overdraft: {overdraft_amount} units")
+                            legacy_print(f"      Available: {available_units}, Requested: {requested_units}")
                             if exceeds_soft_limit:
-                                print(f"      ⚠️  Soft limit exceeded")
-
-                        # Find current active period (same logic as record_usage)
-                        usage_periods = updated_subscription.get("usage_periods", [])
-                        now = datetime.now(timezone.utc)
-                        current_period = None
-                        current_period_idx = None
-
-                        for idx, period in enumerate(usage_periods):
-                            period_start = period["period_start"]
-                            period_end = period["period_end"]
-
-                            # Handle timezone-aware comparison
-                            if not period_start.tzinfo:
-                                period_start = period_start.replace(tzinfo=timezone.utc)
-                            if not period_end.tzinfo:
-                                period_end = period_end.replace(tzinfo=timezone.utc)
+                                legacy_print(f"      ⚠️  Soft limit exceeded")
 
-                            if period_start <= now <= period_end:
-                                current_period = period
-                                current_period_idx = idx
-                                break
+                        # record_usage returns the period it incremented
+                        current_period = updated_subscription.get("current_period")
+                        current_period_idx = current_period.get("period_number") if current_period else None
 
                         if current_period:
                             units_used = current_period["units_used"]
@@ -755,39 +742,39 @@ async def translate_user_files(
                             subscription_units_used = units_used
                             subscription_units_remaining = remaining
                             subscription_promotional_units = promotional
-                            subscription_unit_type = updated_subscription.get("subscription_unit", "page")
+                            subscription_unit_type = subscription.get("subscription_unit", "page")
 
                             log_step("SUBSCRIPTION UPDATED",
-                                    f"Period {current_period_idx}: Units used: {units_used}, Remaining: {remaining}")
-                            print(f"   ✅ Subscription updated successfully")
-                            print(f"      Current period: {current_period_idx}")
-                            print(f"      Units used: {units_used}")
-                            print(f"      Units remaining: {remaining}")
+                                    "Period %s: Units used: %s, Remaining: %s", current_period_idx, units_used, remaining)
+                            legacy_print(f"   ✅ Subscription updated successfully")
+                            legacy_print(f"      Current period: {current_period_idx}")
+                            legacy_print(f"      Units used: {units_used}")
+                            legacy_print(f"      Units remaining: {remaining}")
                         else:
                             log_step("SUBSCRIPTION WARNING", "No current period found to display")
-                            print(f"   ⚠️  No current active period found")
+                            legacy_print(f"   ⚠️  No current active period found")
                     else:
                         log_step("SUBSCRIPTION UPDATE FAILED", "Service returned None")
-                        print(f"   ⚠️  Subscription update returned None")
+                        legacy_print(f"   ⚠️  Subscription update returned None")
                 else:
-                    log_step("NO SUBSCRIPTION", f"No active subscription for {company_name}")
-                    print(f"   ⚠️  No active subscription found for company: {company_name}")
+                    log_step("NO SUBSCRIPTION", "No active subscription for %s", company_name)
+                    legacy_print(f"   ⚠️  No active subscription found for company: {company_name}")
 
             except Exception as e:
-                log_step("SUBSCRIPTION UPDATE ERROR", f"Error: {str(e)}")
-                print(f"   ⚠️  Failed to update subscription: {e}")
+                log_step("SUBSCRIPTION UPDATE ERROR", "Error: %s", e)
+                legacy_print(f"   ⚠️  Failed to update subscription: {e}")
                 logger.warning(f"Failed to update subscription for {company_name}: {e}")
                 # Don't fail the request - subscription update is supplementary
         else:
-            log_step("INDIVIDUAL USER", f"No company_name in user data")
-            print(f"\n👤 Individual user (no company association)")
+            log_step("INDIVIDUAL USER", "No company_name in user data")
+            legacy_print(f"\n👤 Individual user (no company association)")
     else:
         if not current_user:
             log_step("NO AUTHENTICATION", "Request not authenticated")
-            print(f"\n🔓 Unauthenticated request (individual user)")
+            legacy_print(f"\n🔓 Unauthenticated request (individual user)")
         elif total_units == 0:
             log_step("NO UNITS", "No units to record")
-            print(f"\n⚠️  No units to record")
+            legacy_print(f"\n⚠️  No units to record")
 
     # ========================================================================
     # SUMMARY AND RESPONSE
@@ -795,18 +782,17 @@ async def translate_user_files(
     successful_uploads = len([f for f in stored_files if f["status"] == "stored"])
     failed_uploads = len([f for f in stored_files if f["status"] == "failed"])
 
-    print(f"\nUPLOAD COMPLETE: {successful_uploads} successful, {failed_uploads} failed")
-    print(f"Total units for pricing: {total_units}")
-    print(f"Total amount: ${total_amount:.2f}")
-    print(f"Customer: {request.userName} ({request.email})")
-    print(f"Batch transaction ID: {batch_transaction_id}")
+    legacy_print(f"\nUPLOAD COMPLETE: {successful_uploads} successful, {failed_uploads} failed")
+    legacy_print(f"Total units for pricing: {total_units}")
+    legacy_print(f"Total amount: ${total_amount:.2f}")
+    legacy_print(f"Customer: {request.userName} ({request.email})")
+    legacy_print(f"Batch transaction ID: {batch_transaction_id}")
 
     amount_cents = int(total_amount * 100)
 
     log_step(
         "RESPONSE PREPARE",
-        f"Success: {successful_uploads}/{len(request.files)} files, "
-        f"{total_units} units, ${total_amount:.2f}",
+        "Success: %s/%s files, %s units, $%.2f", successful_uploads, len(request.files), total_units, total_amount,
     )
 
     # Extract file_ids for easy access by frontend (for payment confirmation)
@@ -881,50 +867,50 @@ async def translate_user_files(
     # ========================================================================
     # RAW OUTGOING DATA
     # ========================================================================
-    print("=" * 100)
-    print("[RAW OUTGOING DATA] /translate-user RESPONSE")
-    print(f"[RAW OUTGOING DATA] Success: {response_data['success']}")
-    print(f"[RAW OUTGOING DATA] Storage ID: {response_data['data']['id']}")
-    print(f"[RAW OUTGOING DATA] Status: {response_data['data']['status']}")
-    print(f"[RAW OUTGOING DATA] Message: {response_data['data']['message']}")
-    print(f"[RAW OUTGOING DATA] Pricing:")
-    print(
+    legacy_print("=" * 100)
+    legacy_print("[RAW OUTGOING DATA] /translate-user RESPONSE")
+    legacy_print(f"[RAW OUTGOING DATA] Success: {response_data['success']}")
+    legacy_print(f"[RAW OUTGOING DATA] Storage ID: {response_data['data']['id']}")
+    legacy_print(f"[RAW OUTGOING DATA] Status: {response_data['data']['status']}")
+    legacy_print(f"[RAW OUTGOING DATA] Message: {response_data['data']['message']}")
+    legacy_print(f"[RAW OUTGOING DATA] Pricing:")
+    legacy_print(
         f"[RAW OUTGOING DATA]   - Total Pages: {response_data['data']['pricing']['total_pages']}"
     )
-    print(
+    legacy_print(
         f"[RAW OUTGOING DATA]   - Price Per Page: ${response_data['data']['pricing']['price_per_page']}"
     )
-    print(
+    legacy_print(
         f"[RAW OUTGOING DATA]   - Total Amount: ${response_data['data']['pricing']['total_amount']:.2f}"
     )
-    print(
+    legacy_print(
         f"[RAW OUTGOING DATA]   - Currency: {response_data['data']['pricing']['currency']}"
     )
-    print(
+    legacy_print(
         f"[RAW OUTGOING DATA]   - Customer Type: {response_data['data']['pricing']['customer_type']}"
     )
-    print(f"[RAW OUTGOING DATA] Files:")
-    print(
+    legacy_print(f"[RAW OUTGOING DATA] Files:")
+    legacy_print(
         f"[RAW OUTGOING DATA]   - Total: {response_data['data']['files']['total_files']}"
     )
-    print(
+    legacy_print(
         f"[RAW OUTGOING DATA]   - Successful: {response_data['data']['files']['successful_uploads']}"
     )
-    print(
+    legacy_print(
         f"[RAW OUTGOING DATA]   - Failed: {response_data['data']['files']['failed_uploads']}"
     )
-    print(
+    legacy_print(
         f"[RAW OUTGOING DATA] Transaction IDs ({len(response_data['data']['pricing']['transaction_ids'])}): "
         f"{response_data['data']['pricing']['transaction_ids']}"
     )
-    print(f"[RAW OUTGOING DATA] Customer: {request.userName} ({request.email})")
-    print(
+    legacy_print(f"[RAW OUTGOING DATA] Customer: {request.userName} ({request.email})")
+    legacy_print(
         f"[RAW OUTGOING DATA] Payment Required: {response_data['data']['payment']['required']}"
     )
-    print(
+    legacy_print(
         f"[RAW OUTGOING DATA] Payment Amount (cents): {response_data['data']['payment']['amount_cents']}"
     )
-    print("=" * 100)
+    legacy_print("=" * 100)
 
     log_step("RESPONSE SENDING", "Returning response to client")
 
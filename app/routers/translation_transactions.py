@@ -11,7 +11,11 @@ from bson.decimal128 import Decimal128
 from datetime import datetime, timezone
 
 from app.database.mongodb import database
-from app.models.translation_transaction import TranslationTransactionListResponse
+from app.models.translation_transaction import (
+    TranslationTransactionListResponse,
+    TRANSLATION_TRANSACTION_SUMMARY_PROJECTION,
+)
+from app.utils.responses import FastJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +49,7 @@ def serialize_translation_transaction_for_json(txn: dict) -> dict:
 @router.get(
     "/company/{company_name}",
     response_model=TranslationTransactionListResponse,
+    response_class=FastJSONResponse,
     status_code=status.HTTP_200_OK,
     responses={
         200: {
@@ -339,6 +344,9 @@ async def get_company_translation_transactions(
     ```
 
     ## Notes
+    - Returns summary records (TranslationTransactionSummary): each document
+      carries file name, size, URLs, status and translation mode only. Use
+      `GET /api/v1/translation-transactions/{transaction_id}` for the full record
     - Returns empty array if no transactions match the criteria
     - All datetime fields are returned in ISO 8601 format
     - Total price and price per unit are in dollars (not cents)
@@ -379,10 +387,12 @@ async def get_company_translation_transactions(
         # Aggregation pipeline:
         # 1. Match transactions by company_name (and optional status)
         # 2. Skip/limit for pagination
+        # 3. Project summary fields only (full record: GET /{transaction_id})
         pipeline = [
             {"$match": match_stage},
             {"$skip": skip},
-            {"$limit": limit}
+            {"$limit": limit},
+            {"$project": TRANSLATION_TRANSACTION_SUMMARY_PROJECTION}
         ]
         logger.info(f"   - pipeline stages: {len(pipeline)}")
 
@@ -391,18 +401,14 @@ async def get_company_translation_transactions(
         transactions = await database.translation_transactions.aggregate(pipeline).to_list(length=limit)
         logger.info(f"🔎 Database Result: found={len(transactions)} transactions")
 
-        # Serialize all transactions (handles nested documents datetime fields)
-        logger.info(f"🔄 Serializing {len(transactions)} transactions...")
-        transactions = [serialize_translation_transaction_for_json(txn) for txn in transactions]
-        logger.info(f"✅ Serialization complete")
-
         logger.info(f"✅ Retrieval successful:")
         logger.info(f"   - company_name: {company_name}")
         logger.info(f"   - transactions_count: {len(transactions)}")
         logger.info(f"   - status_filter: {status_filter}")
         logger.info(f"📤 Response: success=True, count={len(transactions)}, limit={limit}, skip={skip}")
 
-        return JSONResponse(content={
+        # Raw documents: FastJSONResponse converts ObjectId/datetime/Decimal128 while encoding
+        return FastJSONResponse(content={
             "success": True,
             "data": {
                 "transactions": transactions,
@@ -533,3 +539,59 @@ async def get_companies_with_translations():
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve companies: {str(e)}"
         )
+
+
+@router.get(
+    "/{transaction_id}",
+    status_code=status.HTTP_200_OK,
+    responses={
+        404: {"description": "Transaction not found"},
+        500: {"description": "Internal server error"}
+    }
+)
+async def get_translation_transaction_detail(
+    transaction_id: str = Path(
+        ...,
+        description="Transaction identifier",
+        example="TXN-20FEF6D8FE"
+    )
+):
+    """
+    Get the full translation transaction record.
+
+    List endpoints return summary records; this endpoint returns every field,
+    including per-document upload/translation timings and Drive file IDs.
+    Archived transactions are returned too, marked with `archived: true`.
+
+    ## Usage Examples
+    ```bash
+    curl -X GET "http://localhost:8000/api/v1/translation-transactions/TXN-20FEF6D8FE"
+    ```
+    """
+    from app.services.translation_transaction_service import get_translation_transaction
+
+    try:
+        logger.info(f"🔍 GET /api/v1/translation-transactions/{transaction_id} - START")
+        transaction = await get_translation_transaction(transaction_id, include_archived=True)
+
+        if not transaction:
+            logger.warning(f"❌ Translation transaction not found: {transaction_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Translation transaction not found: {transaction_id}"
+            )
+
+        logger.info(f"✅ Retrieved translation transaction: {transaction_id}")
+        return JSONResponse(content={
+            "success": True,
+            "data": serialize_translation_transaction_for_json(transaction)
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Failed to retrieve translation transaction:", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve translation transaction: {str(e)}"
+        )
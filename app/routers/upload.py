@@ -2,7 +2,7 @@
 File upload API endpoints.
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Depends, Request
 from fastapi.responses import JSONResponse
 from typing import List, Optional
 import uuid
@@ -16,6 +16,7 @@ from app.utils.file_validation import file_validator
 from app.services.google_drive_service import google_drive_service
 from app.services.file_service import file_service
 from app.services.page_counter_service import page_counter_service
+from app.services.tenant_bulkhead import request_tenant, tenant_bulkheads
 from app.config import settings
 from app.exceptions.google_drive_exceptions import (
     GoogleDriveError,
@@ -26,6 +27,7 @@ router = APIRouter(prefix="/api", tags=["File Upload"])
 
 @router.post("/upload", response_model=FileUploadResponse)
 async def upload_files(
+    http_request: Request,
     customer_email: Optional[str] = Form(None, description="Customer email address (uses default if not provided)"),
     target_language: str = Form(..., description="Target language code"),
     files: List[UploadFile] = File(..., description="Files to upload")
@@ -156,12 +158,13 @@ async def upload_files(
             
             # Upload to Google Drive/local storage
             try:
-                file_info = await google_drive_service.upload_file_to_folder(
-                    file_content=content,
-                    filename=result.filename,
-                    folder_id=folder_id,
-                    target_language=request_data.target_language
-                )
+                async with tenant_bulkheads.ingest.slot(request_tenant(None, http_request)):
+                    file_info = await google_drive_service.upload_file_to_folder(
+                        file_content=content,
+                        filename=result.filename,
+                        folder_id=folder_id,
+                        target_language=request_data.target_language
+                    )
                 
                 logging.info(f"File uploaded successfully: {file_info['file_id']}")
                 
@@ -9,9 +9,9 @@ This module provides payment management endpoints for user_transactions collecti
 - Updating payment status
 """
 
-from fastapi import APIRouter, HTTPException, Query, Path, status, Request
-from fastapi.responses import JSONResponse
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, status, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Any, Dict, Literal, Optional
 from datetime import datetime, timezone
 from pydantic import EmailStr
 import logging
@@ -23,6 +23,10 @@ from app.models.payment import (
     UserTransactionResponse,
     UserTransactionRefundRequest,
 )
+from app.models.user_transaction import TRANSACTION_FIELD_MAPPINGS, USER_TRANSACTION_SUMMARY_PROJECTION
+from app.utils.responses import FastJSONResponse
+from app.middleware.auth_middleware import get_admin_user
+from app.services.export_service import export_service
 from app.utils.user_transaction_helper import (
     create_user_transaction,
     get_user_transactions_by_email,
@@ -82,18 +86,30 @@ def serialize_transaction_for_json(txn: dict) -> dict:
     serialized = {key: serialize_value(value) for key, value in txn.items()}
 
     # Map database field names to API field names for consistency
-    field_mappings = {
-        'price_per_unit': 'cost_per_unit',
-        'total_price': 'total_cost',
-        'units_count': 'number_of_units'
-    }
-
-    for db_field, api_field in field_mappings.items():
+    for db_field, api_field in TRANSACTION_FIELD_MAPPINGS.items():
         if db_field in serialized:
             serialized[api_field] = serialized.pop(db_field)
 
     return serialized
 
+def rename_transaction_fields(txn: dict) -> dict:
+    """
+    Map database field names to API field names in place.
+
+    Same mapping as serialize_transaction_for_json, without converting values;
+    used by list routes that encode raw documents with FastJSONResponse.
+
+    Args:
+        txn: Transaction document from MongoDB (modified in place)
+
+    Returns:
+        The same document
+    """
+    for db_field, api_field in TRANSACTION_FIELD_MAPPINGS.items():
+        if db_field in txn:
+            txn[api_field] = txn.pop(db_field)
+    return txn
+
 router = APIRouter(prefix="/api/v1/user-transactions", tags=["User Transaction Payments"])
 
 
@@ -518,7 +534,7 @@ async def process_transaction_refund(
         )
 
 
-@router.get("")
+@router.get("", response_class=FastJSONResponse)
 async def get_all_user_transactions(
     request: Request,
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by transaction status"),
@@ -529,7 +545,9 @@ async def get_all_user_transactions(
     Get all user transactions from the database (admin endpoint).
 
     Retrieves all transactions from the user_transactions collection, with optional status filtering
-    and pagination. Returns complete transaction records sorted by date (newest first).
+    and pagination. Returns summary records (UserTransactionSummary) sorted by date (newest first);
+    refunds, Stripe payment details and per-document timings are only returned by
+    `GET /api/v1/user-transactions/{stripe_checkout_session_id}`.
 
     **Query Parameters:**
     - `status`: Optional filter by transaction status (completed | pending | failed)
@@ -629,7 +647,8 @@ async def get_all_user_transactions(
         pipeline.extend([
             {"$sort": {"created_at": -1}},  # Sort by created_at descending (newest first)
             {"$skip": skip},
-            {"$limit": limit}
+            {"$limit": limit},
+            {"$project": USER_TRANSACTION_SUMMARY_PROJECTION}  # Summary fields only
         ])
         logger.info(f"   - pipeline stages: {len(pipeline)}")
 
@@ -644,9 +663,8 @@ async def get_all_user_transactions(
         logger.info(f"🔎 Database Result: total_count={total_count}")
 
         # Convert all transactions to JSON-serializable format
-        logger.info(f"🔄 Serializing {len(transactions)} transactions...")
-        transactions = [serialize_transaction_for_json(txn) for txn in transactions]
-        logger.info(f"✅ Serialization complete")
+        # Raw documents: FastJSONResponse converts ObjectId/datetime/Decimal128 while encoding
+        transactions = [rename_transaction_fields(txn) for txn in transactions]
 
         logger.info(f"✅ Retrieval successful:")
         logger.info(f"   - transactions_returned: {len(transactions)}")
@@ -654,7 +672,7 @@ async def get_all_user_transactions(
         logger.info(f"   - status_filter: {status_filter}")
         logger.info(f"📤 Response: success=True, count={len(transactions)}, total={total_count}")
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "data": {
                 "transactions": transactions,
@@ -685,7 +703,7 @@ async def get_all_user_transactions(
         )
 
 
-@router.get("/user/{email}")
+@router.get("/user/{email}", response_class=FastJSONResponse)
 async def get_user_transaction_history(
     request: Request,
     email: EmailStr = Path(..., description="User email address"),
@@ -807,9 +825,8 @@ async def get_user_transaction_history(
         logger.info(f"🔎 Database Result: found={len(transactions)} transactions")
 
         # Convert all transactions to JSON-serializable format
-        logger.info(f"🔄 Serializing {len(transactions)} transactions...")
-        transactions = [serialize_transaction_for_json(txn) for txn in transactions]
-        logger.info(f"✅ Serialization complete")
+        # Raw documents: FastJSONResponse converts ObjectId/datetime/Decimal128 while encoding
+        transactions = [rename_transaction_fields(txn) for txn in transactions]
 
         logger.info(f"✅ Retrieval successful:")
         logger.info(f"   - user_email: {email}")
@@ -817,7 +834,7 @@ async def get_user_transaction_history(
         logger.info(f"   - status_filter: {status_filter}")
         logger.info(f"📤 Response: success=True, count={len(transactions)}")
 
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "success": True,
             "data": {
                 "transactions": transactions,
@@ -848,6 +865,66 @@ async def get_user_transaction_history(
         )
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export user transactions (streaming NDJSON/CSV)",
+    responses={
+        200: {
+            "description": "Streamed export file",
+            "content": {"application/x-ndjson": {}, "text/csv": {}}
+        }
+    }
+)
+async def export_user_transactions(
+    admin_user: Dict[str, Any] = Depends(get_admin_user),
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="ndjson or csv"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by transaction status"),
+    user_email: Optional[str] = Query(None, description="Filter by user email"),
+    date_from: Optional[datetime] = Query(None, description="Inclusive start date (ISO 8601)"),
+    date_to: Optional[datetime] = Query(None, description="Inclusive end date (ISO 8601)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export (default: all exportable fields)")
+):
+    """
+    Stream all matching user transactions as NDJSON or CSV (Admin Only).
+
+    Reads a single database cursor in batches and writes rows as they
+    arrive, so exports of any size use constant memory. Use this instead of
+    paging through the list endpoint to pull complete data sets.
+
+    **Query Parameters:**
+    - `format`: `ndjson` (default, one JSON document per line) or `csv`
+    - `status`: Transaction status (completed, pending, failed)
+    - `user_email`: User email address
+    - `date_from` / `date_to`: Inclusive date range
+    - `fields`: Comma-separated subset of columns
+
+    **Response:**
+    - **200**: Streamed file (Content-Disposition: attachment)
+    - **400**: Unknown field or format
+    - **401/403**: Not an admin
+
+    **Example:**
+    ```bash
+    curl -H "Authorization: Bearer $TOKEN" -o export.csv \\
+      "http://localhost:8000/api/v1/user-transactions/export?format=csv&status=completed"
+    ```
+    """
+    logger.info(f"[EXPORT] user transactions export requested by {admin_user.get('email')} (format={export_format})")
+    try:
+        return export_service.streaming_response(
+            "user_transactions",
+            export_format,
+            filters={"status": status_filter, "user_email": user_email},
+            fields=fields,
+            date_from=date_from,
+            date_to=date_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/{stripe_checkout_session_id}")
 async def get_transaction_by_id(
     request: Request,
@@ -911,7 +988,7 @@ async def get_transaction_by_id(
 
         # Database Operations
         logger.info(f"🔄 Calling get_user_transaction({stripe_checkout_session_id})...")
-        transaction = await get_user_transaction(stripe_checkout_session_id)
+        transaction = await get_user_transaction(stripe_checkout_session_id, include_archived=True)
         logger.info(f"🔎 Database Result: found={transaction is not None}")
 
         if not transaction:
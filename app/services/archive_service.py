@@ -0,0 +1,324 @@
+"""
+Archive tier for historical records.
+
+Records older than a horizon (settings.archive_horizon_days) are moved out
+of the hot collections into monthly archive collections named
+`<collection>_archive_YYYY_MM`, keyed by the month of the record's date
+field. Every archive collection is listed in the `archive_manifest`
+collection with its record count and date range.
+
+Moves are crash-safe: a batch is copied (preserving _id) before it is
+deleted from the hot collection, and re-copying an already archived
+record is ignored, so an interrupted run can simply be repeated.
+
+Archived records are read-only. Detail lookups go through
+ArchiveService.find_one and opt in to the archive with
+`include_archived=True`; the returned document carries `archived: True`.
+Archive collections of a collection with a TTL index (webhook_events) get
+the same TTL index, so archiving never extends retention.
+
+Standalone CLI: scripts/archive_old_records.py
+"""
+
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import BulkWriteError
+
+from app.config import settings
+from app.database.mongodb import database
+from app.database.query_shapes import register_query_shape
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MANIFEST_COLLECTION = "archive_manifest"
+
+# MongoDB duplicate key error code (record already copied by an earlier run)
+DUPLICATE_KEY_ERROR = 11000
+
+# How long the list of archive collections per hot collection is cached
+MANIFEST_CACHE_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class ArchivePolicy:
+    """How one hot collection is archived."""
+
+    collection: str
+    date_field: str
+    lookup_keys: Tuple[str, ...]
+    # Cap for collections with a TTL index (archive before the TTL deletes)
+    max_horizon_days: Optional[int] = None
+    # Field of the hot collection's TTL index; the archive collections get
+    # the same index so archived records expire when they would have
+    ttl_field: Optional[str] = None
+
+
+ARCHIVE_POLICIES: Dict[str, ArchivePolicy] = {
+    "translation_transactions": ArchivePolicy("translation_transactions", "created_at", ("transaction_id",)),
+    "user_transactions": ArchivePolicy(
+        "user_transactions", "created_at", ("transaction_id", "stripe_checkout_session_id")
+    ),
+    "payments": ArchivePolicy("payments", "payment_date", ("stripe_payment_intent_id", "invoice_id")),
+    # webhook_events has a 90-day TTL index (ttl_90_days)
+    "webhook_events": ArchivePolicy(
+        "webhook_events", "created_at", ("event_id",), max_horizon_days=80, ttl_field="expires_at"
+    ),
+}
+
+for _policy in ARCHIVE_POLICIES.values():
+    register_query_shape(
+        f"{_policy.collection}.archive_candidates",
+        _policy.collection,
+        {_policy.date_field: {"$lt": datetime(2024, 1, 1, tzinfo=timezone.utc)}},
+        sort=[(_policy.date_field, 1)],
+        source="ArchiveService.archive_collection"
+    )
+
+register_query_shape(
+    "archive_manifest.by_collection",
+    ARCHIVE_MANIFEST_COLLECTION,
+    {"collection": "payments"},
+    sort=[("month", -1)],
+    source="ArchiveService.archive_collections"
+)
+
+
+def archive_collection_name(collection: str, when: datetime) -> str:
+    """Name of the monthly archive collection for a record dated `when`."""
+    return f"{collection}_archive_{when:%Y_%m}"
+
+
+class ArchiveService:
+    """Moves old records into monthly archive collections and reads them back."""
+
+    def __init__(self, db: Optional[AsyncIOMotorDatabase] = None):
+        """
+        Args:
+            db: Database to use (defaults to the application's connection)
+        """
+        self._db = db
+        self._indexed: set = set()
+        self._manifest_cache: Dict[str, Tuple[float, List[str]]] = {}
+
+    @property
+    def db(self) -> AsyncIOMotorDatabase:
+        return self._db if self._db is not None else database.db
+
+    @property
+    def manifest(self):
+        """Get the archive_manifest collection."""
+        return self.db[ARCHIVE_MANIFEST_COLLECTION]
+
+    def cutoff(self, collection: str, horizon_days: Optional[int] = None, now: Optional[datetime] = None) -> datetime:
+        """
+        Date before which records of `collection` are archived.
+
+        Raises:
+            KeyError: If the collection has no archive policy
+        """
+        policy = ARCHIVE_POLICIES[collection]
+        days = horizon_days if horizon_days is not None else settings.archive_horizon_days
+        if policy.max_horizon_days is not None:
+            days = min(days, policy.max_horizon_days)
+        return (now or datetime.now(timezone.utc)) - timedelta(days=days)
+
+    async def archive_collection(
+        self,
+        collection: str,
+        horizon_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        dry_run: bool = False,
+        now: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """
+        Move records older than the horizon into monthly archive collections.
+
+        Args:
+            collection: Hot collection name (must have an ARCHIVE_POLICIES entry)
+            horizon_days: Override settings.archive_horizon_days
+            batch_size: Records moved per batch (default: settings.archive_batch_size)
+            dry_run: Only count the records that would be archived
+            now: Reference time (for tests)
+
+        Returns:
+            dict: {"archived": n, "already_archived": n, "batches": n}
+
+        Raises:
+            KeyError: If the collection has no archive policy
+        """
+        policy = ARCHIVE_POLICIES[collection]
+        batch_size = batch_size or settings.archive_batch_size
+        hot = self.db[collection]
+        query = {policy.date_field: {"$lt": self.cutoff(collection, horizon_days, now)}}
+        totals = {"archived": 0, "already_archived": 0, "batches": 0}
+
+        if dry_run:
+            totals["archived"] = await hot.count_documents(query)
+            return totals
+
+        while True:
+            batch = await hot.find(query).sort(policy.date_field, ASCENDING).limit(batch_size).to_list(length=batch_size)
+            if not batch:
+                break
+
+            by_month: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+            for document in batch:
+                by_month[archive_collection_name(collection, document[policy.date_field])].append(document)
+
+            for archive_name, documents in by_month.items():
+                inserted = await self._copy_to_archive(policy, archive_name, documents)
+                await self._record_manifest(policy, archive_name, documents, inserted)
+                totals["archived"] += inserted
+                totals["already_archived"] += len(documents) - inserted
+
+            # Only delete once every record of the batch is in its archive collection
+            await hot.delete_many({"_id": {"$in": [document["_id"] for document in batch]}})
+            totals["batches"] += 1
+            logger.info(f"[ARCHIVE] {collection}: moved batch {totals['batches']} ({len(batch)} records)")
+
+        self._manifest_cache.pop(collection, None)
+        return totals
+
+    async def _copy_to_archive(self, policy: ArchivePolicy, archive_name: str, documents: List[Dict[str, Any]]) -> int:
+        """Insert documents into an archive collection; returns the number newly inserted."""
+        archive = self.db[archive_name]
+        if archive_name not in self._indexed:
+            indexes = (
+                [IndexModel([(key, ASCENDING)], name=f"{key}_idx") for key in policy.lookup_keys]
+                + [IndexModel([(policy.date_field, ASCENDING)], name=f"{policy.date_field}_idx")]
+            )
+            if policy.ttl_field:
+                indexes.append(
+                    IndexModel([(policy.ttl_field, ASCENDING)], expireAfterSeconds=0, name="ttl_90_days")
+                )
+            await archive.create_indexes(indexes)
+            self._indexed.add(archive_name)
+
+        try:
+            await archive.insert_many(documents, ordered=False)
+            return len(documents)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in write_errors):
+                raise
+            return len(documents) - len(write_errors)
+
+    async def _record_manifest(
+        self,
+        policy: ArchivePolicy,
+        archive_name: str,
+        documents: List[Dict[str, Any]],
+        inserted: int
+    ) -> None:
+        dates = [document[policy.date_field] for document in documents]
+        now = datetime.now(timezone.utc)
+        await self.manifest.update_one(
+            {"_id": archive_name},
+            {
+                "$setOnInsert": {
+                    "collection": policy.collection,
+                    "month": f"{dates[0]:%Y-%m}",
+                    "date_field": policy.date_field,
+                    "created_at": now,
+                },
+                "$inc": {"record_count": inserted},
+                "$min": {"first_date": min(dates)},
+                "$max": {"last_date": max(dates)},
+                "$set": {"updated_at": now},
+            },
+            upsert=True
+        )
+
+    async def archive_collections(self, collection: str) -> List[str]:
+        """
+        List the archive collections of a hot collection, newest month first.
+
+        Cached for MANIFEST_CACHE_SECONDS.
+        """
+        cached = self._manifest_cache.get(collection)
+        if cached and time.monotonic() - cached[0] < MANIFEST_CACHE_SECONDS:
+            return cached[1]
+
+        names = [
+            entry["_id"]
+            async for entry in self.manifest.find({"collection": collection}, {"_id": 1}).sort("month", -1)
+        ]
+        self._manifest_cache[collection] = (time.monotonic(), names)
+        return names
+
+    async def find_archived(
+        self,
+        collection: str,
+        query: Dict[str, Any],
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find matching records in the archive collections of `collection`.
+
+        All archive months are read in one round trip (a $unionWith
+        aggregation, newest month first), so a miss costs the same number of
+        round trips however long retention is. The server still runs `query`
+        once per archive month: it must use a field indexed in every archive
+        collection (the policy's lookup_keys, or _id).
+
+        Args:
+            collection: Hot collection name
+            query: Query as it would be issued against the hot collection
+            limit: Maximum number of documents returned (None for all)
+
+        Returns:
+            list: Archived documents with `archived: True`
+        """
+        archive_names = await self.archive_collections(collection)
+        if not archive_names or (limit is not None and limit <= 0):
+            return []
+
+        pipeline: List[Dict[str, Any]] = [{"$match": query}]
+        for archive_name in archive_names[1:]:
+            pipeline.append({"$unionWith": {"coll": archive_name, "pipeline": [{"$match": query}]}})
+        if limit is not None:
+            pipeline.append({"$limit": limit})
+
+        documents = await self.db[archive_names[0]].aggregate(pipeline).to_list(length=limit)
+        for document in documents:
+            document["archived"] = True
+        return documents
+
+    async def find_one_archived(self, collection: str, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Find a record in the archive collections of `collection` (see find_archived)."""
+        documents = await self.find_archived(collection, query, limit=1)
+        return documents[0] if documents else None
+
+    async def find_one(
+        self,
+        collection: str,
+        query: Dict[str, Any],
+        include_archived: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a record in the hot collection, falling back to its archive.
+
+        Args:
+            collection: Hot collection name
+            query: Query on the collection's lookup keys
+            include_archived: Search the archive tier on a hot miss (read-only
+                detail views only)
+
+        Returns:
+            dict: The document (archived ones carry `archived: True`), or None
+        """
+        document = await self.db[collection].find_one(query)
+        if document is None and include_archived:
+            document = await self.find_one_archived(collection, query)
+        return document
+
+
+# Global archive service instance
+archive_service = ArchiveService()
@@ -7,13 +7,17 @@ for enterprise users with company validation.
 
 import logging
 import secrets
-import bcrypt
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from bson import ObjectId
 
 from app.database.mongodb import database
 from app.config import settings
+from app.services.directory_cache import directory_cache
+from app.services.password_hasher import PasswordHasherBusy, password_hasher
+from app.services.token_revocation import token_digest, token_revocation
+from app.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +32,33 @@ class AuthService:
 
     SESSION_EXPIRATION_HOURS = 8
 
+    async def _upgrade_password_hash(
+        self,
+        collection,
+        query: Dict[str, Any],
+        field: str,
+        password: str,
+        password_hash: str
+    ) -> bool:
+        """
+        Store a new hash for a just-verified password if its bcrypt cost is outdated.
+
+        Failures are logged and ignored: the login succeeds either way and
+        the upgrade is retried on the next login.
+
+        Returns:
+            bool: True if a new hash was stored
+        """
+        new_hash = await password_hasher.rehash_if_needed(password, password_hash)
+        if new_hash is None:
+            return False
+        try:
+            await collection.update_one(query, {"$set": {field: new_hash}})
+        except Exception as e:
+            logger.warning(f"[AUTH] Failed to store upgraded password hash: {e}")
+            return False
+        return True
+
     async def authenticate_user(
         self,
         company_name: str,
@@ -64,7 +95,7 @@ class AuthService:
 
         # Step 1: Verify company exists by company_name
         logger.info(f"[AUTH] Step 1: Verifying company '{company_name}' exists...")
-        company = await database.company.find_one({"company_name": company_name})
+        company = await directory_cache.get_company(company_name)
         if not company:
             logger.warning(f"[AUTH] FAILED - Company not found: {company_name}")
             raise AuthenticationError("Invalid credentials")
@@ -81,11 +112,7 @@ class AuthService:
 
         # Enterprise users: Use company_users collection ONLY (no fallback to users)
         logger.info(f"[AUTH]   Looking up enterprise user in 'company_users' collection...")
-        user = await database.company_users.find_one({
-            "email": email,
-            "company_name": company_name,
-            "user_name": user_name
-        })
+        user = await directory_cache.get_company_user(company_name, email, user_name)
 
         collection_used = "company_users"
 
@@ -96,6 +123,18 @@ class AuthService:
             logger.warning(f"[AUTH]   Company Name: {company_name}")
             raise AuthenticationError("Invalid credentials")
 
+        # Status and password hash are never taken from the directory cache:
+        # a deactivation or password change made on another worker must apply
+        # to the next login, not once the cached entry expires
+        credentials = await database.company_users.find_one(
+            {"_id": user["_id"]}, {"status": 1, "password_hash": 1}
+        )
+        if not credentials:
+            logger.warning(f"[AUTH] FAILED - User no longer exists: {email}")
+            raise AuthenticationError("Invalid credentials")
+        user["status"] = credentials.get("status")
+        user["password_hash"] = credentials.get("password_hash")
+
         logger.info(f"[AUTH] SUCCESS - User found in '{collection_used}' collection")
         logger.info(f"[AUTH]   User ID: {user.get('user_id')}")
         logger.info(f"[AUTH]   User Name: {user.get('user_name')}")
@@ -120,23 +159,11 @@ class AuthService:
             raise AuthenticationError("Invalid credentials")
 
         try:
-            # Verify password with bcrypt - run in thread pool to avoid blocking event loop
-            # IMPORTANT: bcrypt has a 72-byte limit, so we truncate if needed
-            import asyncio
-            from functools import partial
-
-            password_bytes = password.encode('utf-8')[:72]  # Truncate to 72 bytes (bcrypt limit)
-
-            loop = asyncio.get_event_loop()
-            password_valid = await loop.run_in_executor(
-                None,  # Use default ThreadPoolExecutor
-                partial(
-                    bcrypt.checkpw,
-                    password_bytes,
-                    password_hash.encode('utf-8')
-                )
-            )
+            # Verify password in the dedicated bcrypt pool (raises PasswordHasherBusy under login storms)
+            password_valid = await password_hasher.verify(password, password_hash)
             logger.info(f"[AUTH] Password verification completed (non-blocking)")
+        except PasswordHasherBusy:
+            raise
         except Exception as e:
             logger.error(f"[AUTH] FAILED - Error verifying password: {e}")
             raise AuthenticationError("Invalid credentials")
@@ -146,6 +173,10 @@ class AuthService:
             raise AuthenticationError("Invalid credentials")
 
         logger.info(f"[AUTH] SUCCESS - Password verified with bcrypt")
+        if await self._upgrade_password_hash(
+            database.company_users, {"_id": user["_id"]}, "password_hash", password, password_hash
+        ):
+            directory_cache.invalidate_users(company_name)
 
         # Step 5: Create JWT token (NO DATABASE STORAGE - self-contained!)
         logger.info(f"[AUTH] Step 5: Creating JWT access token...")
@@ -276,21 +307,20 @@ class AuthService:
             "expires_at": expires_at.isoformat()
         }
 
+    @traced("auth.verify_session")
     async def verify_session(self, session_token: str) -> Optional[Dict[str, Any]]:
         """
         Verify JWT token and return user data if valid.
 
         NO DATABASE QUERIES - Token is self-contained!
-        Verification is INSTANT.
+        Verification is INSTANT (cached claims, then the revocation bloom filter).
 
         Args:
             session_token: The JWT token to verify
 
         Returns:
-            dict: User data if valid, None otherwise
+            dict: User data if valid and not revoked, None otherwise
         """
-        logger.info(f"[AUTH] Verifying JWT token: {session_token[:8]}...{session_token[-8:]}")
-
         # Verify JWT token (NO DATABASE LOOKUP!)
         from app.services.jwt_service import jwt_service
 
@@ -300,10 +330,14 @@ class AuthService:
             logger.warning(f"[AUTH] JWT token verification failed (invalid or expired)")
             return None
 
-        logger.info(f"[AUTH] JWT token verified successfully - NO DATABASE QUERIES!")
-        logger.info(f"[AUTH]   User: {user_data.get('email')}")
-        logger.info(f"[AUTH]   Company: {user_data.get('company_name')}")
-        logger.info(f"[AUTH]   Permission: {user_data.get('permission_level')}")
+        if await token_revocation.is_revoked(token_digest(session_token)):
+            logger.warning(f"[AUTH] JWT token revoked (logged out) - User: {user_data.get('email')}")
+            return None
+
+        logger.debug(
+            "[AUTH] JWT token verified - User: %s, Company: %s, Permission: %s",
+            user_data.get("email"), user_data.get("company_name"), user_data.get("permission_level")
+        )
 
         return user_data
 
@@ -311,31 +345,32 @@ class AuthService:
         """
         Invalidate (logout) a session.
 
+        The token is added to the revocation list until it expires, so
+        verify_session rejects it from now on (on other workers within
+        settings.token_revocation_sync_seconds).
+
         Args:
             session_token: The session token to invalidate
 
         Returns:
-            bool: True if session was invalidated, False otherwise
+            bool: True if session was invalidated (or had already expired),
+                False if the token is not a valid session token
         """
         logger.info(f"[AUTH] Invalidating session: {session_token[:8]}...{session_token[-8:]}")
 
-        # COMMENTED OUT - Short-term solution: Sessions table updates disabled
-        # result = await database.sessions.update_one(
-        #     {"session_token": session_token},
-        #     {"$set": {"is_active": False}}
-        # )
-        #
-        # if result.modified_count > 0:
-        #     logger.info(f"[AUTH] Session invalidated successfully")
-        #     logger.info(f"[AUTH]   Documents modified: {result.modified_count}")
-        #     return True
-        #
-        # logger.warning(f"[AUTH] Session not found for invalidation")
-        # logger.warning(f"[AUTH]   Token: {session_token[:8]}...{session_token[-8:]}")
-        # return False
-
-        logger.info(f"[AUTH] Session invalidation SKIPPED (commented out for short-term solution)")
-        return True  # Return True since JWT is stateless and doesn't need database invalidation
+        from app.services.jwt_service import jwt_service
+
+        expires_at = jwt_service.token_expiry(session_token)
+        if expires_at is None:
+            logger.warning(f"[AUTH] Session not found for invalidation (invalid token)")
+            return False
+
+        if expires_at > time.time():
+            await token_revocation.revoke(token_digest(session_token), expires_at)
+        jwt_service.evict(session_token)
+
+        logger.info(f"[AUTH] Session invalidated (revoked until {datetime.fromtimestamp(expires_at, timezone.utc).isoformat()})")
+        return True
 
     async def authenticate_individual_user(
         self,
@@ -545,23 +580,11 @@ class AuthService:
             raise AuthenticationError("Invalid credentials")
 
         try:
-            # Verify password with bcrypt - run in thread pool to avoid blocking event loop
-            # IMPORTANT: bcrypt has a 72-byte limit, so we truncate if needed
-            import asyncio
-            from functools import partial
-
-            password_bytes = password.encode('utf-8')[:72]  # Truncate to 72 bytes (bcrypt limit)
-
-            loop = asyncio.get_event_loop()
-            password_valid = await loop.run_in_executor(
-                None,  # Use default ThreadPoolExecutor
-                partial(
-                    bcrypt.checkpw,
-                    password_bytes,
-                    password_hash.encode('utf-8')
-                )
-            )
+            # Verify password in the dedicated bcrypt pool (raises PasswordHasherBusy under login storms)
+            password_valid = await password_hasher.verify(password, password_hash)
             logger.info(f"[AUTH ADMIN] Password verification completed (non-blocking)")
+        except PasswordHasherBusy:
+            raise
         except Exception as e:
             logger.error(f"[AUTH ADMIN] FAILED - Error verifying password: {e}")
             raise AuthenticationError("Invalid credentials")
@@ -571,6 +594,9 @@ class AuthService:
             raise AuthenticationError("Invalid credentials")
 
         logger.info(f"[AUTH ADMIN] SUCCESS - Password verified with bcrypt")
+        await self._upgrade_password_hash(
+            database.db["iris-admins"], {"_id": admin["_id"]}, "password", password, password_hash
+        )
 
         # Step 3: Create JWT token with admin permission level
         logger.info(f"[AUTH ADMIN] Step 3: Creating JWT access token with admin claims...")
@@ -0,0 +1,203 @@
+"""
+Read-through cache for the company directory (company and company_users).
+
+The same few documents are read on almost every enterprise request:
+translate_files and subscription creation check that the company exists,
+corporate login reads the company and then the user, and invoice emails
+read the company's contact. Those reads now go through this cache:
+
+- entries expire after settings.directory_cache_ttl_seconds (0 disables
+  the cache); at most settings.directory_cache_size entries are kept (LRU)
+- the write endpoints (routers/companies.py, routers/company_users.py)
+  invalidate what they change, so this worker sees its own writes at once
+- other workers see a change within the TTL, or at once when
+  settings.directory_cache_change_stream is enabled (needs a replica set):
+  every change event on either collection clears that collection's entries,
+  except updates touching only the fields every login writes (last_login,
+  updated_at), which would otherwise empty the user cache on each login
+- login does not trust cached credentials: auth_service re-reads a user's
+  status and password_hash by _id, so a deactivation or password change on
+  another worker applies to the next login, not after the TTL
+- misses are not cached, so a company created on another worker is usable
+  immediately
+
+Callers get a copy of the cached document and may modify it.
+
+Usage:
+    company = await directory_cache.get_company(company_name)
+    user = await directory_cache.get_company_user(company_name, email, user_name)
+
+    directory_cache.invalidate_company(company_name)
+    directory_cache.invalidate_users(company_name)
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo.errors import OperationFailure
+
+from app.config import settings
+from app.database.mongodb import database
+from app.utils.metrics import DIRECTORY_CACHE_REQUESTS, CallbackMetric
+
+logger = logging.getLogger(__name__)
+
+COMPANIES = "company"
+USERS = "company_users"
+
+# Delay before re-opening a change stream that failed
+CHANGE_STREAM_RETRY_SECONDS = 5.0
+
+# Fields written on every successful login (auth_service.authenticate_user);
+# an update touching only these does not change what the cache serves
+LOGIN_ONLY_FIELDS = frozenset({"last_login", "updated_at"})
+
+
+def is_login_only_update(change: Dict[str, Any]) -> bool:
+    """True for a change event that only records a login."""
+    if change.get("operationType") != "update":
+        return False
+    description = change.get("updateDescription") or {}
+    updated_fields = description.get("updatedFields") or {}
+    return (
+        bool(updated_fields)
+        and set(updated_fields) <= LOGIN_ONLY_FIELDS
+        and not description.get("removedFields")
+    )
+
+
+class DirectoryCache:
+    """TTL + LRU cache of company and company user documents."""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            ttl: Seconds an entry is served (default: settings.directory_cache_ttl_seconds, 0 disables)
+            max_entries: Entries kept (default: settings.directory_cache_size)
+        """
+        self.ttl = settings.directory_cache_ttl_seconds if ttl is None else ttl
+        self.max_entries = settings.directory_cache_size if max_entries is None else max_entries
+        # (collection, *lookup fields) -> (document, expires at (monotonic))
+        self._entries: "OrderedDict[Tuple[str, ...], Tuple[Dict[str, Any], float]]" = OrderedDict()
+        # Bumped on every invalidation of a collection: a lookup that started
+        # before it must not store what it read
+        self._generations: Dict[str, int] = {COMPANIES: 0, USERS: 0}
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    async def get_company(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """Company document by company_name, None if it does not exist."""
+        return await self._get(
+            (COMPANIES, company_name),
+            lambda: database.company.find_one({"company_name": company_name})
+        )
+
+    async def get_company_user(self, company_name: str, email: str, user_name: str) -> Optional[Dict[str, Any]]:
+        """Company user document by company, email and user name, None if it does not exist."""
+        return await self._get(
+            (USERS, company_name, email, user_name),
+            lambda: database.company_users.find_one({
+                "email": email,
+                "company_name": company_name,
+                "user_name": user_name
+            })
+        )
+
+    async def _get(self, key: Tuple[str, ...], load) -> Optional[Dict[str, Any]]:
+        collection = key[0]
+        if not self.enabled:
+            return await load()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            document, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                DIRECTORY_CACHE_REQUESTS.labels(collection, "hit").inc()
+                return copy.deepcopy(document)
+            del self._entries[key]
+        DIRECTORY_CACHE_REQUESTS.labels(collection, "miss").inc()
+
+        generation = self._generations[collection]
+        document = await load()
+        if document is not None and self._generations[collection] == generation:
+            self._entries[key] = (copy.deepcopy(document), time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return document
+
+    def _invalidate(self, collection: str, company_name: Optional[str] = None) -> None:
+        self._generations[collection] += 1
+        stale = [
+            key for key in self._entries
+            if key[0] == collection and (company_name is None or key[1] == company_name)
+        ]
+        for key in stale:
+            del self._entries[key]
+
+    def invalidate_company(self, company_name: Optional[str] = None) -> None:
+        """Drop a cached company (every company when company_name is None)."""
+        self._invalidate(COMPANIES, company_name)
+
+    def invalidate_users(self, company_name: Optional[str] = None) -> None:
+        """Drop the cached users of a company (every user when company_name is None)."""
+        self._invalidate(USERS, company_name)
+
+    def clear(self) -> None:
+        self.invalidate_company()
+        self.invalidate_users()
+
+    def start_change_stream(self) -> None:
+        """Invalidate on changes made by other workers (no-op when already running)."""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.get_running_loop().create_task(
+                self._watch_changes(), name="directory-cache-change-stream"
+            )
+
+    async def stop_change_stream(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch_changes(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": [COMPANIES, USERS]}}}]
+        while True:
+            try:
+                async with database.db.watch(pipeline) as stream:
+                    logger.info("[DIRECTORY CACHE] Watching company and company_users for changes")
+                    # Changes made before the stream opened were not seen
+                    self.clear()
+                    async for change in stream:
+                        if not is_login_only_update(change):
+                            self._invalidate(change["ns"]["coll"])
+            except OperationFailure as e:
+                # e.g. standalone server: change streams need a replica set
+                logger.warning(f"[DIRECTORY CACHE] Change stream unavailable, relying on TTL: {e}")
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[DIRECTORY CACHE] Change stream failed, reopening: {type(e).__name__}: {e}")
+                self.clear()
+                await asyncio.sleep(CHANGE_STREAM_RETRY_SECONDS)
+
+
+# Global directory cache instance
+directory_cache = DirectoryCache()
+
+CallbackMetric(
+    "directory_cache_entries", "Company and company user documents in the directory cache", [],
+    lambda: [((), len(directory_cache._entries))]
+)
@@ -4,11 +4,13 @@ Email service for sending translation notification emails via SMTP.
 
 import logging
 import smtplib
+import time
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime, timezone
 
 from app.config import settings
@@ -20,6 +22,8 @@ from app.models.email import (
     EmailSendResult
 )
 from app.services.template_service import template_service
+from app.utils.metrics import SMTP_SEND_SECONDS
+from app.utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -160,6 +164,33 @@ class EmailService:
             logger.error(f"Unexpected error creating SMTP connection: {e}")
             raise EmailServiceError(f"Unexpected error creating SMTP connection: {e}")
 
+    @contextmanager
+    def _smtp_session(self, kind: str, debug_level: int = 0) -> Iterator[smtplib.SMTP]:
+        """
+        SMTP connection for one send, closed on exit.
+
+        The whole session (connect, login, send, quit) is recorded in
+        smtp_send_duration_seconds with outcome "ok" or "error", and as a
+        "smtp.<kind>" trace span.
+
+        Args:
+            kind: Email kind label (e.g. "notification", "invoice")
+            debug_level: SMTP debug level (see _create_smtp_connection)
+        """
+        start_time = time.perf_counter()
+        outcome = "error"
+        try:
+            with span(f"smtp.{kind}"):
+                smtp = self._create_smtp_connection(debug_level=debug_level)
+                try:
+                    yield smtp
+                    outcome = "ok"
+                finally:
+                    smtp.quit()
+                    logger.debug("SMTP connection closed")
+        finally:
+            SMTP_SEND_SECONDS.labels(kind, outcome).observe(time.perf_counter() - start_time)
+
     def _build_email_message(
         self,
         to_email: str,
@@ -321,8 +352,7 @@ class EmailService:
             # Create SMTP connection and send
             debug_level = 2 if debug else 0
             logger.info(f"Creating SMTP connection (debug_level={debug_level})")
-            smtp = self._create_smtp_connection(debug_level=debug_level)
-            try:
+            with self._smtp_session("notification", debug_level=debug_level) as smtp:
                 logger.info(f"Sending email message to {email_request.to_email}")
                 logger.debug(
                     "SMTP send_message parameters",
@@ -349,10 +379,6 @@ class EmailService:
                     sent_at=datetime.now(timezone.utc).isoformat()
                 )
 
-            finally:
-                smtp.quit()
-                logger.debug("SMTP connection closed")
-
         except EmailServiceError as e:
             logger.error(
                 f"❌ Email service error: {e}",
@@ -1006,9 +1032,7 @@ This is a minimal test email from the translation service.
 
             # Send email via SMTP
             logger.info(f"Connecting to SMTP server: {self.smtp_host}:{self.smtp_port}")
-            smtp = self._create_smtp_connection()
-
-            try:
+            with self._smtp_session("invoice") as smtp:
                 logger.info(f"Sending invoice email to {recipient_email}...")
                 smtp.sendmail(
                     self.email_from,
@@ -1024,10 +1048,6 @@ This is a minimal test email from the translation service.
                     sent_at=datetime.now(timezone.utc).isoformat()
                 )
 
-            finally:
-                smtp.quit()
-                logger.info("SMTP connection closed")
-
         except Exception as e:
             logger.error(f"Failed to send invoice email: {e}", exc_info=True)
             return EmailSendResult(
@@ -0,0 +1,300 @@
+"""
+Streaming exports of payments, user transactions and invoices.
+
+Exports iterate a single MongoDB cursor (fetched in batches of
+settings.export_batch_size) and write NDJSON or CSV rows to a
+StreamingResponse as the batches arrive, so memory stays constant no
+matter how many records match.
+
+Exports read from the analytics client profile. Its per-operation time
+limit is raised to settings.export_timeout_seconds for the lifetime of the
+export cursor.
+
+Usage (in a router):
+    return export_service.streaming_response(
+        "payments", "csv", filters={"status": "COMPLETED"}, fields="amount,payment_date"
+    )
+"""
+
+import csv
+import io
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import orjson
+import pymongo
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config import settings
+from app.database.mongodb import database
+from app.models.user_transaction import TRANSACTION_FIELD_MAPPINGS
+from app.utils.serialization import dumps, serialize_for_json
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """What one export reads and which filters it accepts."""
+
+    collection: str
+    date_field: str
+    # Exportable top-level fields (default column set, in order)
+    fields: Tuple[str, ...]
+    # Filter name (query parameter) -> document field (equality match)
+    filters: Tuple[Tuple[str, str], ...]
+    # Legacy document field -> column it is read into when the column's own
+    # field is missing (records written before a field was renamed)
+    legacy_fields: Tuple[Tuple[str, str], ...] = ()
+
+
+EXPORT_SPECS: Dict[str, ExportSpec] = {
+    "payments": ExportSpec(
+        collection="payments",
+        date_field="payment_date",
+        fields=(
+            "_id", "company_name", "user_email", "stripe_payment_intent_id", "amount", "currency",
+            "payment_status", "total_refunded", "invoice_id", "subscription_id", "payment_date",
+            "created_at", "updated_at",
+        ),
+        filters=(("status", "payment_status"), ("company_name", "company_name")),
+    ),
+    "user_transactions": ExportSpec(
+        collection="user_transactions",
+        date_field="date",
+        fields=(
+            "_id", "transaction_id", "user_name", "user_email", "source_language", "target_language",
+            "number_of_units", "unit_type", "cost_per_unit", "total_cost", "status", "payment_status",
+            "amount_cents", "currency", "stripe_checkout_session_id", "date", "created_at", "updated_at",
+        ),
+        filters=(("status", "status"), ("user_email", "user_email")),
+        legacy_fields=tuple(TRANSACTION_FIELD_MAPPINGS.items()),
+    ),
+    "invoices": ExportSpec(
+        collection="invoices",
+        date_field="invoice_date",
+        fields=(
+            "_id", "invoice_number", "company_name", "subscription_id", "invoice_date", "due_date",
+            "status", "subtotal", "tax_amount", "total_amount", "amount_paid", "amount_due",
+            "billing_period", "created_at", "updated_at",
+        ),
+        filters=(("status", "status"), ("company_name", "company_name")),
+    ),
+}
+
+
+def _csv_value(value: Any) -> Any:
+    """Flatten a document value into a CSV cell."""
+    if value is None:
+        return ""
+    value = serialize_for_json(value)
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode("utf-8")
+    return value
+
+
+class ExportService:
+    """Builds export queries and streams cursor results as NDJSON or CSV."""
+
+    def __init__(self, db: Optional[AsyncIOMotorDatabase] = None):
+        """
+        Args:
+            db: Database to read from (defaults to the analytics client profile)
+        """
+        self._db = db
+
+    @property
+    def db(self) -> AsyncIOMotorDatabase:
+        return self._db if self._db is not None else database.analytics
+
+    def resolve_fields(self, name: str, fields: Optional[str] = None) -> List[str]:
+        """
+        Columns of an export: the requested comma-separated subset, or all.
+
+        Raises:
+            KeyError: If the export does not exist
+            ValueError: If a requested field is not exportable
+        """
+        spec = EXPORT_SPECS[name]
+        if not fields:
+            return list(spec.fields)
+
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in spec.fields]
+        if unknown:
+            raise ValueError(
+                f"Unknown export fields: {', '.join(unknown)}. Allowed: {', '.join(spec.fields)}"
+            )
+        return requested
+
+    def build_query(
+        self,
+        name: str,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the MongoDB filter of an export.
+
+        Args:
+            name: Export name (EXPORT_SPECS key)
+            filters: Filter name -> value (None values are ignored)
+            date_from: Inclusive lower bound on the export's date field
+            date_to: Inclusive upper bound on the export's date field
+
+        Raises:
+            KeyError: If the export does not exist
+            ValueError: If a filter is not supported by the export
+        """
+        spec = EXPORT_SPECS[name]
+        allowed = dict(spec.filters)
+        query: Dict[str, Any] = {}
+
+        for filter_name, value in (filters or {}).items():
+            if value is None:
+                continue
+            if filter_name not in allowed:
+                raise ValueError(f"Unsupported filter for {name} export: {filter_name}")
+            query[allowed[filter_name]] = value
+
+        if date_from or date_to:
+            date_query: Dict[str, Any] = {}
+            if date_from:
+                date_query["$gte"] = date_from
+            if date_to:
+                date_query["$lte"] = date_to
+            query[spec.date_field] = date_query
+
+        return query
+
+    async def iter_documents(
+        self,
+        name: str,
+        query: Dict[str, Any],
+        fields: List[str],
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the matching documents from a single cursor, in _id order."""
+        spec = EXPORT_SPECS[name]
+        projection = {field: 1 for field in fields}
+        legacy_fields = [(legacy, column) for legacy, column in spec.legacy_fields if column in fields]
+        for legacy, _ in legacy_fields:
+            projection[legacy] = 1
+        if "_id" not in fields:
+            projection["_id"] = 0
+
+        # Exports outlive the analytics profile's per-operation time limit
+        with pymongo.timeout(settings.export_timeout_seconds):
+            cursor = (
+                self.db[spec.collection]
+                .find(query, projection)
+                .sort("_id", pymongo.ASCENDING)
+                .batch_size(batch_size or settings.export_batch_size)
+            )
+            async for document in cursor:
+                for legacy, column in legacy_fields:
+                    value = document.pop(legacy, None)
+                    if document.get(column) is None:
+                        document[column] = value
+                yield document
+
+    async def iter_ndjson(self, documents: AsyncIterator[Dict[str, Any]], chunk_rows: int) -> AsyncIterator[bytes]:
+        """Encode documents as NDJSON, flushing every `chunk_rows` lines."""
+        lines: List[bytes] = []
+        async for document in documents:
+            lines.append(dumps(document))
+            if len(lines) >= chunk_rows:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+
+    async def iter_csv(
+        self,
+        documents: AsyncIterator[Dict[str, Any]],
+        fields: List[str],
+        chunk_rows: int
+    ) -> AsyncIterator[bytes]:
+        """Encode documents as CSV (header row first), flushing every `chunk_rows` rows."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        rows = 0
+
+        async for document in documents:
+            writer.writerow([_csv_value(document.get(field)) for field in fields])
+            rows += 1
+            if rows >= chunk_rows:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+                rows = 0
+
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def streaming_response(
+        self,
+        name: str,
+        export_format: str,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+        fields: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        batch_size: Optional[int] = None
+    ) -> StreamingResponse:
+        """
+        Build a StreamingResponse for an export.
+
+        Args:
+            name: Export name (EXPORT_SPECS key)
+            export_format: "ndjson" or "csv"
+            filters: Filter name -> value
+            fields: Comma-separated field subset (default: all exportable fields)
+            date_from: Inclusive lower bound on the export's date field
+            date_to: Inclusive upper bound on the export's date field
+            batch_size: Cursor batch size (default: settings.export_batch_size)
+
+        Returns:
+            StreamingResponse with a Content-Disposition attachment filename
+
+        Raises:
+            KeyError: If the export does not exist
+            ValueError: On an unknown format, field or filter (validated
+                before streaming starts, so callers can return 400)
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+        columns = self.resolve_fields(name, fields)
+        query = self.build_query(name, filters, date_from, date_to)
+        batch_size = batch_size or settings.export_batch_size
+        documents = self.iter_documents(name, query, columns, batch_size)
+
+        if export_format == "csv":
+            body = self.iter_csv(documents, columns, batch_size)
+        else:
+            body = self.iter_ndjson(documents, batch_size)
+
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        logger.info(f"[EXPORT] {name} ({export_format}): query={query}, fields={len(columns)}")
+        return StreamingResponse(
+            body,
+            media_type=MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{name}_{timestamp}.{export_format}"'}
+        )
+
+
+# Global export service instance
+export_service = ExportService()
@@ -14,6 +14,7 @@ from datetime import datetime, timedelta, timezone
 from app.config import settings
 from app.models.responses import FileInfo, FileType
 from app.services.page_counter_service import page_counter_service
+from app.utils.structured_logging import legacy_print
 
 
 class FileService:
@@ -43,7 +44,7 @@ class FileService:
         Raises:
             HTTPException: If file validation fails
         """
-        print(f"Hello World - File upload stub for: {file.filename}")
+        legacy_print(f"Hello World - File upload stub for: {file.filename}")
         
         # Generate stub file ID
         file_id = str(uuid.uuid4())
@@ -57,7 +58,7 @@ class FileService:
             checksum="stub_checksum_123456789"
         )
         
-        print(f"Hello World - Generated stub file_id: {file_id}")
+        legacy_print(f"Hello World - Generated stub file_id: {file_id}")
         return file_id, file_info
     
     async def get_file_content(self, file_id: str) -> bytes:
@@ -73,7 +74,7 @@ class FileService:
         Raises:
             HTTPException: If file not found
         """
-        print(f"Hello World - Getting file content stub for: {file_id}")
+        legacy_print(f"Hello World - Getting file content stub for: {file_id}")
         
         # Return stub content
         return f"Hello World - Stub file content for {file_id}".encode('utf-8')
@@ -91,7 +92,7 @@ class FileService:
         Raises:
             HTTPException: If file not found
         """
-        print(f"Hello World - Getting file info stub for: {file_id}")
+        legacy_print(f"Hello World - Getting file info stub for: {file_id}")
         
         # Return stub file info
         return FileInfo(
@@ -148,7 +149,7 @@ class FileService:
         Returns:
             Dictionary with files list and pagination info
         """
-        print(f"Hello World - File listing stub - page {page}, size {page_size}, type: {file_type}, search: {search}")
+        legacy_print(f"Hello World - File listing stub - page {page}, size {page_size}, type: {file_type}, search: {search}")
         
         # Return stub file list
         stub_files = [
@@ -191,7 +192,7 @@ class FileService:
         Raises:
             HTTPException: If file not found or text extraction fails
         """
-        print(f"Hello World - Text extraction stub for file: {file_id}")
+        legacy_print(f"Hello World - Text extraction stub for file: {file_id}")
         
         # Return stub extracted text
         return f"Hello World - This is stub extracted text content from file {file_id}. This would normally contain the actual file content ready for translation."
@@ -206,11 +207,11 @@ class FileService:
         Returns:
             Number of files deleted
         """
-        print(f"Hello World - Cleanup temp files stub - max age: {max_age_hours} hours")
+        legacy_print(f"Hello World - Cleanup temp files stub - max age: {max_age_hours} hours")
         
         # Return stub deleted count
         stub_deleted_count = 3
-        print(f"Hello World - Stubbed cleanup deleted {stub_deleted_count} files")
+        legacy_print(f"Hello World - Stubbed cleanup deleted {stub_deleted_count} files")
         return stub_deleted_count
     
     async def get_page_count(self, file_id: str) -> int:
@@ -228,7 +229,7 @@ class FileService:
                 file_id, str(self.upload_dir)
             )
         except Exception as e:
-            print(f"Error getting page count for file {file_id}: {e}")
+            legacy_print(f"Error getting page count for file {file_id}: {e}")
             return -1
     
     async def get_file_info_with_pages(self, file_id: str) -> Dict[str, Any]:
@@ -313,7 +314,7 @@ class FileService:
     
     def _detect_file_type(self, content: bytes, filename: str) -> FileType:
         """Detect file type from content and filename - STUB IMPLEMENTATION."""
-        print(f"Hello World - File type detection stub for: {filename}")
+        legacy_print(f"Hello World - File type detection stub for: {filename}")
         
         # Simple stub - just use file extension
         extension = self._get_file_extension(filename).lower().lstrip('.')
@@ -356,32 +357,32 @@ class FileService:
     
     async def _extract_text_from_txt(self, file_path: Path) -> str:
         """Extract text from TXT file - STUB IMPLEMENTATION."""
-        print(f"Hello World - TXT text extraction stub for: {file_path}")
+        legacy_print(f"Hello World - TXT text extraction stub for: {file_path}")
         return f"Hello World - Stub TXT content from {file_path.name}"
     
     async def _extract_text_from_doc(self, file_path: Path) -> str:
         """Extract text from DOC file - STUB IMPLEMENTATION."""
-        print(f"Hello World - DOC text extraction stub for: {file_path}")
+        legacy_print(f"Hello World - DOC text extraction stub for: {file_path}")
         return f"Hello World - Stub DOC content from {file_path.name}"
     
     async def _extract_text_from_docx(self, file_path: Path) -> str:
         """Extract text from DOCX file - STUB IMPLEMENTATION."""
-        print(f"Hello World - DOCX text extraction stub for: {file_path}")
+        legacy_print(f"Hello World - DOCX text extraction stub for: {file_path}")
         return f"Hello World - Stub DOCX content from {file_path.name}"
     
     async def _extract_text_from_pdf(self, file_path: Path) -> str:
         """Extract text from PDF file - STUB IMPLEMENTATION."""
-        print(f"Hello World - PDF text extraction stub for: {file_path}")
+        legacy_print(f"Hello World - PDF text extraction stub for: {file_path}")
         return f"Hello World - Stub PDF content from {file_path.name}"
     
     async def _extract_text_from_rtf(self, file_path: Path) -> str:
         """Extract text from RTF file - STUB IMPLEMENTATION."""
-        print(f"Hello World - RTF text extraction stub for: {file_path}")
+        legacy_print(f"Hello World - RTF text extraction stub for: {file_path}")
         return f"Hello World - Stub RTF content from {file_path.name}"
     
     async def _extract_text_from_odt(self, file_path: Path) -> str:
         """Extract text from ODT file - STUB IMPLEMENTATION."""
-        print(f"Hello World - ODT text extraction stub for: {file_path}")
+        legacy_print(f"Hello World - ODT text extraction stub for: {file_path}")
         return f"Hello World - Stub ODT content from {file_path.name}"
 
 
@@ -24,6 +24,9 @@ from googleapiclient.errors import HttpError
 import json
 
 from app.config import settings
+from app.utils.metrics import DRIVE_CALL_SECONDS
+from app.utils.tracing import span
+from app.utils.structured_logging import legacy_print
 from app.exceptions.google_drive_exceptions import (
     GoogleDriveError,
     GoogleDriveAuthenticationError,
@@ -36,6 +39,31 @@ from app.exceptions.google_drive_exceptions import (
 T = TypeVar('T')
 
 
+def observe_drive_call(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Record the latency of each call in google_drive_call_duration_seconds
+    and as a "drive.<operation>" trace span.
+
+    The operation label is the function name without the leading underscore
+    and the "_with_retry" suffix (e.g. _upload_file_with_retry -> upload_file).
+    """
+    operation = func.__name__.lstrip("_").removesuffix("_with_retry")
+
+    @wraps(func)
+    async def timed(*args, **kwargs) -> T:
+        start_time = time.perf_counter()
+        outcome = "error"
+        try:
+            with span(f"drive.{operation}"):
+                result = await func(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            DRIVE_CALL_SECONDS.labels(operation, outcome).observe(time.perf_counter() - start_time)
+
+    return timed
+
+
 def retry_on_ssl_error(
     max_retries: int = 5,
     initial_delay: float = 1.0,
@@ -63,6 +91,9 @@ def retry_on_ssl_error(
         Decorated async function with retry logic
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        # Every attempt is timed separately (retries included)
+        timed_func = observe_drive_call(func)
+
         @wraps(func)
         async def wrapper(*args, **kwargs) -> T:
             last_exception = None
@@ -71,7 +102,7 @@ def retry_on_ssl_error(
             for attempt in range(max_retries + 1):
                 try:
                     # Attempt to execute the function
-                    return await func(*args, **kwargs)
+                    return await timed_func(*args, **kwargs)
 
                 except ssl.SSLError as e:
                     last_exception = e
@@ -653,43 +684,43 @@ class GoogleDriveService:
         """
         if company_name:
             logging.info(f"Moving {len(file_ids)} files to Inbox for enterprise: {company_name}/{customer_email}")
-            print(f"Google Drive: Moving {len(file_ids)} files to Inbox for {company_name}/{customer_email}")
+            legacy_print(f"Google Drive: Moving {len(file_ids)} files to Inbox for {company_name}/{customer_email}")
         else:
             logging.info(f"Moving {len(file_ids)} files to Inbox for {customer_email}")
-            print(f"Google Drive: Moving {len(file_ids)} files to Inbox for {customer_email}")
-        print(f"Files to move: {file_ids}")
+            legacy_print(f"Google Drive: Moving {len(file_ids)} files to Inbox for {customer_email}")
+        legacy_print(f"Files to move: {file_ids}")
 
         # Use parent_folder_id directly as root (parent folder IS the root folder)
         root_folder_id = self.parent_folder_id
-        print(f"Root folder ID: {root_folder_id}")
+        legacy_print(f"Root folder ID: {root_folder_id}")
 
         # For enterprise, navigate through company folder first
         if company_name:
             company_folder_id = await self._find_or_create_folder(company_name, root_folder_id)
-            print(f"Company folder ID: {company_folder_id}")
+            legacy_print(f"Company folder ID: {company_folder_id}")
             parent_folder_id = company_folder_id
         else:
             parent_folder_id = root_folder_id
 
         customer_folder_id = await self._find_or_create_folder(customer_email, parent_folder_id)
-        print(f"Customer folder ID: {customer_folder_id}")
+        legacy_print(f"Customer folder ID: {customer_folder_id}")
 
         # Get BOTH Temp and Inbox folder IDs - we know the structure!
         temp_folder_id = await self._find_or_create_folder("Temp", customer_folder_id)
         inbox_folder_id = await self._find_or_create_folder("Inbox", customer_folder_id)
-        print(f"Temp folder ID: {temp_folder_id}")
-        print(f"Inbox folder ID: {inbox_folder_id}")
+        legacy_print(f"Temp folder ID: {temp_folder_id}")
+        legacy_print(f"Inbox folder ID: {inbox_folder_id}")
 
         moved_files = []
         failed_moves = []
 
         # Move files one by one - simple and reliable
-        print(f"📦 Moving {len(file_ids)} files from Temp to Inbox...")
+        legacy_print(f"📦 Moving {len(file_ids)} files from Temp to Inbox...")
         start_time = asyncio.get_event_loop().time()
 
         for index, file_id in enumerate(file_ids, 1):
             try:
-                print(f"   [{index}/{len(file_ids)}] Moving {file_id}...")
+                legacy_print(f"   [{index}/{len(file_ids)}] Moving {file_id}...")
 
                 # Move file: remove from Temp, add to Inbox
                 # Wrap in retry logic to handle SSL errors
@@ -700,7 +731,7 @@ class GoogleDriveService:
                 )
 
                 file_name = updated_file.get('name', 'Unknown')
-                print(f"   ✓ [{index}/{len(file_ids)}] Moved: {file_name}")
+                legacy_print(f"   ✓ [{index}/{len(file_ids)}] Moved: {file_name}")
                 logging.info(f"Successfully moved file {file_id} ({file_name}) to Inbox")
 
                 moved_files.append({
@@ -713,7 +744,7 @@ class GoogleDriveService:
 
             except Exception as e:
                 error_msg = str(e)
-                print(f"   ✗ [{index}/{len(file_ids)}] Failed to move {file_id}: {error_msg}")
+                legacy_print(f"   ✗ [{index}/{len(file_ids)}] Failed to move {file_id}: {error_msg}")
                 logging.error(f"Failed to move file {file_id}: {error_msg}")
 
                 failed_moves.append({
@@ -723,7 +754,7 @@ class GoogleDriveService:
                 })
 
         elapsed_time = asyncio.get_event_loop().time() - start_time
-        print(f"📦 Move operation completed in {elapsed_time:.2f}s")
+        legacy_print(f"📦 Move operation completed in {elapsed_time:.2f}s")
 
         result = {
             'customer_email': customer_email,
@@ -736,13 +767,13 @@ class GoogleDriveService:
             'temp_folder_id': temp_folder_id
         }
 
-        print(f"✅ COMPLETE: {len(moved_files)}/{len(file_ids)} files moved successfully")
+        legacy_print(f"✅ COMPLETE: {len(moved_files)}/{len(file_ids)} files moved successfully")
         if moved_files:
-            print(f"   Files now in: {customer_email}/Inbox/ (ID: {inbox_folder_id})")
+            legacy_print(f"   Files now in: {customer_email}/Inbox/ (ID: {inbox_folder_id})")
         if failed_moves:
-            print(f"❌ FAILED: {len(failed_moves)} files")
+            legacy_print(f"❌ FAILED: {len(failed_moves)} files")
             for failed in failed_moves[:3]:  # Show first 3 failures
-                print(f"   - {failed['file_id']}: {failed['error'][:100]}")
+                legacy_print(f"   - {failed['file_id']}: {failed['error'][:100]}")
 
         logging.info(f"Move operation completed: {len(moved_files)}/{len(file_ids)} files moved successfully")
         return result
@@ -1381,7 +1412,7 @@ class GoogleDriveService:
         logging.info("=" * 80)
         logging.info(f"🗑️  TRASH CLEANUP STARTED at {timestamp}")
         logging.info("=" * 80)
-        print(f"\n🗑️  TRASH CLEANUP STARTED at {timestamp}")
+        legacy_print(f"\n🗑️  TRASH CLEANUP STARTED at {timestamp}")
 
         try:
             # Query for all trashed files
@@ -1402,7 +1433,7 @@ class GoogleDriveService:
                 logging.info(f"✅ TRASH FOLDER IS EMPTY - No cleanup needed")
                 logging.info(f"⏱️  Cleanup check completed in {elapsed:.2f}s")
                 logging.info("=" * 80)
-                print(f"✅ TRASH FOLDER IS EMPTY - No cleanup needed (checked in {elapsed:.2f}s)")
+                legacy_print(f"✅ TRASH FOLDER IS EMPTY - No cleanup needed (checked in {elapsed:.2f}s)")
 
                 return {
                     'trash_was_empty': True,
@@ -1420,14 +1451,14 @@ class GoogleDriveService:
             logging.info(f"📊 TRASH STATISTICS:")
             logging.info(f"   Files found: {files_count}")
             logging.info(f"   Total size: {total_size_mb:.2f} MB ({total_size:,} bytes)")
-            print(f"\n📊 Found {files_count} files in Trash ({total_size_mb:.2f} MB)")
+            legacy_print(f"\n📊 Found {files_count} files in Trash ({total_size_mb:.2f} MB)")
 
             # Delete files one by one
             deleted_count = 0
             errors = []
 
             logging.info(f"\n🔥 DELETING {files_count} FILES FROM TRASH...")
-            print(f"🔥 Deleting {files_count} files from Trash...")
+            legacy_print(f"🔥 Deleting {files_count} files from Trash...")
 
             for index, file in enumerate(files, 1):
                 file_id = file.get('id')
@@ -1442,12 +1473,12 @@ class GoogleDriveService:
                     # Log progress every 10 files or for first/last file
                     if index == 1 or index == files_count or index % 10 == 0:
                         logging.info(f"   ✓ [{index}/{files_count}] Deleted: {file_name} ({file_size:,} bytes)")
-                        print(f"   ✓ [{index}/{files_count}] Deleted: {file_name}")
+                        legacy_print(f"   ✓ [{index}/{files_count}] Deleted: {file_name}")
 
                 except Exception as e:
                     error_msg = f"Failed to delete {file_name} (ID: {file_id}): {str(e)}"
                     logging.warning(f"   ✗ [{index}/{files_count}] {error_msg}")
-                    print(f"   ✗ [{index}/{files_count}] Failed: {file_name}")
+                    legacy_print(f"   ✗ [{index}/{files_count}] Failed: {file_name}")
                     errors.append(error_msg)
 
             # Final summary
@@ -1462,12 +1493,12 @@ class GoogleDriveService:
             logging.info(f"⏱️  Total duration: {elapsed:.2f}s")
             logging.info("=" * 80)
 
-            print(f"\n✅ TRASH CLEANUP COMPLETED:")
-            print(f"   Deleted: {deleted_count}/{files_count} files ({success_rate:.1f}%)")
-            print(f"   Space freed: {total_size_mb:.2f} MB")
+            legacy_print(f"\n✅ TRASH CLEANUP COMPLETED:")
+            legacy_print(f"   Deleted: {deleted_count}/{files_count} files ({success_rate:.1f}%)")
+            legacy_print(f"   Space freed: {total_size_mb:.2f} MB")
             if errors:
-                print(f"   ⚠️  Errors: {len(errors)}")
-            print(f"   Duration: {elapsed:.2f}s\n")
+                legacy_print(f"   ⚠️  Errors: {len(errors)}")
+            legacy_print(f"   Duration: {elapsed:.2f}s\n")
 
             return {
                 'trash_was_empty': False,
@@ -1486,7 +1517,7 @@ class GoogleDriveService:
             logging.error(f"❌ {error_msg}")
             logging.error(f"⏱️  Failed after {elapsed:.2f}s")
             logging.error("=" * 80)
-            print(f"\n❌ TRASH CLEANUP FAILED: {str(e)}\n")
+            legacy_print(f"\n❌ TRASH CLEANUP FAILED: {str(e)}\n")
             raise GoogleDriveError(error_msg, original_error=e)
 
     @handle_google_drive_exceptions("get file by ID")
@@ -12,6 +12,7 @@ from bson import ObjectId
 from decimal import Decimal
 
 from app.database.mongodb import database
+from app.services.usage_period_repository import usage_period_repository
 from app.models.invoice import BillingPeriod, LineItem
 
 logger = logging.getLogger(__name__)
@@ -92,7 +93,8 @@ class InvoiceGenerationService:
     def _generate_line_items(
         self,
         subscription: Dict[str, Any],
-        period_numbers: List[int]
+        period_numbers: List[int],
+        usage_periods: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """
         Generate line items for the invoice.
@@ -100,6 +102,7 @@ class InvoiceGenerationService:
         Args:
             subscription: Subscription document
             period_numbers: List of period numbers to bill
+            usage_periods: Usage period documents for the subscription
 
         Returns:
             List of line item dictionaries
@@ -134,7 +137,6 @@ class InvoiceGenerationService:
         })
 
         # Line Items 2+: Overage Charges (per period)
-        usage_periods = subscription.get("usage_periods", [])
         price_per_unit = subscription.get("price_per_unit", 0.0)
         if isinstance(price_per_unit, Decimal):
             price_per_unit = float(price_per_unit)
@@ -228,7 +230,7 @@ class InvoiceGenerationService:
 
         # Step 1: Fetch subscription
         try:
-            subscription = await database.subscriptions.find_one({"_id": ObjectId(subscription_id)})
+            subscription = await database.subscriptions.find_one({"_id": ObjectId(subscription_id)}, {"usage_periods": 0})
             if not subscription:
                 raise InvoiceGenerationError(f"Subscription not found: {subscription_id}")
         except Exception as e:
@@ -238,7 +240,7 @@ class InvoiceGenerationService:
         logger.info(f"[INVOICE_GEN] Subscription found: {subscription.get('company_name')}")
 
         # Step 2: Check if usage periods exist for this period
-        usage_periods = subscription.get("usage_periods", [])
+        usage_periods = await usage_period_repository.list_periods(subscription_id, period_numbers)
         available_periods = [p.get("period_number") for p in usage_periods if p.get("period_number") in period_numbers]
 
         if not available_periods:
@@ -261,7 +263,7 @@ class InvoiceGenerationService:
         logger.info(f"[INVOICE_GEN] Billing period: {period_start.date()} to {period_end.date()}")
 
         # Step 4: Generate line items
-        line_items_data = self._generate_line_items(subscription, period_numbers)
+        line_items_data = self._generate_line_items(subscription, period_numbers, usage_periods)
         line_items = [LineItem(**item) for item in line_items_data]
         logger.info(f"[INVOICE_GEN] Generated {len(line_items)} line items")
 
@@ -3,14 +3,23 @@ JWT-based authentication service - NO DATABASE LOOKUPS NEEDED!
 
 This replaces MongoDB session lookups with self-contained JWT tokens.
 Token verification is INSTANT - no database queries.
+
+Verified claims are cached per worker (LRU keyed by the token digest, each
+entry dropped at the token's exp), so repeat requests with the same token
+skip decoding and the HS256 signature check. Revocation (logout) is checked
+separately by AuthService.verify_session, see token_revocation.py.
 """
 
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
 
 from app.config import settings
+from app.services.token_revocation import token_digest
+from app.utils.metrics import JWT_CACHE_REQUESTS
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +32,15 @@ class JWTService:
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_HOURS = 8  # Match session expiration
 
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Args:
+            cache_size: Verified tokens kept in the claims cache (default: settings.jwt_cache_size, 0 disables)
+        """
+        self.cache_size = settings.jwt_cache_size if cache_size is None else cache_size
+        # Token digest -> (user data, exp as UNIX time), least recently used first
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
     def create_access_token(
         self,
         user_data: Dict[str, Any],
@@ -77,7 +95,8 @@ class JWTService:
         Verify JWT token and extract user data.
 
         NO DATABASE LOOKUP - Token contains all user data!
-        Verification is INSTANT.
+        Verification is INSTANT; tokens verified before are served from
+        the claims cache until they expire.
 
         Args:
             token: JWT token string
@@ -85,6 +104,17 @@ class JWTService:
         Returns:
             dict: User data if valid, None if invalid/expired
         """
+        digest = token_digest(token)
+        cached = self._cache.get(digest)
+        if cached is not None:
+            user_data, expires_at = cached
+            if expires_at > time.time():
+                self._cache.move_to_end(digest)
+                JWT_CACHE_REQUESTS.labels("hit").inc()
+                return dict(user_data)
+            del self._cache[digest]
+        JWT_CACHE_REQUESTS.labels("miss").inc()
+
         try:
             # Decode and verify token
             payload = jwt.decode(
@@ -109,8 +139,9 @@ class JWTService:
                 logger.warning("[JWT] Token missing required fields")
                 return None
 
-            logger.info(f"[JWT] Token verified successfully for: {user_data['email']}")
-            return user_data
+            logger.debug("[JWT] Token verified successfully for: %s", user_data["email"])
+            self._cache_claims(digest, user_data, payload.get("exp"))
+            return dict(user_data)
 
         except JWTError as e:
             logger.warning(f"[JWT] Token verification failed: {str(e)}")
@@ -119,6 +150,41 @@ class JWTService:
             logger.error(f"[JWT] Unexpected error during token verification: {str(e)}")
             return None
 
+    def token_expiry(self, token: str) -> Optional[float]:
+        """
+        Expiry (UNIX time) of a token with a valid signature, expired or not.
+
+        Args:
+            token: JWT token string
+
+        Returns:
+            float: The token's exp, None if the token is invalid
+        """
+        try:
+            payload = jwt.decode(
+                token,
+                self.SECRET_KEY,
+                algorithms=[self.ALGORITHM],
+                options={"verify_exp": False}
+            )
+        except JWTError as e:
+            logger.warning(f"[JWT] Token verification failed: {str(e)}")
+            return None
+        expires_at = payload.get("exp")
+        return float(expires_at) if isinstance(expires_at, (int, float)) else None
+
+    def evict(self, token: str) -> None:
+        """Drop a token from the claims cache (after revocation)."""
+        self._cache.pop(token_digest(token), None)
+
+    def _cache_claims(self, digest: str, user_data: Dict[str, Any], expires_at: Any) -> None:
+        if self.cache_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        self._cache[digest] = (dict(user_data), float(expires_at))
+        self._cache.move_to_end(digest)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
     def decode_token_without_verification(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Decode token WITHOUT verification (for debugging only).
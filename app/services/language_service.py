@@ -3,7 +3,9 @@ Language service for parsing supported languages from file.
 """
 
 import os
+import hashlib
 import logging
+from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
@@ -16,6 +18,9 @@ class LanguageService:
     def __init__(self):
         self.languages_file = Path("supported_languages.txt")
         self._cached_languages: Optional[List[Dict[str, str]]] = None
+        # Version of the cached list (for ETag / Last-Modified)
+        self.version: Optional[str] = None
+        self.last_modified: Optional[datetime] = None
         
     async def get_supported_languages(self) -> List[Dict[str, str]]:
         """
@@ -82,6 +87,10 @@ class LanguageService:
             
             # Cache the results
             self._cached_languages = languages
+            self.version = hashlib.sha1(
+                "\n".join(f"{lang['code']}={lang['name']}" for lang in languages).encode("utf-8")
+            ).hexdigest()
+            self.last_modified = datetime.fromtimestamp(self.languages_file.stat().st_mtime, tz=timezone.utc)
             
             return languages
             
@@ -96,6 +105,8 @@ class LanguageService:
         """Clear the cached languages to force reload from file."""
         logger.info("Clearing languages cache")
         self._cached_languages = None
+        self.version = None
+        self.last_modified = None
     
     async def reload_languages(self) -> List[Dict[str, str]]:
         """Force reload languages from file by clearing cache first."""
@@ -0,0 +1,221 @@
+"""
+Dedicated bcrypt worker pool.
+
+bcrypt at cost 12 takes ~250ms of CPU per hash or check. Running it through
+run_in_executor(None, ...) shared the default thread pool with the Drive
+client, so a burst of login attempts (credential stuffing) queued ahead of
+uploads and had no upper bound. Hashing now runs in its own pool:
+
+- size-capped: settings.password_hash_workers processes per app worker
+  (settings.password_hash_executor="thread" uses threads instead; bcrypt
+  releases the GIL)
+- bounded wait: at most settings.password_hash_queue calls wait for a free
+  process; further calls fail at once with PasswordHasherBusy (HTTP 429
+  with Retry-After) instead of piling up
+- transparent rehash: hashes with a cost other than
+  settings.password_hash_rounds are re-hashed after a successful login
+  (rehash_if_needed), so raising the cost factor upgrades stored hashes as
+  users log in
+
+Passwords are truncated to bcrypt's 72-byte limit, as before.
+
+Usage:
+    if not await password_hasher.verify(password, user["password_hash"]):
+        raise AuthenticationError("Invalid credentials")
+    new_hash = await password_hasher.rehash_if_needed(password, user["password_hash"])
+
+    password_hash = await password_hasher.hash(password)
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+import bcrypt
+from fastapi import HTTPException
+
+from app.config import settings
+from app.utils.metrics import CallbackMetric
+
+logger = logging.getLogger(__name__)
+
+# bcrypt only uses the first 72 bytes of a password
+MAX_PASSWORD_BYTES = 72
+
+
+class PasswordHasherBusy(HTTPException):
+    """Every bcrypt worker is busy and the wait queue is full (429)."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=429,
+            detail="Too many login attempts, please retry shortly",
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.retry_after = retry_after
+
+
+def hash_cost(password_hash: str) -> Optional[int]:
+    """Cost factor of a bcrypt hash ("$2b$12$..." -> 12), None if it is not a bcrypt hash."""
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def _password_bytes(password: str) -> bytes:
+    return password.encode("utf-8")[:MAX_PASSWORD_BYTES]
+
+
+class PasswordHasher:
+    """bcrypt hash/verify in a dedicated, size-capped pool with a bounded wait queue."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_waiting: Optional[int] = None,
+        rounds: Optional[int] = None,
+        executor_type: Optional[str] = None
+    ):
+        """
+        Args:
+            workers: Pool size (default: settings.password_hash_workers)
+            max_waiting: Calls allowed to wait for a worker (default: settings.password_hash_queue)
+            rounds: Cost factor for new hashes (default: settings.password_hash_rounds)
+            executor_type: "process" or "thread" (default: settings.password_hash_executor)
+        """
+        self.workers = settings.password_hash_workers if workers is None else workers
+        self.max_waiting = settings.password_hash_queue if max_waiting is None else max_waiting
+        self.rounds = settings.password_hash_rounds if rounds is None else rounds
+        self.executor_type = settings.password_hash_executor if executor_type is None else executor_type
+        if self.executor_type not in ("process", "thread"):
+            raise ValueError(f"Unknown PASSWORD_HASH_EXECUTOR: {self.executor_type} (use process or thread)")
+        self.in_flight = 0
+        self.rejected = 0
+        # Smoothed seconds per call (for Retry-After)
+        self._call_seconds = 0.25
+        self._executor: Optional[Executor] = None
+
+    @property
+    def waiting(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    def start(self) -> None:
+        """Create the pool and start its workers (avoids the start-up cost on the first login)."""
+        executor = self._get_executor()
+        if isinstance(executor, ProcessPoolExecutor):
+            for _ in range(self.workers):
+                executor.submit(bcrypt.gensalt, 4)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                # spawn: forking a process with running threads (logging, asyncio) is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+            logger.info(f"[PASSWORD HASHER] Started {self.workers} bcrypt {self.executor_type} worker(s)")
+        return self._executor
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to drain."""
+        return max(1, math.ceil(self.in_flight / max(1, self.workers) * self._call_seconds))
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.in_flight >= self.workers + self.max_waiting:
+            self.rejected += 1
+            retry_after = self.retry_after()
+            logger.warning(
+                f"[PASSWORD HASHER] Busy ({self.in_flight} in flight), rejected with Retry-After {retry_after}s"
+            )
+            raise PasswordHasherBusy(retry_after)
+
+        self.in_flight += 1
+        start_time = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            # A worker died: replace the pool for the next calls
+            logger.error("[PASSWORD HASHER] Process pool broken, restarting it")
+            self.shutdown()
+            raise
+        finally:
+            self.in_flight -= 1
+        self._call_seconds += 0.2 * (time.perf_counter() - start_time - self._call_seconds)
+        return result
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """
+        Check a password against a stored bcrypt hash.
+
+        Raises:
+            PasswordHasherBusy: The pool and its wait queue are full
+            ValueError: The stored hash is not a valid bcrypt hash
+        """
+        return await self._run(bcrypt.checkpw, _password_bytes(password), password_hash.encode("utf-8"))
+
+    async def hash(self, password: str) -> str:
+        """
+        bcrypt hash of a password at the configured cost.
+
+        Raises:
+            PasswordHasherBusy: The pool and its wait queue are full
+        """
+        salt = bcrypt.gensalt(self.rounds)
+        password_hash = await self._run(bcrypt.hashpw, _password_bytes(password), salt)
+        return password_hash.decode("utf-8")
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        cost = hash_cost(password_hash)
+        return cost is not None and cost != self.rounds
+
+    async def rehash_if_needed(self, password: str, password_hash: str) -> Optional[str]:
+        """
+        New hash at the configured cost for a verified password whose hash uses another cost.
+
+        Returns:
+            str: The new hash to store, None when the hash is current or the
+                pool is busy (the upgrade is retried on a later login)
+        """
+        if not self.needs_rehash(password_hash):
+            return None
+        try:
+            new_hash = await self.hash(password)
+        except PasswordHasherBusy:
+            return None
+        logger.info(f"[PASSWORD HASHER] Rehashed password from cost {hash_cost(password_hash)} to {self.rounds}")
+        return new_hash
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_waiting": self.max_waiting,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher()
+
+CallbackMetric(
+    "password_hash_in_flight", "bcrypt calls running or waiting for a worker", [],
+    lambda: [((), password_hasher.in_flight)]
+)
+CallbackMetric(
+    "password_hash_rejected_total", "bcrypt calls rejected because the wait queue was full", [],
+    lambda: [((), password_hasher.rejected)], metric_type="counter"
+)
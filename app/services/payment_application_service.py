@@ -11,12 +11,27 @@ from typing import Dict, Any
 from bson import ObjectId
 
 from app.database.mongodb import database
+from app.database.query_shapes import register_query_shape
+from app.services.archive_service import archive_service
 
 logger = logging.getLogger(__name__)
 
 # Module load marker
 logger.warning("🔄 PAYMENT_APPLICATION_SERVICE MODULE LOADED - v1.0")
 
+register_query_shape(
+    "payments.by_invoice",
+    "payments",
+    {"invoice_id": "INV-2025-000001"},
+    source="PaymentApplicationService.get_invoice_payments"
+)
+register_query_shape(
+    "invoices.by_invoice_number",
+    "invoices",
+    {"invoice_number": "INV-2025-000001"},
+    source="PaymentApplicationService.apply_payment_to_invoice"
+)
+
 
 class PaymentApplicationError(Exception):
     """Base payment application error."""
@@ -224,7 +239,8 @@ class PaymentApplicationService:
             invoice_id: Invoice ObjectId
 
         Returns:
-            List of payment documents linked to this invoice
+            List of payment documents linked to this invoice, including
+            archived payments (marked `archived: True`)
 
         Raises:
             PaymentApplicationError: If fetch fails
@@ -232,7 +248,10 @@ class PaymentApplicationService:
         logger.info(f"[PAYMENT_APP] Fetching payments for invoice {invoice_id}")
 
         try:
-            payments = await database.payments.find({"invoice_id": invoice_id}).to_list(length=100)
+            query = {"invoice_id": invoice_id}
+            payments = await database.payments.find(query).to_list(length=100)
+            if len(payments) < 100:
+                payments += await archive_service.find_archived("payments", query, limit=100 - len(payments))
             logger.info(f"[PAYMENT_APP] Found {len(payments)} payments for invoice {invoice_id}")
             return payments
         except Exception as e:
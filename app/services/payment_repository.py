@@ -10,8 +10,46 @@ from typing import Optional, List, Dict, Any, Tuple
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
 
-from app.database.mongodb import database
+from app.database.mongodb import ANALYTICS_PROFILE, database
+from app.database.query_shapes import register_query_shape
 from app.models.payment import Payment, PaymentCreate, PaymentUpdate
+from app.services.archive_service import archive_service
+
+
+register_query_shape(
+    "payments.by_stripe_payment_intent",
+    "payments",
+    {"stripe_payment_intent_id": "pi_test"},
+    source="PaymentRepository.get_payment_by_square_id"
+)
+register_query_shape(
+    "payments.by_company_recent",
+    "payments",
+    {"company_name": "Acme"},
+    sort=[("payment_date", -1)],
+    source="PaymentRepository.get_payments_by_company"
+)
+register_query_shape(
+    "payments.by_company_status_recent",
+    "payments",
+    {"company_name": "Acme", "payment_status": "COMPLETED"},
+    sort=[("payment_date", -1)],
+    source="PaymentRepository.get_payments_by_company / get_all_payments"
+)
+register_query_shape(
+    "payments.by_email_recent",
+    "payments",
+    {"user_email": "user@example.com"},
+    sort=[("payment_date", -1)],
+    source="PaymentRepository.get_payments_by_email"
+)
+register_query_shape(
+    "payments.all_recent",
+    "payments",
+    {},
+    sort=[("payment_date", -1)],
+    source="PaymentRepository.get_all_payments"
+)
 
 
 class PaymentRepository:
@@ -61,33 +99,40 @@ class PaymentRepository:
         result = await self.collection.insert_one(payment_doc)
         return str(result.inserted_id)
 
-    async def get_payment_by_id(self, payment_id: str) -> Optional[Dict[str, Any]]:
+    async def get_payment_by_id(self, payment_id: str, include_archived: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get a payment by its MongoDB _id.
 
         Args:
             payment_id: MongoDB ObjectId as string
+            include_archived: Also search the archive tier (read-only detail views)
 
         Returns:
             Payment document or None if not found
         """
         try:
-            result = await self.collection.find_one({"_id": ObjectId(payment_id)})
-            return result
+            return await archive_service.find_one("payments", {"_id": ObjectId(payment_id)}, include_archived)
         except Exception:
             return None
 
-    async def get_payment_by_square_id(self, stripe_payment_intent_id: str) -> Optional[Dict[str, Any]]:
+    async def get_payment_by_square_id(
+        self,
+        stripe_payment_intent_id: str,
+        include_archived: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """
         Get a payment by Square payment ID.
 
         Args:
             stripe_payment_intent_id: Square payment ID
+            include_archived: Also search the archive tier (read-only detail views)
 
         Returns:
             Payment document or None if not found
         """
-        return await self.collection.find_one({"stripe_payment_intent_id": stripe_payment_intent_id})
+        return await archive_service.find_one(
+            "payments", {"stripe_payment_intent_id": stripe_payment_intent_id}, include_archived
+        )
 
     async def get_payments_by_company(
         self,
@@ -261,7 +306,8 @@ class PaymentRepository:
         self,
         company_name: str,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        profile: str = ANALYTICS_PROFILE
     ) -> Dict[str, Any]:
         """
         Get payment statistics for a company.
@@ -270,6 +316,8 @@ class PaymentRepository:
             company_name: Company name
             start_date: Optional start date filter
             end_date: Optional end date filter
+            profile: Client profile to run the aggregation on (reporting
+                query, so the analytics pool by default)
 
         Returns:
             Dictionary with payment statistics
@@ -301,7 +349,7 @@ class PaymentRepository:
             }
         ]
 
-        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        result = await database.get_db(profile).payments.aggregate(pipeline).to_list(length=1)
 
         if result:
             stats = result[0]
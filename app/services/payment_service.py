@@ -8,6 +8,7 @@ from fastapi import HTTPException
 import uuid
 
 from app.config import settings
+from app.utils.structured_logging import legacy_print
 from app.models.responses import PaymentIntent, PaymentStatus, PaymentHistory
 
 
@@ -15,7 +16,7 @@ class PaymentService:
     """Service for handling payments through Stripe."""
     
     def __init__(self):
-        print("Hello World - Payment service initialization stub")
+        legacy_print("Hello World - Payment service initialization stub")
         # Stub - always consider payment service "enabled" for demo
         self.stripe_enabled = True
         
@@ -69,9 +70,9 @@ class PaymentService:
         Raises:
             HTTPException: If Stripe is not configured or payment creation fails
         """
-        print(f"Hello World - Payment intent creation stub: ${amount} {currency}")
-        print(f"Description: {description}")
-        print(f"Metadata: {metadata}")
+        legacy_print(f"Hello World - Payment intent creation stub: ${amount} {currency}")
+        legacy_print(f"Description: {description}")
+        legacy_print(f"Metadata: {metadata}")
         
         if amount < self.minimum_charge:
             raise HTTPException(
@@ -101,7 +102,7 @@ class PaymentService:
         Returns:
             Payment confirmation details
         """
-        print(f"Hello World - Payment confirmation stub for: {payment_intent_id}")
+        legacy_print(f"Hello World - Payment confirmation stub for: {payment_intent_id}")
         
         return {
             'payment_intent_id': payment_intent_id,
@@ -120,7 +121,7 @@ class PaymentService:
         Returns:
             Payment status information
         """
-        print(f"Hello World - Payment status check stub for: {payment_intent_id}")
+        legacy_print(f"Hello World - Payment status check stub for: {payment_intent_id}")
         
         return {
             'payment_intent_id': payment_intent_id,
@@ -148,8 +149,8 @@ class PaymentService:
         Returns:
             Refund information
         """
-        print(f"Hello World - Payment refund stub for: {payment_intent_id}")
-        print(f"Amount: {amount}, Reason: {reason}")
+        legacy_print(f"Hello World - Payment refund stub for: {payment_intent_id}")
+        legacy_print(f"Amount: {amount}, Reason: {reason}")
         
         stub_refund_id = f"re_stub_{uuid.uuid4().hex[:16]}"
         refund_amount = amount or 10.00  # Default stub amount
@@ -249,8 +250,8 @@ class PaymentService:
         Returns:
             Webhook processing result
         """
-        print(f"Hello World - Webhook handling stub")
-        print(f"Payload length: {len(payload)}, Signature: {signature[:20]}...")
+        legacy_print(f"Hello World - Webhook handling stub")
+        legacy_print(f"Payload length: {len(payload)}, Signature: {signature[:20]}...")
         
         # Return stub webhook response
         return {
@@ -277,7 +278,7 @@ class PaymentService:
         Returns:
             List of payment history records
         """
-        print(f"Hello World - Payment history stub - customer: {customer_id}, limit: {limit}")
+        legacy_print(f"Hello World - Payment history stub - customer: {customer_id}, limit: {limit}")
         
         # Return stub payment history
         stub_history = [
@@ -307,7 +308,7 @@ class PaymentService:
     
     async def _handle_payment_succeeded(self, payment_intent: Dict[str, Any]) -> Dict[str, Any]:
         """Handle successful payment webhook - STUB IMPLEMENTATION."""
-        print(f"Hello World - Payment succeeded webhook stub for: {payment_intent.get('id', 'unknown')}")
+        legacy_print(f"Hello World - Payment succeeded webhook stub for: {payment_intent.get('id', 'unknown')}")
         return {
             'status': 'processed',
             'event_type': 'payment_intent.succeeded',
@@ -317,7 +318,7 @@ class PaymentService:
     
     async def _handle_payment_failed(self, payment_intent: Dict[str, Any]) -> Dict[str, Any]:
         """Handle failed payment webhook - STUB IMPLEMENTATION."""
-        print(f"Hello World - Payment failed webhook stub for: {payment_intent.get('id', 'unknown')}")
+        legacy_print(f"Hello World - Payment failed webhook stub for: {payment_intent.get('id', 'unknown')}")
         return {
             'status': 'processed',
             'event_type': 'payment_intent.payment_failed',
@@ -327,7 +328,7 @@ class PaymentService:
     
     async def _handle_dispute_created(self, charge: Dict[str, Any]) -> Dict[str, Any]:
         """Handle dispute creation webhook - STUB IMPLEMENTATION."""
-        print(f"Hello World - Dispute created webhook stub for: {charge.get('id', 'unknown')}")
+        legacy_print(f"Hello World - Dispute created webhook stub for: {charge.get('id', 'unknown')}")
         return {
             'status': 'processed',
             'event_type': 'charge.dispute.created',
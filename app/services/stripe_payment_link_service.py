@@ -155,7 +155,8 @@ class StripePaymentLinkService:
                     "$set": {
                         "stripe_payment_link_url": payment_link.url,
                         "stripe_payment_link_id": payment_link.id,
-                        "payment_link_created_at": datetime.now(timezone.utc).isoformat()
+                        "payment_link_created_at": datetime.now(timezone.utc).isoformat(),
+                        "updated_at": datetime.now(timezone.utc)
                     }
                 }
             )
@@ -10,6 +10,10 @@ from decimal import Decimal
 from pymongo import ReturnDocument
 
 from app.database.mongodb import database
+from app.database.query_shapes import register_query_shape
+from app.services.directory_cache import directory_cache
+from app.services.usage_period_repository import usage_period_repository
+from app.utils.structured_logging import legacy_print
 from app.models.subscription import (
     SubscriptionCreate,
     SubscriptionUpdate,
@@ -26,6 +30,15 @@ logger = logging.getLogger(__name__)
 logger.warning("🔄 SUBSCRIPTION_SERVICE MODULE LOADED WITH DEBUG LOGGING - v3.0")
 
 
+register_query_shape(
+    "subscriptions.active_for_company",
+    "subscriptions",
+    {"company_name": "Acme", "status": "active"},
+    sort=[("created_at", -1)],
+    source="SubscriptionService.get_company_subscriptions"
+)
+
+
 class SubscriptionError(Exception):
     """Base subscription error."""
     pass
@@ -51,7 +64,7 @@ class SubscriptionService:
 
         # Verify company exists (CRITICAL: Enforce referential integrity)
         # company_name should match a company.company_name in the database
-        company = await database.company.find_one({"company_name": subscription_data.company_name})
+        company = await directory_cache.get_company(subscription_data.company_name)
         if not company:
             logger.error(f"[SUBSCRIPTION] REJECTED: Company does not exist: {subscription_data.company_name}")
             raise SubscriptionError(f"Cannot create subscription: Company '{subscription_data.company_name}' does not exist in database")
@@ -72,7 +85,6 @@ class SubscriptionService:
             "status": subscription_data.status,
             "billing_frequency": subscription_data.billing_frequency,
             "payment_terms_days": subscription_data.payment_terms_days,
-            "usage_periods": [],
             "created_at": now,
             "updated_at": now
         }
@@ -118,7 +130,8 @@ class SubscriptionService:
             except InvalidId:
                 logger.debug(f"[SUBSCRIPTION] Querying by subscription_id field only: {subscription_id}")
 
-            subscription = await database.subscriptions.find_one(query)
+            # Usage periods live in their own collection; never ship legacy history
+            subscription = await database.subscriptions.find_one(query, {"usage_periods": 0})
 
             if subscription:
                 logger.info(f"[SUBSCRIPTION] Found subscription for company: {subscription.get('company_name')}")
@@ -155,7 +168,9 @@ class SubscriptionService:
         elif status:
             query["status"] = status
 
-        subscriptions = await database.subscriptions.find(query).sort("created_at", -1).to_list(length=100)
+        subscriptions = await database.subscriptions.find(
+            query, {"usage_periods": 0}
+        ).sort("created_at", -1).to_list(length=100)
 
         logger.info(f"[SUBSCRIPTION] Found {len(subscriptions)} subscriptions for company {company_name}")
 
@@ -191,6 +206,7 @@ class SubscriptionService:
         result = await database.subscriptions.find_one_and_update(
             {"_id": ObjectId(subscription_id)},
             {"$set": update_dict},
+            projection={"usage_periods": 0},
             return_document=ReturnDocument.AFTER
         )
 
@@ -212,7 +228,7 @@ class SubscriptionService:
             period_data: Usage period data
 
         Returns:
-            dict: Updated subscription or None
+            dict: Subscription with "usage_periods_count" or None
 
         Raises:
             SubscriptionError: If subscription not found or validation fails
@@ -221,6 +237,9 @@ class SubscriptionService:
         if not subscription:
             raise SubscriptionError(f"Subscription not found: {subscription_id}")
 
+        canonical_id = str(subscription["_id"])
+        now = datetime.now(timezone.utc)
+
         # Create usage period
         usage_period = {
             "period_start": period_data.period_start,
@@ -229,18 +248,21 @@ class SubscriptionService:
             "units_used": 0,
             "units_remaining": period_data.units_allocated,
             "promotional_units": 0,
-            "last_updated": datetime.now(timezone.utc)
+            "last_updated": now
         }
 
-        # Add to subscription
+        # Fold any legacy embedded periods in first so the count is complete
+        await usage_period_repository.migrate_embedded_periods(canonical_id)
+        await usage_period_repository.add_period(canonical_id, subscription.get("company_name"), usage_period)
+
         result = await database.subscriptions.find_one_and_update(
-            {"_id": ObjectId(subscription_id)},
-            {
-                "$push": {"usage_periods": usage_period},
-                "$set": {"updated_at": datetime.now(timezone.utc)}
-            },
-            return_document=True
+            {"_id": subscription["_id"]},
+            {"$set": {"updated_at": now}},
+            projection={"usage_periods": 0},
+            return_document=ReturnDocument.AFTER
         )
+        if result:
+            result["usage_periods_count"] = await usage_period_repository.count_periods(canonical_id)
 
         logger.info(f"[SUBSCRIPTION] Added usage period to subscription {subscription_id}")
 
@@ -254,33 +276,103 @@ class SubscriptionService:
         """
         Record usage for the current period.
 
+        The increment is applied atomically with $inc on the current document
+        in the usage_periods collection, so concurrent confirmations for the
+        same company cannot lose updates. The post-update period is returned
+        from the same round trip; the subscription is only read to resolve a
+        non-canonical ID, migrate legacy embedded periods, or explain a failure.
+
         Args:
             subscription_id: Subscription ID
             usage_data: Usage update data
 
         Returns:
-            dict: Updated subscription or None
+            dict: "_id", "subscription_id", "current_period" (updated period),
+            "updated_at", overdraft info and the current period balance
+            ("units_used", "units_remaining")
 
         Raises:
             SubscriptionError: If no active period or insufficient units
         """
-        logger.info(f"[RECORD_USAGE ENTRY] Subscription: {subscription_id}, Mode: {usage_data.translation_mode}, Units to add: {usage_data.units_to_add}")
-        print(f"[RECORD_USAGE ENTRY] Subscription: {subscription_id}, Mode: {usage_data.translation_mode}, Units to add: {usage_data.units_to_add}")
+        logger.info(
+            "[RECORD_USAGE ENTRY] Subscription: %s, Mode: %s, Units to add: %s",
+            subscription_id, usage_data.translation_mode, usage_data.units_to_add
+        )
 
-        subscription = await self.get_subscription(subscription_id)
-        logger.info(f"[RECORD_USAGE] Got subscription: {subscription is not None}")
-        print(f"[RECORD_USAGE] Got subscription: {subscription is not None}")
+        now = datetime.now(timezone.utc)
+        units_to_add = usage_data.units_to_add
+
+        current_period = await usage_period_repository.increment_usage(subscription_id, units_to_add, now)
+
+        if not current_period:
+            canonical_id, migrated = await usage_period_repository.migrate_embedded_periods(subscription_id)
+            if canonical_id is not None and (canonical_id != subscription_id or migrated):
+                current_period = await usage_period_repository.increment_usage(canonical_id, units_to_add, now)
+
+        if not current_period:
+            await self._raise_usage_error(subscription_id, now)
+
+        units_used = current_period.get("units_used", 0)
+        units_remaining = (
+            current_period.get("units_allocated", 0)
+            + current_period.get("promotional_units", 0)
+            - units_used
+        )
+        # Balance before this increment, derived from the post-update state
+        total_available = units_remaining + units_to_add
 
+        overdraft_detected = total_available < units_to_add
+        overdraft_amount = units_to_add - total_available if overdraft_detected else 0
+        exceeds_soft_limit = False
+
+        if overdraft_detected:
+            # Import settings to check soft limit
+            from app.config import settings
+            exceeds_soft_limit = units_remaining < settings.subscription_soft_limit
+
+            logger.warning(
+                f"[OVERDRAFT] Subscription {subscription_id}: "
+                f"Need {units_to_add}, have {total_available}, "
+                f"overdraft: {overdraft_amount}, new_balance: {units_remaining}"
+            )
+            legacy_print(f"[OVERDRAFT] ⚠️  Overdraft detected: {overdraft_amount} units")
+            legacy_print(f"[OVERDRAFT] New balance will be: {units_remaining}")
+            if exceeds_soft_limit:
+                legacy_print(f"[OVERDRAFT] ⚠️  Exceeds soft limit ({settings.subscription_soft_limit})")
+
+        logger.info(
+            f"[SUBSCRIPTION UPDATE] ✅ Subscription {subscription_id} period {current_period.get('period_start')}: "
+            f"+{units_to_add} units, used={units_used}, remaining={units_remaining}"
+        )
+
+        canonical_id = current_period["subscription_id"]
+        return {
+            "_id": ObjectId(canonical_id) if ObjectId.is_valid(canonical_id) else canonical_id,
+            "subscription_id": canonical_id,
+            "current_period": current_period,
+            "updated_at": now,
+            "overdraft": overdraft_detected,
+            "overdraft_amount": overdraft_amount,
+            "exceeds_soft_limit": exceeds_soft_limit,
+            "available_units": total_available,
+            "requested_units": units_to_add,
+            "units_used": units_used,
+            "units_remaining": units_remaining
+        }
+
+    async def _raise_usage_error(self, subscription_id: str, now: datetime) -> None:
+        """
+        Raise the SubscriptionError describing why no usage period could be
+        incremented for a subscription.
+        """
+        subscription = await self.get_subscription(subscription_id)
         if not subscription:
             raise SubscriptionError(f"Subscription not found: {subscription_id}")
 
-        # Find current active period
-        usage_periods = subscription.get("usage_periods", [])
-        logger.info(f"[RECORD_USAGE] Usage periods count: {len(usage_periods)}")
-        print(f"[RECORD_USAGE] Usage periods count: {len(usage_periods)}")
+        canonical_id = str(subscription["_id"])
 
         # CRITICAL: Validate usage periods exist before attempting usage recording
-        if not usage_periods:
+        if not await usage_period_repository.count_periods(canonical_id):
             logger.error(
                 f"[SUBSCRIPTION] ❌ CRITICAL: No usage periods found for subscription {subscription_id}. "
                 f"Usage periods must be added via POST /api/subscriptions/{subscription_id}/usage-periods "
@@ -293,140 +385,111 @@ class SubscriptionService:
                 f"period_end, and units_allocated."
             )
 
-        now = datetime.now(timezone.utc)
-        current_period_idx = None
-
-        for idx, period in enumerate(usage_periods):
-            period_start = period["period_start"]
-            period_end = period["period_end"]
-
-            # Handle timezone-aware comparison
-            if not period_start.tzinfo:
-                period_start = period_start.replace(tzinfo=timezone.utc)
-            if not period_end.tzinfo:
-                period_end = period_end.replace(tzinfo=timezone.utc)
-
-            if period_start <= now <= period_end:
-                current_period_idx = idx
-                break
-
-        logger.info(f"[RECORD_USAGE] Current period index: {current_period_idx}")
-        print(f"[RECORD_USAGE] Current period index: {current_period_idx}")
-
-        if current_period_idx is None:
+        current_period = await usage_period_repository.get_current_period(canonical_id, now)
+        if not current_period:
             raise SubscriptionError("No active usage period found")
 
-        current_period = usage_periods[current_period_idx]
-        units_to_add = usage_data.units_to_add
-
-        logger.info(f"[RECORD_USAGE] Units to add: {units_to_add}")
-        print(f"[RECORD_USAGE] Units to add: {units_to_add}")
-
-        # NEW LOGIC: Check total available units using formula:
-        # promotional_units + units_allocated - units_used >= units_needed
-        promotional_units_in_period = current_period.get("promotional_units", 0)
-
-        # Get units from current period using correct field names
-        units_allocated = current_period.get("units_allocated", 0)
-        units_used = current_period.get("units_used", 0)
-
-        logger.info(f"[RECORD_USAGE] Current state - allocated: {units_allocated}, used: {units_used}, promo: {promotional_units_in_period}")
-        print(f"[RECORD_USAGE] Current state - allocated: {units_allocated}, used: {units_used}, promo: {promotional_units_in_period}")
-
-        # Validate units_allocated was found
-        if units_allocated == 0 and "units_allocated" not in current_period:
-            logger.error(
-                f"[SUBSCRIPTION] Invalid usage period: units_allocated not found. "
-                f"Period keys: {list(current_period.keys())}, Period data: {current_period}"
-            )
-            raise SubscriptionError(
-                f"Invalid usage period: units_allocated field not found. "
-                f"Available fields: {list(current_period.keys())}"
-            )
-
-        total_available = promotional_units_in_period + units_allocated - units_used
-
-        logger.info(f"[RECORD_USAGE] Total available: {total_available}, Need: {units_to_add}")
-        print(f"[RECORD_USAGE] Total available: {total_available}, Need: {units_to_add}")
-
-        # Check if we have enough units (overdraft allowed for enterprise)
-        overdraft_detected = total_available < units_to_add
-        overdraft_amount = 0
-        exceeds_soft_limit = False
+        logger.error(
+            f"[SUBSCRIPTION] Invalid usage period: units_allocated not found. "
+            f"Period keys: {list(current_period.keys())}, Period data: {current_period}"
+        )
+        raise SubscriptionError(
+            f"Invalid usage period: units_allocated field not found. "
+            f"Available fields: {list(current_period.keys())}"
+        )
 
-        if overdraft_detected:
-            overdraft_amount = units_to_add - total_available
-            # Calculate new balance after deduction
-            new_balance_preview = total_available - units_to_add
+    async def record_usage_batch(
+        self,
+        units_by_subscription: Dict[str, int],
+        translation_mode: str = "mixed"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Record usage for several subscriptions with one read and one bulk write.
+
+        Used by the batch confirmation path, where the per-subscription
+        record_usage() call would cost a round trip per subscription. The
+        current periods are read in one query, incremented atomically by _id
+        in one bulk write and read back by _id in one more query; balances
+        and overdraft in the result come from that read-back, not from the
+        first read, which concurrent confirmations may already have made
+        stale. IDs that miss (non-canonical IDs, legacy embedded periods)
+        fall back to a per-subscription lookup. Overdraft is allowed exactly
+        as in record_usage().
 
-            # Import settings to check soft limit
-            from app.config import settings
-            exceeds_soft_limit = new_balance_preview < settings.subscription_soft_limit
+        Args:
+            units_by_subscription: Mapping of subscription ID (ObjectId string
+                or subscription_id field) to units to add
+            translation_mode: Translation mode label for logging
 
-            logger.warning(
-                f"[OVERDRAFT] Subscription {subscription_id}: "
-                f"Need {units_to_add}, have {total_available}, "
-                f"overdraft: {overdraft_amount}, new_balance: {new_balance_preview}"
-            )
-            print(f"[OVERDRAFT] ⚠️  Overdraft detected: {overdraft_amount} units")
-            print(f"[OVERDRAFT] New balance will be: {new_balance_preview}")
-            if exceeds_soft_limit:
-                print(f"[OVERDRAFT] ⚠️  Exceeds soft limit ({settings.subscription_soft_limit})")
-        else:
-            print(f"[RECORD_USAGE] ✅ Sufficient units available")
-
-        print(f"[RECORD_USAGE] Proceeding with MongoDB update")
-        logger.info(f"[RECORD_USAGE] ✅ Passed validation checks, about to update MongoDB")
-
-        # Log before update
-        logger.info(f"[SUBSCRIPTION UPDATE] Subscription: {subscription_id}")
-        print(f"[SUBSCRIPTION UPDATE] Subscription: {subscription_id}")
-        logger.info(f"[SUBSCRIPTION UPDATE] Period index: {current_period_idx}")
-        logger.info(f"[SUBSCRIPTION UPDATE] Current units_used: {units_used}, Adding: {units_to_add}, New total: {units_used + units_to_add}")
-        logger.info(f"[SUBSCRIPTION UPDATE] Total available before: {total_available}")
-
-        # Calculate new values using correct formula
-        new_units_used = units_used + units_to_add
-        new_units_remaining = units_allocated + promotional_units_in_period - new_units_used
-
-        # Update using correct field names including units_remaining
-        update_query = {
-            f"usage_periods.{current_period_idx}.units_used": new_units_used,
-            f"usage_periods.{current_period_idx}.units_remaining": new_units_remaining,
-            f"usage_periods.{current_period_idx}.last_updated": now,
-            "updated_at": now
+        Returns:
+            dict: Per-subscription result keyed by the requested ID. Each entry
+            has either "units_used"/"units_remaining"/"overdraft" or "error".
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        requested = {
+            sub_id: units for sub_id, units in units_by_subscription.items() if units > 0
         }
+        if not requested:
+            return results
 
-        logger.info(f"[SUBSCRIPTION UPDATE] New units_remaining: {new_units_remaining}")
-        logger.info(f"[SUBSCRIPTION UPDATE] MongoDB update query: {update_query}")
+        now = datetime.now(timezone.utc)
+        current_periods = await usage_period_repository.get_current_periods(requested.keys(), now)
+
+        for sub_id in requested:
+            if sub_id not in current_periods:
+                period = await usage_period_repository.get_current_period(sub_id, now)
+                if period:
+                    current_periods[sub_id] = period
+
+        units_by_period_id: Dict[Any, int] = {}
+        period_id_by_subscription: Dict[str, Any] = {}
+
+        for sub_id, units_to_add in requested.items():
+            period = current_periods.get(sub_id)
+            if not period:
+                results[sub_id] = {"error": f"No active usage period found for subscription: {sub_id}"}
+                continue
+
+            if "units_allocated" not in period:
+                results[sub_id] = {"error": "Invalid usage period: units_allocated field not found"}
+                continue
+
+            units_by_period_id[period["_id"]] = units_by_period_id.get(period["_id"], 0) + units_to_add
+            period_id_by_subscription[sub_id] = period["_id"]
+
+        updated_periods = await usage_period_repository.increment_usage_bulk(units_by_period_id, now)
+
+        for sub_id, period_id in period_id_by_subscription.items():
+            period = updated_periods.get(period_id)
+            if not period:
+                results[sub_id] = {"error": f"Usage period {period_id} disappeared during update"}
+                continue
+
+            units_to_add = requested[sub_id]
+            units_used = period.get("units_used", 0)
+            units_remaining = period["units_allocated"] + period.get("promotional_units", 0) - units_used
+            # Same rule as record_usage(): the balance after the increment went negative
+            overdraft = units_remaining < 0
+
+            if overdraft:
+                logger.warning(
+                    f"[OVERDRAFT] Subscription {sub_id}: +{units_to_add} units, "
+                    f"overdraft: {-units_remaining}, new_balance: {units_remaining}"
+                )
+
+            results[sub_id] = {
+                "units_added": units_to_add,
+                "units_used": units_used,
+                "units_remaining": units_remaining,
+                "overdraft": overdraft
+            }
 
-        # Update subscription (return document AFTER update)
-        result = await database.subscriptions.find_one_and_update(
-            {"_id": ObjectId(subscription_id)},
-            {"$set": update_query},
-            return_document=ReturnDocument.AFTER
+        logger.info(
+            "[RECORD_USAGE_BATCH] Mode: %s, applied %d/%d subscription updates",
+            translation_mode, len(units_by_period_id), len(requested)
         )
 
-        if result:
-            # Verify the update
-            updated_period = result["usage_periods"][current_period_idx]
-            logger.info(f"[SUBSCRIPTION UPDATE] ✅ Update successful")
-            logger.info(f"[SUBSCRIPTION UPDATE] New units_used: {updated_period.get('units_used', 0)}")
-            logger.info(f"[SUBSCRIPTION UPDATE] Last updated: {updated_period.get('last_updated')}")
-
-            # Add overdraft information to the result
-            result["overdraft"] = overdraft_detected
-            result["overdraft_amount"] = overdraft_amount
-            result["exceeds_soft_limit"] = exceeds_soft_limit
-            result["available_units"] = total_available
-            result["requested_units"] = units_to_add
-
-            if overdraft_detected:
-                logger.info(f"[SUBSCRIPTION] Overdraft info added to result: {overdraft_amount} units")
-        else:
-            logger.error(f"[SUBSCRIPTION UPDATE] ❌ Update failed - no document returned")
-
-        return result
+        return results
 
     async def get_subscription_summary(self, subscription_id: str) -> Optional[SubscriptionSummary]:
         """
@@ -442,7 +505,7 @@ class SubscriptionService:
         if not subscription:
             return None
 
-        usage_periods = subscription.get("usage_periods", [])
+        usage_periods = await usage_period_repository.list_periods(str(subscription["_id"]))
 
         # Calculate totals - use safe .get() with fallbacks for field name variations
         total_allocated = sum(
@@ -453,22 +516,9 @@ class SubscriptionService:
         total_remaining = sum(p.get("units_remaining", 0) for p in usage_periods)
         total_promo_in_periods = sum(p.get("promotional_units", 0) for p in usage_periods)
 
-        # Find current period
-        now = datetime.now(timezone.utc)
-        current_period = None
-
-        for period in usage_periods:
-            period_start = period["period_start"]
-            period_end = period["period_end"]
-
-            if not period_start.tzinfo:
-                period_start = period_start.replace(tzinfo=timezone.utc)
-            if not period_end.tzinfo:
-                period_end = period_end.replace(tzinfo=timezone.utc)
-
-            if period_start <= now <= period_end:
-                current_period = UsagePeriod(**period)
-                break
+        # Find current period (indexed lookup, same rule as record_usage)
+        period = await usage_period_repository.get_current_period(str(subscription["_id"]))
+        current_period = UsagePeriod(**period) if period else None
 
         return SubscriptionSummary(
             subscription_id=str(subscription["_id"]),
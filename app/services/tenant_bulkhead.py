@@ -0,0 +1,261 @@
+"""
+Per-tenant bulkheads for the ingest, confirm and payment paths.
+
+A single enterprise uploading many large files used to occupy every Drive
+worker thread and Mongo connection while other tenants waited behind it.
+Each path now has a TenantBulkhead:
+
+- capacity: slots for the whole path per worker (keeps headroom in the
+  default thread pool used by the Drive client and in the Mongo pool)
+- tenant quota: slots a single tenant may hold at once (per-tenant
+  overrides via settings.bulkhead_tenant_quotas)
+- fair scheduling: when a slot frees up, waiting tenants are served
+  round-robin, one grant per tenant per turn, so a small customer's single
+  upload does not wait behind an enterprise's whole batch.
+
+Tenants are companies for enterprise users (company_name), email
+addresses for authenticated individuals and peer addresses for anonymous
+requests, see request_tenant(). The key never comes from the request body:
+a client-chosen email would let one client rotate addresses past its quota.
+
+Usage:
+    async with tenant_bulkheads.ingest.slot(request_tenant(current_user, request)):
+        await google_drive_service.upload_file_to_folder(...)
+
+    background_tasks.add_task(tenant_bulkheads.confirm.run, tenant, func, **kwargs)
+"""
+
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+
+from starlette.requests import Request
+
+from app.config import settings
+from app.middleware.rate_limiting import client_address, parse_trusted_proxies
+from app.utils.metrics import CallbackMetric
+
+logger = logging.getLogger(__name__)
+
+_TRUSTED_PROXIES = parse_trusted_proxies(settings.trusted_proxy_list)
+
+
+def tenant_key(company_name: Optional[str], email: Optional[str]) -> str:
+    """Tenant of a request: the company for enterprise users, else the email."""
+    if company_name:
+        return f"company:{company_name}"
+    return f"user:{(email or '').lower()}"
+
+
+def request_tenant(current_user: Optional[Dict[str, Any]], request: Request) -> str:
+    """
+    Tenant of a request from its credentials, never from client-supplied fields.
+
+    Args:
+        current_user: Authenticated user (None for anonymous requests)
+        request: The request (anonymous requests are keyed on its client
+            address, with X-Forwarded-For honored only from trusted proxies
+            as in the rate limiter)
+
+    Returns:
+        "company:<name>", "user:<email>" or "ip:<address>"
+    """
+    if current_user:
+        return tenant_key(current_user.get("company_name"), current_user.get("email"))
+    return f"ip:{client_address(request.scope, _TRUSTED_PROXIES)}"
+
+
+def parse_tenant_quotas(spec: str) -> Dict[str, int]:
+    """
+    Parse "tenant=quota;tenant=quota" into {tenant: quota}.
+
+    Entries are separated by ';' because company names may contain commas.
+
+    Raises:
+        ValueError: On a malformed entry or a quota below 1
+    """
+    quotas: Dict[str, int] = {}
+    for entry in spec.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        tenant, separator, quota = entry.rpartition("=")
+        if not separator or not tenant.strip() or not quota.strip().isdigit() or int(quota) < 1:
+            raise ValueError(f"Invalid tenant quota entry: '{entry}' (expected tenant=quota)")
+        quotas[tenant.strip()] = int(quota)
+    return quotas
+
+
+class TenantBulkhead:
+    """Concurrency limit per path and per tenant, with round-robin scheduling across tenants."""
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        tenant_quota: int,
+        quota_overrides: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            name: Path name (for logs and metrics)
+            capacity: Slots for all tenants together
+            tenant_quota: Slots per tenant
+            quota_overrides: Tenant -> quota for tenants with a custom quota
+        """
+        self.name = name
+        self.capacity = capacity
+        self.tenant_quota = tenant_quota
+        self.quota_overrides = quota_overrides or {}
+        self.active = 0
+        self._active: Dict[str, int] = {}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {}
+        # Tenants with waiters, in round-robin order
+        self._ring: Deque[str] = deque()
+
+    def quota(self, tenant: str) -> int:
+        return min(self.capacity, self.quota_overrides.get(tenant, self.tenant_quota))
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._waiters.values())
+
+    async def acquire(self, tenant: str) -> None:
+        """Wait for a slot for `tenant`."""
+        if (
+            tenant not in self._waiters
+            and self.active < self.capacity
+            and self._active.get(tenant, 0) < self.quota(tenant)
+        ):
+            self._grant(tenant)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._waiters.get(tenant)
+        if queue is None:
+            queue = self._waiters[tenant] = deque()
+            self._ring.append(tenant)
+        queue.append(future)
+        logger.debug(
+            "[BULKHEAD] %s: %s waiting (active=%d, tenant active=%d, waiting=%d)",
+            self.name, tenant, self.active, self._active.get(tenant, 0), len(queue)
+        )
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation: hand the slot on
+                self.release(tenant)
+            else:
+                self._remove_waiter(tenant, future)
+            raise
+
+    def release(self, tenant: str) -> None:
+        """Free a slot of `tenant` and grant freed slots to waiting tenants."""
+        self.active -= 1
+        remaining = self._active[tenant] - 1
+        if remaining:
+            self._active[tenant] = remaining
+        else:
+            del self._active[tenant]
+        self._schedule()
+
+    @asynccontextmanager
+    async def slot(self, tenant: str) -> AsyncIterator[None]:
+        """Hold a slot for `tenant` for the duration of the block."""
+        await self.acquire(tenant)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    async def run(self, tenant: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Run `func(*args, **kwargs)` in a slot of `tenant` (e.g. as a background task)."""
+        async with self.slot(tenant):
+            return await func(*args, **kwargs)
+
+    def _grant(self, tenant: str) -> None:
+        self.active += 1
+        self._active[tenant] = self._active.get(tenant, 0) + 1
+
+    def _schedule(self) -> None:
+        """Round-robin over waiting tenants, skipping tenants at their quota."""
+        skipped = 0
+        while self._ring and self.active < self.capacity and skipped < len(self._ring):
+            tenant = self._ring.popleft()
+            queue = self._waiters[tenant]
+            if self._active.get(tenant, 0) >= self.quota(tenant):
+                self._ring.append(tenant)
+                skipped += 1
+                continue
+
+            while queue and queue[0].done():
+                queue.popleft()
+            if queue:
+                self._grant(tenant)
+                queue.popleft().set_result(None)
+                skipped = 0
+            if queue:
+                self._ring.append(tenant)
+            else:
+                del self._waiters[tenant]
+
+    def _remove_waiter(self, tenant: str, future: asyncio.Future) -> None:
+        queue = self._waiters.get(tenant)
+        if queue is None:
+            return
+        if future in queue:
+            queue.remove(future)
+        if not queue:
+            del self._waiters[tenant]
+            self._ring.remove(tenant)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Slots in use and waiters (counts only: tenant keys contain emails)."""
+        return {
+            "capacity": self.capacity,
+            "active": self.active,
+            "waiting": self.waiting,
+            "tenants_active": len(self._active),
+            "tenants_waiting": len(self._waiters),
+        }
+
+
+class TenantBulkheads:
+    """The bulkheads of the ingest, confirm and payment paths."""
+
+    def __init__(self):
+        overrides = parse_tenant_quotas(settings.bulkhead_tenant_quotas)
+        # Drive uploads in /translate, /translate-user and /api/upload (per file)
+        self.ingest = TenantBulkhead(
+            "ingest", settings.bulkhead_ingest_capacity, settings.bulkhead_ingest_tenant_quota, overrides
+        )
+        # Temp -> Inbox moves after transaction confirmation
+        self.confirm = TenantBulkhead(
+            "confirm", settings.bulkhead_confirm_capacity, settings.bulkhead_confirm_tenant_quota, overrides
+        )
+        # File processing after a successful payment
+        self.payment = TenantBulkhead(
+            "payment", settings.bulkhead_payment_capacity, settings.bulkhead_payment_tenant_quota, overrides
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            bulkhead.name: bulkhead.snapshot()
+            for bulkhead in (self.ingest, self.confirm, self.payment)
+        }
+
+
+# Global bulkheads instance
+tenant_bulkheads = TenantBulkheads()
+
+
+def _bulkhead_samples(field: str):
+    return lambda: [((name,), bulkhead[field]) for name, bulkhead in tenant_bulkheads.snapshot().items()]
+
+
+CallbackMetric("bulkhead_active", "Slots in use per path (ingest, confirm, payment)", ["path"], _bulkhead_samples("active"))
+CallbackMetric("bulkhead_waiting", "Operations waiting for a slot per path", ["path"], _bulkhead_samples("waiting"))
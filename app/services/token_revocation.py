@@ -0,0 +1,258 @@
+"""
+Revocation list for JWT access tokens (logout).
+
+Tokens are identified by the SHA-256 digest of the token string, so raw
+tokens never reach the shared store. A revoked digest is kept until the
+token's own expiry; after that the signature check rejects it anyway.
+
+Lookups happen on every authenticated request, so each worker keeps a
+bloom filter of revoked digests in front of the store:
+- not in the filter: not revoked (no I/O, the common case)
+- in the filter: confirmed with the store (false positives cost one lookup)
+
+Stores:
+- MemoryRevocationStore: per process (single worker / development / tests)
+- RedisRevocationStore: shared by every worker (settings.token_revocation_store="redis")
+
+Every settings.token_revocation_sync_seconds a worker adds the digests
+revoked since its last sync (by any worker) to its filter, so a logout is
+enforced at once on the worker that handled it and within the sync
+interval on the others.
+
+Usage:
+    await token_revocation.revoke(token_digest(token), expires_at)
+    if await token_revocation.is_revoked(token_digest(token)):
+        ...
+"""
+
+import hashlib
+import logging
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "revoked"
+
+# Revocations are re-read this far back on every sync, so a revocation
+# written by a worker with a slightly slower clock is not missed
+SYNC_OVERLAP_SECONDS = 2.0
+
+
+def token_digest(token: str) -> str:
+    """SHA-256 hex digest identifying a token."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """Bloom filter over hex digests (double hashing on the digest bits)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Args:
+            capacity: Entries the filter is sized for
+            error_rate: False positive rate at capacity
+        """
+        self.capacity = capacity
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: str) -> List[int]:
+        first = int(digest[:16], 16)
+        second = int(digest[16:32], 16) | 1
+        return [(first + index * second) % self.size for index in range(self.hash_count)]
+
+    def add(self, digest: str) -> None:
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class RevocationStore:
+    """Revoked digest store interface."""
+
+    async def revoke(self, digest: str, expires_at: float, now: Optional[float] = None) -> None:
+        """
+        Revoke `digest` until `expires_at` (UNIX time).
+
+        Args:
+            digest: Token digest
+            expires_at: Token expiry
+            now: Revocation time (default: time.time())
+        """
+        raise NotImplementedError
+
+    async def is_revoked(self, digest: str) -> bool:
+        raise NotImplementedError
+
+    async def revoked_since(self, since: float) -> List[str]:
+        """Digests revoked at or after `since` (UNIX time) that have not expired."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release store resources."""
+
+
+class MemoryRevocationStore(RevocationStore):
+    """Per-process store; expired entries are dropped on write."""
+
+    def __init__(self):
+        # digest -> (revoked at, expires at)
+        self._revoked: Dict[str, Tuple[float, float]] = {}
+
+    async def revoke(self, digest: str, expires_at: float, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        for stale in [key for key, (_, expiry) in self._revoked.items() if expiry <= now]:
+            del self._revoked[stale]
+        self._revoked[digest] = (now, expires_at)
+
+    async def is_revoked(self, digest: str) -> bool:
+        entry = self._revoked.get(digest)
+        return entry is not None and entry[1] > time.time()
+
+    async def revoked_since(self, since: float) -> List[str]:
+        now = time.time()
+        return [
+            digest for digest, (revoked_at, expires_at) in self._revoked.items()
+            if revoked_at >= since and expires_at > now
+        ]
+
+
+class RedisRevocationStore(RevocationStore):
+    """
+    Store shared by all workers.
+
+    Each revocation is a key that expires with the token (exact lookups)
+    plus a member of a sorted set scored by revocation time (incremental
+    sync); set members older than the longest token lifetime are trimmed on
+    write.
+    """
+
+    def __init__(self, client, prefix: str = KEY_PREFIX, max_token_lifetime: float = 24 * 3600):
+        """
+        Args:
+            client: redis.asyncio.Redis (or a compatible client)
+            prefix: Key prefix
+            max_token_lifetime: Seconds a revocation stays in the sync log
+        """
+        self.client = client
+        self.prefix = prefix
+        self.max_token_lifetime = max_token_lifetime
+        self.log_key = f"{prefix}:log"
+
+    async def revoke(self, digest: str, expires_at: float, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(f"{self.prefix}:{digest}", 1, exat=max(int(math.ceil(expires_at)), int(now) + 1))
+            pipe.zadd(self.log_key, {digest: now})
+            pipe.zremrangebyscore(self.log_key, "-inf", now - self.max_token_lifetime)
+            await pipe.execute()
+
+    async def is_revoked(self, digest: str) -> bool:
+        return bool(await self.client.exists(f"{self.prefix}:{digest}"))
+
+    async def revoked_since(self, since: float) -> List[str]:
+        members = await self.client.zrangebyscore(self.log_key, since, "+inf")
+        return [member.decode() if isinstance(member, bytes) else member for member in members]
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def build_revocation_store() -> RevocationStore:
+    """
+    Store selected by settings.token_revocation_store ("memory" or "redis").
+
+    Raises:
+        ValueError: On an unknown store or a Redis store without REDIS_URL
+    """
+    if settings.token_revocation_store == "memory":
+        return MemoryRevocationStore()
+    if settings.token_revocation_store == "redis":
+        if not settings.redis_url:
+            raise ValueError("TOKEN_REVOCATION_STORE=redis requires REDIS_URL")
+        import redis.asyncio as redis_asyncio
+
+        return RedisRevocationStore(redis_asyncio.from_url(settings.redis_url))
+    raise ValueError(f"Unknown TOKEN_REVOCATION_STORE: {settings.token_revocation_store} (use memory or redis)")
+
+
+class TokenRevocationList:
+    """Bloom filter of revoked digests in front of a RevocationStore."""
+
+    def __init__(
+        self,
+        store: Optional[RevocationStore] = None,
+        capacity: Optional[int] = None,
+        sync_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            store: Default: build_revocation_store()
+            capacity: Bloom filter capacity (default: settings.token_revocation_capacity)
+            sync_interval: Seconds between syncs with the store (default: settings.token_revocation_sync_seconds)
+        """
+        self.store = store if store is not None else build_revocation_store()
+        self.capacity = settings.token_revocation_capacity if capacity is None else capacity
+        self.sync_interval = settings.token_revocation_sync_seconds if sync_interval is None else sync_interval
+        self.bloom = BloomFilter(self.capacity)
+        self._synced_until = 0.0
+        self._next_sync = 0.0
+
+    async def revoke(self, digest: str, expires_at: float) -> None:
+        """Revoke a token digest until `expires_at` (UNIX time)."""
+        await self.store.revoke(digest, expires_at)
+        self.bloom.add(digest)
+
+    async def is_revoked(self, digest: str) -> bool:
+        """
+        Whether a token digest is revoked.
+
+        Fails closed: when the store cannot confirm a filter hit, the token
+        is treated as revoked.
+        """
+        await self._sync()
+        if digest not in self.bloom:
+            return False
+        try:
+            return await self.store.is_revoked(digest)
+        except Exception as e:
+            logger.warning(f"[REVOCATION] Store lookup failed, token rejected: {type(e).__name__}: {e}")
+            return True
+
+    async def _sync(self) -> None:
+        """Add revocations made by other workers since the last sync (at most every sync_interval)."""
+        now = time.time()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_interval
+        try:
+            if self.bloom.count >= self.capacity:
+                # Full: rebuild from the unexpired revocations only
+                bloom, since = BloomFilter(self.capacity), 0.0
+            else:
+                bloom, since = self.bloom, max(0.0, self._synced_until - SYNC_OVERLAP_SECONDS)
+            for digest in await self.store.revoked_since(since):
+                if digest not in bloom:
+                    bloom.add(digest)
+        except Exception as e:
+            logger.warning(f"[REVOCATION] Sync failed: {type(e).__name__}: {e}")
+            return
+        self.bloom = bloom
+        self._synced_until = now
+
+    async def close(self) -> None:
+        """Release the store (called on application shutdown)."""
+        await self.store.close()
+
+
+# Global revocation list
+token_revocation = TokenRevocationList()
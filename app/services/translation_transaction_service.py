@@ -10,9 +10,33 @@ from typing import Optional, List, Dict, Any
 import logging
 
 from app.database import database
+from app.database.query_shapes import register_query_shape
+from app.services.archive_service import archive_service
 
 logger = logging.getLogger(__name__)
 
+_SAMPLE_TIME = datetime(2025, 1, 15, tzinfo=timezone.utc)
+
+register_query_shape(
+    "translation_transactions.by_transaction_id",
+    "translation_transactions",
+    {"transaction_id": "TXN-0000000000"},
+    source="get_translation_transaction / transaction confirmation"
+)
+register_query_shape(
+    "translation_transactions.by_company_status",
+    "translation_transactions",
+    {"company_name": "Acme", "status": "started"},
+    source="GET /api/v1/translation-transactions/company/{company_name}"
+)
+register_query_shape(
+    "translation_transactions.by_company_recent",
+    "translation_transactions",
+    {"company_name": "Acme", "created_at": {"$gte": _SAMPLE_TIME, "$lte": _SAMPLE_TIME}},
+    sort=[("created_at", -1)],
+    source="GET /api/orders"
+)
+
 
 async def create_translation_transaction(
     transaction_id: str,
@@ -269,21 +293,21 @@ async def update_translated_file_info(
         return False
 
 
-async def get_translation_transaction(transaction_id: str) -> Optional[dict]:
+async def get_translation_transaction(transaction_id: str, include_archived: bool = False) -> Optional[dict]:
     """
     Retrieve a translation transaction by its transaction_id.
 
     Args:
         transaction_id: The unique transaction identifier
+        include_archived: Also search the archive tier (read-only detail views)
 
     Returns:
         Optional[dict]: The transaction document if found, None otherwise
     """
     try:
-        transaction = await database.translation_transactions.find_one(
-            {"transaction_id": transaction_id}
+        return await archive_service.find_one(
+            "translation_transactions", {"transaction_id": transaction_id}, include_archived
         )
-        return transaction
     except Exception as e:
         logger.error(
             f"Error retrieving transaction {transaction_id}: {str(e)}",
@@ -0,0 +1,341 @@
+"""
+Usage period repository for subscription usage tracking.
+
+Usage periods used to live in an embedded `usage_periods` array on each
+subscription document. They are now stored one document per period in the
+`usage_periods` collection, indexed on (subscription_id, period_start,
+period_end), so the current period is an indexed point read and subscription
+fetches no longer carry the whole history.
+
+Subscriptions that still carry an embedded array (not yet migrated with
+scripts/migrations/migrate_usage_periods_collection.py, or written by an
+older script) are migrated lazily the first time a lookup misses.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.database.mongodb import database
+from app.database.query_shapes import register_query_shape
+
+logger = logging.getLogger(__name__)
+
+# MongoDB duplicate key error code
+DUPLICATE_KEY_ERROR = 11000
+
+_SAMPLE_TIME = datetime(2025, 1, 15, tzinfo=timezone.utc)
+
+register_query_shape(
+    "usage_periods.current_period",
+    "usage_periods",
+    {"subscription_id": "sub", "period_start": {"$lte": _SAMPLE_TIME}, "period_end": {"$gte": _SAMPLE_TIME}},
+    sort=[("period_start", DESCENDING)],
+    source="UsagePeriodRepository.get_current_period / increment_usage"
+)
+register_query_shape(
+    "usage_periods.by_subscription",
+    "usage_periods",
+    {"subscription_id": "sub"},
+    sort=[("period_start", ASCENDING)],
+    source="UsagePeriodRepository.list_periods"
+)
+
+
+def build_period_document(
+    subscription_id: str,
+    company_name: Optional[str],
+    period: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build a usage_periods collection document from an embedded period.
+
+    Args:
+        subscription_id: Subscription ObjectId as string
+        company_name: Owning company name
+        period: Embedded usage period dict
+
+    Returns:
+        dict: Document ready for insertion
+    """
+    document = {key: value for key, value in period.items() if key != "_id"}
+    document["subscription_id"] = subscription_id
+    document["company_name"] = company_name
+    document.setdefault("units_used", 0)
+    document.setdefault("promotional_units", 0)
+    document.setdefault("created_at", datetime.now(timezone.utc))
+    return document
+
+
+class UsagePeriodRepository:
+    """Repository for usage period operations in MongoDB."""
+
+    @property
+    def collection(self) -> AsyncIOMotorCollection:
+        """Get the usage_periods collection."""
+        return database.usage_periods
+
+    @staticmethod
+    def _current_filter(subscription_id: Any, now: datetime) -> Dict[str, Any]:
+        """Filter matching the period(s) covering `now` for one or more subscriptions."""
+        return {
+            "subscription_id": subscription_id,
+            "period_start": {"$lte": now},
+            "period_end": {"$gte": now}
+        }
+
+    async def get_current_period(
+        self,
+        subscription_id: str,
+        now: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the usage period covering `now` for a subscription.
+
+        Args:
+            subscription_id: Subscription ObjectId string or subscription_id field
+            now: Reference time (defaults to current UTC time)
+
+        Returns:
+            Usage period document or None
+        """
+        now = now or datetime.now(timezone.utc)
+        period = await self.collection.find_one(
+            self._current_filter(subscription_id, now),
+            sort=[("period_start", DESCENDING)]
+        )
+        if period:
+            return period
+
+        canonical_id, migrated = await self.migrate_embedded_periods(subscription_id)
+        if canonical_id is None or (canonical_id == subscription_id and not migrated):
+            return None
+
+        return await self.collection.find_one(
+            self._current_filter(canonical_id, now),
+            sort=[("period_start", DESCENDING)]
+        )
+
+    async def get_current_periods(
+        self,
+        subscription_ids: Iterable[str],
+        now: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current period for several subscriptions in one query.
+
+        No lazy migration is attempted; callers resolve misses individually.
+
+        Returns:
+            dict: subscription_id -> current period document
+        """
+        now = now or datetime.now(timezone.utc)
+        ids = list(subscription_ids)
+        periods = await self.collection.find(
+            self._current_filter({"$in": ids}, now)
+        ).sort("period_start", ASCENDING).to_list(length=None)
+
+        # Later-starting periods win if two overlap, matching get_current_period()
+        return {period["subscription_id"]: period for period in periods}
+
+    async def list_periods(
+        self,
+        subscription_id: str,
+        period_numbers: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List a subscription's usage periods ordered by period_start.
+
+        Args:
+            subscription_id: Subscription ObjectId as string
+            period_numbers: Optional filter on period_number
+
+        Returns:
+            List of usage period documents
+        """
+        query: Dict[str, Any] = {"subscription_id": subscription_id}
+        if period_numbers is not None:
+            query["period_number"] = {"$in": period_numbers}
+
+        periods = await self.collection.find(query).sort("period_start", ASCENDING).to_list(length=None)
+        if periods:
+            return periods
+
+        canonical_id, migrated = await self.migrate_embedded_periods(subscription_id)
+        if canonical_id is None or (canonical_id == subscription_id and not migrated):
+            return []
+
+        query["subscription_id"] = canonical_id
+        return await self.collection.find(query).sort("period_start", ASCENDING).to_list(length=None)
+
+    async def list_periods_for_subscriptions(
+        self,
+        subscription_ids: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        List usage periods for several subscriptions with one query.
+
+        Returns:
+            dict: subscription_id -> list of periods ordered by period_start
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {sub_id: [] for sub_id in subscription_ids}
+        if not subscription_ids:
+            return grouped
+
+        cursor = self.collection.find(
+            {"subscription_id": {"$in": subscription_ids}}
+        ).sort([("subscription_id", ASCENDING), ("period_start", ASCENDING)])
+        async for period in cursor:
+            grouped.setdefault(period["subscription_id"], []).append(period)
+
+        for sub_id, periods in grouped.items():
+            if not periods:
+                grouped[sub_id] = await self.list_periods(sub_id)
+
+        return grouped
+
+    async def count_periods(self, subscription_id: str) -> int:
+        """Count usage periods for a subscription."""
+        return await self.collection.count_documents({"subscription_id": subscription_id})
+
+    async def add_period(
+        self,
+        subscription_id: str,
+        company_name: Optional[str],
+        period: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Insert a usage period for a subscription.
+
+        Args:
+            subscription_id: Subscription ObjectId as string
+            company_name: Owning company name
+            period: Period fields (period_start, period_end, units_allocated, ...)
+
+        Returns:
+            dict: Inserted document with _id
+        """
+        document = build_period_document(subscription_id, company_name, period)
+        result = await self.collection.insert_one(document)
+        document["_id"] = result.inserted_id
+        return document
+
+    async def increment_usage(
+        self,
+        subscription_id: str,
+        units: int,
+        now: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically add `units` to the period covering `now`.
+
+        Returns:
+            Updated period document, or None if no current period matched
+        """
+        query = self._current_filter(subscription_id, now)
+        query["units_allocated"] = {"$exists": True}
+
+        return await self.collection.find_one_and_update(
+            query,
+            {
+                "$inc": {"units_used": units, "units_remaining": -units},
+                "$set": {"last_updated": now}
+            },
+            sort=[("period_start", DESCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def increment_usage_bulk(
+        self,
+        units_by_period_id: Dict[ObjectId, int],
+        now: datetime
+    ) -> Dict[ObjectId, Dict[str, Any]]:
+        """
+        Atomically add units to several periods (by _id) in one bulk write.
+
+        The periods are read back by _id afterwards, so the balances returned
+        include concurrent increments applied before the read-back.
+
+        Returns:
+            dict: period _id -> updated period document
+        """
+        if not units_by_period_id:
+            return {}
+
+        operations = [
+            UpdateOne(
+                {"_id": period_id},
+                {
+                    "$inc": {"units_used": units, "units_remaining": -units},
+                    "$set": {"last_updated": now}
+                }
+            )
+            for period_id, units in units_by_period_id.items()
+        ]
+        await self.collection.bulk_write(operations, ordered=False)
+
+        periods = await self.collection.find(
+            {"_id": {"$in": list(units_by_period_id)}}
+        ).to_list(length=None)
+        return {period["_id"]: period for period in periods}
+
+    async def migrate_embedded_periods(self, subscription_id: str) -> Tuple[Optional[str], int]:
+        """
+        Move a subscription's legacy embedded usage_periods into the collection.
+
+        Safe to run concurrently: the unique (subscription_id, period_start,
+        period_end) index rejects duplicate copies.
+
+        Args:
+            subscription_id: Subscription ObjectId string or subscription_id field
+
+        Returns:
+            tuple: (canonical subscription ID as str of _id or None if the
+            subscription does not exist, number of periods migrated)
+        """
+        id_clauses: List[Dict[str, Any]] = [{"subscription_id": subscription_id}]
+        try:
+            id_clauses.append({"_id": ObjectId(subscription_id)})
+        except (InvalidId, TypeError):
+            pass
+
+        subscription = await database.subscriptions.find_one(
+            {"$or": id_clauses},
+            {"company_name": 1, "usage_periods": 1}
+        )
+        if not subscription:
+            return None, 0
+
+        canonical_id = str(subscription["_id"])
+        embedded = subscription.get("usage_periods") or []
+        if not embedded:
+            return canonical_id, 0
+
+        documents = [
+            build_period_document(canonical_id, subscription.get("company_name"), period)
+            for period in embedded
+        ]
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in e.details.get("writeErrors", [])):
+                raise
+
+        await database.subscriptions.update_one(
+            {"_id": subscription["_id"]},
+            {"$unset": {"usage_periods": ""}}
+        )
+        logger.info(
+            f"[USAGE_PERIODS] Migrated {len(documents)} embedded periods for subscription {canonical_id}"
+        )
+        return canonical_id, len(documents)
+
+
+# Global repository instance
+usage_period_repository = UsagePeriodRepository()
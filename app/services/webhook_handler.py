@@ -350,7 +350,8 @@ class WebhookHandler:
                             "status": "paid",
                             "stripe_payment_intent_id": payment_intent_id,
                             "amount_paid": amount_decimal,
-                            "paid_at": datetime.now(timezone.utc)
+                            "paid_at": datetime.now(timezone.utc),
+                            "updated_at": datetime.now(timezone.utc)
                         }
                     },
                     return_document=ReturnDocument.AFTER
@@ -47,6 +47,16 @@ from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo.errors import DuplicateKeyError
 
+from app.database.query_shapes import register_query_shape
+
+
+register_query_shape(
+    "webhook_events.by_event_id",
+    "webhook_events",
+    {"event_id": "evt_test"},
+    source="WebhookRepository.get_event"
+)
+
 
 class DuplicateEventError(Exception):
     """
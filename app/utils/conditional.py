@@ -0,0 +1,189 @@
+"""
+Conditional GET (ETag / Last-Modified) for read-mostly endpoints.
+
+A route computes a cheap version stamp of the data it would return (the
+document count plus the newest modification timestamp of the matching
+documents), derives a weak ETag from it and answers 304 Not Modified before
+loading or serializing the body when the client already has that version.
+
+The stamp never touches the documents themselves: the count is answered from
+the filter's index and each newest timestamp is a single read of a compound
+(filter field, timestamp) index, e.g. invoices company_updated_idx.
+
+Usage:
+    stamp = await collection_version(database.invoices, {"company_name": company_name})
+    conditional = ConditionalGet(request, make_etag("invoices", stamp, page), stamp.last_modified)
+    if conditional.is_not_modified():
+        return conditional.not_modified_response()
+    ...
+    conditional.apply(response)
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import Request, Response
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DESCENDING
+
+from app.database.query_shapes import register_query_shape
+
+# Revalidate on every use; responses are per user/company
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+
+for _field in ("updated_at", "created_at"):
+    register_query_shape(
+        f"invoices.newest_{_field}_by_company",
+        "invoices",
+        {"company_name": "Acme Health LLC"},
+        sort=[(_field, DESCENDING)],
+        source="collection_version"
+    )
+
+
+@dataclass(frozen=True)
+class VersionStamp:
+    """Cheap fingerprint of a set of documents."""
+
+    count: int
+    # Newest value of each modification field (None when absent)
+    maxima: tuple = ()
+
+    @property
+    def last_modified(self) -> Optional[datetime]:
+        """Newest modification time (UTC), if any document carries one."""
+        dates = [value for value in self.maxima if isinstance(value, datetime)]
+        if not dates:
+            return None
+        return max(_as_utc(value) for value in dates)
+
+    def token(self) -> str:
+        return f"{self.count}:" + ",".join(
+            value.isoformat() if isinstance(value, datetime) else repr(value) for value in self.maxima
+        )
+
+
+def _as_utc(value: datetime) -> datetime:
+    # MongoDB returns naive UTC datetimes unless the client is tz_aware
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+async def collection_version(
+    collection: AsyncIOMotorCollection,
+    query: Dict[str, Any],
+    fields: Sequence[str] = ("updated_at", "created_at")
+) -> VersionStamp:
+    """
+    Compute the version stamp of the documents matching `query`.
+
+    Inserts and deletes change the count; updates change the newest
+    modification timestamp (writers set updated_at). Each field is read with
+    a sorted find_one, so index (query fields..., field) keeps the stamp from
+    scanning the matching documents.
+
+    Args:
+        collection: Collection to stamp
+        query: Filter of the documents the response is built from
+        fields: Modification timestamp fields, newest value of each is used
+
+    Returns:
+        VersionStamp
+    """
+    result = await collection.aggregate([{"$match": query}, {"$count": "count"}]).to_list(length=1)
+    if not result:
+        return VersionStamp(count=0, maxima=tuple(None for _ in fields))
+
+    maxima: List[Any] = []
+    for field in fields:
+        newest_document = await collection.find_one(
+            query,
+            {"_id": 0, field: 1},
+            sort=[(field, DESCENDING)]
+        )
+        maxima.append(newest_document.get(field) if newest_document else None)
+    return VersionStamp(count=result[0]["count"], maxima=tuple(maxima))
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from version stamps and request parameters.
+
+    Args:
+        parts: Scope name, VersionStamps, query parameters, ...
+
+    Returns:
+        str: Weak ETag, e.g. W/"3f2a..."
+    """
+    material = "|".join(part.token() if isinstance(part, VersionStamp) else repr(part) for part in parts)
+    return f'W/"{hashlib.sha1(material.encode("utf-8")).hexdigest()}"'
+
+
+def newest(*stamps: VersionStamp) -> Optional[datetime]:
+    """Latest last_modified of several stamps."""
+    dates = [stamp.last_modified for stamp in stamps if stamp.last_modified is not None]
+    return max(dates) if dates else None
+
+
+def _etag_list(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _weak_equal(a: str, b: str) -> bool:
+    return a.removeprefix("W/") == b.removeprefix("W/")
+
+
+class ConditionalGet:
+    """Evaluates If-None-Match / If-Modified-Since for one response version."""
+
+    def __init__(
+        self,
+        request: Request,
+        etag: str,
+        last_modified: Optional[datetime] = None,
+        cache_control: str = DEFAULT_CACHE_CONTROL
+    ):
+        self.request = request
+        self.etag = etag
+        self.last_modified = _as_utc(last_modified).replace(microsecond=0) if last_modified else None
+        self.cache_control = cache_control
+
+    def is_not_modified(self) -> bool:
+        """
+        True when the client's cached copy is current (RFC 9110 section 13.2.2).
+
+        If-None-Match takes precedence; If-Modified-Since is only evaluated
+        when the request carries no If-None-Match.
+        """
+        if_none_match = self.request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = _etag_list(if_none_match)
+            return "*" in tags or any(_weak_equal(tag, self.etag) for tag in tags)
+
+        if_modified_since = self.request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified <= _as_utc(since)
+        return False
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def not_modified_response(self) -> Response:
+        """Empty 304 response carrying the validators."""
+        return Response(status_code=304, headers=self.headers)
+
+    def apply(self, response: Response) -> Response:
+        """Set the validators on a full (200) response."""
+        for name, value in self.headers.items():
+            response.headers[name] = value
+        return response
@@ -0,0 +1,181 @@
+"""
+Event loop lag monitor and blocking detector.
+
+Lag: a background task sleeps for a fixed interval and measures how late it
+wakes up. The overshoot is the time other callbacks kept the loop busy
+(blocking calls, CPU-heavy work), i.e. the extra latency every request saw
+at that moment. Samples go to the event_loop_lag_seconds histogram.
+
+Blocking: a watchdog thread posts a heartbeat callback to the loop and
+checks that it runs. When it is still pending after
+settings.loop_block_threshold_ms, the loop thread is stuck in some callback:
+the watchdog captures that thread's stack while it is still blocked, logs
+it, and counts it in event_loop_blocked_total by code site (the innermost
+frame in the app package, e.g. app/services/email_service.py:send_email).
+When the heartbeat finally runs, the stall's duration goes to
+event_loop_blocked_seconds.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from app.config import settings
+from app.utils.metrics import (
+    EVENT_LOOP_BLOCKED,
+    EVENT_LOOP_BLOCKED_SECONDS,
+    EVENT_LOOP_LAG_SECONDS,
+    CallbackMetric,
+)
+
+logger = logging.getLogger(__name__)
+
+# Directory containing the app package (for site labels and short paths)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_APP_ROOT = os.path.join(_PROJECT_ROOT, "app") + os.sep
+
+# Frames kept in a logged stack (innermost)
+STACK_LIMIT = 30
+
+
+def blocking_site(stack: List[traceback.FrameSummary]) -> str:
+    """
+    Code site of a blocked stack: the innermost frame in the app package.
+
+    Library frames (smtplib, reportlab, stripe) are skipped so that the label
+    names the app code that made the blocking call; stacks without app
+    frames fall back to the innermost frame.
+    """
+    for frame in reversed(stack):
+        if frame.filename.startswith(_APP_ROOT):
+            return f"{os.path.relpath(frame.filename, _PROJECT_ROOT)}:{frame.name}"
+    if stack:
+        return f"{os.path.basename(stack[-1].filename)}:{stack[-1].name}"
+    return "unknown"
+
+
+class LoopLagMonitor:
+    """Samples event loop lag every `interval` seconds and reports blocking callbacks."""
+
+    def __init__(self, interval: Optional[float] = None, block_threshold: Optional[float] = None):
+        """
+        Args:
+            interval: Seconds between samples (default: settings.loop_lag_sample_interval_ms)
+            block_threshold: Seconds a callback may block the loop before its
+                stack is captured, 0 disables (default: settings.loop_block_threshold_ms)
+        """
+        self.interval = settings.loop_lag_sample_interval_ms / 1000 if interval is None else interval
+        self.block_threshold = (
+            settings.loop_block_threshold_ms / 1000 if block_threshold is None else block_threshold
+        )
+        self.last_lag = 0.0
+        self.blocked_count = 0
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        # Heartbeat posted to the loop and not run yet (monotonic time)
+        self._pending_since: Optional[float] = None
+        self._reported = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling (and the watchdog) on the running loop (no-op when already running)."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._task = self._loop.create_task(self._run(), name="loop-lag-monitor")
+
+        if self.block_threshold > 0:
+            self._stop_event.clear()
+            self._pending_since = None
+            self._reported = False
+            self._watchdog = threading.Thread(target=self._watch, name="loop-block-watchdog", daemon=True)
+            self._watchdog.start()
+
+        logger.info(
+            f"[LOOP MONITOR] Sampling event loop lag every {self.interval * 1000:.0f}ms"
+            + (f", blocking threshold {self.block_threshold * 1000:.0f}ms" if self.block_threshold > 0 else "")
+        )
+
+    async def stop(self) -> None:
+        if self._watchdog is not None:
+            self._stop_event.set()
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - expected)
+            EVENT_LOOP_LAG_SECONDS.observe(self.last_lag)
+
+    def _watch(self) -> None:
+        """Watchdog thread: post heartbeats and capture the stack of a stuck loop."""
+        check_interval = max(self.block_threshold / 4, 0.005)
+        while not self._stop_event.wait(check_interval):
+            pending_since = self._pending_since
+            now = time.monotonic()
+            if pending_since is None:
+                self._pending_since = now
+                try:
+                    self._loop.call_soon_threadsafe(self._heartbeat, now)
+                except RuntimeError:
+                    # Loop closed
+                    return
+            elif (
+                not self._reported
+                and now - pending_since >= self.block_threshold
+                and self._pending_since == pending_since
+            ):
+                self._reported = True
+                self._report_block(now - pending_since)
+
+    def _heartbeat(self, posted_at: float) -> None:
+        """Runs on the loop: the loop is responsive again."""
+        if self._reported:
+            blocked = time.monotonic() - posted_at
+            EVENT_LOOP_BLOCKED_SECONDS.observe(blocked)
+            logger.warning(f"[LOOP MONITOR] Event loop unblocked after {blocked * 1000:.0f}ms")
+        self._reported = False
+        self._pending_since = None
+
+    def _report_block(self, blocked: float) -> None:
+        """Log and count the stack the loop thread is blocked in (watchdog thread)."""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.extract_stack(frame, limit=STACK_LIMIT) if frame is not None else []
+        site = blocking_site(stack)
+        self.blocked_count += 1
+        EVENT_LOOP_BLOCKED.labels(site).inc()
+        logger.warning(
+            f"[LOOP MONITOR] Event loop blocked for {blocked * 1000:.0f}ms+ in {site}\n"
+            + "".join(traceback.format_list(stack))
+        )
+
+
+# Global monitor instance
+loop_lag_monitor = LoopLagMonitor()
+
+CallbackMetric(
+    "event_loop_lag_last_seconds", "Most recent event loop lag sample", [],
+    lambda: [((), loop_lag_monitor.last_lag)]
+)
@@ -0,0 +1,347 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+A small, dependency-free subset of the prometheus_client API (Counter,
+Gauge, Histogram with .labels(), plus CallbackMetric for values read at
+scrape time). Hot-path cost is one dict lookup for the labelled child and
+one bisect + lock for a histogram observation; formatting only happens
+when /metrics is scraped.
+
+Values are per process: with several uvicorn workers each worker exports
+its own series (scrape each worker, or aggregate by instance).
+
+Usage:
+    HTTP_REQUESTS.labels("GET", "/api/v1/companies", "200").inc()
+    MONGO_COMMAND_SECONDS.labels("oltp", "find").observe(0.004)
+    with SOME_HISTOGRAM.time("label value"):
+        ...
+    body = REGISTRY.render()
+"""
+
+import bisect
+import hmac
+import ipaddress
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets (seconds) for network calls: 5ms .. 60s
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Event loop lag buckets (seconds): 1ms .. 5s
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+LabelValues = Tuple[str, ...]
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Registry:
+    """Collection of metrics rendered together at /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, "_Metric"] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric") -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def scrape_allowed(
+    peer: Optional[str],
+    authorization: Optional[str],
+    allowed_networks: Sequence[IPNetwork],
+    token: str = "",
+) -> bool:
+    """
+    Decide whether a /metrics request may read the registry.
+
+    The peer is the socket address, never X-Forwarded-For: the header is
+    client-controlled and a proxy in front of the app would otherwise make
+    every scrape look local.
+
+    Args:
+        peer: Direct peer address of the request (None if unknown)
+        authorization: Authorization header value, if any
+        allowed_networks: Networks whose peers may scrape without a token
+        token: Scrape token accepted as "Bearer <token>" from any peer (empty disables)
+
+    Returns:
+        True if the peer is allowlisted or the bearer token matches
+    """
+    if token and authorization:
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(credentials.strip().encode(), token.encode()):
+            return True
+    if not peer:
+        return False
+    try:
+        address = ipaddress.ip_address(peer)
+    except ValueError:
+        return False
+    return any(address in network for network in allowed_networks)
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[Registry] = REGISTRY
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values: str):
+        """Child metric for one combination of label values."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(tuple(str(value) for value in values), self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    type = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One count per bucket (non-cumulative) plus +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """Distribution of observations in fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional[Registry] = REGISTRY
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self, *values: str):
+        """Context manager observing the duration of the block."""
+        return self.labels(*values).time()
+
+    def samples(self) -> Iterator[str]:
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackMetric(_Metric):
+    """Gauge or counter whose samples are read from a callback at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[LabelValues, float]]],
+        metric_type: str = "gauge",
+        registry: Optional[Registry] = REGISTRY
+    ):
+        """
+        Args:
+            callback: Returns (label values, value) pairs
+            metric_type: "gauge" or "counter"
+        """
+        self.type = metric_type
+        self.callback = callback
+        super().__init__(name, documentation, labelnames, registry)
+
+    def samples(self) -> Iterator[str]:
+        for values, value in self.callback():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(float(value))}"
+
+
+# ============================================================================
+# Application metrics
+# ============================================================================
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"]
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request duration until the response is sent", ["method", "route"]
+)
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency (driver round trip)", ["client", "command"]
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongodb_command_failures_total", "MongoDB commands that failed", ["client", "command"]
+)
+DRIVE_CALL_SECONDS = Histogram(
+    "google_drive_call_duration_seconds", "Google Drive API call latency per attempt", ["operation", "outcome"]
+)
+SMTP_SEND_SECONDS = Histogram(
+    "smtp_send_duration_seconds", "SMTP connect + send + quit time", ["kind", "outcome"]
+)
+STRIPE_REQUEST_SECONDS = Histogram(
+    "stripe_request_duration_seconds", "Stripe API request latency per attempt", ["method", "endpoint", "status"]
+)
+JWT_CACHE_REQUESTS = Counter(
+    "jwt_verification_cache_requests_total", "JWT verifications served from the claims cache (hit) or decoded (miss)",
+    ["result"]
+)
+DIRECTORY_CACHE_REQUESTS = Counter(
+    "directory_cache_requests_total", "Company directory lookups served from the cache (hit) or MongoDB (miss)",
+    ["collection", "result"]
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds", "Delay of event loop callbacks beyond their scheduled time", buckets=LAG_BUCKETS
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total", "Event loop stalls beyond the blocking threshold, by blocking code site", ["site"]
+)
+EVENT_LOOP_BLOCKED_SECONDS = Histogram(
+    "event_loop_blocked_seconds", "Duration of event loop stalls beyond the blocking threshold", buckets=LAG_BUCKETS
+)
@@ -0,0 +1,56 @@
+"""
+MongoDB projection helpers for list (summary) read models.
+
+List endpoints fetch only the fields their summary model declares, so the
+projection and the response model cannot drift apart.
+"""
+
+import typing
+from typing import Any, Dict, Iterable, Optional, Type
+
+from pydantic import BaseModel
+
+
+def _nested_model(annotation: Any) -> Optional[Type[BaseModel]]:
+    """Return the model inside Optional[...] / List[...] annotations, if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        model = _nested_model(arg)
+        if model is not None:
+            return model
+    return None
+
+
+def projection_for(
+    model: Type[BaseModel],
+    extra_fields: Iterable[str] = (),
+    prefix: str = ""
+) -> Dict[str, int]:
+    """
+    Build an inclusion projection from a Pydantic model's fields.
+
+    Field aliases are used when set (e.g. `_id`). Fields typed as a nested
+    model (or a list of them) expand to dotted paths, so array elements are
+    trimmed to the nested model's fields too.
+
+    Args:
+        model: Summary model describing the list view
+        extra_fields: Additional stored field names to fetch (e.g. legacy
+            names that the serializer maps onto model fields)
+        prefix: Dotted path prefix (used for nested models)
+
+    Returns:
+        dict: Projection suitable for find() or a $project stage
+    """
+    projection: Dict[str, int] = {}
+    for name, field in model.model_fields.items():
+        path = f"{prefix}{field.alias or name}"
+        nested = _nested_model(field.annotation)
+        if nested is not None:
+            projection.update(projection_for(nested, prefix=f"{path}."))
+        else:
+            projection[path] = 1
+    for name in extra_fields:
+        projection[f"{prefix}{name}"] = 1
+    return projection
@@ -0,0 +1,35 @@
+"""
+Fast JSON response class for trusted MongoDB output.
+
+FastJSONResponse encodes with orjson (app.utils.serialization.dumps), so
+list routes can return raw MongoDB documents: ObjectId, Decimal128 and
+datetime are converted during encoding instead of in a separate
+serialize-then-json.dumps pass. The bytes are identical to
+JSONResponse(content=serialize_for_json(content)) except for floats below
+1e-4 written in exponent form (orjson: 1e-7, json: 1e-07) and NaN/Infinity
+(orjson: null, json: error); see tests/unit/test_fast_json_response.py.
+
+Opt-in per route:
+
+    @router.get("/...", response_model=SomeListResponse, response_class=FastJSONResponse)
+    async def list_things(...):
+        documents = await database.things.find(query).to_list(length=limit)
+        return FastJSONResponse(content={"success": True, "data": documents})
+
+Returning the response instance skips response_model re-validation; the
+response_model then only documents the schema in OpenAPI. Only use it for
+documents read from our own database, not for user-supplied payloads.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.utils.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson, accepting raw MongoDB documents."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -5,18 +5,49 @@ Handles conversion of:
 - datetime → ISO 8601 string
 - ObjectId → string
 - Decimal128 → float
+
+Two entry points:
+- serialize_for_json(): converts a document tree to JSON-compatible Python
+  objects (for JSONResponse / response models)
+- dumps(): encodes a document tree straight to JSON bytes with orjson,
+  converting BSON types through the bson_default() hook
 """
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Dict
 from bson import ObjectId
 from bson.decimal128 import Decimal128
-import logging
+import orjson
+
+
+def _decimal128_to_float(value: Decimal128) -> float:
+    return float(value.to_decimal())
+
+
+# Exact-type dispatch for BSON scalars (subclasses fall back to isinstance)
+_BSON_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    datetime: datetime.isoformat,
+    ObjectId: str,
+    Decimal128: _decimal128_to_float,
+}
+
+# Types returned unchanged
+_PRIMITIVES = frozenset({str, int, float, bool, type(None)})
+
 
-logger = logging.getLogger(__name__)
+def _convert_other(obj: Any) -> Any:
+    """Convert subclasses of the BSON types; return anything else unchanged."""
+    for bson_type, convert in _BSON_CONVERTERS.items():
+        if isinstance(obj, bson_type):
+            return convert(obj)
+    if isinstance(obj, dict):
+        return {key: serialize_for_json(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [serialize_for_json(item) for item in obj]
+    return obj
 
 
-def serialize_for_json(obj: Any, *, _path: str = "root") -> Any:
+def serialize_for_json(obj: Any) -> Any:
     """
     Recursively serialize MongoDB documents for JSON responses.
 
@@ -29,7 +60,6 @@ def serialize_for_json(obj: Any, *, _path: str = "root") -> Any:
 
     Args:
         obj: Object to serialize (dict, list, datetime, ObjectId, Decimal128, primitive)
-        _path: Internal tracking of object path (for logging)
 
     Returns:
         JSON-serializable object
@@ -47,38 +77,53 @@ def serialize_for_json(obj: Any, *, _path: str = "root") -> Any:
         >>> assert isinstance(serialized["created_at"], str)
         >>> assert isinstance(serialized["amount"], float)
     """
-    if isinstance(obj, datetime):
-        # Convert datetime to ISO 8601 string
-        iso_str = obj.isoformat()
-        logger.debug(f"[SERIALIZATION] {_path}: datetime → '{iso_str}'")
-        return iso_str
-
-    elif isinstance(obj, ObjectId):
-        # Convert ObjectId to hex string
-        str_val = str(obj)
-        logger.debug(f"[SERIALIZATION] {_path}: ObjectId → '{str_val}'")
-        return str_val
-
-    elif isinstance(obj, Decimal128):
-        # Convert Decimal128 to float
-        float_val = float(obj.to_decimal())
-        logger.debug(f"[SERIALIZATION] {_path}: Decimal128 → {float_val}")
-        return float_val
-
-    elif isinstance(obj, dict):
-        # Recursively process dictionary
-        return {
-            key: serialize_for_json(value, _path=f"{_path}.{key}")
-            for key, value in obj.items()
-        }
-
-    elif isinstance(obj, list):
-        # Recursively process list
-        return [
-            serialize_for_json(item, _path=f"{_path}[{i}]")
-            for i, item in enumerate(obj)
-        ]
-
-    else:
-        # Primitive type (str, int, float, bool, None) - return as-is
+    obj_type = type(obj)
+    if obj_type in _PRIMITIVES:
         return obj
+    if obj_type is dict:
+        return {key: serialize_for_json(value) for key, value in obj.items()}
+    if obj_type is list:
+        return [serialize_for_json(item) for item in obj]
+    convert = _BSON_CONVERTERS.get(obj_type)
+    if convert is not None:
+        return convert(obj)
+    return _convert_other(obj)
+
+
+def bson_default(obj: Any) -> Any:
+    """
+    orjson `default` hook for BSON types.
+
+    orjson encodes datetime natively (same ISO 8601 output as isoformat());
+    this hook only sees types orjson does not know.
+
+    Raises:
+        TypeError: If the object is not a supported BSON type
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Decimal128):
+        return _decimal128_to_float(obj)
+    if isinstance(obj, datetime):
+        # datetime subclasses are not encoded natively
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode a MongoDB document tree to JSON bytes.
+
+    Equivalent to json.dumps(serialize_for_json(obj)) without building the
+    intermediate copy of the document.
+
+    Args:
+        obj: Document, list of documents or primitive
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+
+    Raises:
+        TypeError: If the tree contains a type that cannot be encoded
+    """
+    return orjson.dumps(obj, default=bson_default)
@@ -0,0 +1,70 @@
+"""
+Stripe API latency metrics and trace spans.
+
+Every Stripe SDK call goes through stripe.default_http_client, so timing its
+request() covers all of them (each network attempt is observed separately,
+retries included) without touching the call sites. Object IDs in the URL are
+replaced with {id} to keep the endpoint label bounded.
+"""
+
+import time
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import stripe
+from stripe._http_client import HTTPClient, new_default_http_client, new_http_client_async_fallback
+
+from app.utils.metrics import STRIPE_REQUEST_SECONDS
+from app.utils.tracing import span
+
+
+def stripe_endpoint(url: str) -> str:
+    """Endpoint label of a Stripe URL: /v1/payment_intents/pi_123/capture -> /v1/payment_intents/{id}/capture."""
+    segments = urlsplit(url).path.strip("/").split("/")
+    return "/" + "/".join(
+        "{id}" if index > 0 and any(char.isdigit() for char in segment) else segment
+        for index, segment in enumerate(segments)
+    )
+
+
+def instrument_stripe(client: Optional[HTTPClient] = None) -> HTTPClient:
+    """
+    Time the requests of a Stripe HTTP client and install it as stripe.default_http_client.
+
+    Args:
+        client: Client to instrument (default: the current default client,
+            or a new one built like the SDK builds it)
+
+    Returns:
+        The instrumented client
+    """
+    if client is None:
+        client = stripe.default_http_client
+    if client is None:
+        kwargs = {"verify_ssl_certs": stripe.verify_ssl_certs, "proxy": stripe.proxy}
+        client = new_default_http_client(async_fallback_client=new_http_client_async_fallback(**kwargs), **kwargs)
+
+    if not getattr(client, "_metrics_instrumented", False):
+        request = client.request
+
+        def timed_request(method: str, url: str, headers: Any, post_data: Any = None, **kwargs) -> Any:
+            start_time = time.perf_counter()
+            status = "error"
+            endpoint = stripe_endpoint(url)
+            try:
+                with span("stripe.request", **{"http.method": method.upper(), "stripe.endpoint": endpoint}) as current:
+                    response = request(method, url, headers, post_data, **kwargs)
+                    status = str(response[1])
+                    if current is not None:
+                        current.set_attribute("http.status_code", response[1])
+                return response
+            finally:
+                STRIPE_REQUEST_SECONDS.labels(method.upper(), endpoint, status).observe(
+                    time.perf_counter() - start_time
+                )
+
+        client.request = timed_request
+        client._metrics_instrumented = True
+
+    stripe.default_http_client = client
+    return client
@@ -0,0 +1,263 @@
+"""
+Structured, non-blocking logging pipeline.
+
+The event loop only enqueues log records: the root logger's single handler
+puts records on a bounded in-memory queue (dropping and counting them when
+the queue is full instead of blocking), and a background QueueListener
+thread formats them (structlog ProcessorFormatter: JSON in production,
+console otherwise) and writes them to stdout and the log file.
+
+Also provides:
+- Deferred formatting: records are formatted in the listener thread, but
+  only the %-style arguments of a call are deferred (logger.debug("x=%s", x)).
+  An f-string message is built by the caller on the event loop, so hot paths
+  pass arguments instead of f-strings.
+- Per-component levels: settings.log_component_levels, e.g.
+  "translator.middleware=WARNING,app.services.google_drive_service=DEBUG".
+- Sampling of DEBUG records: settings.log_debug_sample_rate (0.0-1.0).
+- legacy_print(): called by name in place of the console print() calls on
+  request paths; routes them through the pipeline (logger "legacy.print"),
+  or drops them when settings.legacy_prints_enabled is False. It never
+  shadows the builtin, so a bare print() still means stdout.
+
+Usage:
+    configure_logging()            # application startup
+    logger = get_logger(__name__)  # structlog logger (stdlib-backed)
+    logger.info("payment_confirmed", transaction_id=transaction_id)
+    shutdown_logging()             # application shutdown (flushes the queue)
+"""
+
+import atexit
+import builtins
+import logging
+import math
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
+
+import structlog
+
+from app.config import settings
+from app.utils.metrics import CallbackMetric
+
+# Records that could not be enqueued because the queue was full
+_dropped_records = 0
+_listener: Optional[QueueListener] = None
+_legacy_prints_enabled: bool = settings.legacy_prints_enabled
+
+_print_logger = logging.getLogger("legacy.print")
+
+# Processors shared by structlog loggers and plain stdlib records
+SHARED_PROCESSORS = [
+    structlog.contextvars.merge_contextvars,
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.processors.TimeStamper(fmt="iso", utc=True),
+]
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller and never formats.
+
+    The stdlib QueueHandler formats the message in the calling thread before
+    enqueueing; here the record is enqueued as-is and formatted by the
+    listener thread. When the queue is full the record is dropped and counted.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _dropped_records
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped_records += 1
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fixed fraction of DEBUG (and lower) records, per logger.
+
+    Sampling is deterministic: with rate 0.25 every fourth debug record of
+    each logger is kept. Records at INFO and above always pass.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = min(max(rate, 0.0), 1.0)
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        if self.rate <= 0.0:
+            return False
+
+        with self._lock:
+            count = self._counts.get(record.name, 0)
+            self._counts[record.name] = count + 1
+        # Keep the record whenever the running total of kept records ticks over
+        return math.floor((count + 1) * self.rate) > math.floor(count * self.rate)
+
+
+class _PrintMessage:
+    """print() arguments, joined only when the record is formatted."""
+
+    __slots__ = ("args", "sep")
+
+    def __init__(self, args: tuple, sep: str):
+        self.args = args
+        self.sep = sep
+
+    def __str__(self) -> str:
+        return self.sep.join(str(arg) for arg in self.args)
+
+
+def legacy_print(*args, sep: Optional[str] = " ", end: Optional[str] = "\n", file=None, flush: bool = False) -> None:
+    """
+    print() replacement for request paths.
+
+    Console output goes through the logging queue (logger "legacy.print",
+    INFO) instead of writing to stdout from the event loop, or is dropped
+    when settings.legacy_prints_enabled is False. Output to an explicit
+    stream other than stdout is passed to the builtin print().
+
+    Only the joining of the arguments is deferred; the arguments themselves
+    (f-strings included) are evaluated by the caller.
+    """
+    if file is not None and file is not sys.stdout:
+        builtins.print(*args, sep=sep, end=end, file=file, flush=flush)
+        return
+    if not _legacy_prints_enabled or not _print_logger.isEnabledFor(logging.INFO):
+        return
+    _print_logger.info(_PrintMessage(args, " " if sep is None else sep))
+
+
+def set_legacy_prints(enabled: bool) -> None:
+    """Turn legacy_print() output on or off at runtime."""
+    global _legacy_prints_enabled
+    _legacy_prints_enabled = enabled
+
+
+def parse_component_levels(spec: str) -> Dict[str, int]:
+    """
+    Parse "logger=LEVEL,logger=LEVEL" into {logger: level}.
+
+    Raises:
+        ValueError: On a malformed entry or unknown level name
+    """
+    levels: Dict[str, int] = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, separator, level_name = entry.partition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not separator or not name.strip() or not isinstance(level, int):
+            raise ValueError(f"Invalid log level entry: '{entry}' (expected logger=LEVEL)")
+        levels[name.strip()] = level
+    return levels
+
+
+def _output_handlers(renderer) -> List[logging.Handler]:
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processor=renderer,
+        foreign_pre_chain=SHARED_PROCESSORS,
+    )
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stdout)]
+    if settings.log_file:
+        handlers.append(logging.FileHandler(settings.log_file, mode="a", encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def configure_logging(handlers: Optional[List[logging.Handler]] = None) -> QueueListener:
+    """
+    Install the queue-based pipeline on the root logger.
+
+    Args:
+        handlers: Output handlers run by the listener thread (default:
+            stdout and settings.log_file, structlog-formatted)
+
+    Returns:
+        The started QueueListener
+    """
+    global _listener
+    shutdown_logging()
+
+    if handlers is None:
+        renderer = (
+            structlog.processors.JSONRenderer()
+            if settings.is_production
+            else structlog.dev.ConsoleRenderer(colors=False)
+        )
+        handlers = _output_handlers(renderer)
+
+    structlog.configure(
+        processors=SHARED_PROCESSORS + [
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(settings.log_debug_sample_rate))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.log_level.upper())
+
+    for name, level in parse_component_levels(settings.log_component_levels).items():
+        logging.getLogger(name).setLevel(level)
+
+    set_legacy_prints(settings.legacy_prints_enabled)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Stop the listener thread after it has written every queued record."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    """Number of records dropped because the log queue was full."""
+    return _dropped_records
+
+
+def get_logger(name: Optional[str] = None) -> structlog.stdlib.BoundLogger:
+    """Structured logger; key/value events are rendered by the pipeline."""
+    return structlog.get_logger(name)
+
+
+def queue_depth() -> int:
+    """Records waiting for the listener thread."""
+    return _listener.queue.qsize() if _listener is not None else 0
+
+
+atexit.register(shutdown_logging)
+
+CallbackMetric("log_queue_depth", "Log records waiting to be written", [], lambda: [((), queue_depth())])
+CallbackMetric(
+    "log_records_dropped_total", "Log records dropped because the queue was full", [],
+    lambda: [((), _dropped_records)], metric_type="counter"
+)
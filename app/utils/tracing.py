@@ -0,0 +1,456 @@
+"""
+Lightweight in-process request tracing.
+
+Every HTTP request is one trace whose id is the request's X-Request-ID (the
+32 hex digits of the UUID). The active trace and span live in contextvars,
+so spans opened anywhere below the request nest under the right parent
+without being passed around - including Motor and asyncio.to_thread worker
+threads and background tasks, which run with a copy of the request context.
+
+Spans are recorded at the dependency chokepoints:
+- MongoDB: every command (CommandMetricsListener, "mongo.<command>")
+- Google Drive: every API call attempt (observe_drive_call, "drive.<operation>")
+- SMTP: every send session (EmailService._smtp_session, "smtp.<kind>")
+- Stripe: every HTTP request (instrument_stripe, "stripe.request")
+
+Finished traces are handed to a SpanExporter on a background thread
+through a bounded queue (full queue: the trace is dropped and counted), so
+exporting never blocks the event loop. The response carries a
+Server-Timing header with the span time per dependency (see server_timing()).
+
+Usage:
+    with span("pricing.calculate", units=total_units):
+        ...
+
+    @traced("payment.process_files")
+    async def process_payment_files_background(...):
+        ...
+
+    configure_tracing()  # application startup (exporter from settings)
+    shutdown_tracing()   # application shutdown (flushes queued traces)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from app.config import settings
+from app.utils.metrics import CallbackMetric
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Events kept per span (log_step calls in long requests)
+MAX_SPAN_EVENTS = 128
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def trace_id_from_request_id(request_id: str) -> str:
+    """Trace id (32 hex digits) of a request id: the UUID itself, else a hash of it."""
+    try:
+        return uuid.UUID(request_id).hex
+    except ValueError:
+        return hashlib.sha256(request_id.encode("utf-8")).hexdigest()[:32]
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "events", "error")
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        start_ns: Optional[int] = None
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Tuple[int, str, Dict[str, Any]]] = []
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds from start to end (to now while the span is open)."""
+        end_ns = time.time_ns() if self.end_ns is None else self.end_ns
+        return (end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        if len(self.events) < MAX_SPAN_EVENTS:
+            self.events.append((time.time_ns(), name, attributes))
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        self.end_ns = time.time_ns() if end_ns is None else end_ns
+
+
+class Trace:
+    """The spans of one request."""
+
+    def __init__(self, trace_id: str, root: Span, max_spans: int):
+        self.trace_id = trace_id
+        self.root = root
+        self.max_spans = max_spans
+        # Finished child spans, in end order
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+
+    def add(self, span: Span) -> None:
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span)
+        else:
+            self.dropped_spans += 1
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace id of the request being handled, if any."""
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time the block as a child of the current span.
+
+    Outside of a traced request this does nothing and yields None.
+
+    Args:
+        name: "<category>.<operation>"; the category groups the span in Server-Timing
+        **attributes: Span attributes
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(name, trace.trace_id, parent.span_id if parent else trace.root.span_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        # Type only: messages may contain customer data
+        current.error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+        trace.add(current)
+
+
+def traced(name: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorator running an async function in a span."""
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_span(name: str, duration: float, error: Optional[str] = None, **attributes: Any) -> None:
+    """
+    Add an already-timed operation that ended now (e.g. from a driver event).
+
+    Args:
+        name: Span name (see span())
+        duration: Seconds the operation took
+        error: Error type or code, if the operation failed
+        **attributes: Span attributes
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    parent = _current_span.get()
+    end_ns = time.time_ns()
+    recorded = Span(
+        name, trace.trace_id, parent.span_id if parent else trace.root.span_id, attributes,
+        start_ns=end_ns - int(duration * 1e9)
+    )
+    recorded.error = error
+    recorded.end(end_ns)
+    trace.add(recorded)
+
+
+def add_event(name: str, **attributes: Any) -> None:
+    """Add a point-in-time event to the current span (no-op outside a traced request)."""
+    current = _current_span.get()
+    if current is not None:
+        current.add_event(name, **attributes)
+
+
+def server_timing(trace: Trace) -> str:
+    """
+    Server-Timing header value: span time per category plus the total so far.
+
+    Example: mongo;dur=12.4;desc="5 calls", drive;dur=310.0;desc="2 calls", total;dur=341.7
+    """
+    totals: Dict[str, List[float]] = {}
+    for finished in list(trace.spans):
+        category = finished.name.split(".", 1)[0]
+        entry = totals.setdefault(category, [0.0, 0])
+        entry[0] += finished.duration
+        entry[1] += 1
+
+    entries = [
+        f'{category};dur={duration * 1000:.1f};desc="{count} call{"" if count == 1 else "s"}"'
+        for category, (duration, count) in totals.items()
+    ]
+    entries.append(f"total;dur={trace.root.duration * 1000:.1f}")
+    return ", ".join(entries)
+
+
+# ============================================================================
+# Export
+# ============================================================================
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def _otlp_span(exported: Span, is_root: bool) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "traceId": exported.trace_id,
+        "spanId": exported.span_id,
+        "name": exported.name,
+        "kind": 2 if is_root else 3,  # SERVER for the request, CLIENT for dependency calls
+        "startTimeUnixNano": str(exported.start_ns),
+        "endTimeUnixNano": str(exported.end_ns or exported.start_ns),
+        "attributes": _otlp_attributes(exported.attributes),
+    }
+    if exported.parent_id:
+        data["parentSpanId"] = exported.parent_id
+    if exported.events:
+        data["events"] = [
+            {"timeUnixNano": str(time_ns), "name": name, "attributes": _otlp_attributes(attributes)}
+            for time_ns, name, attributes in exported.events
+        ]
+    if exported.error:
+        data["status"] = {"code": 2, "message": exported.error}
+    return data
+
+
+def to_otlp(traces: List[Trace]) -> Dict[str, Any]:
+    """OTLP/JSON ExportTraceServiceRequest for finished traces."""
+    spans = []
+    for trace in traces:
+        spans.append(_otlp_span(trace.root, is_root=True))
+        spans.extend(_otlp_span(child, is_root=False) for child in trace.spans)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({
+                "service.name": settings.app_name,
+                "deployment.environment": settings.environment,
+            })},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+        }]
+    }
+
+
+class SpanExporter:
+    """Receives finished traces on the export thread."""
+
+    def export(self, trace: Trace) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class LogSpanExporter(SpanExporter):
+    """One log line per request with its Server-Timing summary."""
+
+    def export(self, trace: Trace) -> None:
+        logger.info(
+            "[TRACE] %s %s %.1fms - %s",
+            trace.trace_id, trace.root.name, trace.root.duration * 1000, server_timing(trace)
+        )
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends one OTLP/JSON document per request to a file (JSON lines)."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, trace: Trace) -> None:
+        self._file.write(json.dumps(to_otlp([trace]), separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """Posts OTLP/JSON to an OpenTelemetry collector (OTLP/HTTP, /v1/traces)."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        import httpx
+
+        self.endpoint = endpoint
+        self._client = httpx.Client(timeout=timeout)
+
+    def export(self, trace: Trace) -> None:
+        response = self._client.post(self.endpoint, json=to_otlp([trace]))
+        response.raise_for_status()
+
+    def shutdown(self) -> None:
+        self._client.close()
+
+
+def build_exporter(name: str) -> Optional[SpanExporter]:
+    """
+    Exporter for settings.tracing_exporter.
+
+    Raises:
+        ValueError: On an unknown exporter name
+    """
+    name = name.strip().lower()
+    if name in ("", "none"):
+        return None
+    if name == "log":
+        return LogSpanExporter()
+    if name == "file":
+        return FileSpanExporter(settings.tracing_file)
+    if name == "otlp":
+        return OTLPHttpSpanExporter(settings.tracing_otlp_endpoint)
+    raise ValueError(f"Unknown tracing exporter: '{name}' (expected none, log, file or otlp)")
+
+
+class SpanExportQueue:
+    """Bounded queue of finished traces drained by a daemon thread."""
+
+    _STOP = object()
+
+    def __init__(self, exporter: SpanExporter, maxsize: int):
+        self.exporter = exporter
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, trace: Trace) -> None:
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Export what is queued, then stop the thread."""
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+        self.exporter.shutdown()
+
+    def _run(self) -> None:
+        while True:
+            trace = self._queue.get()
+            if trace is self._STOP:
+                return
+            try:
+                self.exporter.export(trace)
+            except Exception as e:
+                logger.warning(f"[TRACING] Export failed for trace {trace.trace_id}: {type(e).__name__}: {e}")
+
+
+_export_queue: Optional[SpanExportQueue] = None
+_dropped_traces = 0
+
+
+def configure_tracing(exporter: Optional[SpanExporter] = None) -> None:
+    """
+    Start exporting finished traces.
+
+    Args:
+        exporter: Exporter to use (default: built from settings.tracing_exporter;
+            "none" keeps tracing in-process for Server-Timing only)
+    """
+    global _export_queue
+    shutdown_tracing()
+    if exporter is None:
+        exporter = build_exporter(settings.tracing_exporter)
+    if exporter is not None:
+        _export_queue = SpanExportQueue(exporter, settings.tracing_queue_size)
+        logger.info(f"[TRACING] Exporting traces with {type(exporter).__name__}")
+
+
+def shutdown_tracing() -> None:
+    """Flush queued traces and stop the export thread."""
+    global _export_queue, _dropped_traces
+    if _export_queue is not None:
+        _export_queue.stop()
+        _dropped_traces += _export_queue.dropped
+        _export_queue = None
+
+
+def dropped_traces() -> int:
+    """Traces dropped because the export queue was full."""
+    return _dropped_traces + (_export_queue.dropped if _export_queue is not None else 0)
+
+
+@contextmanager
+def request_trace(trace_id: str, name: str, **attributes: Any) -> Iterator[Trace]:
+    """
+    Make a new trace current for the block and export it when the block exits.
+
+    Args:
+        trace_id: 32 hex digit trace id (see trace_id_from_request_id)
+        name: Root span name (the middleware renames it to the route template)
+        **attributes: Root span attributes
+    """
+    root = Span(name, trace_id, attributes=attributes)
+    trace = Trace(trace_id, root, settings.tracing_max_spans)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(root)
+    try:
+        yield trace
+    except BaseException as e:
+        root.error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        root.end()
+        if _export_queue is not None:
+            _export_queue.submit(trace)
+
+
+CallbackMetric(
+    "traces_dropped_total", "Traces dropped because the export queue was full", [],
+    lambda: [((), dropped_traces())], metric_type="counter"
+)
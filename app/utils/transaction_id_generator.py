@@ -5,12 +5,69 @@ Generates unique transaction IDs in format: USER + 6-digit number
 Example: USER123456, USER789012
 
 Includes collision detection, retry logic, and fallback format.
+
+New documents should use insert_with_transaction_id(): it relies on the
+unique transaction_id index instead of a find_one pre-check, so the common
+case costs a single insert round trip.
 """
 
 import random
 import time
-from typing import Optional
+from typing import Any, Dict, Optional
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import DuplicateKeyError
+
+
+async def insert_with_transaction_id(
+    collection: AsyncIOMotorCollection,
+    document: Dict[str, Any],
+    max_retries: int = 5
+) -> str:
+    """
+    Insert a document with a freshly allocated transaction ID.
+
+    No uniqueness pre-check is made: the unique transaction_id index
+    rejects a colliding candidate and the insert is retried with a new one.
+    After max_retries collisions the fallback format is used.
+
+    Format: USER + 6-digit random number (e.g., USER123456)
+    Fallback: USER + timestamp_ms + 3-digit random if collisions persist
+
+    Args:
+        collection: MongoDB collection with a unique index on transaction_id
+        document: Document to insert; transaction_id (and _id) are set on it
+        max_retries: Maximum number of random-format attempts (default: 5)
+
+    Returns:
+        The transaction ID the document was inserted with
+
+    Raises:
+        DuplicateKeyError: If the document conflicts on another unique key
+            (e.g. stripe_checkout_session_id), or the fallback also collides
+    """
+    for attempt in range(max_retries):
+        document["transaction_id"] = _generate_random_format()
+        try:
+            await collection.insert_one(document)
+            return document["transaction_id"]
+        except DuplicateKeyError as e:
+            if not _is_transaction_id_conflict(e):
+                raise
+            print(f"Transaction ID collision detected: {document['transaction_id']} (attempt {attempt + 1}/{max_retries})")
+
+    document["transaction_id"] = _generate_fallback_format()
+    await collection.insert_one(document)
+    return document["transaction_id"]
+
+
+def _is_transaction_id_conflict(error: DuplicateKeyError) -> bool:
+    """Check whether a duplicate key error was raised by the transaction_id index."""
+    details = error.details or {}
+    key_pattern = details.get("keyPattern") or details.get("keyValue")
+    if key_pattern:
+        return "transaction_id" in key_pattern
+    # Servers before 4.2 only report the index name in the message
+    return "transaction_id" in str(error)
 
 
 async def generate_unique_transaction_id(
@@ -20,6 +77,11 @@ async def generate_unique_transaction_id(
     """
     Generate a unique transaction ID for user transactions.
 
+    Checks each candidate with find_one before returning it. Use this only
+    when the ID is written by an update to an existing document (see
+    scripts/migrate_add_transaction_id.py); for inserts prefer
+    insert_with_transaction_id(), which needs no pre-check round trip.
+
     Format: USER + 6-digit random number (e.g., USER123456)
     Fallback: USER + timestamp_ms + 3-digit random if collisions persist
 
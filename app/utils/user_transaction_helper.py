@@ -13,10 +13,33 @@ from typing import Any, Dict, List, Optional
 from pymongo.errors import DuplicateKeyError, PyMongoError
 
 from app.database import database
-from app.utils.transaction_id_generator import generate_unique_transaction_id
+from app.database.query_shapes import register_query_shape
+from app.services.archive_service import archive_service
+from app.utils.transaction_id_generator import insert_with_transaction_id
+from app.utils.structured_logging import legacy_print
 
 logger = logging.getLogger(__name__)
 
+register_query_shape(
+    "user_transactions.by_transaction_id",
+    "user_transactions",
+    {"transaction_id": "USER-0000000000"},
+    source="transaction_update_service / user transaction confirmation"
+)
+register_query_shape(
+    "user_transactions.by_checkout_session",
+    "user_transactions",
+    {"stripe_checkout_session_id": "cs_test"},
+    source="get_user_transaction"
+)
+register_query_shape(
+    "user_transactions.by_user_recent",
+    "user_transactions",
+    {"user_email": "user@example.com"},
+    sort=[("date", -1)],
+    source="get_user_transactions_by_email"
+)
+
 
 async def create_user_transaction(
     user_name: str,
@@ -129,14 +152,6 @@ async def create_user_transaction(
             logger.error("[UserTransaction] documents array cannot be empty")
             return None
 
-        # Generate unique transaction ID (USER + 6-digit number)
-        try:
-            transaction_id = await generate_unique_transaction_id(collection)
-            logger.info(f"[UserTransaction] Generated transaction_id: {transaction_id}")
-        except Exception as e:
-            logger.error(f"[UserTransaction] Failed to generate transaction_id: {e}")
-            return None
-
         # Build transaction document with Square payment fields
         transaction_doc = {
             # Core transaction fields
@@ -148,7 +163,6 @@ async def create_user_transaction(
             "cost_per_unit": cost_per_unit,
             "source_language": source_language,
             "target_language": target_language,
-            "transaction_id": transaction_id,
             "stripe_checkout_session_id": stripe_checkout_session_id,
             "date": date,
             "status": status,
@@ -165,12 +179,14 @@ async def create_user_transaction(
             "updated_at": current_time,
         }
 
-        # Insert into database
+        # Insert into database. The transaction_id (USER + 6-digit number) is
+        # allocated by the insert itself, retrying on a duplicate key.
         try:
-            result = await collection.insert_one(transaction_doc)
+            transaction_id = await insert_with_transaction_id(collection, transaction_doc)
+            logger.info(f"[UserTransaction] Generated transaction_id: {transaction_id}")
 
             # Get MongoDB-generated _id
-            inserted_id = str(result.inserted_id)
+            inserted_id = str(transaction_doc["_id"])
 
             logger.info(
                 f"[UserTransaction] Created transaction {transaction_id} (Square: {stripe_checkout_session_id}) "
@@ -187,32 +203,32 @@ async def create_user_transaction(
             )
 
             # Console output for visibility (matching translate_user.py logging style)
-            print(f"✅ Created user transaction with {len(documents)} document(s)")
-            print(f"   📋 Transaction Details:")
-            print(f"      • transaction_id: {transaction_id} (USER format)")
-            print(f"      • stripe_checkout_session_id: {stripe_checkout_session_id}")
-            print(f"      • user_email: {user_email}")
-            print(f"      • total_cost: ${total_cost}")
-            print(f"      • status: {status}")
+            legacy_print(f"✅ Created user transaction with {len(documents)} document(s)")
+            legacy_print(f"   📋 Transaction Details:")
+            legacy_print(f"      • transaction_id: {transaction_id} (USER format)")
+            legacy_print(f"      • stripe_checkout_session_id: {stripe_checkout_session_id}")
+            legacy_print(f"      • user_email: {user_email}")
+            legacy_print(f"      • total_cost: ${total_cost}")
+            legacy_print(f"      • status: {status}")
             # Log each document with its translation mode (matching Enterprise flow format)
             for idx, doc in enumerate(documents, 1):
                 doc_name = doc.get('file_name') or doc.get('document_name', 'unknown')
                 doc_mode = doc.get('translation_mode', 'automatic')
                 doc_pages = doc.get('page_count', 1)  # Get page count from document, default to 1
-                print(f"   📄 Document {idx}: {doc_name} ({doc_pages} pages, mode: {doc_mode})")
+                legacy_print(f"   📄 Document {idx}: {doc_name} ({doc_pages} pages, mode: {doc_mode})")
 
             # Full transaction record logging (for debugging and verification)
-            print("=" * 80)
-            print("📋 FULL TRANSACTION RECORD CREATED IN DATABASE:")
-            print("=" * 80)
+            legacy_print("=" * 80)
+            legacy_print("📋 FULL TRANSACTION RECORD CREATED IN DATABASE:")
+            legacy_print("=" * 80)
             for key, value in transaction_doc.items():
                 if key == "documents":
-                    print(f"   • {key}: [{len(value)} documents]")
+                    legacy_print(f"   • {key}: [{len(value)} documents]")
                     for idx, doc in enumerate(value, 1):
-                        print(f"      📄 Doc {idx}: {doc}")
+                        legacy_print(f"      📄 Doc {idx}: {doc}")
                 else:
-                    print(f"   • {key}: {value}")
-            print("=" * 80)
+                    legacy_print(f"   • {key}: {value}")
+            legacy_print("=" * 80)
 
             # Structured logging for production
             logger.info(
@@ -254,7 +270,7 @@ async def create_user_transaction(
 
     except DuplicateKeyError:
         logger.error(
-            f"[UserTransaction] Duplicate transaction_id or stripe_checkout_session_id: {transaction_id} / {stripe_checkout_session_id}"
+            f"[UserTransaction] Duplicate stripe_checkout_session_id: {stripe_checkout_session_id}"
         )
         return None
     except PyMongoError as e:
@@ -435,12 +451,14 @@ async def get_user_transactions_by_email(
 
 async def get_user_transaction(
     stripe_checkout_session_id: str,
+    include_archived: bool = False,
 ) -> Optional[Dict[str, Any]]:
     """
     Get single transaction by Square transaction ID.
 
     Args:
         stripe_checkout_session_id: Unique Square transaction ID
+        include_archived: Also search the archive tier (read-only detail views)
 
     Returns:
         dict: Transaction dictionary if found, None otherwise
@@ -456,8 +474,8 @@ async def get_user_transaction(
             return None
 
         # Query database
-        transaction = await collection.find_one(
-            {"stripe_checkout_session_id": stripe_checkout_session_id}
+        transaction = await archive_service.find_one(
+            "user_transactions", {"stripe_checkout_session_id": stripe_checkout_session_id}, include_archived
         )
 
         if transaction is None:
@@ -7,7 +7,7 @@ This script:
 2. For each subscription, generates 12 consecutive monthly periods
 3. Preserves existing usage data (units_used) for current periods
 4. Sets appropriate status for each period (completed/active)
-5. Updates the subscription document with the new usage_periods array
+5. Replaces the subscription's documents in the usage_periods collection
 
 Usage:
     python scripts/add_12_monthly_periods.py [--database DATABASE_NAME] [--dry-run]
@@ -30,6 +30,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.config import settings
+from app.services.usage_period_repository import build_period_document
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -156,7 +157,9 @@ async def update_subscriptions_with_12_periods(database_name: str = None, dry_ru
             units_per_subscription = subscription.get("units_per_subscription", 1000)
             promotional_units = subscription.get("promotional_units", 0)
             price_per_unit = subscription.get("price_per_unit", 0.01)
-            existing_periods = subscription.get("usage_periods", [])
+            existing_periods = await db.usage_periods.find(
+                {"subscription_id": str(sub_id)}
+            ).to_list(length=None) or subscription.get("usage_periods", [])
 
             logger.info(f"[{idx}/{len(subscriptions)}] Processing: {company_name}")
             logger.info(f"  Subscription ID: {sub_id}")
@@ -199,18 +202,21 @@ async def update_subscriptions_with_12_periods(database_name: str = None, dry_ru
             if dry_run:
                 logger.info(f"  [DRY RUN] Would update subscription with {len(new_usage_periods)} periods")
             else:
-                # Update the subscription
-                result = await db.subscriptions.update_one(
+                # Replace the subscription's periods in the usage_periods collection
+                await db.usage_periods.delete_many({"subscription_id": str(sub_id)})
+                result = await db.usage_periods.insert_many([
+                    build_period_document(str(sub_id), company_name, period)
+                    for period in new_usage_periods
+                ])
+                await db.subscriptions.update_one(
                     {"_id": sub_id},
                     {
-                        "$set": {
-                            "usage_periods": new_usage_periods,
-                            "updated_at": datetime.now(timezone.utc)
-                        }
+                        "$set": {"updated_at": datetime.now(timezone.utc)},
+                        "$unset": {"usage_periods": ""}
                     }
                 )
 
-                if result.modified_count > 0:
+                if result.inserted_ids:
                     logger.info(f"  ✅ Updated subscription with {len(new_usage_periods)} monthly periods")
                     updated_count += 1
                 else:
@@ -244,8 +250,7 @@ async def update_subscriptions_with_12_periods(database_name: str = None, dry_ru
 
             # Re-fetch to get updated data (unless dry run)
             if not dry_run:
-                updated_sub = await db.subscriptions.find_one({"_id": sub_id})
-                period_count = len(updated_sub.get("usage_periods", []))
+                period_count = await db.usage_periods.count_documents({"subscription_id": str(sub_id)})
             else:
                 period_count = 12  # Would have 12 periods
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Move old records into monthly archive collections.
+
+Records older than the archive horizon are copied into
+`<collection>_archive_YYYY_MM` and then removed from the hot collection.
+The archive_manifest collection lists every archive collection with its
+record count and date range. Runs are safe to interrupt and repeat.
+
+Usage:
+    python scripts/archive_old_records.py [--database DATABASE_NAME] [--collection NAME ...]
+        [--horizon-days N] [--batch-size N] [--dry-run]
+
+Options:
+    --database      Database name (default: from settings)
+    --collection    Collection to archive; repeatable (default: all archived collections)
+    --horizon-days  Archive records older than N days (default: settings.archive_horizon_days)
+    --batch-size    Records moved per batch (default: settings.archive_batch_size)
+    --dry-run       Only count the records that would be archived
+"""
+
+import asyncio
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import settings
+from app.services.archive_service import ARCHIVE_POLICIES, ArchiveService
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def run(
+    database_name: str = None,
+    collections: list = None,
+    horizon_days: int = None,
+    batch_size: int = None,
+    dry_run: bool = False
+):
+    """Archive the selected collections and print a summary and the manifest."""
+    db_name = database_name or settings.mongodb_database
+    client = AsyncIOMotorClient(settings.mongodb_uri)
+    db = client[db_name]
+    service = ArchiveService(db)
+
+    logger.info(f"{'='*80}")
+    logger.info(f"Archive old records{' (DRY RUN)' if dry_run else ''}")
+    logger.info(f"{'='*80}")
+    logger.info(f"Database: {db_name}\n")
+
+    try:
+        for collection in collections or list(ARCHIVE_POLICIES):
+            cutoff = service.cutoff(collection, horizon_days)
+            logger.info(f"📦 {collection}: records before {cutoff.isoformat()}")
+            totals = await service.archive_collection(
+                collection,
+                horizon_days=horizon_days,
+                batch_size=batch_size,
+                dry_run=dry_run
+            )
+            if dry_run:
+                logger.info(f"   Would archive {totals['archived']} records")
+            else:
+                logger.info(
+                    f"   ✅ Archived {totals['archived']} records in {totals['batches']} batches "
+                    f"({totals['already_archived']} already archived)"
+                )
+
+        logger.info(f"\n{'='*80}")
+        logger.info("Archive manifest")
+        logger.info(f"{'='*80}")
+        async for entry in db.archive_manifest.find().sort([("collection", 1), ("month", 1)]):
+            logger.info(
+                f"{entry['_id']:<45} {entry.get('record_count', 0):>10} records  "
+                f"{entry.get('first_date')} → {entry.get('last_date')}"
+            )
+    finally:
+        client.close()
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(description="Move old records into monthly archive collections")
+    parser.add_argument("--database", type=str, default=None, help="Database name (default: from settings)")
+    parser.add_argument(
+        "--collection",
+        action="append",
+        choices=sorted(ARCHIVE_POLICIES),
+        help="Collection to archive; repeatable (default: all)"
+    )
+    parser.add_argument("--horizon-days", type=int, default=None, help="Archive records older than N days")
+    parser.add_argument("--batch-size", type=int, default=None, help="Records moved per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the records that would be archived")
+
+    args = parser.parse_args()
+
+    asyncio.run(run(
+        database_name=args.database,
+        collections=args.collection,
+        horizon_days=args.horizon_days,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-request overhead of the custom middleware stack.
+
+Drives a minimal FastAPI app directly through ASGI (no sockets) with:
+- bare:   no custom middleware
+- legacy: the previous BaseHTTPMiddleware versions of LoggingMiddleware and
+          EncodingFixMiddleware (reproduced below, including their
+          per-request console output, which is sent to /dev/null)
+- asgi:   the current pure ASGI LoggingMiddleware + EncodingFixMiddleware
+
+and reports the overhead of each stack over the bare app, per request.
+Requests are a JSON POST and a GET.
+
+No database connection is needed.
+
+Usage:
+    python scripts/benchmark_middleware.py [--requests N] [--repeat N]
+
+Options:
+    --requests  Requests per timed run (default: 2000)
+    --repeat    Timed runs per stack; the best run is reported (default: 5)
+"""
+
+import sys
+import time
+import uuid
+import asyncio
+import argparse
+import contextlib
+import logging
+import os
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.encoding_fix import EncodingFixMiddleware
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Middleware loggers stay quiet so the benchmark measures the middleware, not log I/O
+logging.getLogger("translator").setLevel(logging.WARNING)
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous LoggingMiddleware request path (BaseHTTPMiddleware)."""
+
+    async def dispatch(self, request: Request, call_next):
+        print(f"Hello World - Logging middleware processing: {request.method} {request.url.path}")
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        start_time = time.time()
+        # Request log data was built on every request
+        {
+            'request_id': request_id,
+            'method': request.method,
+            'url': str(request.url),
+            'query_params': dict(request.query_params),
+            'headers': dict(request.headers),
+        }
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        {'status_code': response.status_code, 'response_headers': dict(response.headers)}
+        response.headers["X-Request-ID"] = request_id
+        response.headers["X-Process-Time"] = f"{process_time:.4f}s"
+        return response
+
+
+class LegacyEncodingFixMiddleware(BaseHTTPMiddleware):
+    """The previous EncodingFixMiddleware request path (BaseHTTPMiddleware)."""
+
+    async def dispatch(self, request: Request, call_next):
+        logging.getLogger("translator.encoding_fix").info(
+            f"[ENCODING FIX] Processing: {request.method} {request.url.path}"
+        )
+        print(f"[ENCODING FIX] Processing: {request.method} {request.url.path}")
+        if request.url.path != "/submit":
+            print(f"[ENCODING FIX] SKIPPING {request.url.path} - Body NOT consumed (middleware disabled)")
+        return await call_next(request)
+
+
+def build_app(stack: str) -> FastAPI:
+    """Minimal app with one GET and one JSON POST route, plus the given middleware stack."""
+    app = FastAPI()
+
+    @app.get("/api/v1/items")
+    async def list_items():
+        return {"success": True, "data": [1, 2, 3]}
+
+    @app.post("/api/v1/items")
+    async def create_item(request: Request):
+        return {"success": True, "data": await request.json()}
+
+    if stack == "legacy":
+        app.add_middleware(LegacyEncodingFixMiddleware)
+        app.add_middleware(LegacyLoggingMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(EncodingFixMiddleware, capture_paths=[])
+        app.add_middleware(LoggingMiddleware)
+    return app
+
+
+async def _call(app: FastAPI, method: str, body: bytes = b""):
+    """Run one request through the ASGI app."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": "/api/v1/items",
+        "raw_path": b"/api/v1/items",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8000),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def _timed_run(app: FastAPI, requests: int) -> float:
+    body = b'{"name": "item", "quantity": 3}'
+    started = time.perf_counter()
+    for i in range(requests):
+        if i % 2:
+            await _call(app, "POST", body)
+        else:
+            await _call(app, "GET")
+    return time.perf_counter() - started
+
+
+async def run(requests: int = 2000, repeat: int = 5):
+    """Time each middleware stack and print the per-request overhead over the bare app."""
+    apps = {stack: build_app(stack) for stack in ("bare", "legacy", "asgi")}
+
+    logger.info(f"{'='*80}")
+    logger.info(f"Middleware stack benchmark")
+    logger.info(f"{'='*80}")
+    logger.info(f"Requests per run: {requests}, runs per stack: {repeat}\n")
+
+    best = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for stack, app in apps.items():
+            await _timed_run(app, min(requests, 200))  # warm up
+            best[stack] = min([await _timed_run(app, requests) for _ in range(repeat)])
+
+    for stack, seconds in best.items():
+        per_request_us = seconds / requests * 1e6
+        overhead_us = (seconds - best["bare"]) / requests * 1e6
+        logger.info(f"{stack:>8}: {per_request_us:8.1f} us/request  overhead {overhead_us:8.1f} us/request")
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(description="Benchmark the per-request overhead of the middleware stack")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stack (best is reported)")
+
+    args = parser.parse_args()
+
+    asyncio.run(run(requests=args.requests, repeat=args.repeat))
+
+
+if __name__ == "__main__":
+    main()
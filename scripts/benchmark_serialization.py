@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization of MongoDB documents.
+
+Compares, on synthetic translation transaction documents (ObjectId,
+datetime, Decimal128, nested document lists):
+- legacy:   the previous path-tracking recursive serializer + json.dumps
+- dispatch: serialize_for_json() (type dispatch) + json.dumps
+- orjson:   dumps() (orjson with the bson_default hook)
+- response: JSONResponse(serialize_for_json(page)) vs FastJSONResponse(page),
+            i.e. the full encode step of a list route
+
+Use --documents 100 for a typical list page.
+
+No database connection is needed.
+
+Usage:
+    python scripts/benchmark_serialization.py [--documents N] [--repeat N]
+
+Options:
+    --documents  Documents per payload (default: 1000)
+    --repeat     Timed runs per strategy; the best run is reported (default: 20)
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+
+from fastapi.responses import JSONResponse
+
+from app.utils.responses import FastJSONResponse
+from app.utils.serialization import dumps, serialize_for_json
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def _legacy_serialize(obj, *, _path="root"):
+    """The previous serializer: isinstance chain with per-node path strings and debug calls."""
+    if isinstance(obj, datetime):
+        iso_str = obj.isoformat()
+        logger.debug(f"[SERIALIZATION] {_path}: datetime → '{iso_str}'")
+        return iso_str
+    elif isinstance(obj, ObjectId):
+        str_val = str(obj)
+        logger.debug(f"[SERIALIZATION] {_path}: ObjectId → '{str_val}'")
+        return str_val
+    elif isinstance(obj, Decimal128):
+        float_val = float(obj.to_decimal())
+        logger.debug(f"[SERIALIZATION] {_path}: Decimal128 → {float_val}")
+        return float_val
+    elif isinstance(obj, dict):
+        return {key: _legacy_serialize(value, _path=f"{_path}.{key}") for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [_legacy_serialize(item, _path=f"{_path}[{i}]") for i, item in enumerate(obj)]
+    return obj
+
+
+def make_documents(count: int) -> list:
+    """Build `count` translation-transaction-shaped documents."""
+    now = datetime.now(timezone.utc)
+    documents = []
+    for i in range(count):
+        created_at = now - timedelta(minutes=i)
+        documents.append({
+            "_id": ObjectId(),
+            "transaction_id": f"TXN-{i:08d}",
+            "user_id": f"user{i % 50}@example.com",
+            "company_name": "Acme Health LLC",
+            "source_language": "en",
+            "target_language": "es",
+            "units_count": 12,
+            "price_per_unit": Decimal128("0.10"),
+            "total_price": Decimal128("1.20"),
+            "status": "completed",
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(minutes=5),
+            "documents": [
+                {
+                    "file_name": f"document_{i}_{n}.pdf",
+                    "file_size": 123456,
+                    "original_url": f"https://drive.google.com/file/d/{ObjectId()}/view",
+                    "translated_url": None,
+                    "status": "translated",
+                    "uploaded_at": created_at,
+                    "translated_at": created_at + timedelta(minutes=3),
+                }
+                for n in range(3)
+            ],
+        })
+    return documents
+
+
+STRATEGIES = {
+    "legacy": lambda documents: json.dumps(_legacy_serialize(documents)).encode(),
+    "dispatch": lambda documents: json.dumps(serialize_for_json(documents)).encode(),
+    "orjson": dumps,
+    "JSONResponse": lambda documents: JSONResponse(content=serialize_for_json(documents)).body,
+    "FastJSONResponse": lambda documents: FastJSONResponse(content=documents).body,
+}
+
+
+def run(document_count: int = 1000, repeat: int = 20):
+    """Time each strategy and print a comparison against the legacy serializer."""
+    documents = make_documents(document_count)
+
+    logger.info(f"{'='*80}")
+    logger.info(f"Serialization benchmark")
+    logger.info(f"{'='*80}")
+    logger.info(f"Documents: {document_count}, runs per strategy: {repeat}\n")
+
+    # Same JSON from every strategy (modulo separators)
+    reference = json.loads(STRATEGIES["legacy"](documents))
+    for name, encode in STRATEGIES.items():
+        assert json.loads(encode(documents)) == reference, f"{name} output differs"
+
+    best = {}
+    for name, encode in STRATEGIES.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            encode(documents)
+            timings.append(time.perf_counter() - started)
+        best[name] = min(timings)
+
+    for name, seconds in best.items():
+        logger.info(
+            f"{name:>16}: {seconds * 1000:8.2f} ms  "
+            f"{best['legacy'] / seconds:5.1f}x vs legacy"
+        )
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of MongoDB documents")
+    parser.add_argument("--documents", type=int, default=1000, help="Documents per payload")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per strategy (best is reported)")
+
+    args = parser.parse_args()
+
+    run(document_count=args.documents, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
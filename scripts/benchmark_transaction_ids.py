@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark transaction ID allocation strategies.
+
+Compares:
+- precheck: generate_unique_transaction_id() + insert_one (find_one per candidate)
+- insert:   insert_with_transaction_id() (insert, retry on duplicate key)
+
+Inserts into a scratch collection (dropped afterwards) that has the same
+unique transaction_id index as user_transactions. --prefill occupies part of
+the 6-digit USER space first, to show how collisions affect each strategy.
+
+Usage:
+    python scripts/benchmark_transaction_ids.py [--database DATABASE_NAME] [--count N] [--concurrency N] [--prefill N]
+
+Options:
+    --database      Database name (default: from settings)
+    --count         IDs to allocate per strategy (default: 2000)
+    --concurrency   Concurrent allocations (default: 20)
+    --prefill       Random USER IDs inserted before each run (default: 0)
+"""
+
+import asyncio
+import sys
+import time
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+
+from app.config import settings
+from app.utils.transaction_id_generator import (
+    _generate_random_format,
+    generate_unique_transaction_id,
+    insert_with_transaction_id,
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SCRATCH_COLLECTION = "benchmark_transaction_ids"
+
+
+class _CountingCollection:
+    """Wraps a collection and counts round trips."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.round_trips = 0
+
+    async def find_one(self, *args, **kwargs):
+        self.round_trips += 1
+        return await self._collection.find_one(*args, **kwargs)
+
+    async def insert_one(self, *args, **kwargs):
+        self.round_trips += 1
+        return await self._collection.insert_one(*args, **kwargs)
+
+
+async def _precheck(collection) -> str:
+    transaction_id = await generate_unique_transaction_id(collection)
+    await collection.insert_one({"transaction_id": transaction_id})
+    return transaction_id
+
+
+async def _insert(collection) -> str:
+    return await insert_with_transaction_id(collection, {})
+
+
+STRATEGIES = {"precheck": _precheck, "insert": _insert}
+
+
+async def _prepare(collection, prefill: int) -> None:
+    await collection.drop()
+    await collection.create_index([("transaction_id", ASCENDING)], unique=True, name="transaction_id_unique")
+    if prefill:
+        documents = [{"transaction_id": _generate_random_format()} for _ in range(prefill)]
+        try:
+            await collection.insert_many(documents, ordered=False)
+        except BulkWriteError:
+            pass  # Duplicate random IDs in the prefill are expected
+
+
+async def run_strategy(collection, name: str, count: int, concurrency: int, prefill: int) -> dict:
+    """
+    Allocate `count` IDs with one strategy.
+
+    Returns:
+        dict: Throughput, latency percentiles and round trips per ID
+    """
+    await _prepare(collection, prefill)
+    counting = _CountingCollection(collection)
+    allocate = STRATEGIES[name]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await allocate(counting)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "strategy": name,
+        "ids_per_second": count / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "round_trips_per_id": counting.round_trips / count,
+    }
+
+
+async def run(database_name: str = None, count: int = 2000, concurrency: int = 20, prefill: int = 0):
+    """Run both strategies against a scratch collection and print a comparison."""
+    db_name = database_name or settings.mongodb_database
+    client = AsyncIOMotorClient(settings.mongodb_uri)
+    collection = client[db_name][SCRATCH_COLLECTION]
+
+    logger.info(f"{'='*80}")
+    logger.info(f"Transaction ID allocation benchmark")
+    logger.info(f"{'='*80}")
+    logger.info(f"Database: {db_name}, count: {count}, concurrency: {concurrency}, prefill: {prefill}\n")
+
+    try:
+        for name in STRATEGIES:
+            result = await run_strategy(collection, name, count, concurrency, prefill)
+            logger.info(
+                f"{result['strategy']:>9}: {result['ids_per_second']:8.0f} ids/s  "
+                f"p50 {result['p50_ms']:6.2f} ms  p99 {result['p99_ms']:6.2f} ms  "
+                f"{result['round_trips_per_id']:.3f} round trips/id"
+            )
+    finally:
+        await collection.drop()
+        client.close()
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(description="Benchmark transaction ID allocation strategies")
+    parser.add_argument("--database", type=str, default=None, help="Database name (default: from settings)")
+    parser.add_argument("--count", type=int, default=2000, help="IDs to allocate per strategy")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent allocations")
+    parser.add_argument("--prefill", type=int, default=0, help="Random USER IDs inserted before each run")
+
+    args = parser.parse_args()
+
+    asyncio.run(run(
+        database_name=args.database,
+        count=args.count,
+        concurrency=args.concurrency,
+        prefill=args.prefill
+    ))
+
+
+if __name__ == "__main__":
+    main()
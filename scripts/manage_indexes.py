@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Manage the application's MongoDB indexes (INDEX_SPECS in app/database/indexes.py).
+
+The application only builds collections whose spec hash changed, in the
+background, at startup. This tool shows which collections are out of date and
+runs a build on demand (for example before a deploy, or against a restored
+database). It replaces scripts/create_indexes.py and
+scripts/fix_index_conflicts.py: index name/option conflicts are resolved
+automatically during a build.
+
+Usage:
+    python scripts/manage_indexes.py status [--database DATABASE_NAME]
+    python scripts/manage_indexes.py sync [--database DATABASE_NAME] [--collection NAME ...] [--force] [--dry-run]
+
+Commands:
+    status   Show stored vs current spec hash and missing/extra indexes per collection
+    sync     Build collections whose spec changed (all listed ones with --force)
+
+Options:
+    --database     Database name (default: from settings)
+    --collection   Limit sync to this collection (repeatable)
+    --force        Build even if the stored hash matches
+    --dry-run      Show what would be built without making changes
+"""
+
+import asyncio
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import settings
+from app.database.indexes import INDEX_SPECS, BUILD_LOCK_ID, IndexManager, compute_spec_hash
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def show_status(database_name: str = None) -> int:
+    """
+    Print per-collection index status.
+
+    Args:
+        database_name: Database name (uses settings.mongodb_database if None)
+
+    Returns:
+        int: Number of collections whose stored hash is out of date
+    """
+    db_name = database_name or settings.mongodb_database
+    client = AsyncIOMotorClient(settings.mongodb_uri)
+    db = client[db_name]
+    manager = IndexManager(db)
+
+    try:
+        logger.info(f"{'='*80}")
+        logger.info(f"Index status for database: {db_name}")
+        logger.info(f"{'='*80}")
+
+        pending = await manager.pending_collections()
+        for collection, models in INDEX_SPECS.items():
+            stored = await manager.versions.find_one({"_id": collection}) or {}
+            existing = {index["name"] async for index in db[collection].list_indexes()}
+            wanted = {model.document["name"] for model in models}
+
+            status = "❌ out of date" if collection in pending else "✅ up to date"
+            logger.info(f"\n{collection}: {status}")
+            logger.info(f"  current hash: {compute_spec_hash(collection)[:12]}")
+            logger.info(f"  stored hash:  {(stored.get('hash') or 'none')[:12]} (built {stored.get('built_at', 'never')})")
+            missing = sorted(wanted - existing)
+            extra = sorted(existing - wanted - {"_id_"})
+            if missing:
+                logger.info(f"  missing: {', '.join(missing)}")
+            if extra:
+                logger.info(f"  not in spec: {', '.join(extra)}")
+
+        lock = await manager.versions.find_one({"_id": BUILD_LOCK_ID})
+        if lock:
+            logger.info(f"\nBuild lock held by {lock.get('owner')} until {lock.get('expires_at')}")
+
+        logger.info(f"\n{len(pending)} of {len(INDEX_SPECS)} collections need a build")
+        return len(pending)
+    finally:
+        client.close()
+
+
+async def run_sync(
+    database_name: str = None,
+    collections: list = None,
+    force: bool = False,
+    dry_run: bool = False
+) -> int:
+    """
+    Build indexes for changed (or all, with force) collections.
+
+    Args:
+        database_name: Database name (uses settings.mongodb_database if None)
+        collections: Limit to these collections (default: all in INDEX_SPECS)
+        force: Build even if the stored hash matches
+        dry_run: If True, only list the collections that would be built
+
+    Returns:
+        int: Number of collections that failed to build
+    """
+    db_name = database_name or settings.mongodb_database
+    client = AsyncIOMotorClient(settings.mongodb_uri)
+    db = client[db_name]
+    manager = IndexManager(db)
+
+    unknown = [collection for collection in collections or [] if collection not in INDEX_SPECS]
+    if unknown:
+        logger.error(f"Unknown collections (not in INDEX_SPECS): {', '.join(unknown)}")
+        client.close()
+        return len(unknown)
+
+    try:
+        targets = collections or list(INDEX_SPECS)
+        if not force:
+            pending = set(await manager.pending_collections())
+            targets = [collection for collection in targets if collection in pending]
+
+        if not targets:
+            logger.info("All index specs are up to date, nothing to build")
+            return 0
+
+        if dry_run:
+            logger.info(f"[DRY RUN] Would build: {', '.join(targets)}")
+            return 0
+
+        if not await manager.acquire_lock():
+            logger.error("Another process holds the index build lock; try again later")
+            return len(targets)
+
+        try:
+            results = await manager.sync(targets, force=True)
+        finally:
+            await manager.release_lock()
+
+        for collection, ok in results.items():
+            logger.info(f"{'✅' if ok else '❌'} {collection}")
+        return sum(1 for ok in results.values() if not ok)
+    finally:
+        client.close()
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(
+        description="Show and build the application's MongoDB indexes"
+    )
+    parser.add_argument(
+        "command",
+        choices=["status", "sync"],
+        help="status: compare stored and current spec hashes; sync: build changed collections"
+    )
+    parser.add_argument(
+        "--database",
+        type=str,
+        default=None,
+        help="Database name (default: from settings)"
+    )
+    parser.add_argument(
+        "--collection",
+        action="append",
+        default=None,
+        help="Limit sync to this collection (repeatable)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Build even if the stored hash matches"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be built without making changes"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "status":
+        asyncio.run(show_status(database_name=args.database))
+        sys.exit(0)
+
+    failed = asyncio.run(run_sync(
+        database_name=args.database,
+        collections=args.collection,
+        force=args.force,
+        dry_run=args.dry_run
+    ))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
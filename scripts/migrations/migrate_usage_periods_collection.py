@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Migration Script: Move embedded usage periods into the usage_periods collection
+
+Subscriptions used to carry every usage period in an embedded `usage_periods`
+array, so each usage update rewrote (and each subscription read shipped) the
+whole history. This script moves each embedded period into its own document
+in the `usage_periods` collection and removes the embedded array.
+
+Database: translation (production) and translation_test (test)
+Collections: subscriptions, usage_periods
+
+The script is idempotent: the unique (subscription_id, period_start,
+period_end) index rejects periods that were already copied, so it can be
+re-run after a partial failure. The application also migrates a subscription
+lazily on first access, so running this script is not a deployment blocker.
+
+Usage:
+    python scripts/migrations/migrate_usage_periods_collection.py [--database DATABASE_NAME] [--dry-run] [--keep-embedded]
+
+Options:
+    --database        Database name (default: from settings)
+    --dry-run         Show what would be migrated without making changes
+    --keep-embedded   Copy periods but leave the embedded arrays in place
+"""
+
+import asyncio
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError
+
+from app.config import settings
+from app.services.usage_period_repository import build_period_document, DUPLICATE_KEY_ERROR
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def migrate_usage_periods(
+    database_name: str = None,
+    dry_run: bool = False,
+    keep_embedded: bool = False
+):
+    """
+    Copy embedded usage periods of every subscription into usage_periods.
+
+    Args:
+        database_name: Database name (uses settings.mongodb_database if None)
+        dry_run: If True, show what would be migrated without making changes
+        keep_embedded: If True, do not unset the embedded arrays
+    """
+    db_name = database_name or settings.mongodb_database
+
+    logger.info(f"{'='*80}")
+    logger.info(f"Migrating Embedded Usage Periods to usage_periods Collection")
+    logger.info(f"{'='*80}")
+    logger.info(f"Database: {db_name}")
+    logger.info(f"Mode: {'DRY RUN (no changes will be made)' if dry_run else 'LIVE (will update database)'}")
+    logger.info(f"{'='*80}\n")
+
+    client = AsyncIOMotorClient(settings.mongodb_uri)
+    db = client[db_name]
+
+    try:
+        if not dry_run:
+            # Same index the application creates at startup; required for idempotency
+            await db.usage_periods.create_index(
+                [("subscription_id", ASCENDING), ("period_start", ASCENDING), ("period_end", ASCENDING)],
+                unique=True,
+                name="subscription_period_unique"
+            )
+
+        cursor = db.subscriptions.find(
+            {"usage_periods.0": {"$exists": True}},
+            {"company_name": 1, "usage_periods": 1}
+        )
+
+        migrated_subscriptions = 0
+        migrated_periods = 0
+        duplicate_periods = 0
+
+        async for subscription in cursor:
+            sub_id = str(subscription["_id"])
+            company_name = subscription.get("company_name", "Unknown")
+            documents = [
+                build_period_document(sub_id, subscription.get("company_name"), period)
+                for period in subscription["usage_periods"]
+            ]
+
+            logger.info(f"Processing: {company_name} ({sub_id}) - {len(documents)} periods")
+
+            if dry_run:
+                logger.info(f"  [DRY RUN] Would copy {len(documents)} periods")
+                migrated_subscriptions += 1
+                migrated_periods += len(documents)
+                continue
+
+            inserted = len(documents)
+            try:
+                await db.usage_periods.insert_many(documents, ordered=False)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != DUPLICATE_KEY_ERROR for error in write_errors):
+                    raise
+                inserted -= len(write_errors)
+                duplicate_periods += len(write_errors)
+
+            if not keep_embedded:
+                await db.subscriptions.update_one(
+                    {"_id": subscription["_id"]},
+                    {"$unset": {"usage_periods": ""}}
+                )
+
+            logger.info(f"  ✅ Copied {inserted} periods ({len(documents) - inserted} already present)")
+            migrated_subscriptions += 1
+            migrated_periods += inserted
+
+        logger.info(f"\n{'='*80}")
+        logger.info(f"Summary:")
+        logger.info(f"{'='*80}")
+        logger.info(f"Subscriptions migrated: {migrated_subscriptions}")
+        logger.info(f"Periods copied: {migrated_periods}")
+        logger.info(f"Periods already present: {duplicate_periods}")
+        if dry_run:
+            logger.info(f"Mode: DRY RUN - No changes were made")
+        logger.info(f"{'='*80}\n")
+
+    except Exception as e:
+        logger.error(f"Error migrating usage periods: {e}", exc_info=True)
+        raise
+    finally:
+        client.close()
+        logger.info("MongoDB connection closed")
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(
+        description="Move embedded subscription usage periods into the usage_periods collection"
+    )
+    parser.add_argument(
+        "--database",
+        type=str,
+        default=None,
+        help="Database name (default: from settings)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be migrated without making changes"
+    )
+    parser.add_argument(
+        "--keep-embedded",
+        action="store_true",
+        help="Copy periods but leave the embedded arrays in place"
+    )
+
+    args = parser.parse_args()
+
+    asyncio.run(migrate_usage_periods(
+        database_name=args.database,
+        dry_run=args.dry_run,
+        keep_embedded=args.keep_embedded
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Verify that every registered query shape is served by an index.
+
+Runs explain() for each shape declared with register_query_shape() (see
+app/database/query_shapes.py) and fails if a winning plan contains a
+collection scan (COLLSCAN) or an in-memory sort (SORT). For each failing
+shape the suggested index is printed as an IndexModel line ready to add to
+INDEX_SPECS in app/database/indexes.py.
+
+Run it against a seeded database such as translation_test (restored from the
+golden source by scripts/restore_test_db.py).
+
+Usage:
+    python scripts/verify_query_shapes.py [--database DATABASE_NAME] [--create-indexes]
+
+Options:
+    --database         Database name (default: from settings)
+    --create-indexes   Apply the application's indexes to the database first
+
+Exit code is 1 if any shape needs an index.
+"""
+
+import asyncio
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import settings
+from app.database.indexes import IndexManager
+from app.database.query_shapes import load_query_shapes, verify_query_shapes, format_index_model
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def run(database_name: str = None, create_indexes: bool = False) -> int:
+    """
+    Verify all registered query shapes.
+
+    Args:
+        database_name: Database name (uses settings.mongodb_database if None)
+        create_indexes: Build every collection in INDEX_SPECS before verifying
+
+    Returns:
+        int: Number of shapes that need an index
+    """
+    db_name = database_name or settings.mongodb_database
+    client = AsyncIOMotorClient(settings.mongodb_uri)
+    db = client[db_name]
+
+    try:
+        if create_indexes:
+            await IndexManager(db).sync(force=True)
+
+        shapes = load_query_shapes()
+        logger.info(f"Verifying {len(shapes)} query shapes against database: {db_name}\n")
+
+        reports = await verify_query_shapes(db, shapes)
+        failing = [report for report in reports if not report.ok]
+
+        for report in reports:
+            status = "✅" if report.ok else "❌"
+            logger.info(f"{status} {report.shape.name}: {' -> '.join(report.stages)}")
+
+        if failing:
+            logger.info(f"\n{'='*80}")
+            logger.info(f"Missing indexes ({len(failing)} shapes):")
+            logger.info(f"{'='*80}")
+            for report in failing:
+                logger.info(f"# {report.shape.name} ({report.shape.source}): {', '.join(report.problems)}")
+                logger.info(f"db.{report.shape.collection}: {format_index_model(report)}")
+        else:
+            logger.info(f"\nAll {len(reports)} query shapes are served by an index")
+
+        return len(failing)
+    finally:
+        client.close()
+
+
+def main():
+    """Main entry point with argument parsing."""
+    parser = argparse.ArgumentParser(
+        description="Verify registered query shapes with explain() and suggest missing indexes"
+    )
+    parser.add_argument(
+        "--database",
+        type=str,
+        default=None,
+        help="Database name (default: from settings)"
+    )
+    parser.add_argument(
+        "--create-indexes",
+        action="store_true",
+        help="Apply the application's indexes to the database first"
+    )
+
+    args = parser.parse_args()
+
+    failing = asyncio.run(run(database_name=args.database, create_indexes=args.create_indexes))
+    sys.exit(1 if failing else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -676,7 +676,9 @@ async def test_subscription_units_updated_after_transaction(http_client, test_db
 
     # Get initial subscription state - Find CURRENT active period
     from datetime import datetime, timezone
-    usage_periods = subscription["usage_periods"]
+    usage_periods = await test_db.usage_periods.find(
+        {"subscription_id": str(subscription["_id"])}
+    ).sort("period_start", 1).to_list(length=None) or subscription.get("usage_periods", [])
     now = datetime.now(timezone.utc)
     current_period = None
     current_period_idx = None
@@ -749,7 +751,9 @@ async def test_subscription_units_updated_after_transaction(http_client, test_db
         assert updated_subscription is not None, "Subscription should still exist"
 
         # Find current active period in updated subscription (same logic as before)
-        updated_usage_periods = updated_subscription["usage_periods"]
+        updated_usage_periods = await test_db.usage_periods.find(
+            {"subscription_id": str(subscription["_id"])}
+        ).sort("period_start", 1).to_list(length=None)
         updated_current_period = None
 
         for idx, period in enumerate(updated_usage_periods):
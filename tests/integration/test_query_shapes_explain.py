@@ -0,0 +1,29 @@
+"""
+Explain-based index verification against the REAL test database.
+
+Applies the application's indexes to translation_test, then runs explain()
+for every registered query shape and fails on COLLSCAN or in-memory SORT.
+When this fails, the assertion message lists the index to add to
+INDEX_SPECS in app/database/indexes.py (same output as scripts/verify_query_shapes.py).
+"""
+
+import pytest
+
+from app.database.mongodb import MongoDB
+from app.database.query_shapes import load_query_shapes, verify_query_shapes, format_index_model
+
+
+@pytest.mark.integration
+async def test_registered_query_shapes_use_indexes(test_db):
+    """Every registered query shape is served by an index."""
+    mongo = MongoDB()
+    mongo.db = test_db
+    await mongo._create_indexes()
+
+    reports = await verify_query_shapes(test_db, load_query_shapes())
+
+    failing = [
+        f"{report.shape.name}: {', '.join(report.problems)} -> db.{report.shape.collection}: {format_index_model(report)}"
+        for report in reports if not report.ok
+    ]
+    assert not failing, "Query shapes without a supporting index:\n" + "\n".join(failing)
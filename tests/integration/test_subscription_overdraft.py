@@ -355,7 +355,7 @@ async def test_negative_balance_saved_to_database(
     subscription = await test_db.subscriptions.find_one({"_id": ObjectId(test_subscription_low_balance)})
 
     assert subscription is not None
-    current_period = subscription["usage_periods"][0]
+    current_period = await test_db.usage_periods.find_one({"subscription_id": test_subscription_low_balance})
 
     print(f"Units used: {current_period['units_used']}")
     print(f"Units remaining: {current_period['units_remaining']}")
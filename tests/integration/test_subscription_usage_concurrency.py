@@ -0,0 +1,131 @@
+"""
+Concurrency stress tests for atomic subscription usage recording.
+
+record_usage() used to read the subscription, add units in Python and write
+the result back with $set, so parallel confirmations for the same company
+lost updates. These tests fire hundreds of concurrent record_usage() calls
+against the REAL test database and assert the ledger total is exact.
+
+The service and the usage period repository are pointed at translation_test
+by patching their `database` references with the test_db fixture (see
+tests/conftest.py).
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.models.subscription import UsageUpdate
+from app.services.subscription_service import SubscriptionService
+
+
+PARALLEL_CALLS = 300
+
+
+@pytest.fixture(scope="function")
+async def usage_subscription(test_db, test_company):
+    """Subscription with one expired and one active usage period."""
+    now = datetime.now(timezone.utc)
+    subscription_doc = {
+        "company_name": test_company["company_name"],
+        "subscription_unit": "page",
+        "units_per_subscription": 1000,
+        "price_per_unit": 0.10,
+        "promotional_units": 0,
+        "discount": 1.0,
+        "subscription_price": 100.0,
+        "start_date": now - timedelta(days=60),
+        "end_date": now + timedelta(days=300),
+        "status": "active",
+        "created_at": now,
+        "updated_at": now
+    }
+    result = await test_db.subscriptions.insert_one(subscription_doc)
+    subscription_id = str(result.inserted_id)
+
+    await test_db.usage_periods.insert_many([
+        {
+            "subscription_id": subscription_id,
+            "company_name": test_company["company_name"],
+            "period_start": start,
+            "period_end": end,
+            "units_allocated": 1000,
+            "units_used": 0,
+            "units_remaining": 1000,
+            "promotional_units": 0,
+            "last_updated": now
+        }
+        for start, end in [
+            (now - timedelta(days=60), now - timedelta(days=31)),
+            (now - timedelta(days=30), now + timedelta(days=30)),
+        ]
+    ])
+
+    yield subscription_id
+
+    await test_db.usage_periods.delete_many({"subscription_id": subscription_id})
+    await test_db.subscriptions.delete_one({"_id": result.inserted_id})
+
+
+def _patch_database(test_db):
+    """Point the service and repository at the test database."""
+    test_database = SimpleNamespace(
+        subscriptions=test_db.subscriptions,
+        usage_periods=test_db.usage_periods
+    )
+    return (
+        patch("app.services.subscription_service.database", test_database),
+        patch("app.services.usage_period_repository.database", test_database),
+    )
+
+
+async def _periods(test_db, subscription_id):
+    return await test_db.usage_periods.find(
+        {"subscription_id": subscription_id}
+    ).sort("period_start", 1).to_list(length=None)
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+async def test_parallel_record_usage_is_exact(test_db, usage_subscription):
+    """Hundreds of concurrent increments land exactly, including overdraft."""
+    service = SubscriptionService()
+
+    patch_service, patch_repository = _patch_database(test_db)
+    with patch_service, patch_repository:
+        results = await asyncio.gather(*[
+            service.record_usage(usage_subscription, UsageUpdate(units_to_add=4))
+            for _ in range(PARALLEL_CALLS)
+        ])
+
+    expired_period, active_period = await _periods(test_db, usage_subscription)
+
+    assert active_period["units_used"] == PARALLEL_CALLS * 4
+    assert active_period["units_remaining"] == 1000 - PARALLEL_CALLS * 4
+    assert expired_period["units_used"] == 0
+
+    # Every call saw a distinct post-update balance (no lost updates)
+    balances = sorted(result["units_used"] for result in results)
+    assert balances == [4 * (i + 1) for i in range(PARALLEL_CALLS)]
+    assert sum(1 for result in results if result["overdraft"]) == PARALLEL_CALLS - 250
+
+
+@pytest.mark.integration
+@pytest.mark.slow
+async def test_parallel_batch_usage_is_exact(test_db, usage_subscription):
+    """Concurrent batch confirmations for the same subscription do not lose updates."""
+    service = SubscriptionService()
+
+    patch_service, patch_repository = _patch_database(test_db)
+    with patch_service, patch_repository:
+        await asyncio.gather(*[
+            service.record_usage_batch({usage_subscription: 3})
+            for _ in range(PARALLEL_CALLS)
+        ])
+
+    active_period = (await _periods(test_db, usage_subscription))[1]
+
+    assert active_period["units_used"] == PARALLEL_CALLS * 3
+    assert active_period["units_remaining"] == 1000 - PARALLEL_CALLS * 3
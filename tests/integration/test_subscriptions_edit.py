@@ -467,8 +467,7 @@ class TestUsagePeriods:
         subscription_id = str(test_subscription["_id"])
 
         # Get record before
-        record_before = await db.subscriptions.find_one({"_id": ObjectId(subscription_id)})
-        original_periods_count = len(record_before.get("usage_periods", []))
+        original_periods_count = await db.usage_periods.count_documents({"subscription_id": subscription_id})
         print(f"📊 Before: usage_periods count={original_periods_count}")
 
         # Prepare usage period data
@@ -492,12 +491,15 @@ class TestUsagePeriods:
         assert data["success"] is True
 
         # Verify database
-        record_after = await db.subscriptions.find_one({"_id": ObjectId(subscription_id)})
-        new_periods_count = len(record_after.get("usage_periods", []))
+        periods_after = await db.usage_periods.find(
+            {"subscription_id": subscription_id}
+        ).sort("created_at", 1).to_list(length=None)
+        new_periods_count = len(periods_after)
         assert new_periods_count == original_periods_count + 1
+        assert data["data"]["usage_periods_count"] == new_periods_count
 
         # Verify last period has correct data
-        last_period = record_after["usage_periods"][-1]
+        last_period = periods_after[-1]
         assert last_period["units_allocated"] == 1000
         assert last_period["units_used"] == 0
 
@@ -551,9 +553,10 @@ class TestUsagePeriods:
             print(f"⚠️ Test skipped: Could not create usage period ({period_response.status_code})")
             pytest.skip("Could not create usage period")
 
-        # Get subscription with usage period
-        record_before = await db.subscriptions.find_one({"_id": ObjectId(subscription_id)})
-        last_period_before = record_before["usage_periods"][-1]
+        # Get the usage period just added
+        last_period_before = await db.usage_periods.find_one(
+            {"subscription_id": subscription_id}, sort=[("created_at", -1)]
+        )
         original_used_units = last_period_before["units_used"]
         print(f"📊 Before: units_used={original_used_units}")
 
@@ -576,8 +579,7 @@ class TestUsagePeriods:
         assert data["success"] is True
 
         # Verify database
-        record_after = await db.subscriptions.find_one({"_id": ObjectId(subscription_id)})
-        last_period_after = record_after["usage_periods"][-1]
+        last_period_after = await db.usage_periods.find_one({"_id": last_period_before["_id"]})
         assert last_period_after["units_used"] == original_used_units + 50
 
         print(f"✅ Test passed: Usage recorded (units_used: {original_used_units} → {last_period_after['units_used']})")
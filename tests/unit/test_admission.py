@@ -0,0 +1,304 @@
+"""
+Unit tests for admission control.
+
+Tests cover:
+- Concurrency limit and FIFO queue
+- Shedding: full queue, CoDel dropping state, expected wait over the deadline
+- Cancelled waiters leave the queue
+- Middleware: 503 with Retry-After, routes without a class pass through
+- Stacked with RoutePolicyMiddleware: bursts are queued, not capped; the
+  route timeout starts at admission and bounds the queue wait
+"""
+
+import asyncio
+import pytest
+
+from app.middleware.admission import (
+    SHED_DEADLINE,
+    SHED_OVERLOAD,
+    SHED_QUEUE_FULL,
+    AdmissionClass,
+    AdmissionController,
+    AdmissionGate,
+    AdmissionMiddleware,
+    AdmissionRejected,
+    build_admission_classes,
+)
+from app.middleware.route_policy import RoutePolicy, RoutePolicyMiddleware, build_route_policies
+from app.middleware.route_table import RouteTable
+
+
+def _gate(max_in_flight=1, max_queue=4, target=10.0, interval=10.0):
+    return AdmissionGate(AdmissionClass("test", max_in_flight, max_queue, target, interval))
+
+
+class TestAdmissionGate:
+    """Test the gate of one endpoint class."""
+
+    @pytest.mark.asyncio
+    async def test_queues_beyond_limit_in_fifo_order(self):
+        gate = _gate(max_in_flight=2)
+        await gate.acquire()
+        await gate.acquire()
+
+        order = []
+
+        async def waiter(name):
+            await gate.acquire()
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(waiter(name)) for name in ("a", "b")]
+        await asyncio.sleep(0)
+        assert gate.queue_depth == 2 and order == []
+
+        gate.release(0.1)
+        gate.release(0.1)
+        await asyncio.gather(*tasks)
+
+        assert order == ["a", "b"]
+        assert gate.in_flight == 2
+        assert gate.snapshot()["admitted"] == 4
+        assert gate.snapshot()["queued_total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_is_shed(self):
+        gate = _gate(max_queue=1)
+        await gate.acquire()
+        queued = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await gate.acquire()
+
+        assert exc_info.value.reason == SHED_QUEUE_FULL
+        assert exc_info.value.retry_after >= 1
+        gate.release(0.1)
+        await queued
+
+    @pytest.mark.asyncio
+    async def test_codel_sheds_arrivals_on_standing_queue(self):
+        gate = _gate(max_queue=10, target=0.01, interval=0.02)
+        await gate.acquire()
+        waiters = [asyncio.ensure_future(gate.acquire()) for _ in range(3)]
+        await asyncio.sleep(0.05)
+
+        # A burst: the first delay above target only starts the interval
+        gate.release(0.05)
+        await asyncio.sleep(0)
+        assert not gate.dropping
+        # The delay is still above target an interval later: standing queue
+        await asyncio.sleep(0.03)
+        gate.release(0.05)
+        await asyncio.sleep(0)
+        assert gate.dropping
+
+        # New arrivals are shed, the queued requests are still served
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await gate.acquire()
+        assert exc_info.value.reason == SHED_OVERLOAD
+        gate.release(0.05)
+        assert await asyncio.gather(*waiters) == [None, None, None]
+
+        # The queue has drained: the next request runs at once, ending the state
+        gate.release(0.05)
+        await gate.acquire()
+        assert not gate.dropping
+        assert gate.snapshot()["shed"][SHED_OVERLOAD] == 1
+
+    @pytest.mark.asyncio
+    async def test_expected_wait_over_deadline_is_shed(self):
+        gate = _gate()
+        await gate.acquire()
+        gate.release(10.0)
+        await gate.acquire()
+
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await gate.acquire(deadline=5.0)
+
+        assert exc_info.value.reason == SHED_DEADLINE
+        assert exc_info.value.retry_after == 10
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        gate = _gate()
+        await gate.acquire()
+        waiter = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert gate.queue_depth == 0
+        gate.release(0.1)
+        assert gate.in_flight == 0
+
+
+class _Recorder:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, message):
+        self.messages.append(message)
+
+    @property
+    def status(self):
+        return self.messages[0]["status"]
+
+    @property
+    def headers(self):
+        return dict(self.messages[0]["headers"])
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+def _scope(path, policy=None):
+    scope = {"type": "http", "method": "POST", "path": path, "headers": []}
+    if policy is not None:
+        scope["state"] = {"route_policy": policy}
+    return scope
+
+
+class TestAdmissionMiddleware:
+    """Test the ASGI middleware."""
+
+    def setup_method(self):
+        self.release = asyncio.Event()
+
+        async def app(scope, receive, send):
+            await self.release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        classes = RouteTable(exact={("POST", "/translate"): AdmissionClass("translate", 1, 0)})
+        self.controller = AdmissionController(classes)
+        self.middleware = AdmissionMiddleware(app, controller=self.controller, enabled=True)
+
+    @pytest.mark.asyncio
+    async def test_overload_returns_503(self):
+        first = _Recorder()
+        running = asyncio.ensure_future(self.middleware(_scope("/translate"), _receive, first.send))
+        await asyncio.sleep(0)
+
+        shed = _Recorder()
+        await self.middleware(_scope("/translate", RoutePolicy("translate", timeout=120)), _receive, shed.send)
+        self.release.set()
+        await running
+
+        assert shed.status == 503
+        assert shed.headers[b"retry-after"] == b"1"
+        assert b"overload_error" in shed.messages[1]["body"]
+        assert first.status == 200
+        snapshot = self.controller.snapshot()["translate"]
+        assert snapshot["admitted"] == 1
+        assert snapshot["shed"][SHED_QUEUE_FULL] == 1
+        assert snapshot["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unclassified_routes_pass(self):
+        self.release.set()
+        recorder = _Recorder()
+
+        await self.middleware(_scope("/login/corporate"), _receive, recorder.send)
+
+        assert recorder.status == 200
+        assert self.controller.snapshot() == {}
+
+
+class TestWithRoutePolicy:
+    """Test AdmissionMiddleware inside RoutePolicyMiddleware, as stacked in main.py."""
+
+    @staticmethod
+    def _stack(app, route_policies=None, admission_classes=None):
+        controller = AdmissionController(admission_classes)
+        admission = AdmissionMiddleware(app, controller=controller, enabled=True)
+        return RoutePolicyMiddleware(admission, policies=route_policies), controller
+
+    @staticmethod
+    def _app(release=None, delay=0.0):
+        async def app(scope, receive, send):
+            if release is not None:
+                await release.wait()
+            await asyncio.sleep(delay)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        return app
+
+    def test_admission_routes_have_no_route_policy_cap(self):
+        route_policies = build_route_policies()
+        admission_classes = build_admission_classes()
+        routes = list(admission_classes._exact) + [(method, prefix) for method, prefix, _ in admission_classes._prefixes]
+
+        for method, path in routes:
+            policy = route_policies.match("POST" if method == "*" else method, path)
+            assert policy is None or policy.max_concurrency is None, (method, path)
+
+    @pytest.mark.asyncio
+    async def test_burst_is_queued_not_rejected(self):
+        release = asyncio.Event()
+        stack, controller = self._stack(self._app(release))
+        max_in_flight = controller.classes.match("POST", "/translate").max_in_flight
+        recorders = [_Recorder() for _ in range(max_in_flight * 2)]
+        requests = [
+            asyncio.ensure_future(stack(_scope("/translate"), _receive, recorder.send)) for recorder in recorders
+        ]
+        await asyncio.sleep(0.01)
+        assert controller.snapshot()["translate"]["queued"] == max_in_flight
+
+        release.set()
+        await asyncio.gather(*requests)
+
+        assert [recorder.status for recorder in recorders] == [200] * len(recorders)
+
+    @pytest.mark.asyncio
+    async def test_route_timeout_starts_after_admission(self):
+        stack, _ = self._stack(
+            self._app(delay=0.15),
+            route_policies=RouteTable(exact={("POST", "/translate"): RoutePolicy("translate", timeout=0.25)}),
+            admission_classes=RouteTable(exact={("POST", "/translate"): AdmissionClass("translate", 1, 4)}),
+        )
+        first, second = _Recorder(), _Recorder()
+
+        # The second request waits ~0.15s, then runs 0.15s: over the timeout in
+        # total, within it after admission
+        await asyncio.gather(
+            stack(_scope("/translate"), _receive, first.send),
+            stack(_scope("/translate"), _receive, second.send),
+        )
+
+        assert (first.status, second.status) == (200, 200)
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_bounded_by_route_timeout(self):
+        release = asyncio.Event()
+        translate = AdmissionClass("translate", 1, 4)
+        # Both paths share one gate; the running request's own timeout outlives
+        # the queued request's deadline, so the gate is never freed early
+        stack, controller = self._stack(
+            self._app(release),
+            route_policies=RouteTable(exact={
+                ("POST", "/translate"): RoutePolicy("translate", timeout=0.05),
+                ("POST", "/translate-user"): RoutePolicy("translate_user", timeout=10),
+            }),
+            admission_classes=RouteTable(exact={
+                ("POST", "/translate"): translate,
+                ("POST", "/translate-user"): translate,
+            }),
+        )
+        first, queued = _Recorder(), _Recorder()
+        running = asyncio.ensure_future(stack(_scope("/translate-user"), _receive, first.send))
+        await asyncio.sleep(0)
+
+        await stack(_scope("/translate"), _receive, queued.send)
+        assert not running.done()
+        release.set()
+        await running
+
+        assert first.status == 200
+        assert queued.status == 503
+        snapshot = controller.snapshot()["translate"]
+        assert snapshot["shed"][SHED_DEADLINE] == 1
+        assert snapshot["queued"] == 0
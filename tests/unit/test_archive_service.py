@@ -0,0 +1,284 @@
+"""
+Unit tests for the archive tier.
+
+Tests cover:
+- Cutoff respects the horizon and the webhook TTL cap
+- Records are copied into monthly archive collections before deletion
+- The manifest counts only newly archived records
+- Re-running after an interrupted move tolerates duplicate keys
+- Archive lookups read every month in one round trip and mark documents archived
+- Detail lookups opt in to the archive
+- Archived webhook events keep their TTL index
+- Invoice payment lists include archived payments
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from app.services.archive_service import (
+    ARCHIVE_MANIFEST_COLLECTION,
+    ArchiveService,
+    archive_collection_name,
+)
+
+NOW = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+class _AsyncCursor:
+    def __init__(self, documents):
+        self._documents = list(documents)
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    def limit(self, *args, **kwargs):
+        return self
+
+    async def to_list(self, length=None):
+        return list(self._documents)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self._documents:
+            yield document
+
+
+def _mock_database(hot_batches=None, manifest_entries=None):
+    """Mock database whose collections are created per name on first access."""
+    collections = {}
+
+    def _collection(name):
+        if name not in collections:
+            collection = MagicMock()
+            collection.create_indexes = AsyncMock()
+            collection.insert_many = AsyncMock()
+            collection.delete_many = AsyncMock()
+            collection.update_one = AsyncMock()
+            collection.find_one = AsyncMock(return_value=None)
+            collection.count_documents = AsyncMock(return_value=0)
+            collection.find = MagicMock(return_value=_AsyncCursor([]))
+            collections[name] = collection
+        return collections[name]
+
+    db = MagicMock()
+    db.__getitem__ = MagicMock(side_effect=_collection)
+    if hot_batches is not None:
+        db["payments"].find = MagicMock(side_effect=[_AsyncCursor(batch) for batch in hot_batches])
+    if manifest_entries is not None:
+        db[ARCHIVE_MANIFEST_COLLECTION].find = MagicMock(return_value=_AsyncCursor(manifest_entries))
+    return db, collections
+
+
+async def _archived_payment_indexes():
+    db, collections = _mock_database(hot_batches=[[_payment(datetime(2024, 1, 15, tzinfo=timezone.utc))], []])
+    await ArchiveService(db).archive_collection("payments", horizon_days=90, batch_size=10, now=NOW)
+    return collections["payments_archive_2024_01"].create_indexes.await_args.args[0]
+
+
+def _payment(payment_date):
+    return {"_id": ObjectId(), "stripe_payment_intent_id": f"pi_{ObjectId()}", "payment_date": payment_date}
+
+
+class TestCutoff:
+    """Test ArchiveService.cutoff."""
+
+    def test_uses_horizon(self):
+        service = ArchiveService(MagicMock())
+        assert service.cutoff("payments", 30, now=NOW) == NOW - timedelta(days=30)
+
+    def test_webhook_horizon_capped_below_ttl(self):
+        service = ArchiveService(MagicMock())
+        assert service.cutoff("webhook_events", 365, now=NOW) == NOW - timedelta(days=80)
+
+    def test_unknown_collection(self):
+        with pytest.raises(KeyError):
+            ArchiveService(MagicMock()).cutoff("company_users")
+
+
+class TestArchiveCollection:
+    """Test moving records into archive collections."""
+
+    @pytest.mark.asyncio
+    async def test_copies_by_month_then_deletes(self):
+        january = _payment(datetime(2024, 1, 15, tzinfo=timezone.utc))
+        february = _payment(datetime(2024, 2, 3, tzinfo=timezone.utc))
+        db, collections = _mock_database(hot_batches=[[january, february], []])
+
+        totals = await ArchiveService(db).archive_collection("payments", horizon_days=90, batch_size=10, now=NOW)
+
+        assert totals == {"archived": 2, "already_archived": 0, "batches": 1}
+        collections["payments_archive_2024_01"].insert_many.assert_awaited_once_with([january], ordered=False)
+        collections["payments_archive_2024_02"].insert_many.assert_awaited_once_with([february], ordered=False)
+        collections["payments"].delete_many.assert_awaited_once_with(
+            {"_id": {"$in": [january["_id"], february["_id"]]}}
+        )
+
+        query, update = collections[ARCHIVE_MANIFEST_COLLECTION].update_one.await_args_list[0].args
+        assert query == {"_id": "payments_archive_2024_01"}
+        assert update["$inc"] == {"record_count": 1}
+        assert update["$setOnInsert"]["month"] == "2024-01"
+
+    @pytest.mark.asyncio
+    async def test_webhook_archive_gets_ttl_index(self):
+        event = {"_id": ObjectId(), "event_id": "evt_1", "created_at": datetime(2024, 1, 5, tzinfo=timezone.utc)}
+        db, collections = _mock_database()
+        db["webhook_events"].find = MagicMock(side_effect=[_AsyncCursor([event]), _AsyncCursor([])])
+
+        await ArchiveService(db).archive_collection("webhook_events", batch_size=10, now=NOW)
+
+        indexes = collections["webhook_events_archive_2024_01"].create_indexes.await_args.args[0]
+        ttl = [index.document for index in indexes if "expireAfterSeconds" in index.document]
+        assert ttl == [{"key": {"expires_at": 1}, "name": "ttl_90_days", "expireAfterSeconds": 0}]
+
+        payment_indexes = await _archived_payment_indexes()
+        assert not any("expireAfterSeconds" in index.document for index in payment_indexes)
+
+    @pytest.mark.asyncio
+    async def test_already_archived_records_are_not_recounted(self):
+        records = [_payment(datetime(2024, 1, day, tzinfo=timezone.utc)) for day in (1, 2, 3)]
+        db, collections = _mock_database(hot_batches=[records, []])
+        collections["payments_archive_2024_01"] = db["payments_archive_2024_01"]
+        collections["payments_archive_2024_01"].insert_many.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 0, "code": 11000}, {"index": 1, "code": 11000}]
+        })
+
+        totals = await ArchiveService(db).archive_collection("payments", horizon_days=90, now=NOW)
+
+        assert totals == {"archived": 1, "already_archived": 2, "batches": 1}
+        _, update = collections[ARCHIVE_MANIFEST_COLLECTION].update_one.await_args.args
+        assert update["$inc"] == {"record_count": 1}
+        collections["payments"].delete_many.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_other_write_errors_keep_hot_records(self):
+        records = [_payment(datetime(2024, 1, 1, tzinfo=timezone.utc))]
+        db, collections = _mock_database(hot_batches=[records, []])
+        db["payments_archive_2024_01"].insert_many.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 0, "code": 121}]
+        })
+
+        with pytest.raises(BulkWriteError):
+            await ArchiveService(db).archive_collection("payments", horizon_days=90, now=NOW)
+
+        collections["payments"].delete_many.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_dry_run_only_counts(self):
+        db, collections = _mock_database()
+        db["payments"].count_documents.return_value = 42
+
+        totals = await ArchiveService(db).archive_collection("payments", horizon_days=90, dry_run=True, now=NOW)
+
+        assert totals["archived"] == 42
+        query = collections["payments"].count_documents.await_args.args[0]
+        assert query == {"payment_date": {"$lt": NOW - timedelta(days=90)}}
+        collections["payments"].delete_many.assert_not_awaited()
+
+
+class TestArchiveReads:
+    """Test reading from archive collections."""
+
+    @pytest.mark.asyncio
+    async def test_find_one_archived_is_one_round_trip(self):
+        db, collections = _mock_database(manifest_entries=[
+            {"_id": "payments_archive_2024_03"},
+            {"_id": "payments_archive_2024_02"},
+            {"_id": "payments_archive_2024_01"},
+        ])
+        query = {"stripe_payment_intent_id": "pi_1"}
+        db["payments_archive_2024_03"].aggregate = MagicMock(return_value=_AsyncCursor([dict(query)]))
+
+        document = await ArchiveService(db).find_one_archived("payments", query)
+
+        assert document == {"stripe_payment_intent_id": "pi_1", "archived": True}
+        collections["payments_archive_2024_03"].aggregate.assert_called_once_with([
+            {"$match": query},
+            {"$unionWith": {"coll": "payments_archive_2024_02", "pipeline": [{"$match": query}]}},
+            {"$unionWith": {"coll": "payments_archive_2024_01", "pipeline": [{"$match": query}]}},
+            {"$limit": 1},
+        ])
+        # Older months are only named in the pipeline, never queried separately
+        assert "payments_archive_2024_01" not in collections
+
+    @pytest.mark.asyncio
+    async def test_no_archive_collections_no_query(self):
+        db, collections = _mock_database(manifest_entries=[])
+
+        assert await ArchiveService(db).find_one_archived("payments", {"_id": 1}) is None
+        assert list(collections) == [ARCHIVE_MANIFEST_COLLECTION]
+
+    @pytest.mark.asyncio
+    async def test_manifest_is_cached(self):
+        db, collections = _mock_database(manifest_entries=[{"_id": "payments_archive_2024_01"}])
+        db["payments_archive_2024_01"].aggregate = MagicMock(return_value=_AsyncCursor([]))
+        service = ArchiveService(db)
+
+        await service.find_one_archived("payments", {"_id": 1})
+        await service.find_one_archived("payments", {"_id": 2})
+
+        assert collections[ARCHIVE_MANIFEST_COLLECTION].find.call_count == 1
+
+    def test_archive_collection_name(self):
+        assert archive_collection_name("payments", datetime(2024, 3, 9)) == "payments_archive_2024_03"
+
+    @pytest.mark.asyncio
+    async def test_payment_lookup_falls_back_only_when_requested(self):
+        from app.services.archive_service import archive_service
+        from app.services.payment_repository import payment_repository
+
+        db, collections = _mock_database()
+        archived = {"stripe_payment_intent_id": "pi_old", "archived": True}
+
+        with patch.object(archive_service, "_db", db), \
+                patch.object(archive_service, "find_one_archived", AsyncMock(return_value=archived)) as find_archived:
+            assert await payment_repository.get_payment_by_square_id("pi_old") is None
+            find_archived.assert_not_awaited()
+
+            result = await payment_repository.get_payment_by_square_id("pi_old", include_archived=True)
+
+        assert result == archived
+        find_archived.assert_awaited_once_with("payments", {"stripe_payment_intent_id": "pi_old"})
+
+    @pytest.mark.asyncio
+    async def test_find_archived_collects_across_months(self):
+        db, collections = _mock_database(manifest_entries=[
+            {"_id": "payments_archive_2024_02"},
+            {"_id": "payments_archive_2024_01"},
+        ])
+        db["payments_archive_2024_02"].aggregate = MagicMock(return_value=_AsyncCursor([
+            {"invoice_id": "inv_1", "amount": 2},
+            {"invoice_id": "inv_1", "amount": 1},
+        ]))
+
+        documents = await ArchiveService(db).find_archived("payments", {"invoice_id": "inv_1"})
+
+        assert documents == [
+            {"invoice_id": "inv_1", "amount": 2, "archived": True},
+            {"invoice_id": "inv_1", "amount": 1, "archived": True},
+        ]
+        pipeline = collections["payments_archive_2024_02"].aggregate.call_args.args[0]
+        assert pipeline[-1] == {
+            "$unionWith": {"coll": "payments_archive_2024_01", "pipeline": [{"$match": {"invoice_id": "inv_1"}}]}
+        }
+
+    @pytest.mark.asyncio
+    async def test_invoice_payments_include_archived(self):
+        from app.services.payment_application_service import payment_application_service
+
+        hot = {"invoice_id": "inv_1", "amount": 3}
+        archived = {"invoice_id": "inv_1", "amount": 1, "archived": True}
+        db = MagicMock()
+        db.payments.find = MagicMock(return_value=_AsyncCursor([hot]))
+
+        with patch("app.services.payment_application_service.database", db), \
+                patch("app.services.archive_service.archive_service.find_archived",
+                      AsyncMock(return_value=[archived])) as find_archived:
+            payments = await payment_application_service.get_invoice_payments("inv_1")
+
+        assert payments == [hot, archived]
+        find_archived.assert_awaited_once_with("payments", {"invoice_id": "inv_1"}, limit=99)
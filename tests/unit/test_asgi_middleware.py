@@ -0,0 +1,190 @@
+"""
+Unit tests for the pure ASGI middleware.
+
+Tests cover:
+- RouteTable exact/prefix/method matching
+- LoggingMiddleware adds X-Request-ID / X-Process-Time and exposes the
+  request ID on request.state, without touching streamed bodies, and never
+  logs the Authorization header value
+- EncodingFixMiddleware passes requests through without reading the body
+  unless the path is configured for capture, and replays captured bodies
+"""
+
+import logging
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.encoding_fix import EncodingFixMiddleware
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.route_table import RouteTable
+
+
+def _app():
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"body": (await request.body()).decode(), "request_id": request.state.request_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk{i}\n".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+class TestRouteTable:
+    """Test RouteTable lookups."""
+
+    def test_exact_and_any_method(self):
+        table = RouteTable(exact={("POST", "/translate"): "translate", ("*", "/submit"): "submit"})
+
+        assert table.match("POST", "/translate") == "translate"
+        assert table.match("GET", "/translate") is None
+        assert table.match("PUT", "/submit") == "submit"
+
+    def test_longest_prefix_wins_and_exact_first(self):
+        table = RouteTable(
+            exact={("GET", "/api/payments/export"): "export"},
+            prefixes={("*", "/api/"): "api", ("GET", "/api/payments/"): "payments"},
+        )
+
+        assert table.match("GET", "/api/payments/123") == "payments"
+        assert table.match("POST", "/api/payments/123") == "api"
+        assert table.match("GET", "/api/payments/export") == "export"
+        assert table.match("GET", "/health") is None
+        # Memoized result is stable
+        assert table.match("GET", "/api/payments/123") == "payments"
+
+    def test_empty_table_is_falsy(self):
+        assert not RouteTable()
+        assert RouteTable(exact={("GET", "/"): 1})
+
+
+class TestLoggingMiddleware:
+    """Test response headers and request state."""
+
+    def test_headers_and_request_id(self):
+        app = _app()
+        app.add_middleware(LoggingMiddleware)
+
+        response = TestClient(app).post("/echo", content=b'{"a": 1}')
+
+        assert response.status_code == 200
+        assert response.json()["body"] == '{"a": 1}'
+        assert response.headers["x-request-id"] == response.json()["request_id"]
+        assert response.headers["x-process-time"].endswith("s")
+
+    def test_streaming_response_passes_through(self):
+        app = _app()
+        app.add_middleware(LoggingMiddleware)
+
+        response = TestClient(app).get("/stream")
+
+        assert response.text == "chunk0\nchunk1\nchunk2\n"
+        assert "x-request-id" in response.headers
+
+    def test_errors_are_logged_and_reraised(self):
+        app = FastAPI()
+
+        @app.get("/boom")
+        async def boom():
+            raise RuntimeError("boom")
+
+        app.add_middleware(LoggingMiddleware)
+
+        with pytest.raises(RuntimeError):
+            TestClient(app).get("/boom")
+
+    def test_confirm_metadata_never_logs_bearer_token(self, caplog):
+        app = FastAPI()
+
+        @app.post("/api/transactions/confirm")
+        async def confirm():
+            return {}
+
+        app.add_middleware(LoggingMiddleware)
+
+        with caplog.at_level(logging.DEBUG, logger="translator.middleware"):
+            TestClient(app).post("/api/transactions/confirm", headers={"Authorization": "Bearer secret-token-value"})
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert any("Authorization: present" in message for message in messages)
+        assert not any("secret-token" in message for message in messages)
+
+
+class TestEncodingFixMiddleware:
+    """Test pass-through and opt-in body capture."""
+
+    @pytest.mark.asyncio
+    async def test_passthrough_does_not_read_body(self):
+        calls = []
+
+        async def downstream(scope, receive, send):
+            calls.append(receive)
+
+        async def receive():
+            raise AssertionError("body must not be read")
+
+        middleware = EncodingFixMiddleware(downstream, capture_paths=[])
+        await middleware({"type": "http", "method": "POST", "path": "/submit", "headers": []}, receive, None)
+
+        assert calls == [receive]
+
+    @pytest.mark.asyncio
+    async def test_capture_replays_chunked_body(self):
+        messages = [
+            {"type": "http.request", "body": b'{"transaction_id":', "more_body": True},
+            {"type": "http.request", "body": b' "TXN-1"}', "more_body": False},
+        ]
+
+        async def receive():
+            return messages.pop(0)
+
+        replayed = []
+
+        async def downstream(scope, receive, send):
+            while True:
+                message = await receive()
+                replayed.append(message["body"])
+                if not message.get("more_body"):
+                    break
+
+        middleware = EncodingFixMiddleware(downstream, capture_paths=["/submit"])
+        await middleware({"type": "http", "method": "POST", "path": "/submit", "headers": []}, receive, None)
+
+        assert b"".join(replayed) == b'{"transaction_id": "TXN-1"}'
+
+    @pytest.mark.asyncio
+    async def test_capture_stops_at_max_bytes(self):
+        messages = [
+            {"type": "http.request", "body": b"x" * 10, "more_body": True},
+            {"type": "http.request", "body": b"y" * 10, "more_body": True},
+            {"type": "http.request", "body": b"z" * 10, "more_body": False},
+        ]
+        reads = []
+
+        async def receive():
+            reads.append(1)
+            return messages.pop(0)
+
+        replayed = []
+
+        async def downstream(scope, receive, send):
+            assert len(reads) == 1  # only the first chunk was buffered
+            while True:
+                message = await receive()
+                replayed.append(message["body"])
+                if not message.get("more_body"):
+                    break
+
+        middleware = EncodingFixMiddleware(downstream, capture_paths=["/submit"], capture_max_bytes=5)
+        await middleware({"type": "http", "method": "POST", "path": "/submit", "headers": []}, receive, None)
+
+        assert b"".join(replayed) == b"x" * 10 + b"y" * 10 + b"z" * 10
@@ -0,0 +1,207 @@
+"""
+Unit tests for conditional GET (ETag / Last-Modified).
+
+Tests cover:
+- Version stamps and ETag stability/change
+- If-None-Match (weak comparison, lists, "*") and If-Modified-Since
+- Routes answer 304 before loading or serializing the body
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.utils.conditional import (
+    ConditionalGet,
+    VersionStamp,
+    collection_version,
+    make_etag,
+    newest,
+)
+
+WHEN = datetime(2025, 3, 1, 12, 0, 30, 123000, tzinfo=timezone.utc)
+
+
+def _request(headers=None):
+    request = MagicMock()
+    request.headers = {name.lower(): value for name, value in (headers or {}).items()}
+    return request
+
+
+def _aggregate_cursor(documents):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=documents)
+    return cursor
+
+
+class TestVersionStamp:
+    """Test collection_version() and make_etag()."""
+
+    @pytest.mark.asyncio
+    async def test_collection_version_queries(self):
+        collection = MagicMock()
+        collection.aggregate = MagicMock(return_value=_aggregate_cursor([{"count": 3}]))
+        collection.find_one = AsyncMock(side_effect=[{"updated_at": WHEN.replace(tzinfo=None)}, {}])
+
+        stamp = await collection_version(collection, {"company_name": "Acme"})
+
+        collection.aggregate.assert_called_once_with([
+            {"$match": {"company_name": "Acme"}},
+            {"$count": "count"},
+        ])
+        # Newest value per field is one read of the (company_name, field) index
+        assert [call.args + (call.kwargs["sort"],) for call in collection.find_one.await_args_list] == [
+            ({"company_name": "Acme"}, {"_id": 0, "updated_at": 1}, [("updated_at", -1)]),
+            ({"company_name": "Acme"}, {"_id": 0, "created_at": 1}, [("created_at", -1)]),
+        ]
+        assert stamp.count == 3
+        assert stamp.maxima == (WHEN.replace(tzinfo=None), None)
+        # Naive MongoDB datetimes are UTC
+        assert stamp.last_modified == WHEN
+
+    @pytest.mark.asyncio
+    async def test_empty_collection(self):
+        collection = MagicMock()
+        collection.aggregate = MagicMock(return_value=_aggregate_cursor([]))
+        collection.find_one = AsyncMock()
+
+        stamp = await collection_version(collection, {})
+
+        collection.find_one.assert_not_awaited()
+        assert stamp == VersionStamp(count=0, maxima=(None, None))
+        assert stamp.last_modified is None
+
+    def test_etag_is_stable_and_weak(self):
+        stamp = VersionStamp(count=2, maxima=(WHEN, None))
+
+        etag = make_etag("invoices", "Acme", 1, stamp)
+
+        assert etag == make_etag("invoices", "Acme", 1, VersionStamp(count=2, maxima=(WHEN, None)))
+        assert etag.startswith('W/"')
+
+    def test_etag_changes_with_data_and_parameters(self):
+        stamp = VersionStamp(count=2, maxima=(WHEN,))
+        etag = make_etag("invoices", 1, stamp)
+
+        assert make_etag("invoices", 1, VersionStamp(count=3, maxima=(WHEN,))) != etag
+        assert make_etag("invoices", 1, VersionStamp(count=2, maxima=(WHEN + timedelta(seconds=1),))) != etag
+        assert make_etag("invoices", 2, stamp) != etag
+
+    def test_newest(self):
+        older = VersionStamp(count=1, maxima=(WHEN,))
+        newer = VersionStamp(count=1, maxima=(None, WHEN + timedelta(days=1)))
+
+        assert newest(older, newer, VersionStamp(count=0, maxima=(None,))) == WHEN + timedelta(days=1)
+        assert newest(VersionStamp(count=0)) is None
+
+
+class TestConditionalGet:
+    """Test request precondition evaluation."""
+
+    ETAG = make_etag("test", 1)
+
+    def test_no_validators(self):
+        assert not ConditionalGet(_request(), self.ETAG, WHEN).is_not_modified()
+
+    @pytest.mark.parametrize("header", [
+        ETAG,
+        ETAG.removeprefix("W/"),
+        f'"other", {ETAG}',
+        "*",
+    ])
+    def test_if_none_match_hit(self, header):
+        assert ConditionalGet(_request({"If-None-Match": header}), self.ETAG).is_not_modified()
+
+    def test_if_none_match_miss(self):
+        assert not ConditionalGet(_request({"If-None-Match": 'W/"stale"'}), self.ETAG).is_not_modified()
+
+    def test_if_none_match_takes_precedence(self):
+        request = _request({
+            "If-None-Match": 'W/"stale"',
+            "If-Modified-Since": format_datetime(WHEN + timedelta(days=1), usegmt=True),
+        })
+
+        assert not ConditionalGet(request, self.ETAG, WHEN).is_not_modified()
+
+    def test_if_modified_since(self):
+        # HTTP dates have second precision; sub-second changes are not newer
+        same_second = _request({"If-Modified-Since": format_datetime(WHEN.replace(microsecond=0), usegmt=True)})
+        earlier = _request({"If-Modified-Since": format_datetime(WHEN - timedelta(minutes=1), usegmt=True)})
+
+        assert ConditionalGet(same_second, self.ETAG, WHEN).is_not_modified()
+        assert not ConditionalGet(earlier, self.ETAG, WHEN).is_not_modified()
+        assert not ConditionalGet(_request({"If-Modified-Since": "garbage"}), self.ETAG, WHEN).is_not_modified()
+
+    def test_not_modified_response_carries_validators(self):
+        response = ConditionalGet(_request(), self.ETAG, WHEN).not_modified_response()
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == self.ETAG
+        assert response.headers["last-modified"] == "Sat, 01 Mar 2025 12:00:30 GMT"
+        assert response.headers["cache-control"] == "private, no-cache"
+
+
+class TestConditionalRoutes:
+    """Routes short-circuit with 304 before the list query."""
+
+    @pytest.mark.asyncio
+    async def test_companies_304_skips_find(self):
+        from app.routers.companies import get_all_companies
+
+        db = MagicMock()
+        db.company.aggregate = MagicMock(return_value=_aggregate_cursor([{"count": 1}]))
+        db.company.find_one = AsyncMock(return_value={"updated_at": WHEN, "created_at": WHEN})
+        db.company.find = MagicMock(return_value=_aggregate_cursor([{"company_name": "Acme"}]))
+
+        with patch("app.routers.companies.database", db):
+            first = await get_all_companies(_request())
+            second = await get_all_companies(_request({"If-None-Match": first.headers["etag"]}))
+
+        assert first.status_code == 200
+        assert json.loads(first.body)["data"]["count"] == 1
+        assert second.status_code == 304
+        db.company.find.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_enterprise_invoices_304_skips_query_and_serializer(self):
+        from fastapi import Response
+        from app.routers.enterprise_documents import get_invoices
+
+        db = MagicMock()
+        db.invoices.aggregate = MagicMock(return_value=_aggregate_cursor([{"count": 4}]))
+        db.invoices.find_one = AsyncMock(return_value={"updated_at": WHEN, "created_at": WHEN})
+        db.invoices.count_documents = AsyncMock(return_value=0)
+        db.invoices.find = MagicMock()
+        etag = make_etag(
+            "enterprise_invoices", "Acme", None, "date", "desc", 1, 20,
+            VersionStamp(count=4, maxima=(WHEN, WHEN))
+        )
+
+        with patch("app.routers.enterprise_documents.database", db), \
+             patch("app.routers.enterprise_documents.serialize_for_json") as serializer:
+            result = await get_invoices(
+                request=_request({"If-None-Match": etag}), response=Response(), search=None,
+                sort_by="date", sort_order="desc", page=1, page_size=20,
+                current_user={"company_name": "Acme", "email": "jane@acme.com"}
+            )
+
+        assert result.status_code == 304
+        db.invoices.find.assert_not_called()
+        db.invoices.count_documents.assert_not_called()
+        serializer.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_languages_etag_round_trip(self):
+        from app.routers.languages import get_supported_languages
+        from app.services.language_service import language_service
+
+        first = await get_supported_languages(_request())
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "public, no-cache"
+        assert first.headers["etag"] == make_etag("languages", language_service.version)
+
+        second = await get_supported_languages(_request({"If-None-Match": first.headers["etag"]}))
+        assert second.status_code == 304
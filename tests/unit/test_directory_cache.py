@@ -0,0 +1,210 @@
+"""
+Unit tests for the company directory cache.
+
+Tests cover:
+- Read-through hits, copies, TTL and LRU bound
+- Invalidation (per company, racing lookups)
+- Change stream invalidation (login-only updates ignored)
+- Login re-reads status and password hash
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services import auth_service as auth_service_module
+from app.services import directory_cache as directory_cache_module
+from app.services.auth_service import AuthenticationError, AuthService
+from app.services.directory_cache import DirectoryCache
+
+ACME = {"company_name": "Acme Health LLC", "contact_person": {"email": "billing@acme.com"}}
+JOHN = {"user_id": "user_1", "company_name": "Acme Health LLC", "email": "john@acme.com", "user_name": "John"}
+
+
+@pytest.fixture
+def fake_database():
+    fake = SimpleNamespace(
+        company=SimpleNamespace(find_one=AsyncMock(return_value=dict(ACME))),
+        company_users=SimpleNamespace(find_one=AsyncMock(return_value=dict(JOHN))),
+        db=None,
+    )
+    with patch.object(directory_cache_module, "database", fake):
+        yield fake
+
+
+class FakeChangeStream:
+    def __init__(self, changes):
+        self.changes = changes
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.changes.get()
+
+
+class TestReadThrough:
+    """Test cached lookups."""
+
+    @pytest.mark.asyncio
+    async def test_hit_returns_copy(self, fake_database):
+        cache = DirectoryCache(ttl=60, max_entries=10)
+
+        first = await cache.get_company("Acme Health LLC")
+        first["contact_person"]["email"] = "changed@example.com"
+        second = await cache.get_company("Acme Health LLC")
+
+        assert fake_database.company.find_one.await_count == 1
+        assert second["contact_person"]["email"] == "billing@acme.com"
+
+    @pytest.mark.asyncio
+    async def test_user_lookup(self, fake_database):
+        cache = DirectoryCache(ttl=60, max_entries=10)
+
+        for _ in range(2):
+            user = await cache.get_company_user("Acme Health LLC", "john@acme.com", "John")
+
+        assert user["user_id"] == "user_1"
+        fake_database.company_users.find_one.assert_awaited_once_with(
+            {"email": "john@acme.com", "company_name": "Acme Health LLC", "user_name": "John"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_misses_not_cached(self, fake_database):
+        cache = DirectoryCache(ttl=60, max_entries=10)
+        fake_database.company.find_one.return_value = None
+
+        assert await cache.get_company("Globex") is None
+        fake_database.company.find_one.return_value = {"company_name": "Globex"}
+        assert (await cache.get_company("Globex"))["company_name"] == "Globex"
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, fake_database):
+        cache = DirectoryCache(ttl=30, max_entries=10)
+        await cache.get_company("Acme Health LLC")
+
+        later = directory_cache_module.time.monotonic() + 60
+        with patch.object(directory_cache_module.time, "monotonic", return_value=later):
+            await cache.get_company("Acme Health LLC")
+
+        assert fake_database.company.find_one.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_bound_and_disabled(self, fake_database):
+        cache = DirectoryCache(ttl=60, max_entries=2)
+        for name in ("a", "b", "c"):
+            await cache.get_company(name)
+        assert [key[1] for key in cache._entries] == ["b", "c"]
+
+        disabled = DirectoryCache(ttl=0, max_entries=10)
+        await disabled.get_company("a")
+        assert len(disabled._entries) == 0
+
+
+class TestInvalidation:
+    """Test invalidation from write endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_one_company(self, fake_database):
+        cache = DirectoryCache(ttl=60, max_entries=10)
+        await cache.get_company_user("Acme Health LLC", "john@acme.com", "John")
+        await cache.get_company_user("Globex", "jane@globex.com", "Jane")
+        await cache.get_company("Acme Health LLC")
+
+        cache.invalidate_users("Acme Health LLC")
+
+        assert sorted(key[:2] for key in cache._entries) == [("company", "Acme Health LLC"), ("company_users", "Globex")]
+
+    @pytest.mark.asyncio
+    async def test_lookup_racing_invalidation_not_stored(self, fake_database):
+        cache = DirectoryCache(ttl=60, max_entries=10)
+        release = asyncio.Event()
+
+        async def slow_find_one(query):
+            await release.wait()
+            return dict(ACME)
+
+        fake_database.company.find_one.side_effect = slow_find_one
+        lookup = asyncio.ensure_future(cache.get_company("Acme Health LLC"))
+        await asyncio.sleep(0)
+        cache.invalidate_company("Acme Health LLC")
+        release.set()
+
+        assert (await lookup)["company_name"] == "Acme Health LLC"
+        assert len(cache._entries) == 0
+
+
+class TestChangeStream:
+    """Test invalidation from changes made by other workers."""
+
+    @pytest.mark.asyncio
+    async def test_change_event_clears_collection(self, fake_database):
+        cache = DirectoryCache(ttl=60, max_entries=10)
+        changes = asyncio.Queue()
+        fake_database.db = SimpleNamespace(watch=lambda pipeline: FakeChangeStream(changes))
+        cache.start_change_stream()
+        await asyncio.sleep(0)
+        await cache.get_company("Acme Health LLC")
+        await cache.get_company_user("Acme Health LLC", "john@acme.com", "John")
+
+        changes.put_nowait({"ns": {"db": "translation", "coll": "company_users"}})
+        await asyncio.sleep(0.01)
+        await cache.stop_change_stream()
+
+        assert [key[0] for key in cache._entries] == ["company"]
+
+    @pytest.mark.asyncio
+    async def test_login_only_update_keeps_entries(self, fake_database):
+        cache = DirectoryCache(ttl=60, max_entries=10)
+        changes = asyncio.Queue()
+        fake_database.db = SimpleNamespace(watch=lambda pipeline: FakeChangeStream(changes))
+        cache.start_change_stream()
+        await asyncio.sleep(0)
+        await cache.get_company_user("Acme Health LLC", "john@acme.com", "John")
+
+        changes.put_nowait({
+            "operationType": "update",
+            "ns": {"db": "translation", "coll": "company_users"},
+            "updateDescription": {"updatedFields": {"last_login": 1, "updated_at": 1}, "removedFields": []},
+        })
+        await asyncio.sleep(0.01)
+        assert [key[0] for key in cache._entries] == ["company_users"]
+
+        changes.put_nowait({
+            "operationType": "update",
+            "ns": {"db": "translation", "coll": "company_users"},
+            "updateDescription": {"updatedFields": {"status": "inactive", "updated_at": 1}, "removedFields": []},
+        })
+        await asyncio.sleep(0.01)
+        await cache.stop_change_stream()
+
+        assert len(cache._entries) == 0
+
+
+class TestLoginFreshness:
+    """Test that login does not trust cached credentials."""
+
+    @pytest.mark.asyncio
+    async def test_deactivated_user_rejected_despite_cached_entry(self, fake_database):
+        cache = DirectoryCache(ttl=60, max_entries=10)
+        fake_database.company_users.find_one.return_value = {**JOHN, "_id": "oid_1", "status": "active"}
+        await cache.get_company_user("Acme Health LLC", "john@acme.com", "John")
+
+        # Deactivated on another worker: the cached entry still says active
+        fresh = AsyncMock(return_value={"_id": "oid_1", "status": "inactive", "password_hash": "$2b$04$x"})
+        auth_database = SimpleNamespace(is_connected=True, company_users=SimpleNamespace(find_one=fresh))
+
+        with patch.object(auth_service_module, "directory_cache", cache), \
+                patch.object(auth_service_module, "database", auth_database):
+            with pytest.raises(AuthenticationError, match="not active"):
+                await AuthService().authenticate_user("Acme Health LLC", "secret123", "John", "john@acme.com")
+
+        fresh.assert_awaited_once_with({"_id": "oid_1"}, {"status": 1, "password_hash": 1})
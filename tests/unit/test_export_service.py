@@ -0,0 +1,231 @@
+"""
+Unit tests for streaming exports.
+
+Tests cover:
+- Field selection and filter/date-range query building
+- One cursor per export, with projection, _id order and batch size
+- NDJSON and CSV encoding, flushed in chunks as rows arrive
+- Legacy user transaction field names read into the current columns
+- Invalid formats/fields are rejected before streaming starts
+"""
+
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from fastapi import HTTPException
+
+from app.services.export_service import EXPORT_SPECS, ExportService
+
+WHEN = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class _Cursor:
+    """Chainable async cursor over a fixed document list."""
+
+    def __init__(self, documents):
+        self._documents = list(documents)
+        self.sort_args = None
+        self.batch = None
+
+    def sort(self, *args):
+        self.sort_args = args
+        return self
+
+    def batch_size(self, size):
+        self.batch = size
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self._documents:
+            yield document
+
+
+def _service(documents):
+    cursor = _Cursor(documents)
+    collection = MagicMock()
+    collection.find = MagicMock(return_value=cursor)
+    db = MagicMock()
+    db.__getitem__ = MagicMock(return_value=collection)
+    return ExportService(db), db, collection, cursor
+
+
+async def _body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+async def _generate(documents):
+    for document in documents:
+        yield document
+
+
+class TestQueryBuilding:
+    """Test field resolution and filters."""
+
+    def test_default_fields_are_all_exportable_fields(self):
+        assert ExportService(MagicMock()).resolve_fields("payments") == list(EXPORT_SPECS["payments"].fields)
+
+    def test_field_subset_and_unknown_field(self):
+        service = ExportService(MagicMock())
+        assert service.resolve_fields("invoices", "invoice_number, total_amount") == ["invoice_number", "total_amount"]
+        with pytest.raises(ValueError):
+            service.resolve_fields("invoices", "invoice_number,line_items")
+
+    def test_filters_map_to_document_fields(self):
+        query = ExportService(MagicMock()).build_query(
+            "payments",
+            {"status": "COMPLETED", "company_name": None},
+            date_from=WHEN
+        )
+        assert query == {"payment_status": "COMPLETED", "payment_date": {"$gte": WHEN}}
+
+    def test_unsupported_filter(self):
+        with pytest.raises(ValueError):
+            ExportService(MagicMock()).build_query("invoices", {"user_email": "a@b.com"})
+
+
+class TestStreaming:
+    """Test NDJSON/CSV streaming."""
+
+    @pytest.mark.asyncio
+    async def test_ndjson_uses_one_cursor_with_batch_size(self):
+        documents = [
+            {"_id": ObjectId(), "invoice_number": f"INV-{i}", "total_amount": Decimal128("10.50")}
+            for i in range(5)
+        ]
+        service, db, collection, cursor = _service(documents)
+
+        response = service.streaming_response(
+            "invoices", "ndjson", filters={"company_name": "Acme"}, fields="_id,invoice_number,total_amount",
+            batch_size=2
+        )
+        body = await _body(response)
+
+        db.__getitem__.assert_called_once_with("invoices")
+        collection.find.assert_called_once_with(
+            {"company_name": "Acme"}, {"_id": 1, "invoice_number": 1, "total_amount": 1}
+        )
+        assert cursor.batch == 2
+        assert cursor.sort_args == ("_id", 1)
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        assert [line["invoice_number"] for line in lines] == [f"INV-{i}" for i in range(5)]
+        assert lines[0]["total_amount"] == 10.5
+        assert response.media_type == "application/x-ndjson"
+        assert response.headers["content-disposition"].startswith('attachment; filename="invoices_')
+
+    @pytest.mark.asyncio
+    async def test_id_excluded_unless_requested(self):
+        service, _, collection, _ = _service([])
+
+        await _body(service.streaming_response("payments", "csv", fields="amount"))
+
+        assert collection.find.call_args.args[1] == {"amount": 1, "_id": 0}
+
+    @pytest.mark.asyncio
+    async def test_csv_rows(self):
+        documents = [{
+            "_id": ObjectId("507f1f77bcf86cd799439011"),
+            "invoice_number": "INV-1",
+            "invoice_date": WHEN,
+            "billing_period": {"period_start": WHEN},
+            "amount_paid": None,
+        }]
+        service, _, _, _ = _service(documents)
+
+        response = service.streaming_response(
+            "invoices", "csv", fields="_id,invoice_number,invoice_date,billing_period,amount_paid"
+        )
+        rows = list(csv.reader(io.StringIO((await _body(response)).decode())))
+
+        assert rows[0] == ["_id", "invoice_number", "invoice_date", "billing_period", "amount_paid"]
+        assert rows[1] == [
+            "507f1f77bcf86cd799439011",
+            "INV-1",
+            "2025-03-01T12:00:00+00:00",
+            '{"period_start":"2025-03-01T12:00:00+00:00"}',
+            "",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_user_transaction_stored_and_legacy_field_names(self):
+        documents = [
+            # Shape written by create_user_transaction
+            {"transaction_id": "USER000001", "number_of_units": 3, "cost_per_unit": 0.1, "total_cost": 0.3},
+            # Older record
+            {"transaction_id": "USER000002", "units_count": 5, "price_per_unit": 0.2, "total_price": 1.0},
+        ]
+        service, _, collection, _ = _service(documents)
+
+        response = service.streaming_response(
+            "user_transactions", "csv", fields="transaction_id,number_of_units,cost_per_unit,total_cost"
+        )
+        rows = list(csv.reader(io.StringIO((await _body(response)).decode())))
+
+        assert collection.find.call_args.args[1] == {
+            "transaction_id": 1, "number_of_units": 1, "cost_per_unit": 1, "total_cost": 1,
+            "price_per_unit": 1, "total_price": 1, "units_count": 1, "_id": 0,
+        }
+        assert rows == [
+            ["transaction_id", "number_of_units", "cost_per_unit", "total_cost"],
+            ["USER000001", "3", "0.1", "0.3"],
+            ["USER000002", "5", "0.2", "1.0"],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rows_flushed_in_chunks(self):
+        service = ExportService(MagicMock())
+        documents = [{"n": i} for i in range(7)]
+
+        ndjson_chunks = [chunk async for chunk in service.iter_ndjson(_generate(documents), chunk_rows=3)]
+        csv_chunks = [chunk async for chunk in service.iter_csv(_generate(documents), ["n"], chunk_rows=3)]
+
+        assert len(ndjson_chunks) == 3
+        assert ndjson_chunks[0] == b'{"n":0}\n{"n":1}\n{"n":2}\n'
+        assert len(csv_chunks) == 3
+        assert csv_chunks[-1] == b"6\r\n"
+
+    def test_unknown_format_rejected_before_streaming(self):
+        service, _, collection, _ = _service([])
+
+        with pytest.raises(ValueError):
+            service.streaming_response("payments", "xlsx")
+        collection.find.assert_not_called()
+
+
+class TestExportRoutes:
+    """Test the export endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_invalid_field_is_400(self):
+        from app.routers.payments import export_payments
+
+        with pytest.raises(HTTPException) as exc_info:
+            await export_payments(
+                admin_user={"email": "admin@example.com"}, export_format="csv", status_filter=None,
+                company_name=None, date_from=None, date_to=None, fields="password_hash"
+            )
+
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_export_route_streams(self):
+        from app.routers.user_transactions import export_user_transactions
+
+        service, _, collection, _ = _service([{"transaction_id": "USER000001", "status": "completed"}])
+
+        with patch("app.routers.user_transactions.export_service", service):
+            response = await export_user_transactions(
+                admin_user={"email": "admin@example.com"}, export_format="ndjson", status_filter="completed",
+                user_email=None, date_from=None, date_to=None, fields="transaction_id,status"
+            )
+            body = await _body(response)
+
+        assert collection.find.call_args.args[0] == {"status": "completed"}
+        assert json.loads(body) == {"transaction_id": "USER000001", "status": "completed"}
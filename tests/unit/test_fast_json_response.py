@@ -0,0 +1,178 @@
+"""
+Contract tests for FastJSONResponse.
+
+Routes that switched to FastJSONResponse return raw MongoDB documents; the
+response body must be byte-identical to the previous
+JSONResponse(content=serialize_for_json(...)) output.
+
+Tests cover:
+- Byte-identical bodies for translation transaction, payment, invoice and
+  user transaction list payloads
+- The known float-exponent difference (documented in app/utils/responses.py)
+- List routes return FastJSONResponse with raw documents
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from fastapi.responses import JSONResponse
+
+from app.utils.responses import FastJSONResponse
+from app.utils.serialization import serialize_for_json
+
+NOW = datetime(2025, 10, 26, 13, 15, 10, 913000, tzinfo=timezone.utc)
+
+
+def _translation_transaction(i):
+    return {
+        "_id": ObjectId(),
+        "transaction_id": f"TXN-{i:010X}",
+        "user_id": "user@example.com",
+        "company_name": "Iris Trading",
+        "source_language": "en",
+        "target_language": "fr",
+        "units_count": 33,
+        "price_per_unit": Decimal128("0.01"),
+        "total_price": Decimal128("0.33"),
+        "status": "started",
+        "subscription_id": ObjectId(),
+        "created_at": NOW - timedelta(hours=i),
+        "updated_at": NOW,
+        "documents": [{
+            "file_name": "Übersicht — TCG.docx",
+            "file_size": 838186,
+            "original_url": "https://docs.google.com/document/d/1ABCdef123/edit",
+            "translated_url": None,
+            "status": "uploaded",
+            "uploaded_at": NOW,
+        }],
+    }
+
+
+def _payment(i):
+    return {
+        "_id": ObjectId(),
+        "company_name": "Acme Health LLC",
+        "user_email": "billing@acme.com",
+        "stripe_payment_intent_id": f"pi_{i}",
+        "amount": 1299,
+        "currency": "USD",
+        "payment_status": "REFUNDED" if i % 2 else "COMPLETED",
+        "refunds": [{"refund_id": f"re_{i}", "amount": 500, "created_at": NOW}] if i % 2 else [],
+        "payment_date": NOW,
+        "created_at": datetime(2025, 10, 1, 8, 0),  # naive datetime
+        "updated_at": NOW,
+    }
+
+
+def _invoice(i):
+    return {
+        "_id": ObjectId(),
+        "invoice_number": f"INV-2025-{i:04d}",
+        "company_name": "Acme Health LLC",
+        "subscription_id": str(ObjectId()),
+        "invoice_date": NOW,
+        "due_date": NOW + timedelta(days=30),
+        "total_amount": Decimal128("106.00"),
+        "tax_amount": Decimal128("6.00"),
+        "amount_paid": 0.0,
+        "status": "sent",
+        "line_items": [{"description": "Base Subscription", "quantity": 1, "amount": Decimal128("100.00")}],
+        "billing_period": {"period_start": NOW, "period_end": NOW + timedelta(days=30)},
+    }
+
+
+PAYLOADS = {
+    "translation_transactions": [_translation_transaction(i) for i in range(100)],
+    "payments": [_payment(i) for i in range(100)],
+    "invoices": [_invoice(i) for i in range(100)],
+}
+
+
+def _legacy_body(content):
+    return JSONResponse(content=serialize_for_json(content)).body
+
+
+class TestByteIdenticalOutput:
+    """FastJSONResponse(raw) == JSONResponse(serialize_for_json(raw))."""
+
+    @pytest.mark.parametrize("name", sorted(PAYLOADS))
+    def test_list_payload(self, name):
+        content = {
+            "success": True,
+            "data": {name: PAYLOADS[name], "count": 100, "limit": 100, "skip": 0, "filters": {"status": None}},
+        }
+
+        assert FastJSONResponse(content=content).body == _legacy_body(content)
+
+    def test_headers_match(self):
+        fast = FastJSONResponse(content={"a": 1})
+        legacy = JSONResponse(content={"a": 1})
+
+        assert fast.media_type == legacy.media_type
+        assert fast.headers["content-type"] == legacy.headers["content-type"]
+        assert fast.headers["content-length"] == legacy.headers["content-length"]
+
+    def test_small_float_exponent_differs(self):
+        # Known, documented difference; money values never hit it
+        assert FastJSONResponse(content=1e-7).body == b"1e-7"
+        assert JSONResponse(content=1e-7).body == b"1e-07"
+
+
+class TestListRoutes:
+    """List routes encode raw documents with FastJSONResponse."""
+
+    @pytest.mark.asyncio
+    async def test_company_translation_transactions(self):
+        from app.routers.translation_transactions import get_company_translation_transactions
+
+        documents = PAYLOADS["translation_transactions"][:3]
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[dict(document) for document in documents])
+        db = MagicMock()
+        db.translation_transactions.aggregate = MagicMock(return_value=cursor)
+
+        with patch("app.routers.translation_transactions.database", db):
+            response = await get_company_translation_transactions(
+                request=MagicMock(), company_name="Iris Trading", status_filter=None, limit=50, skip=0
+            )
+
+        assert isinstance(response, FastJSONResponse)
+        body = json.loads(response.body)
+        assert body["data"]["transactions"] == serialize_for_json(documents)
+
+    @pytest.mark.asyncio
+    async def test_user_transactions_keep_api_field_names(self):
+        from app.routers.user_transactions import (
+            get_user_transaction_history,
+            serialize_transaction_for_json,
+        )
+
+        document = {
+            "_id": ObjectId(),
+            "transaction_id": "USER123456",
+            "user_email": "jane@example.com",
+            "units_count": 4,
+            "price_per_unit": Decimal128("0.10"),
+            "total_price": Decimal128("0.40"),
+            "status": "completed",
+            "date": NOW,
+        }
+        legacy = serialize_transaction_for_json(document)
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[dict(document)])
+        db = MagicMock()
+        db.user_transactions.aggregate = MagicMock(return_value=cursor)
+
+        # The route imports the database handle locally
+        with patch("app.database.mongodb.database", db):
+            response = await get_user_transaction_history(
+                request=MagicMock(), email="jane@example.com", status_filter=None, limit=50, skip=0
+            )
+
+        assert isinstance(response, FastJSONResponse)
+        transaction = json.loads(response.body)["data"]["transactions"][0]
+        assert json.dumps(transaction) == json.dumps(legacy)
@@ -0,0 +1,188 @@
+"""
+Unit tests for hash-checked index management.
+
+Tests cover:
+- Spec hashes are stable and change with the spec or INDEX_SPECS_VERSION
+- Only collections whose stored hash differs are built
+- Builds record the spec hash in index_versions
+- The build lease lock and the non-blocking startup path
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from app.database import indexes
+from app.database.indexes import (
+    INDEX_SPECS,
+    INDEX_SPECS_VERSION,
+    IndexManager,
+    compute_spec_hash,
+)
+
+
+class _AsyncCursor:
+    def __init__(self, documents):
+        self._documents = list(documents)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self._documents:
+            yield document
+
+
+def _mock_database(stored_hashes=None):
+    versions = MagicMock()
+    versions.find = MagicMock(side_effect=lambda *args, **kwargs: _AsyncCursor(
+        {"_id": name, "hash": value} for name, value in (stored_hashes or {}).items()
+    ))
+    versions.find_one_and_update = AsyncMock()
+    versions.update_one = AsyncMock()
+    versions.delete_one = AsyncMock()
+
+    collections = {}
+
+    def _collection(name):
+        if name == indexes.INDEX_VERSIONS_COLLECTION:
+            return versions
+        if name not in collections:
+            collection = MagicMock()
+            collection.create_indexes = AsyncMock()
+            collection.drop_index = AsyncMock()
+            collection.list_indexes = MagicMock(return_value=_AsyncCursor([]))
+            collections[name] = collection
+        return collections[name]
+
+    db = MagicMock()
+    db.__getitem__ = MagicMock(side_effect=_collection)
+    return db, versions, collections
+
+
+def _current_hashes():
+    return {collection: compute_spec_hash(collection) for collection in INDEX_SPECS}
+
+
+class TestSpecHash:
+    """Test compute_spec_hash."""
+
+    def test_hash_is_stable(self):
+        assert compute_spec_hash("payments") == compute_spec_hash("payments")
+        assert compute_spec_hash("payments") != compute_spec_hash("invoices")
+
+    def test_hash_changes_with_version(self):
+        assert compute_spec_hash("payments", INDEX_SPECS_VERSION + 1) != compute_spec_hash("payments")
+
+    def test_hash_changes_with_spec(self):
+        before = compute_spec_hash("invoices")
+        changed = INDEX_SPECS["invoices"] + [IndexModel([("paid_at", ASCENDING)], name="paid_at_idx")]
+
+        with patch.dict(INDEX_SPECS, {"invoices": changed}):
+            assert compute_spec_hash("invoices") != before
+        assert compute_spec_hash("invoices") == before
+
+
+class TestIndexManagerSync:
+    """Test IndexManager pending detection and builds."""
+
+    @pytest.mark.asyncio
+    async def test_pending_skips_matching_hashes(self):
+        stored = _current_hashes()
+        stored["payments"] = "stale"
+        del stored["invoices"]
+        db, _, _ = _mock_database(stored)
+
+        pending = await IndexManager(db).pending_collections()
+
+        assert sorted(pending) == ["invoices", "payments"]
+
+    @pytest.mark.asyncio
+    async def test_sync_builds_pending_and_records_hash(self):
+        stored = _current_hashes()
+        stored["payments"] = "stale"
+        db, versions, collections = _mock_database(stored)
+
+        results = await IndexManager(db).sync()
+
+        assert results == {"payments": True}
+        collections["payments"].create_indexes.assert_awaited_once_with(INDEX_SPECS["payments"])
+        query, update = versions.update_one.await_args.args
+        assert query == {"_id": "payments"}
+        assert update["$set"]["hash"] == compute_spec_hash("payments")
+
+    @pytest.mark.asyncio
+    async def test_conflict_drops_and_retries(self):
+        db, versions, collections = _mock_database()
+        collection = db["invoices"]
+        collection.create_indexes.side_effect = [
+            OperationFailure("Index already exists with a different name", code=85),
+            None,
+        ]
+        collection.list_indexes.return_value = _AsyncCursor([
+            {"name": "idx_invoice_number", "key": {"invoice_number": 1}, "unique": True, "v": 2},
+        ])
+
+        manager = IndexManager(db)
+        results = await manager.sync(["invoices"], force=True)
+
+        assert results == {"invoices": True}
+        collection.drop_index.assert_any_await("idx_invoice_number")
+        assert collection.create_indexes.await_count == 2
+        assert manager.status["state"] == "ready"
+
+    @pytest.mark.asyncio
+    async def test_failed_collection_does_not_record_hash(self):
+        db, versions, collections = _mock_database()
+        db["invoices"].create_indexes.side_effect = OperationFailure("boom", code=2)
+
+        manager = IndexManager(db)
+        results = await manager.sync(["invoices"], force=True)
+
+        assert results == {"invoices": False}
+        versions.update_one.assert_not_awaited()
+        assert manager.status["failed"] == ["invoices"]
+
+
+class TestBackgroundSync:
+    """Test the startup path."""
+
+    @pytest.mark.asyncio
+    async def test_lock_held_by_other_worker(self):
+        db, versions, _ = _mock_database()
+        versions.find_one_and_update.side_effect = DuplicateKeyError("E11000")
+
+        assert await IndexManager(db).acquire_lock() is False
+
+    @pytest.mark.asyncio
+    async def test_unchanged_specs_skip_lock_and_build(self):
+        db, versions, collections = _mock_database(_current_hashes())
+
+        manager = IndexManager(db)
+        await manager.start_background_sync()
+
+        versions.find_one_and_update.assert_not_awaited()
+        assert collections == {}
+        assert manager.status["state"] == "ready"
+
+    @pytest.mark.asyncio
+    async def test_start_does_not_wait_for_build(self):
+        db, _, _ = _mock_database()
+        release = asyncio.Event()
+        manager = IndexManager(db)
+
+        async def slow_sync(*args, **kwargs):
+            await release.wait()
+            return {}
+
+        with patch.object(manager, "sync", side_effect=slow_sync):
+            task = manager.start_background_sync()
+            await asyncio.sleep(0)
+            assert not task.done()
+
+            release.set()
+            await task
+
+        assert manager.status["state"] == "checking"
@@ -0,0 +1,150 @@
+"""
+Unit tests for list-view projections and summary read models.
+
+Tests cover:
+- projection_for() uses aliases and expands nested (list) models
+- Summary projections omit heavy/sensitive fields
+- List endpoints pass the summary projection to MongoDB
+"""
+
+import json
+import pytest
+from datetime import datetime, timezone
+from typing import List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from pydantic import BaseModel, Field
+
+from app.models.company import COMPANY_SUMMARY_PROJECTION
+from app.models.company_user_models import COMPANY_USER_RESPONSE_PROJECTION
+from app.models.invoice import INVOICE_SUMMARY_PROJECTION
+from app.models.translation_transaction import TRANSLATION_TRANSACTION_SUMMARY_PROJECTION
+from app.models.user_transaction import USER_TRANSACTION_SUMMARY_PROJECTION
+from app.utils.projection import projection_for
+
+
+class _Item(BaseModel):
+    name: str
+    size: int = 0
+
+
+class _Record(BaseModel):
+    id: str = Field(..., alias="_id")
+    title: str
+    items: List[_Item] = Field(default_factory=list)
+    parent: Optional[_Item] = None
+
+
+def _find_cursor(documents):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=documents)
+    return cursor
+
+
+class TestProjectionFor:
+    """Test projection_for()."""
+
+    def test_aliases_and_nested_models(self):
+        assert projection_for(_Record) == {
+            "_id": 1,
+            "title": 1,
+            "items.name": 1,
+            "items.size": 1,
+            "parent.name": 1,
+            "parent.size": 1,
+        }
+
+    def test_extra_fields(self):
+        assert projection_for(_Item, extra_fields=("legacy_name",)) == {
+            "name": 1, "size": 1, "legacy_name": 1
+        }
+
+
+class TestSummaryProjections:
+    """Test that summary projections leave out detail-only fields."""
+
+    def test_translation_transaction_documents_are_trimmed(self):
+        assert TRANSLATION_TRANSACTION_SUMMARY_PROJECTION["documents.file_name"] == 1
+        assert "documents" not in TRANSLATION_TRANSACTION_SUMMARY_PROJECTION
+        assert "documents.file_id" not in TRANSLATION_TRANSACTION_SUMMARY_PROJECTION
+        assert "documents.processing_started_at" not in TRANSLATION_TRANSACTION_SUMMARY_PROJECTION
+
+    def test_user_transaction_omits_refunds_and_keeps_legacy_names(self):
+        assert "refunds" not in USER_TRANSACTION_SUMMARY_PROJECTION
+        assert "stripe_payment_intent_id" not in USER_TRANSACTION_SUMMARY_PROJECTION
+        assert USER_TRANSACTION_SUMMARY_PROJECTION["units_count"] == 1
+        assert USER_TRANSACTION_SUMMARY_PROJECTION["number_of_units"] == 1
+
+    def test_invoice_omits_line_items(self):
+        assert "line_items" not in INVOICE_SUMMARY_PROJECTION
+        assert "payment_applications" not in INVOICE_SUMMARY_PROJECTION
+        assert INVOICE_SUMMARY_PROJECTION["billing_period.period_start"] == 1
+
+    def test_company_user_never_fetches_password(self):
+        assert COMPANY_USER_RESPONSE_PROJECTION["_id"] == 0
+        assert "password_hash" not in COMPANY_USER_RESPONSE_PROJECTION
+        assert COMPANY_USER_RESPONSE_PROJECTION["email"] == 1
+
+
+class TestListEndpointsUseProjections:
+    """Test that list endpoints query with the summary projection."""
+
+    @pytest.mark.asyncio
+    async def test_get_all_companies(self):
+        from app.routers.companies import get_all_companies
+
+        db = MagicMock()
+        db.company.find = MagicMock(return_value=_find_cursor([
+            {"_id": ObjectId(), "company_name": "Acme", "created_at": datetime.now(timezone.utc)}
+        ]))
+        db.company.aggregate = MagicMock(return_value=_find_cursor([]))
+        request = MagicMock()
+        request.headers = {}
+
+        with patch("app.routers.companies.database", db):
+            response = await get_all_companies(request)
+
+        db.company.find.assert_called_once_with({}, COMPANY_SUMMARY_PROJECTION)
+        body = json.loads(response.body)
+        assert body["data"]["companies"][0]["company_name"] == "Acme"
+
+    @pytest.mark.asyncio
+    async def test_get_company_users(self):
+        from app.routers.company_users import get_company_users
+
+        db = MagicMock()
+        db.company_users.find = MagicMock(return_value=_find_cursor([{
+            "user_id": "user_1",
+            "company_name": "Acme",
+            "user_name": "Jane",
+            "email": "jane@acme.com",
+            "permission_level": "user",
+            "status": "active",
+            "created_at": datetime.now(timezone.utc),
+        }]))
+
+        with patch("app.routers.company_users.database", db):
+            users = await get_company_users(company_name=None)
+
+        db.company_users.find.assert_called_once_with({}, COMPANY_USER_RESPONSE_PROJECTION)
+        assert users[0].email == "jane@acme.com"
+
+    @pytest.mark.asyncio
+    async def test_list_invoices(self):
+        from app.routers.invoices import list_invoices
+
+        db = MagicMock()
+        db.analytics.invoices.find = MagicMock(return_value=_find_cursor([{
+            "_id": ObjectId(),
+            "invoice_number": "INV-1",
+            "company_name": "Acme",
+            "invoice_date": datetime.now(timezone.utc),
+            "total_amount": 10.0,
+        }]))
+
+        with patch("app.routers.invoices.database", db):
+            response = await list_invoices(admin={})
+
+        db.analytics.invoices.find.assert_called_once_with({}, INVOICE_SUMMARY_PROJECTION)
+        body = json.loads(response.body)
+        assert body[0]["invoice_id"] == "INV-1"
@@ -0,0 +1,251 @@
+"""
+Unit tests for the metrics subsystem.
+
+Tests cover:
+- Counter / Histogram / CallbackMetric text exposition
+- /metrics scrape allowlist and token
+- HTTP middleware route templates
+- Mongo command listener, Drive call timing, SMTP sessions, Stripe client
+- Event loop lag sampling and blocking detection
+"""
+
+import asyncio
+import ipaddress
+import os
+import time
+import traceback
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database.command_metrics import CommandMetricsListener
+from app.middleware.metrics import MetricsMiddleware
+from app.services.email_service import EmailService
+from app.services.google_drive_service import observe_drive_call
+from app.utils import metrics
+from app.utils.loop_monitor import LoopLagMonitor, blocking_site
+from app.utils.metrics import CallbackMetric, Counter, Histogram, Registry, scrape_allowed
+from app.utils.stripe_metrics import instrument_stripe, stripe_endpoint
+
+
+def _count(histogram, *labels):
+    return sum(histogram.labels(*labels).counts)
+
+
+class TestExposition:
+    """Test the text format."""
+
+    def test_counter_and_histogram(self):
+        registry = Registry()
+        requests = Counter("requests_total", "Requests", ["route"], registry=registry)
+        latency = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0), registry=registry)
+
+        requests.labels('/a"b').inc()
+        requests.labels('/a"b').inc(2)
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        assert registry.render().splitlines() == [
+            "# HELP requests_total Requests",
+            "# TYPE requests_total counter",
+            'requests_total{route="/a\\"b"} 3',
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 3.65",
+            "latency_seconds_count 4",
+        ]
+
+    def test_callback_metric(self):
+        registry = Registry()
+        CallbackMetric("queue_depth", "Depth", ["path"], lambda: [(("ingest",), 3)], registry=registry)
+
+        assert 'queue_depth{path="ingest"} 3' in registry.render()
+
+    def test_label_count_checked(self):
+        counter = Counter("checked_total", "Checked", ["a", "b"], registry=None)
+
+        with pytest.raises(ValueError):
+            counter.labels("only-one")
+
+    def test_duplicate_name_rejected(self):
+        registry = Registry()
+        Counter("dup_total", "Dup", registry=registry)
+
+        with pytest.raises(ValueError):
+            Counter("dup_total", "Dup", registry=registry)
+
+
+class TestScrapeAccess:
+    """Test who may read /metrics."""
+
+    NETWORKS = [ipaddress.ip_network("127.0.0.1"), ipaddress.ip_network("10.0.0.0/8")]
+
+    def test_allowlisted_peer(self):
+        assert scrape_allowed("127.0.0.1", None, self.NETWORKS)
+        assert scrape_allowed("10.1.2.3", None, self.NETWORKS)
+
+    def test_other_peer_refused(self):
+        assert not scrape_allowed("203.0.113.7", None, self.NETWORKS)
+        assert not scrape_allowed(None, None, self.NETWORKS)
+        assert not scrape_allowed("testclient", None, self.NETWORKS)
+
+    def test_token_allows_any_peer(self):
+        assert scrape_allowed("203.0.113.7", "Bearer s3cret", self.NETWORKS, token="s3cret")
+        assert not scrape_allowed("203.0.113.7", "Bearer wrong", self.NETWORKS, token="s3cret")
+
+    def test_empty_token_never_matches(self):
+        assert not scrape_allowed("203.0.113.7", "Bearer ", self.NETWORKS, token="")
+
+
+class TestMetricsMiddleware:
+    """Test HTTP request metrics."""
+
+    def test_route_template_label(self):
+        app = FastAPI()
+
+        @app.get("/api/v1/metrics-test/{item_id}")
+        async def item(item_id: str):
+            return {"id": item_id}
+
+        app.add_middleware(MetricsMiddleware, enabled=True)
+        client = TestClient(app)
+        before = metrics.HTTP_REQUESTS.labels("GET", "/api/v1/metrics-test/{item_id}", "200").value
+        unmatched = metrics.HTTP_REQUESTS.labels("GET", "unmatched", "404").value
+
+        client.get("/api/v1/metrics-test/1")
+        client.get("/api/v1/metrics-test/2")
+        client.get("/no-such-route")
+
+        assert metrics.HTTP_REQUESTS.labels("GET", "/api/v1/metrics-test/{item_id}", "200").value == before + 2
+        assert metrics.HTTP_REQUESTS.labels("GET", "unmatched", "404").value == unmatched + 1
+        assert _count(metrics.HTTP_REQUEST_SECONDS, "GET", "/api/v1/metrics-test/{item_id}") >= 2
+
+
+class TestInstrumentation:
+    """Test the per-dependency instrumentation."""
+
+    def test_mongo_command_listener(self):
+        listener = CommandMetricsListener("oltp")
+        before = _count(metrics.MONGO_COMMAND_SECONDS, "oltp", "find")
+        failures = metrics.MONGO_COMMAND_FAILURES.labels("oltp", "find").value
+
+        listener.succeeded(SimpleNamespace(command_name="find", duration_micros=2500))
+        listener.failed(SimpleNamespace(command_name="find", duration_micros=900, failure={"codeName": "Unauthorized"}))
+
+        assert _count(metrics.MONGO_COMMAND_SECONDS, "oltp", "find") == before + 2
+        assert metrics.MONGO_COMMAND_FAILURES.labels("oltp", "find").value == failures + 1
+
+    @pytest.mark.asyncio
+    async def test_drive_call_timing(self):
+        @observe_drive_call
+        async def _upload_file_with_retry():
+            return "file-id"
+
+        @observe_drive_call
+        async def _delete_file_with_retry():
+            raise ConnectionError("reset")
+
+        ok_before = _count(metrics.DRIVE_CALL_SECONDS, "upload_file", "ok")
+        error_before = _count(metrics.DRIVE_CALL_SECONDS, "delete_file", "error")
+
+        assert await _upload_file_with_retry() == "file-id"
+        with pytest.raises(ConnectionError):
+            await _delete_file_with_retry()
+
+        assert _count(metrics.DRIVE_CALL_SECONDS, "upload_file", "ok") == ok_before + 1
+        assert _count(metrics.DRIVE_CALL_SECONDS, "delete_file", "error") == error_before + 1
+
+    def test_smtp_session(self):
+        service = EmailService()
+        smtp = MagicMock()
+        ok_before = _count(metrics.SMTP_SEND_SECONDS, "invoice", "ok")
+        error_before = _count(metrics.SMTP_SEND_SECONDS, "invoice", "error")
+
+        with patch.object(service, "_create_smtp_connection", return_value=smtp):
+            with service._smtp_session("invoice"):
+                pass
+            with pytest.raises(RuntimeError):
+                with service._smtp_session("invoice"):
+                    raise RuntimeError("send failed")
+
+        assert smtp.quit.call_count == 2
+        assert _count(metrics.SMTP_SEND_SECONDS, "invoice", "ok") == ok_before + 1
+        assert _count(metrics.SMTP_SEND_SECONDS, "invoice", "error") == error_before + 1
+
+    def test_stripe_endpoint(self):
+        assert stripe_endpoint("https://api.stripe.com/v1/payment_intents/pi_3Ab9/capture") == \
+            "/v1/payment_intents/{id}/capture"
+        assert stripe_endpoint("https://api.stripe.com/v1/checkout/sessions") == "/v1/checkout/sessions"
+
+    def test_stripe_client_instrumented(self):
+        client = SimpleNamespace(request=MagicMock(return_value=("{}", 200, {})))
+        labels = ("POST", "/v1/customers", "200")
+        before = _count(metrics.STRIPE_REQUEST_SECONDS, *labels)
+
+        with patch("app.utils.stripe_metrics.stripe") as stripe_module:
+            instrumented = instrument_stripe(client)
+            instrument_stripe(client)
+            assert stripe_module.default_http_client is client
+
+        assert instrumented.request("post", "https://api.stripe.com/v1/customers", {}, "a=1") == ("{}", 200, {})
+        assert _count(metrics.STRIPE_REQUEST_SECONDS, *labels) == before + 1
+
+
+class TestLoopLagMonitor:
+    """Test event loop lag sampling."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_shows_as_lag(self):
+        monitor = LoopLagMonitor(interval=0.01)
+        lag = metrics.EVENT_LOOP_LAG_SECONDS.labels()
+        slow = metrics.LAG_BUCKETS.index(0.05) + 1
+        before = sum(lag.counts[slow:])
+
+        monitor.start()
+        await asyncio.sleep(0)
+        time.sleep(0.1)  # Blocks the loop
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        # At least one sample above 50ms
+        assert sum(lag.counts[slow:]) > before
+        assert not monitor.running
+
+    @pytest.mark.asyncio
+    async def test_blocking_callback_is_reported(self, caplog):
+        monitor = LoopLagMonitor(interval=1.0, block_threshold=0.05)
+        stalls = metrics.EVENT_LOOP_BLOCKED_SECONDS.labels()
+        before = sum(stalls.counts)
+
+        monitor.start()
+        await asyncio.sleep(0.05)
+        with caplog.at_level("WARNING", logger="app.utils.loop_monitor"):
+            _blocking_call()
+            await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        assert monitor.blocked_count == 1
+        assert sum(stalls.counts) == before + 1
+        assert metrics.EVENT_LOOP_BLOCKED.labels("test_metrics.py:_blocking_call").value >= 1
+        report = next(record.getMessage() for record in caplog.records if "blocked for" in record.getMessage())
+        assert "in _blocking_call" in report and "time.sleep(0.3)" in report
+
+    def test_blocking_site_prefers_app_frames(self):
+        app_root = os.path.dirname(os.path.dirname(os.path.abspath(metrics.__file__)))
+        stack = [
+            traceback.FrameSummary(os.path.join(app_root, "services", "email_service.py"), 10, "send_email"),
+            traceback.FrameSummary("/usr/lib/python3.12/smtplib.py", 20, "sendmail"),
+        ]
+
+        assert blocking_site(stack) == "app/services/email_service.py:send_email"
+        assert blocking_site(stack[1:]) == "smtplib.py:sendmail"
+
+
+def _blocking_call():
+    time.sleep(0.3)
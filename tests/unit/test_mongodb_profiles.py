@@ -0,0 +1,98 @@
+"""
+Unit tests for MongoDB client profiles.
+
+Tests cover:
+- Profiles are built from settings (pool sizes, read preference, time limit)
+- connect() opens one client per profile
+- get_db() falls back to the OLTP database for unconfigured profiles
+- Reporting queries run on the analytics profile
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.database.mongodb import (
+    ANALYTICS_PROFILE,
+    OLTP_PROFILE,
+    MongoDB,
+    build_client_profiles,
+)
+
+
+class TestBuildClientProfiles:
+    """Test build_client_profiles()."""
+
+    def test_pool_settings_come_from_settings(self):
+        with patch("app.database.mongodb.settings.mongodb_max_pool_size", 80), \
+                patch("app.database.mongodb.settings.mongodb_min_pool_size", 5):
+            profiles = build_client_profiles()
+
+        oltp = profiles[OLTP_PROFILE]
+        assert (oltp.min_pool_size, oltp.max_pool_size) == (5, 80)
+        assert oltp.client_options()["readPreference"] == "primary"
+        assert "timeoutMS" not in oltp.client_options()
+
+    def test_analytics_profile(self):
+        with patch("app.database.mongodb.settings.mongodb_analytics_max_time_ms", 9000):
+            options = build_client_profiles()[ANALYTICS_PROFILE].client_options()
+
+        assert options["readPreference"] == "secondaryPreferred"
+        assert options["timeoutMS"] == 9000
+        assert options["appname"] == "translator-analytics"
+
+    def test_analytics_can_be_disabled(self):
+        with patch("app.database.mongodb.settings.mongodb_analytics_enabled", False):
+            assert list(build_client_profiles()) == [OLTP_PROFILE]
+
+
+class TestMongoDBProfiles:
+    """Test MongoDB client handling per profile."""
+
+    @pytest.mark.asyncio
+    async def test_connect_opens_one_client_per_profile(self):
+        clients = []
+
+        def _client(uri, **options):
+            client = MagicMock()
+            client.options = options
+            client.admin.command = AsyncMock()
+            clients.append(client)
+            return client
+
+        index_manager = MagicMock()
+        index_manager.stop = AsyncMock()
+        mongodb = MongoDB()
+        with patch("app.database.mongodb.AsyncIOMotorClient", side_effect=_client), \
+                patch("app.database.mongodb.IndexManager", return_value=index_manager):
+            assert await mongodb.connect() is True
+
+        assert len(clients) == 2
+        assert mongodb.client is clients[0]
+        assert clients[1].options["readPreference"] == "secondaryPreferred"
+        assert mongodb.analytics is not mongodb.db
+
+        await mongodb.disconnect()
+        for client in clients:
+            client.close.assert_called_once()
+
+    def test_get_db_falls_back_to_oltp(self):
+        mongodb = MongoDB()
+        mongodb.db = MagicMock()
+
+        assert mongodb.get_db(ANALYTICS_PROFILE) is mongodb.db
+        assert mongodb.analytics is mongodb.db
+
+    @pytest.mark.asyncio
+    async def test_payment_stats_use_analytics_profile(self):
+        from app.services.payment_repository import payment_repository
+
+        db = MagicMock()
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[{"total_payments": 2, "total_amount": 500}])
+        db.get_db.return_value.payments.aggregate = MagicMock(return_value=cursor)
+
+        with patch("app.services.payment_repository.database", db):
+            stats = await payment_repository.get_payment_stats_by_company("Acme")
+
+        db.get_db.assert_called_once_with(ANALYTICS_PROFILE)
+        assert stats["total_amount_dollars"] == 5.0
@@ -0,0 +1,103 @@
+"""
+Unit tests for the dedicated bcrypt worker pool.
+
+Tests cover:
+- Hash and verify (72-byte truncation)
+- Cost parsing and transparent rehash
+- Bounded wait queue (429 with Retry-After)
+- Process pool execution
+"""
+
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy, hash_cost
+
+
+@pytest.fixture
+def hasher():
+    password_hasher = PasswordHasher(workers=1, max_waiting=1, rounds=4, executor_type="thread")
+    yield password_hasher
+    password_hasher.shutdown()
+
+
+class TestHashAndVerify:
+    """Test hashing through the pool."""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip(self, hasher):
+        password_hash = await hasher.hash("secret123")
+
+        assert hash_cost(password_hash) == 4
+        assert await hasher.verify("secret123", password_hash)
+        assert not await hasher.verify("wrong", password_hash)
+        assert hasher.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_long_password_truncated(self, hasher):
+        password_hash = await hasher.hash("a" * 100)
+
+        assert await hasher.verify("a" * 72 + "b" * 28, password_hash)
+
+    @pytest.mark.asyncio
+    async def test_invalid_hash_raises(self, hasher):
+        with pytest.raises(ValueError):
+            await hasher.verify("secret123", "not-a-bcrypt-hash")
+
+
+class TestRehash:
+    """Test cost upgrades on login."""
+
+    def test_hash_cost(self):
+        assert hash_cost("$2b$12$" + "a" * 53) == 12
+        assert hash_cost("plaintext") is None
+
+    @pytest.mark.asyncio
+    async def test_rehash_if_needed(self, hasher):
+        old_hash = bcrypt.hashpw(b"secret123", bcrypt.gensalt(5)).decode()
+        current_hash = await hasher.hash("secret123")
+
+        assert await hasher.rehash_if_needed("secret123", current_hash) is None
+        new_hash = await hasher.rehash_if_needed("secret123", old_hash)
+        assert hash_cost(new_hash) == 4
+        assert await hasher.verify("secret123", new_hash)
+
+
+class TestBoundedQueue:
+    """Test rejection once the pool and its queue are full."""
+
+    @pytest.mark.asyncio
+    async def test_busy_rejects_with_retry_after(self, hasher):
+        release = threading.Event()
+        # One call running, one waiting: the queue is full
+        blocked = [asyncio.ensure_future(hasher._run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(PasswordHasherBusy) as exc_info:
+            await hasher.verify("secret123", bcrypt.hashpw(b"secret123", bcrypt.gensalt(4)).decode())
+        # Rehash is skipped rather than rejected
+        assert await hasher.rehash_if_needed("secret123", "$2b$12$" + "a" * 53) is None
+
+        release.set()
+        await asyncio.gather(*blocked)
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+        assert hasher.snapshot()["rejected"] == 2
+        assert hasher.in_flight == 0
+
+
+class TestProcessPool:
+    """Test the default process executor."""
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self):
+        hasher = PasswordHasher(workers=1, max_waiting=1, rounds=4, executor_type="process")
+        try:
+            hasher.start()
+            password_hash = await hasher.hash("secret123")
+            assert await hasher.verify("secret123", password_hash)
+        finally:
+            hasher.shutdown()
@@ -0,0 +1,156 @@
+"""
+Unit tests for the query shape registry and explain plan analysis.
+
+Tests cover:
+- Registry registration and conflicting definitions
+- COLLSCAN / in-memory SORT detection in classic, SBE and sharded plans
+- Equality-Sort-Range index suggestions
+- Every registered shape is served by an index declared in INDEX_SPECS
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from app.database.indexes import INDEX_SPECS
+from app.database.query_shapes import (
+    QueryShape,
+    QueryShapeRegistry,
+    find_plan_problems,
+    format_index_model,
+    load_query_shapes,
+    suggest_index,
+    verify_query_shapes,
+)
+
+
+def _explain(winning_plan):
+    return {"queryPlanner": {"winningPlan": winning_plan}}
+
+
+class TestQueryShapeRegistry:
+    """Test QueryShapeRegistry."""
+
+    def test_register_and_filter_by_collection(self):
+        registry = QueryShapeRegistry()
+        registry.register("payments.by_invoice", "payments", {"invoice_id": "INV-1"})
+        registry.register("invoices.by_number", "invoices", {"invoice_number": "INV-1"})
+
+        assert [s.name for s in registry.shapes("payments")] == ["payments.by_invoice"]
+        assert len(registry.shapes()) == 2
+
+    def test_reregistering_same_shape_is_idempotent(self):
+        registry = QueryShapeRegistry()
+        registry.register("payments.by_invoice", "payments", {"invoice_id": "INV-1"})
+        registry.register("payments.by_invoice", "payments", {"invoice_id": "INV-1"})
+        assert len(registry.shapes()) == 1
+
+    def test_conflicting_definition_raises(self):
+        registry = QueryShapeRegistry()
+        registry.register("payments.by_invoice", "payments", {"invoice_id": "INV-1"})
+        with pytest.raises(ValueError):
+            registry.register("payments.by_invoice", "payments", {"subscription_id": "SUB-1"})
+
+
+class TestFindPlanProblems:
+    """Test explain plan inspection."""
+
+    def test_index_scan_is_ok(self):
+        stages, problems = find_plan_problems(_explain({
+            "stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "invoice_id_idx"}
+        }))
+        assert stages == ["FETCH", "IXSCAN"]
+        assert problems == []
+
+    def test_collscan_detected(self):
+        _, problems = find_plan_problems(_explain({"stage": "COLLSCAN"}))
+        assert problems == ["collection scan (COLLSCAN)"]
+
+    def test_blocking_sort_detected_in_sbe_plan(self):
+        _, problems = find_plan_problems(_explain({
+            "queryPlan": {"stage": "SORT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}
+        }))
+        assert problems == ["in-memory sort (SORT)"]
+
+    def test_sort_merge_is_not_a_blocking_sort(self):
+        _, problems = find_plan_problems(_explain({
+            "stage": "FETCH",
+            "inputStage": {"stage": "SORT_MERGE", "inputStages": [{"stage": "IXSCAN"}, {"stage": "IXSCAN"}]}
+        }))
+        assert problems == []
+
+    def test_sharded_plan(self):
+        _, problems = find_plan_problems(_explain({
+            "stage": "SINGLE_SHARD",
+            "shards": [{"winningPlan": {"stage": "COLLSCAN"}}]
+        }))
+        assert problems == ["collection scan (COLLSCAN)"]
+
+
+class TestSuggestIndex:
+    """Test Equality-Sort-Range index suggestions."""
+
+    def test_equality_then_sort_then_range(self):
+        now = datetime.now(timezone.utc)
+        shape = QueryShape(
+            name="t", collection="translation_transactions",
+            filter={"created_at": {"$gte": now}, "company_name": "Acme", "status": {"$in": ["started"]}},
+            sort=(("updated_at", -1),)
+        )
+        assert suggest_index(shape) == [
+            ("company_name", 1), ("status", 1), ("updated_at", -1), ("created_at", 1)
+        ]
+
+    def test_range_field_used_for_sort_not_repeated(self):
+        now = datetime.now(timezone.utc)
+        shape = QueryShape(
+            name="t", collection="translation_transactions",
+            filter={"company_name": "Acme", "created_at": {"$gte": now}},
+            sort=(("created_at", -1),)
+        )
+        assert suggest_index(shape) == [("company_name", 1), ("created_at", -1)]
+
+    def test_format_index_model(self):
+        shape = QueryShape(name="t", collection="payments", filter={"invoice_id": "INV-1"})
+        from app.database.query_shapes import QueryShapeReport
+        report = QueryShapeReport(shape=shape, suggested_index=suggest_index(shape))
+        assert format_index_model(report) == 'IndexModel([("invoice_id", ASCENDING)], name="invoice_id_idx")'
+
+
+class TestVerifyQueryShapes:
+    """Test verify_query_shapes against a mocked explain command."""
+
+    @pytest.mark.asyncio
+    async def test_reports_suggestion_for_collscan(self):
+        shape = QueryShape(name="payments.by_invoice", collection="payments", filter={"invoice_id": "INV-1"})
+        db = MagicMock()
+        db.command = AsyncMock(return_value=_explain({"stage": "COLLSCAN"}))
+
+        reports = await verify_query_shapes(db, [shape])
+
+        assert not reports[0].ok
+        assert reports[0].suggested_index == [("invoice_id", 1)]
+        command = db.command.await_args
+        assert command.args[0] == "explain"
+        assert command.args[1] == {"find": "payments", "filter": {"invoice_id": "INV-1"}}
+        assert command.kwargs["verbosity"] == "queryPlanner"
+
+
+class TestDeclaredIndexesCoverShapes:
+    """Static check: every registered shape has a declared index with its ESR prefix."""
+
+    def test_every_shape_has_matching_index(self):
+        declared = {
+            collection: [list(model.document["key"].keys()) for model in models]
+            for collection, models in INDEX_SPECS.items()
+        }
+
+        missing = []
+        for shape in load_query_shapes():
+            wanted = [key for key, _ in suggest_index(shape)]
+            if not wanted:
+                continue
+            if not any(keys[:len(wanted)] == wanted for keys in declared.get(shape.collection, [])):
+                missing.append((shape.name, wanted))
+
+        assert missing == []
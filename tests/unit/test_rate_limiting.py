@@ -0,0 +1,246 @@
+"""
+Unit tests for the rate limiter.
+
+Tests cover:
+- Sliding window counter semantics and Retry-After
+- Memory store bound (batched eviction), Redis store (fakeredis) shared across "workers"
+- Pure ASGI middleware: per-route policies, headers, 429, fail-open, client keying
+"""
+
+import json
+import pytest
+import fakeredis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.rate_limiting import (
+    MemoryRateLimitStore,
+    RateLimitMiddleware,
+    RateLimitPolicy,
+    RateLimitStore,
+    RedisRateLimitStore,
+)
+from app.middleware.route_table import RouteTable
+
+POLICY = RateLimitPolicy("test", limit=5, period=60)
+# Start of a window
+T0 = 60 * 1_000_000
+
+
+def _redis_store(server=None):
+    return RedisRateLimitStore(fakeredis.FakeAsyncRedis(server=server or fakeredis.FakeServer()))
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    return MemoryRateLimitStore() if request.param == "memory" else _redis_store()
+
+
+class TestSlidingWindow:
+    """Semantics shared by both stores."""
+
+    @pytest.mark.asyncio
+    async def test_limit_within_window(self, store):
+        results = [await store.hit("client", POLICY, now=T0 + i) for i in range(6)]
+
+        assert [result.allowed for result in results] == [True] * 5 + [False]
+        assert [result.remaining for result in results[:5]] == [4, 3, 2, 1, 0]
+        # Denied in the first window: 55s to the window end, then 12s until
+        # the previous 5 weigh in at 4
+        assert results[5].retry_after == 67
+
+    @pytest.mark.asyncio
+    async def test_previous_window_is_weighted(self, store):
+        for _ in range(5):
+            await store.hit("client", POLICY, now=T0 + 10)
+
+        # Half-way through the next window the previous 5 count as 2.5
+        allowed = [(await store.hit("client", POLICY, now=T0 + 90)).allowed for _ in range(3)]
+
+        assert allowed == [True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_enough(self, store):
+        for _ in range(5):
+            await store.hit("client", POLICY, now=T0)
+        denied = await store.hit("client", POLICY, now=T0 + 70)
+
+        assert not denied.allowed
+        assert (await store.hit("client", POLICY, now=T0 + 70 + denied.retry_after)).allowed
+
+    @pytest.mark.asyncio
+    async def test_denied_requests_are_not_counted(self, store):
+        for _ in range(20):
+            await store.hit("client", POLICY, now=T0)
+
+        # Next window: only the 5 allowed requests weigh in
+        assert (await store.hit("client", POLICY, now=T0 + 60 + 12)).allowed
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self, store):
+        for _ in range(5):
+            await store.hit("a", POLICY, now=T0)
+
+        assert (await store.hit("b", POLICY, now=T0)).allowed
+
+
+class TestStores:
+    """Store-specific behavior."""
+
+    @pytest.mark.asyncio
+    async def test_memory_store_is_bounded(self):
+        store = MemoryRateLimitStore(max_keys=10)
+
+        for i in range(25):
+            await store.hit(f"client{i}", POLICY, now=T0 + i)
+
+        assert len(store) <= 10
+
+    @pytest.mark.asyncio
+    async def test_memory_store_sweeps_finished_windows_first(self):
+        store = MemoryRateLimitStore(max_keys=2)
+        await store.hit("old", POLICY, now=T0)
+        await store.hit("recent", POLICY, now=T0 + 150)
+
+        await store.hit("new", POLICY, now=T0 + 150)
+
+        assert "old" not in store._windows
+        assert "recent" in store._windows
+
+    @pytest.mark.asyncio
+    async def test_memory_store_evicts_in_batches(self):
+        store = MemoryRateLimitStore(max_keys=100)
+        sweeps = 0
+        sweep = store._sweep
+
+        def counting_sweep(now):
+            nonlocal sweeps
+            sweeps += 1
+            sweep(now)
+
+        store._sweep = counting_sweep
+        for i in range(110):
+            await store.hit(f"client{i}", POLICY, now=T0)
+
+        # One full scan trims to 90 entries; the next 10 new clients need none
+        assert sweeps == 1
+        assert len(store) == 100
+        assert "client0" not in store._windows and "client109" in store._windows
+
+    @pytest.mark.asyncio
+    async def test_redis_store_shared_across_workers(self):
+        server = fakeredis.FakeServer()
+        worker_a, worker_b = _redis_store(server), _redis_store(server)
+
+        for _ in range(3):
+            await worker_a.hit("client", POLICY, now=T0)
+        results = [await worker_b.hit("client", POLICY, now=T0) for _ in range(3)]
+
+        assert [result.allowed for result in results] == [True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_redis_keys_expire(self):
+        store = _redis_store()
+
+        await store.hit("client", POLICY, now=T0)
+
+        keys = await store.client.keys("ratelimit:*")
+        assert len(keys) == 1
+        assert 0 < await store.client.ttl(keys[0]) <= 120
+
+
+class _FailingStore(RateLimitStore):
+    async def hit(self, key, policy, now=None):
+        raise ConnectionError("redis down")
+
+
+def _client(store=None, **kwargs):
+    app = FastAPI()
+
+    @app.post("/login/corporate")
+    async def login():
+        return {"success": True}
+
+    @app.get("/api/v1/companies")
+    async def companies():
+        return {"success": True}
+
+    policies = RouteTable(exact={("POST", "/login/corporate"): RateLimitPolicy("login", limit=2, period=300)})
+    app.add_middleware(
+        RateLimitMiddleware,
+        store=MemoryRateLimitStore() if store is None else store,
+        policies=policies,
+        enabled=True,
+        **kwargs
+    )
+    return TestClient(app)
+
+
+class TestRateLimitMiddleware:
+    """Test the ASGI middleware."""
+
+    def test_policy_route_limited(self):
+        client = _client()
+
+        first = client.post("/login/corporate")
+        client.post("/login/corporate")
+        limited = client.post("/login/corporate")
+
+        assert first.status_code == 200
+        assert first.headers["x-ratelimit-limit"] == "2"
+        assert first.headers["x-ratelimit-remaining"] == "1"
+        assert limited.status_code == 429
+        assert int(limited.headers["retry-after"]) >= 1
+        body = json.loads(limited.content)
+        assert body["error"]["type"] == "rate_limit_error"
+        assert body["error"]["details"]["limit"] == 2
+
+    def test_rotating_headers_do_not_reset_counter(self):
+        store = MemoryRateLimitStore()
+        client = _client(store)
+
+        statuses = [
+            client.post("/login/corporate", headers={
+                "Authorization": f"Bearer token-{attempt}",
+                "X-API-Key": f"key-{attempt}",
+                "X-Forwarded-For": f"203.0.113.{attempt}",
+            }).status_code
+            for attempt in range(4)
+        ]
+
+        assert statuses == [200, 200, 429, 429]
+        assert list(store._windows) == ["login:ip:testclient"]
+
+    def test_forwarded_for_only_from_trusted_proxies(self):
+        middleware = RateLimitMiddleware(
+            None, store=MemoryRateLimitStore(), enabled=True, trusted_proxies=["10.0.0.0/8"]
+        )
+
+        def scope(peer, forwarded_for):
+            return {"client": (peer, 40000), "headers": [(b"x-forwarded-for", forwarded_for.encode())]}
+
+        # Untrusted peer: the header is ignored
+        assert middleware._get_client_id(scope("198.51.100.7", "203.0.113.1")) == "ip:198.51.100.7"
+        # Trusted proxy: right-most untrusted hop, spoofed left-most entries are ignored
+        assert middleware._get_client_id(scope("10.0.0.2", "1.2.3.4, 203.0.113.1, 10.0.0.3")) == "ip:203.0.113.1"
+        assert middleware._get_client_id(scope("10.0.0.2", "not-an-ip")) == "ip:10.0.0.2"
+
+    def test_routes_without_policy_and_preflight_pass(self):
+        client = _client()
+
+        for _ in range(5):
+            assert client.get("/api/v1/companies").status_code == 200
+            client.options("/login/corporate")
+        assert "x-ratelimit-limit" not in client.get("/api/v1/companies").headers
+        assert client.post("/login/corporate").status_code == 200
+
+    def test_default_policy(self):
+        client = _client(default_policy=RateLimitPolicy("default", limit=1, period=60))
+
+        assert client.get("/api/v1/companies").status_code == 200
+        assert client.get("/api/v1/companies").status_code == 429
+
+    def test_store_failure_fails_open(self):
+        client = _client(_FailingStore())
+
+        assert client.post("/login/corporate").status_code == 200
@@ -0,0 +1,184 @@
+"""
+Unit tests for the per-route policy middleware.
+
+Tests cover:
+- Policy resolution (exact, prefix, default)
+- 413 on Content-Length before the body is read, and on streamed bodies
+- 503 at a route's concurrency cap
+- 408 when the handler does not start its response in time; streaming
+  responses that started in time are allowed to finish
+"""
+
+import asyncio
+import json
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.route_policy import (
+    PRIORITY_BULK,
+    PRIORITY_CRITICAL,
+    RoutePolicy,
+    RoutePolicyMiddleware,
+    build_route_policies,
+)
+from app.middleware.route_table import RouteTable
+
+
+class TestResolve:
+    """Test the default policy table."""
+
+    def setup_method(self):
+        self.middleware = RoutePolicyMiddleware(app=None)
+
+    def test_exact_routes(self):
+        assert self.middleware.resolve("POST", "/translate").priority == PRIORITY_BULK
+        assert self.middleware.resolve("POST", "/api/upload").timeout == 300
+        assert self.middleware.resolve("GET", "/health").priority == PRIORITY_CRITICAL
+
+    def test_prefix_routes(self):
+        payment = self.middleware.resolve("POST", "/api/payment/success")
+
+        assert payment.name == "payment"
+        assert payment.timeout == 90
+        assert self.middleware.resolve("POST", "/login/corporate").timeout == 60
+
+    def test_default(self):
+        policy = self.middleware.resolve("GET", "/api/v1/companies")
+
+        assert policy.name == "default"
+        assert policy.timeout == 30
+        # Method matters for exact routes
+        assert self.middleware.resolve("GET", "/translate").name == "default"
+
+    def test_table_is_declarative(self):
+        policies = build_route_policies()
+
+        assert policies.match("POST", "/translate-user") is policies.match("POST", "/translate")
+
+
+def _client(policy: RoutePolicy):
+    app = FastAPI()
+    events = {"body_read": False}
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        events["body_read"] = True
+        return {"size": len(body), "priority": request.state.route_policy.priority}
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(5)
+        return {"success": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                await asyncio.sleep(0.1)
+                yield f"{i}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app.add_middleware(
+        RoutePolicyMiddleware,
+        policies=RouteTable(exact={}),
+        default_policy=policy
+    )
+    return TestClient(app), events
+
+
+class TestBodyLimit:
+    """Test max_body_bytes."""
+
+    def test_within_limit(self):
+        client, _ = _client(RoutePolicy("test", max_body_bytes=100, priority=PRIORITY_BULK))
+
+        response = client.post("/echo", content=b"x" * 100)
+
+        assert response.status_code == 200
+        assert response.json() == {"size": 100, "priority": PRIORITY_BULK}
+
+    def test_content_length_rejected_before_reading(self):
+        client, events = _client(RoutePolicy("test", max_body_bytes=100))
+
+        response = client.post("/echo", content=b"x" * 101)
+
+        assert response.status_code == 413
+        assert response.json()["error"]["type"] == "payload_too_large_error"
+        assert events["body_read"] is False
+
+    def test_streamed_body_rejected(self):
+        client, events = _client(RoutePolicy("test", max_body_bytes=100))
+
+        def chunks():
+            for _ in range(10):
+                yield b"x" * 50
+
+        response = client.post("/echo", content=chunks())
+
+        assert response.status_code == 413
+        assert events["body_read"] is False
+
+
+class TestTimeout:
+    """Test the time-to-response-start limit."""
+
+    def test_handler_cancelled_with_408(self):
+        client, _ = _client(RoutePolicy("test", timeout=0.1))
+
+        response = client.get("/slow")
+
+        assert response.status_code == 408
+        body = json.loads(response.content)
+        assert body["error"] == {"code": 408, "message": "Request timeout", "type": "timeout_error"}
+
+    def test_started_stream_finishes(self):
+        client, _ = _client(RoutePolicy("test", timeout=0.05))
+
+        response = client.get("/stream")
+
+        assert response.status_code == 200
+        assert response.text == "0\n1\n2\n"
+
+
+class TestConcurrency:
+    """Test max_concurrency."""
+
+    @pytest.mark.asyncio
+    async def test_cap_rejects_with_503(self):
+        sent = []
+        release = asyncio.Event()
+
+        async def app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = RoutePolicyMiddleware(
+            app, policies=RouteTable(exact={}), default_policy=RoutePolicy("test", max_concurrency=1)
+        )
+
+        async def call(name):
+            scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+            async def receive():
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    sent.append((name, message["status"], dict(message["headers"])))
+
+            await middleware(scope, receive, send)
+
+        first = asyncio.ensure_future(call("first"))
+        await asyncio.sleep(0)
+        await call("second")
+        release.set()
+        await first
+
+        assert sent[0][:2] == ("second", 503)
+        assert sent[0][2][b"retry-after"] == b"1"
+        assert sent[1][:2] == ("first", 200)
+        assert middleware.in_flight["test"] == 0
@@ -0,0 +1,89 @@
+"""
+Unit tests for MongoDB document serialization.
+
+Tests cover:
+- serialize_for_json converts BSON types at any depth
+- Subclasses of the BSON types and containers are still converted
+- dumps() produces the same JSON as json.dumps(serialize_for_json(...))
+- Unsupported types raise TypeError
+"""
+
+import json
+import pytest
+from collections import OrderedDict
+from datetime import datetime, timezone
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+
+from app.utils.serialization import bson_default, dumps, serialize_for_json
+
+OID = ObjectId("507f1f77bcf86cd799439011")
+WHEN = datetime(2025, 1, 15, 10, 30, 0, 123456, tzinfo=timezone.utc)
+
+
+def _document():
+    return {
+        "_id": OID,
+        "created_at": WHEN,
+        "naive_at": datetime(2025, 1, 15, 10, 30),
+        "amount": Decimal128("123.45"),
+        "count": 3,
+        "ratio": 0.25,
+        "active": True,
+        "note": "Übersetzung ✓",
+        "missing": None,
+        "documents": [{"uploaded_at": WHEN, "ids": [OID, OID]}],
+    }
+
+
+class TestSerializeForJson:
+    """Test serialize_for_json."""
+
+    def test_converts_nested_bson_types(self):
+        result = serialize_for_json(_document())
+
+        assert result["_id"] == "507f1f77bcf86cd799439011"
+        assert result["created_at"] == "2025-01-15T10:30:00.123456+00:00"
+        assert result["naive_at"] == "2025-01-15T10:30:00"
+        assert result["amount"] == 123.45
+        assert result["documents"][0] == {
+            "uploaded_at": "2025-01-15T10:30:00.123456+00:00",
+            "ids": ["507f1f77bcf86cd799439011", "507f1f77bcf86cd799439011"],
+        }
+        assert result["count"] == 3 and result["active"] is True and result["missing"] is None
+
+    def test_subclasses_are_converted(self):
+        class _Stamp(datetime):
+            pass
+
+        result = serialize_for_json(OrderedDict(at=_Stamp(2025, 1, 1)))
+
+        assert result == {"at": "2025-01-01T00:00:00"}
+
+    def test_does_not_mutate_input(self):
+        document = _document()
+        serialize_for_json(document)
+        assert document["_id"] is OID
+
+
+class TestDumps:
+    """Test orjson encoding with the BSON default hook."""
+
+    def test_matches_stdlib_encoding(self):
+        documents = [_document(), _document()]
+
+        expected = json.dumps(
+            serialize_for_json(documents), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+        assert dumps(documents) == expected
+
+    def test_unsupported_type(self):
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
+
+    def test_default_hook(self):
+        assert bson_default(OID) == "507f1f77bcf86cd799439011"
+        assert bson_default(Decimal128("1.5")) == 1.5
+        with pytest.raises(TypeError):
+            bson_default({1, 2})
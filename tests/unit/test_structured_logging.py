@@ -0,0 +1,176 @@
+"""
+Unit tests for the structured, non-blocking logging pipeline.
+
+Tests cover:
+- Debug sampling and per-component level parsing
+- The queue handler never blocks or formats in the caller
+- legacy_print() routing, the off switch, and no module shadowing print()
+- configure_logging() end to end (stdlib and structlog records)
+"""
+
+import io
+import logging
+import queue
+import re
+from pathlib import Path
+import pytest
+from unittest.mock import patch
+
+import structlog
+
+from app.utils import structured_logging
+from app.utils.structured_logging import (
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    configure_logging,
+    get_logger,
+    legacy_print,
+    parse_component_levels,
+    set_legacy_prints,
+    shutdown_logging,
+)
+
+
+def _record(level=logging.DEBUG, name="test.component", msg="event %s", args=(1,)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    structlog.reset_defaults()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    logging.getLogger("noisy.component").setLevel(logging.NOTSET)
+    set_legacy_prints(True)
+
+
+class TestSamplingFilter:
+    """Test debug sampling."""
+
+    def test_keeps_exact_fraction_per_logger(self):
+        sampler = SamplingFilter(0.25)
+
+        kept = sum(sampler.filter(_record()) for _ in range(100))
+        kept_other = sum(sampler.filter(_record(name="other")) for _ in range(8))
+
+        assert kept == 25
+        assert kept_other == 2
+
+    def test_info_and_above_always_pass(self):
+        sampler = SamplingFilter(0.0)
+
+        assert sampler.filter(_record(level=logging.INFO))
+        assert sampler.filter(_record(level=logging.ERROR))
+        assert not sampler.filter(_record(level=logging.DEBUG))
+
+
+class TestComponentLevels:
+    """Test per-component level parsing."""
+
+    def test_parse(self):
+        assert parse_component_levels(" translator.middleware=warning, app.services=DEBUG ,") == {
+            "translator.middleware": logging.WARNING,
+            "app.services": logging.DEBUG,
+        }
+        assert parse_component_levels("") == {}
+
+    @pytest.mark.parametrize("spec", ["translator.middleware", "=INFO", "app=LOUD"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_component_levels(spec)
+
+
+class TestNonBlockingQueueHandler:
+    """Test enqueueing."""
+
+    def test_record_is_not_formatted_in_caller(self):
+        handler = NonBlockingQueueHandler(queue.Queue())
+
+        handler.handle(_record(msg="value=%s count=%d", args=("x", 2)))
+
+        queued = handler.queue.get_nowait()
+        assert queued.msg == "value=%s count=%d"
+        assert queued.args == ("x", 2)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        before = structured_logging.dropped_records()
+
+        handler.handle(_record())
+        handler.handle(_record())
+
+        assert handler.queue.qsize() == 1
+        assert structured_logging.dropped_records() == before + 1
+
+
+class TestLegacyPrint:
+    """Test the print() replacement."""
+
+    def test_routed_through_logging(self, caplog):
+        set_legacy_prints(True)
+        with caplog.at_level(logging.INFO, logger="legacy.print"):
+            legacy_print("[TIMEOUT MIDDLEWARE]", "START", 42)
+
+        assert caplog.records[0].name == "legacy.print"
+        assert caplog.records[0].getMessage() == "[TIMEOUT MIDDLEWARE] START 42"
+
+    def test_switch_off(self, caplog):
+        set_legacy_prints(False)
+        try:
+            with caplog.at_level(logging.INFO, logger="legacy.print"):
+                legacy_print("dropped")
+        finally:
+            set_legacy_prints(True)
+
+        assert caplog.records == []
+
+    def test_explicit_stream_uses_builtin_print(self):
+        stream = io.StringIO()
+
+        legacy_print("to stream", file=stream)
+
+        assert stream.getvalue() == "to stream\n"
+
+    def test_builtin_print_is_never_shadowed(self):
+        app_dir = Path(structured_logging.__file__).resolve().parents[1]
+
+        shadowing = [
+            str(path.relative_to(app_dir)) for path in app_dir.rglob("*.py")
+            if re.search(r"import .*\bas print\b", path.read_text(encoding="utf-8"))
+        ]
+
+        assert shadowing == []
+
+
+class TestConfigureLogging:
+    """Test the installed pipeline."""
+
+    def test_records_reach_output_handler(self, restore_logging):
+        output = io.StringIO()
+        handler = logging.StreamHandler(output)
+        handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+            processor=structlog.processors.JSONRenderer(),
+            foreign_pre_chain=structured_logging.SHARED_PROCESSORS,
+        ))
+
+        with patch.object(structured_logging.settings, "log_component_levels", "noisy.component=ERROR"), \
+             patch.object(structured_logging.settings, "log_level", "INFO"):
+            configure_logging(handlers=[handler])
+
+        root_handlers = logging.getLogger().handlers
+        assert len(root_handlers) == 1 and isinstance(root_handlers[0], NonBlockingQueueHandler)
+
+        logging.getLogger("app.services.test").info("stdlib %s", "record")
+        logging.getLogger("noisy.component").warning("suppressed")
+        get_logger("app.services.test").info("structured_event", transaction_id="TXN-1")
+        shutdown_logging()
+
+        lines = output.getvalue().splitlines()
+        assert len(lines) == 2
+        assert '"event": "stdlib record"' in lines[0]
+        assert '"transaction_id": "TXN-1"' in lines[1]
+        assert '"logger": "app.services.test"' in lines[1]
@@ -0,0 +1,263 @@
+"""
+Unit tests for subscription usage recording against the usage_periods collection.
+
+Tests cover:
+- Atomic $inc on the current usage period document in record_usage
+- One find + one bulk_write + one read-back regardless of subscription count
+- Batch balances come from the read-back, not the stale first read
+- Per-subscription errors (missing subscription, no active period)
+- Lazy migration of legacy embedded usage_periods arrays
+- Subscription summary uses the indexed current-period lookup
+"""
+
+import pytest
+from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+
+from app.models.subscription import UsageUpdate
+from app.services.subscription_service import SubscriptionError, SubscriptionService
+from app.services.usage_period_repository import UsagePeriodRepository
+
+
+def _active_period(subscription_id, units_allocated=100, units_used=0, promotional_units=0):
+    now = datetime.now(timezone.utc)
+    return {
+        "_id": ObjectId(),
+        "subscription_id": subscription_id,
+        "period_start": now - timedelta(days=1),
+        "period_end": now + timedelta(days=1),
+        "units_allocated": units_allocated,
+        "units_used": units_used,
+        "units_remaining": units_allocated - units_used,
+        "promotional_units": promotional_units,
+    }
+
+
+def _incremented(period, units):
+    return {**period, "units_used": period["units_used"] + units, "units_remaining": period["units_remaining"] - units}
+
+
+def _mock_database(periods=None, subscription=None, read_back=None):
+    cursor = MagicMock()
+    cursor.sort = MagicMock(return_value=cursor)
+    if read_back is None:
+        cursor.to_list = AsyncMock(return_value=periods or [])
+    else:
+        cursor.to_list = AsyncMock(side_effect=[periods or [], read_back])
+
+    usage_periods = MagicMock()
+    usage_periods.find = MagicMock(return_value=cursor)
+    usage_periods.find_one = AsyncMock(return_value=None)
+    usage_periods.find_one_and_update = AsyncMock(return_value=None)
+    usage_periods.bulk_write = AsyncMock()
+    usage_periods.insert_many = AsyncMock()
+    usage_periods.count_documents = AsyncMock(return_value=0)
+
+    subscriptions = MagicMock()
+    subscriptions.find_one = AsyncMock(return_value=subscription)
+    subscriptions.update_one = AsyncMock()
+
+    db = MagicMock()
+    db.usage_periods = usage_periods
+    db.subscriptions = subscriptions
+    return db
+
+
+def _patch_database(db):
+    return (
+        patch("app.services.subscription_service.database", db),
+        patch("app.services.usage_period_repository.database", db),
+    )
+
+
+class TestRecordUsageBatch:
+    """Test SubscriptionService.record_usage_batch."""
+
+    @pytest.mark.asyncio
+    async def test_single_read_and_single_bulk_write(self):
+        sub_a, sub_b = str(ObjectId()), str(ObjectId())
+        period_a, period_b = _active_period(sub_a, units_used=10), _active_period(sub_b)
+        db = _mock_database(
+            periods=[period_a, period_b],
+            read_back=[_incremented(period_a, 5), _incremented(period_b, 7)],
+        )
+
+        patch_service, patch_repository = _patch_database(db)
+        with patch_service, patch_repository:
+            results = await SubscriptionService().record_usage_batch({sub_a: 5, sub_b: 7})
+
+        assert db.usage_periods.find.call_count == 2
+        read_back_query = db.usage_periods.find.call_args.args[0]
+        assert set(read_back_query["_id"]["$in"]) == {period_a["_id"], period_b["_id"]}
+        db.usage_periods.bulk_write.assert_awaited_once()
+        operations = db.usage_periods.bulk_write.await_args.args[0]
+        assert len(operations) == 2
+
+        assert results[sub_a]["units_used"] == 15
+        assert results[sub_a]["units_remaining"] == 85
+        assert results[sub_b]["units_used"] == 7
+        assert results[sub_b]["overdraft"] is False
+
+    @pytest.mark.asyncio
+    async def test_reports_overdraft(self):
+        sub_id = str(ObjectId())
+        period = _active_period(sub_id, units_allocated=10, units_used=8)
+        db = _mock_database(periods=[period], read_back=[_incremented(period, 5)])
+
+        patch_service, patch_repository = _patch_database(db)
+        with patch_service, patch_repository:
+            results = await SubscriptionService().record_usage_batch({sub_id: 5})
+
+        assert results[sub_id]["overdraft"] is True
+        assert results[sub_id]["units_remaining"] == -3
+
+    @pytest.mark.asyncio
+    async def test_balances_include_concurrent_increments(self):
+        sub_id = str(ObjectId())
+        period = _active_period(sub_id, units_allocated=10, units_used=0)
+        # Another confirmation added 8 units between the first read and the bulk write
+        db = _mock_database(periods=[period], read_back=[_incremented(period, 8 + 5)])
+
+        patch_service, patch_repository = _patch_database(db)
+        with patch_service, patch_repository:
+            results = await SubscriptionService().record_usage_batch({sub_id: 5})
+
+        assert results[sub_id]["units_used"] == 13
+        assert results[sub_id]["units_remaining"] == -3
+        assert results[sub_id]["overdraft"] is True
+
+    @pytest.mark.asyncio
+    async def test_missing_subscription_and_no_period_are_errors(self):
+        sub_id = str(ObjectId())
+        db = _mock_database(subscription={"_id": ObjectId(sub_id), "company_name": "Acme"})
+
+        patch_service, patch_repository = _patch_database(db)
+        with patch_service, patch_repository:
+            results = await SubscriptionService().record_usage_batch({sub_id: 5, "SUB-MISSING": 3})
+
+        assert "error" in results[sub_id]
+        assert "error" in results["SUB-MISSING"]
+        db.usage_periods.bulk_write.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_empty_input_skips_database(self):
+        db = _mock_database()
+
+        patch_service, patch_repository = _patch_database(db)
+        with patch_service, patch_repository:
+            results = await SubscriptionService().record_usage_batch({})
+
+        assert results == {}
+        db.usage_periods.find.assert_not_called()
+
+
+class TestRecordUsageAtomic:
+    """Test SubscriptionService.record_usage single round-trip path."""
+
+    @pytest.mark.asyncio
+    async def test_increments_current_period_document(self):
+        sub_id = str(ObjectId())
+        db = _mock_database()
+        db.usage_periods.find_one_and_update.return_value = _active_period(
+            sub_id, units_allocated=10, units_used=12
+        )
+
+        patch_service, patch_repository = _patch_database(db)
+        with patch_service, patch_repository:
+            result = await SubscriptionService().record_usage(sub_id, UsageUpdate(units_to_add=5))
+
+        call = db.usage_periods.find_one_and_update.await_args
+        query, update = call.args
+        assert query["subscription_id"] == sub_id
+        assert update["$inc"] == {"units_used": 5, "units_remaining": -5}
+        db.subscriptions.find_one.assert_not_called()
+
+        # 12 used after adding 5 → 3 were available before the increment
+        assert result["_id"] == ObjectId(sub_id)
+        assert result["current_period"]["units_used"] == 12
+        assert result["units_remaining"] == -2
+        assert result["available_units"] == 3
+        assert result["overdraft"] is True
+        assert result["overdraft_amount"] == 2
+
+    @pytest.mark.asyncio
+    async def test_no_periods_raises(self):
+        sub_id = str(ObjectId())
+        db = _mock_database(subscription={"_id": ObjectId(sub_id), "company_name": "Acme"})
+
+        patch_service, patch_repository = _patch_database(db)
+        with patch_service, patch_repository:
+            with pytest.raises(SubscriptionError, match="has no usage periods"):
+                await SubscriptionService().record_usage(sub_id, UsageUpdate(units_to_add=1))
+
+    @pytest.mark.asyncio
+    async def test_migrates_embedded_periods_then_retries(self):
+        oid = ObjectId()
+        embedded = _active_period(None, units_allocated=50)
+        db = _mock_database(subscription={"_id": oid, "company_name": "Acme", "usage_periods": [embedded]})
+        db.usage_periods.find_one_and_update.side_effect = [
+            None,
+            _active_period(str(oid), units_allocated=50, units_used=4),
+        ]
+
+        patch_service, patch_repository = _patch_database(db)
+        with patch_service, patch_repository:
+            result = await SubscriptionService().record_usage("SUB-CUSTOM", UsageUpdate(units_to_add=4))
+
+        inserted = db.usage_periods.insert_many.await_args.args[0]
+        assert inserted[0]["subscription_id"] == str(oid)
+        assert inserted[0]["company_name"] == "Acme"
+        assert "_id" not in inserted[0]
+        db.subscriptions.update_one.assert_awaited_once_with(
+            {"_id": oid}, {"$unset": {"usage_periods": ""}}
+        )
+        retry_query = db.usage_periods.find_one_and_update.await_args.args[0]
+        assert retry_query["subscription_id"] == str(oid)
+        assert result["units_remaining"] == 46
+
+
+class TestSubscriptionSummary:
+    """Test SubscriptionService.get_subscription_summary."""
+
+    @pytest.mark.asyncio
+    async def test_current_period_from_repository(self):
+        oid = ObjectId()
+        sub_id = str(oid)
+        previous = _active_period(sub_id, units_allocated=100, units_used=100)
+        previous["period_end"] = previous["period_start"] - timedelta(seconds=1)
+        previous["period_start"] = previous["period_end"] - timedelta(days=30)
+        current = _active_period(sub_id, units_allocated=100, units_used=30)
+        db = _mock_database(periods=[previous, current], subscription={
+            "_id": oid, "company_name": "Acme", "subscription_unit": "page", "status": "active",
+        })
+        db.usage_periods.find_one.return_value = current
+
+        patch_service, patch_repository = _patch_database(db)
+        with patch_service, patch_repository:
+            summary = await SubscriptionService().get_subscription_summary(sub_id)
+
+        query = db.usage_periods.find_one.await_args.args[0]
+        assert query["subscription_id"] == sub_id
+        assert summary.current_period.units_used == 30
+        assert summary.total_units_used == 130
+
+
+class TestUsagePeriodRepository:
+    """Test UsagePeriodRepository lookups."""
+
+    @pytest.mark.asyncio
+    async def test_current_periods_keyed_by_subscription(self):
+        sub_id = str(ObjectId())
+        older = _active_period(sub_id)
+        newer = _active_period(sub_id)
+        newer["period_start"] = older["period_start"] + timedelta(hours=1)
+        db = _mock_database(periods=[older, newer])
+
+        with patch("app.services.usage_period_repository.database", db):
+            periods = await UsagePeriodRepository().get_current_periods([sub_id])
+
+        # Later-starting period wins, as in get_current_period()
+        assert periods == {sub_id: newer}
+        query = db.usage_periods.find.call_args.args[0]
+        assert query["subscription_id"] == {"$in": [sub_id]}
@@ -0,0 +1,132 @@
+"""
+Unit tests for the per-tenant bulkheads.
+
+Tests cover:
+- Tenant keys and quota overrides
+- Path capacity and per-tenant quotas
+- Round-robin scheduling across tenants
+- Cancelled waiters and background-task usage (run())
+"""
+
+import asyncio
+import pytest
+
+from starlette.requests import Request
+
+from app.services.tenant_bulkhead import TenantBulkhead, parse_tenant_quotas, request_tenant, tenant_key
+
+
+class TestTenantKey:
+    """Test tenant identification and quota parsing."""
+
+    def test_enterprise_and_individual(self):
+        assert tenant_key("Acme Health LLC", "john@acme.com") == "company:Acme Health LLC"
+        assert tenant_key(None, "Jane@Example.com") == "user:jane@example.com"
+
+    def test_request_tenant_ignores_client_supplied_email(self):
+        request = Request({"type": "http", "client": ("198.51.100.7", 50000), "headers": []})
+
+        assert request_tenant(None, request) == "ip:198.51.100.7"
+        assert request_tenant({"email": "Jane@Example.com"}, request) == "user:jane@example.com"
+        assert request_tenant({"email": "john@acme.com", "company_name": "Acme"}, request) == "company:Acme"
+
+    def test_parse_quotas(self):
+        assert parse_tenant_quotas(" company:Acme, Inc.=8 ; user:a@b.com=2;") == {
+            "company:Acme, Inc.": 8,
+            "user:a@b.com": 2,
+        }
+        assert parse_tenant_quotas("") == {}
+
+    @pytest.mark.parametrize("spec", ["company:Acme", "=3", "company:Acme=0", "company:Acme=many"])
+    def test_parse_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_tenant_quotas(spec)
+
+
+async def _hold(bulkhead, tenant, started, release):
+    async with bulkhead.slot(tenant):
+        started.append(tenant)
+        await release.wait()
+
+
+class TestTenantBulkhead:
+    """Test quotas and scheduling."""
+
+    @pytest.mark.asyncio
+    async def test_tenant_quota(self):
+        bulkhead = TenantBulkhead("test", capacity=10, tenant_quota=2)
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.ensure_future(_hold(bulkhead, "company:Big", started, release)) for _ in range(3)]
+        tasks.append(asyncio.ensure_future(_hold(bulkhead, "user:small@example.com", started, release)))
+        await asyncio.sleep(0)
+
+        assert started == ["company:Big", "company:Big", "user:small@example.com"]
+        assert bulkhead.snapshot()["waiting"] == 1
+        release.set()
+        await asyncio.gather(*tasks)
+        assert bulkhead.snapshot() == {
+            "capacity": 10, "active": 0, "waiting": 0, "tenants_active": 0, "tenants_waiting": 0
+        }
+
+    @pytest.mark.asyncio
+    async def test_round_robin_across_tenants(self):
+        bulkhead = TenantBulkhead("test", capacity=1, tenant_quota=1)
+        await bulkhead.acquire("company:Big")
+        order = []
+
+        async def job(tenant):
+            async with bulkhead.slot(tenant):
+                order.append(tenant)
+
+        # The rest of a large batch queues first, small tenants arrive behind it
+        tasks = [asyncio.ensure_future(job("company:Big")) for _ in range(3)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.ensure_future(job(tenant)) for tenant in ("user:a", "user:b")]
+        await asyncio.sleep(0)
+        bulkhead.release("company:Big")
+        await asyncio.gather(*tasks)
+
+        assert order == ["company:Big", "user:a", "user:b", "company:Big", "company:Big"]
+
+    @pytest.mark.asyncio
+    async def test_quota_override(self):
+        bulkhead = TenantBulkhead("test", capacity=3, tenant_quota=1, quota_overrides={"company:Big": 5})
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.ensure_future(_hold(bulkhead, "company:Big", started, release)) for _ in range(4)]
+        await asyncio.sleep(0)
+
+        # Override applies, capped at the path capacity
+        assert bulkhead.quota("company:Big") == 3
+        assert len(started) == 3
+        release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        bulkhead = TenantBulkhead("test", capacity=1, tenant_quota=1)
+        await bulkhead.acquire("company:Big")
+        waiter = asyncio.ensure_future(bulkhead.acquire("user:a"))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        bulkhead.release("company:Big")
+
+        assert bulkhead.snapshot()["active"] == 0
+        assert bulkhead.snapshot()["tenants_waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_run_background_task(self):
+        bulkhead = TenantBulkhead("test", capacity=1, tenant_quota=1)
+
+        async def process(transaction_id, customer_email=None):
+            assert bulkhead.active == 1
+            return (transaction_id, customer_email)
+
+        result = await bulkhead.run("user:a", process, "TXN-1", customer_email="a@example.com")
+
+        assert result == ("TXN-1", "a@example.com")
+        assert bulkhead.active == 0
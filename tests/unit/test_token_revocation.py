@@ -0,0 +1,169 @@
+"""
+Unit tests for cached JWT verification and token revocation.
+
+Tests cover:
+- Bloom filter membership
+- Revocation list: local revocations, sync from a shared store, failing closed
+- JWT claims cache (hits, expiry, LRU bound, eviction)
+- Logout through AuthService.invalidate_session
+"""
+
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.services import jwt_service as jwt_module
+from app.services.auth_service import AuthService
+from app.services.jwt_service import JWTService
+from app.services.token_revocation import (
+    BloomFilter,
+    MemoryRevocationStore,
+    TokenRevocationList,
+    token_digest,
+)
+
+USER = {
+    "user_id": "user_123",
+    "email": "john@acme.com",
+    "user_name": "John",
+    "company_name": "Acme Health LLC",
+    "permission_level": "user",
+}
+
+
+class FailingStore(MemoryRevocationStore):
+    async def is_revoked(self, digest):
+        raise ConnectionError("store down")
+
+
+class TestBloomFilter:
+    """Test the filter in front of the store."""
+
+    def test_membership(self):
+        bloom = BloomFilter(capacity=1000)
+        added = [token_digest(f"token-{index}") for index in range(1000)]
+        for digest in added:
+            bloom.add(digest)
+
+        assert all(digest in bloom for digest in added)
+        false_positives = sum(token_digest(f"other-{index}") in bloom for index in range(10000))
+        assert false_positives < 50  # ~0.1% expected
+
+
+class TestTokenRevocationList:
+    """Test revocation and cross-worker sync."""
+
+    @pytest.mark.asyncio
+    async def test_revoke(self):
+        revocations = TokenRevocationList(MemoryRevocationStore(), capacity=100, sync_interval=60)
+
+        await revocations.revoke(token_digest("a"), time.time() + 60)
+
+        assert await revocations.is_revoked(token_digest("a"))
+        assert not await revocations.is_revoked(token_digest("b"))
+
+    @pytest.mark.asyncio
+    async def test_sync_from_shared_store(self):
+        store = MemoryRevocationStore()
+        worker_a = TokenRevocationList(store, capacity=100, sync_interval=60)
+        worker_b = TokenRevocationList(store, capacity=100, sync_interval=60)
+        assert not await worker_b.is_revoked(token_digest("a"))
+
+        await worker_a.revoke(token_digest("a"), time.time() + 60)
+
+        # Not seen until worker B's next sync
+        assert not await worker_b.is_revoked(token_digest("a"))
+        worker_b._next_sync = 0.0
+        assert await worker_b.is_revoked(token_digest("a"))
+
+    @pytest.mark.asyncio
+    async def test_expired_revocations_not_synced(self):
+        store = MemoryRevocationStore()
+        await store.revoke(token_digest("old"), time.time() - 1)
+        revocations = TokenRevocationList(store, capacity=100, sync_interval=60)
+
+        assert not await revocations.is_revoked(token_digest("old"))
+
+    @pytest.mark.asyncio
+    async def test_rebuild_when_full(self):
+        store = MemoryRevocationStore()
+        revocations = TokenRevocationList(store, capacity=2, sync_interval=0)
+        for token in ("a", "b", "c"):
+            await revocations.revoke(token_digest(token), time.time() + 60)
+
+        await revocations.is_revoked(token_digest("x"))
+
+        assert revocations.bloom.count == 3
+        assert await revocations.is_revoked(token_digest("c"))
+
+    @pytest.mark.asyncio
+    async def test_store_failure_fails_closed(self):
+        revocations = TokenRevocationList(FailingStore(), capacity=100, sync_interval=60)
+        await revocations.revoke(token_digest("a"), time.time() + 60)
+
+        assert await revocations.is_revoked(token_digest("a"))
+        # Filter misses never reach the store
+        assert not await revocations.is_revoked(token_digest("b"))
+
+
+class TestJWTCache:
+    """Test the verified-claims cache."""
+
+    def test_cache_hit_skips_decode(self):
+        service = JWTService(cache_size=10)
+        token = service.create_access_token(USER)
+
+        with patch.object(jwt_module.jwt, "decode", wraps=jwt_module.jwt.decode) as decode:
+            first = service.verify_token(token)
+            first["email"] = "changed@example.com"
+            second = service.verify_token(token)
+
+        assert decode.call_count == 1
+        assert second["email"] == "john@acme.com"
+
+    def test_expired_entry_is_reverified(self):
+        service = JWTService(cache_size=10)
+        token = service.create_access_token(USER, expires_delta=timedelta(seconds=30))
+        assert service.verify_token(token) is not None
+
+        # Past the cached exp: the token is decoded (and verified) again
+        with patch.object(jwt_module.time, "time", return_value=time.time() + 60), \
+                patch.object(jwt_module.jwt, "decode", wraps=jwt_module.jwt.decode) as decode:
+            service.verify_token(token)
+
+        assert decode.call_count == 1
+
+    def test_lru_bound_and_evict(self):
+        service = JWTService(cache_size=2)
+        tokens = [service.create_access_token({**USER, "user_id": f"user_{index}"}) for index in range(3)]
+        for token in tokens:
+            service.verify_token(token)
+
+        assert list(service._cache) == [token_digest(tokens[1]), token_digest(tokens[2])]
+        service.evict(tokens[2])
+        assert list(service._cache) == [token_digest(tokens[1])]
+
+    def test_invalid_token_not_cached(self):
+        service = JWTService(cache_size=10)
+
+        assert service.verify_token("not-a-jwt") is None
+        assert service.token_expiry("not-a-jwt") is None
+        assert len(service._cache) == 0
+
+
+class TestLogout:
+    """Test revocation through AuthService."""
+
+    @pytest.mark.asyncio
+    async def test_invalidated_session_is_rejected(self):
+        auth_service = AuthService()
+        revocations = TokenRevocationList(MemoryRevocationStore(), capacity=100, sync_interval=60)
+        token = jwt_module.jwt_service.create_access_token(USER)
+
+        with patch("app.services.auth_service.token_revocation", revocations):
+            assert (await auth_service.verify_session(token))["email"] == "john@acme.com"
+            assert await auth_service.invalidate_session(token) is True
+            assert await auth_service.verify_session(token) is None
+            assert await auth_service.invalidate_session("not-a-jwt") is False
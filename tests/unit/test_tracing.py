@@ -0,0 +1,180 @@
+"""
+Unit tests for request tracing.
+
+Tests cover:
+- Span nesting through contextvars (tasks and worker threads)
+- Server-Timing summaries
+- TracingMiddleware (X-Request-ID as trace id, route template, header)
+- OTLP/JSON export and the file exporter
+"""
+
+import asyncio
+import json
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.logging import LoggingMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.utils import tracing
+from app.utils.tracing import (
+    FileSpanExporter,
+    SpanExporter,
+    record_span,
+    request_trace,
+    server_timing,
+    span,
+    to_otlp,
+    trace_id_from_request_id,
+)
+
+
+class CollectingExporter(SpanExporter):
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+@pytest.fixture
+def exporter():
+    collecting = CollectingExporter()
+    tracing.configure_tracing(collecting)
+    yield collecting
+    tracing.shutdown_tracing()
+
+
+class TestSpans:
+    """Test span creation and nesting."""
+
+    def test_no_trace_is_noop(self):
+        with span("mongo.find") as current:
+            assert current is None
+        record_span("mongo.find", 0.01)
+
+    def test_nesting_and_errors(self):
+        with request_trace("a" * 32, "GET /x") as trace:
+            with span("payment.process_files") as outer:
+                with span("drive.upload_file") as inner:
+                    pass
+                record_span("mongo.insert", 0.002, error="DuplicateKey")
+            with pytest.raises(ValueError):
+                with span("smtp.invoice"):
+                    raise ValueError("customer@example.com rejected")
+
+        names = {finished.name: finished for finished in trace.spans}
+        assert outer.parent_id == trace.root.span_id
+        assert inner.parent_id == outer.span_id
+        assert names["mongo.insert"].parent_id == outer.span_id
+        assert names["mongo.insert"].error == "DuplicateKey"
+        # Error type only, never the message
+        assert names["smtp.invoice"].error == "ValueError"
+        assert tracing.current_trace_id() is None
+
+    @pytest.mark.asyncio
+    async def test_context_reaches_threads_and_tasks(self):
+        with request_trace("b" * 32, "POST /translate") as trace:
+            await asyncio.to_thread(record_span, "mongo.find", 0.001)
+            await asyncio.gather(*(asyncio.ensure_future(self._drive_call()) for _ in range(2)))
+
+        assert sorted(finished.name for finished in trace.spans) == ["drive.get_file", "drive.get_file", "mongo.find"]
+        assert {finished.trace_id for finished in trace.spans} == {"b" * 32}
+
+    @staticmethod
+    async def _drive_call():
+        with span("drive.get_file"):
+            await asyncio.sleep(0)
+
+    def test_span_limit(self, monkeypatch):
+        monkeypatch.setattr(tracing.settings, "tracing_max_spans", 2)
+        with request_trace("c" * 32, "GET /x") as trace:
+            for _ in range(5):
+                record_span("mongo.find", 0.001)
+
+        assert len(trace.spans) == 2
+        assert trace.dropped_spans == 3
+
+    def test_server_timing(self):
+        with request_trace("d" * 32, "GET /x") as trace:
+            record_span("mongo.find", 0.010)
+            record_span("mongo.update", 0.0025)
+            record_span("drive.upload_file", 0.3)
+
+        header = server_timing(trace)
+        assert header.startswith('mongo;dur=12.5;desc="2 calls", drive;dur=300.0;desc="1 call", total;dur=')
+
+    def test_trace_id_from_request_id(self):
+        request_id = str(uuid.uuid4())
+        assert trace_id_from_request_id(request_id) == request_id.replace("-", "")
+        assert len(trace_id_from_request_id("not-a-uuid")) == 32
+
+
+class TestTracingMiddleware:
+    """Test the per-request trace."""
+
+    def test_request_trace_and_header(self, exporter):
+        app = FastAPI()
+
+        @app.get("/api/v1/items/{item_id}")
+        async def item(item_id: str):
+            record_span("mongo.find", 0.004)
+            return {"id": item_id}
+
+        app.add_middleware(TracingMiddleware, enabled=True, server_timing_header=True)
+        app.add_middleware(LoggingMiddleware)
+        response = TestClient(app).get("/api/v1/items/42")
+        tracing.shutdown_tracing()
+
+        assert response.headers["server-timing"].startswith('mongo;dur=4.0;desc="1 call", total;dur=')
+        [trace] = exporter.traces
+        assert trace.trace_id == response.headers["x-request-id"].replace("-", "")
+        assert trace.root.name == "GET /api/v1/items/{item_id}"
+        assert trace.root.attributes["http.status_code"] == 200
+
+    def test_disabled(self, exporter):
+        app = FastAPI()
+
+        @app.get("/ping")
+        async def ping():
+            return {}
+
+        app.add_middleware(TracingMiddleware, enabled=False)
+        response = TestClient(app).get("/ping")
+        tracing.shutdown_tracing()
+
+        assert "server-timing" not in response.headers
+        assert exporter.traces == []
+
+
+class TestExport:
+    """Test the OTLP/JSON document and the file exporter."""
+
+    def test_otlp_document(self):
+        with request_trace("e" * 32, "GET /x", **{"http.method": "GET"}) as trace:
+            with span("stripe.request", **{"http.status_code": 200}):
+                tracing.add_event("PAYMENT INTENT CREATED")
+            record_span("mongo.find", 0.001, error="Unauthorized")
+
+        [resource] = to_otlp([trace])["resourceSpans"]
+        root, stripe_span, mongo_span = resource["scopeSpans"][0]["spans"]
+        assert root["kind"] == 2 and "parentSpanId" not in root
+        assert root["attributes"] == [{"key": "http.method", "value": {"stringValue": "GET"}}]
+        assert stripe_span["parentSpanId"] == root["spanId"]
+        assert stripe_span["attributes"] == [{"key": "http.status_code", "value": {"intValue": "200"}}]
+        assert stripe_span["events"][0]["name"] == "PAYMENT INTENT CREATED"
+        assert mongo_span["status"] == {"code": 2, "message": "Unauthorized"}
+        assert int(mongo_span["endTimeUnixNano"]) - int(mongo_span["startTimeUnixNano"]) == 1_000_000
+
+    def test_file_exporter(self, tmp_path):
+        path = tmp_path / "traces" / "traces.jsonl"
+        tracing.configure_tracing(FileSpanExporter(str(path)))
+        with request_trace("f" * 32, "GET /x"):
+            record_span("mongo.find", 0.001)
+        tracing.shutdown_tracing()
+
+        [line] = path.read_text().splitlines()
+        spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [exported["name"] for exported in spans] == ["GET /x", "mongo.find"]
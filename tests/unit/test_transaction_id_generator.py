@@ -6,14 +6,17 @@ Tests cover:
 - Fallback format generation
 - Uniqueness checking logic
 - Retry mechanism
+- Insert-and-retry allocation on duplicate key
 - Format validation
 """
 
 import pytest
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo.errors import DuplicateKeyError
 from app.utils.transaction_id_generator import (
     generate_unique_transaction_id,
+    insert_with_transaction_id,
     _generate_random_format,
     _generate_fallback_format,
     validate_transaction_id_format
@@ -256,3 +259,63 @@ class TestGenerateUniqueTransactionId:
         for _ in range(10):
             transaction_id = await generate_unique_transaction_id(mock_collection)
             assert validate_transaction_id_format(transaction_id) is True
+
+
+def _duplicate_key(field):
+    return DuplicateKeyError(
+        f"E11000 duplicate key error index: {field}_unique",
+        code=11000,
+        details={"code": 11000, "keyPattern": {field: 1}, "keyValue": {field: "x"}}
+    )
+
+
+class TestInsertWithTransactionId:
+    """Test insert-and-retry allocation (no find_one pre-check)."""
+
+    @pytest.mark.asyncio
+    async def test_single_insert_without_precheck(self):
+        """Test that the common case is one insert and no find_one."""
+        mock_collection = AsyncMock()
+        document = {"user_email": "a@example.com"}
+
+        transaction_id = await insert_with_transaction_id(mock_collection, document)
+
+        assert validate_transaction_id_format(transaction_id) is True
+        assert len(transaction_id) == 10
+        assert document["transaction_id"] == transaction_id
+        mock_collection.insert_one.assert_awaited_once_with(document)
+        mock_collection.find_one.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_retries_on_transaction_id_collision(self):
+        """Test that a transaction_id duplicate key triggers a new candidate."""
+        mock_collection = AsyncMock()
+        mock_collection.insert_one.side_effect = [_duplicate_key("transaction_id"), None]
+
+        with patch("random.randint", side_effect=[1, 2]):
+            transaction_id = await insert_with_transaction_id(mock_collection, {})
+
+        assert transaction_id == "USER000002"
+        assert mock_collection.insert_one.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_uses_fallback_after_max_retries(self):
+        """Test fallback format after exhausting retries."""
+        mock_collection = AsyncMock()
+        mock_collection.insert_one.side_effect = [_duplicate_key("transaction_id")] * 3 + [None]
+
+        transaction_id = await insert_with_transaction_id(mock_collection, {}, max_retries=3)
+
+        assert len(transaction_id) >= 17
+        assert mock_collection.insert_one.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_other_unique_key_conflict_is_raised(self):
+        """Test that a duplicate checkout session is not retried."""
+        mock_collection = AsyncMock()
+        mock_collection.insert_one.side_effect = _duplicate_key("stripe_checkout_session_id")
+
+        with pytest.raises(DuplicateKeyError):
+            await insert_with_transaction_id(mock_collection, {})
+
+        mock_collection.insert_one.assert_awaited_once()